@@ -0,0 +1,81 @@
+"""
+Micro-benchmark: matching scraped jobs against the user's applied jobs.
+
+Compares the former per-job scan of the company's applied urls and titles
+with the precomputed AppliedJobsIndex of the MCP server. Run from the
+repository root:
+
+    python benchmarks/bench_jobs_filter.py [--scraped 10000] [--applied 5000] [--companies 500]
+"""
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from llm.mcp_servers.services.applied_jobs_index import AppliedJobsIndex
+
+
+def _make_jobs(count: int, companies: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [{
+        "company_name": f"Company {rng.randrange(companies)}",
+        "job_title": f"Engineer {rng.randrange(count)}",
+        "job_url": f"https://www.linkedin.com/jobs/view/{rng.randrange(count * 2)}/?refId={rng.random()}",
+    } for _ in range(count)]
+
+
+def _legacy_filter(scraped: list[dict], applied: list[dict]) -> int:
+    by_company: dict[str, list[dict]] = {}
+    for job in applied:
+        by_company.setdefault(job["company_name"].strip().lower(), []).append(job)
+    tracked = 0
+    for job in scraped:
+        applied_jobs = by_company.get(job["company_name"].strip().lower())
+        if not applied_jobs:
+            continue
+        urls = [applied_job["job_url"] for applied_job in applied_jobs]
+        titles = [applied_job["job_title"].strip().lower() for applied_job in applied_jobs]
+        if job["job_url"] in urls or job["job_title"].strip().lower() in titles:
+            tracked += 1
+    return tracked
+
+
+def _index_filter(scraped: list[dict], index: AppliedJobsIndex) -> int:
+    return sum(index.contains(job["company_name"], job["job_url"], job["job_title"]) for job in scraped)
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scraped', type=int, default=10000)
+    parser.add_argument('--applied', type=int, default=5000)
+    parser.add_argument('--companies', type=int, default=500)
+    args = parser.parse_args()
+
+    applied = _make_jobs(args.applied, args.companies, seed=1)
+    scraped = _make_jobs(args.scraped, args.companies, seed=2)
+
+    legacy_tracked, legacy_ms = _timed(_legacy_filter, scraped, applied)
+
+    def build_index():
+        index = AppliedJobsIndex()
+        for job in applied:
+            index.add_job(job)
+        return index
+
+    index, build_ms = _timed(build_index)
+    index_tracked, lookup_ms = _timed(_index_filter, scraped, index)
+
+    print(f"scraped / applied jobs:  {args.scraped} / {args.applied} in {args.companies} companies")
+    print(f"list scan per job:       {legacy_ms:8.1f} ms, {legacy_tracked} tracked")
+    print(f"index build (once):      {build_ms:8.1f} ms")
+    print(f"index lookups:           {lookup_ms:8.1f} ms, {index_tracked} tracked")
+    print(f"speedup per search:      {legacy_ms / lookup_ms:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
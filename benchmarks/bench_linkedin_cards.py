@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: parsing the job cards of LinkedIn search result pages.
+
+Compares the former BeautifulSoup parser, which searched each card once per
+field, with the lxml parser of the LinkedIn scraper, which reads all fields in
+one walk over each card. Both build the same ScrapedJob objects, checked before
+timing. Run from the repository root:
+
+    python benchmarks/bench_linkedin_cards.py [--fixtures tests/mockups/linkedin] [--rounds 20]
+"""
+import argparse, logging, os, sys, time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bs4 import BeautifulSoup
+
+from llm.mcp_servers.job_search.services.job_scrapers.linkedin_jobs_scraper_service import LinkedInJobsScraperService
+
+
+def _legacy_card_fields(card) -> dict:
+    fields = {}
+    title_element = card.find('h3', class_='base-search-card__title')
+    if title_element:
+        fields['title'] = title_element.text.strip()
+    company_element = card.find('h4', class_='base-search-card__subtitle')
+    if not company_element:
+        company_element = card.find('a', {'data-tracking-control-name': 'public_jobs_topcard-org-name'})
+    if company_element:
+        fields['company'] = company_element.text.strip()
+    location_element = card.find('span', class_='job-search-card__location')
+    if location_element:
+        fields['location'] = location_element.text.strip()
+    link_element = card.find('a', class_='base-card__full-link')
+    if link_element and 'href' in link_element.attrs:
+        fields['link'] = link_element['href']
+    date_element = card.find('time', class_='job-search-card__listdate')
+    if date_element and date_element.has_attr('datetime'):
+        fields['posted_date'] = date_element['datetime']
+    return fields
+
+
+def _legacy_parse(scraper: LinkedInJobsScraperService, content: bytes) -> list:
+    soup = BeautifulSoup(content, 'lxml')
+    return [job for job in (scraper._parse_job_card(_legacy_card_fields(card), [])
+                            for card in soup.find_all('div', class_='base-card')) if job]
+
+
+def _timed_rounds(func, pages: list[bytes], rounds: int) -> tuple[int, float]:
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in pages:
+            cards += len(func(content))
+    return cards, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', type=Path,
+                        default=Path(__file__).resolve().parent.parent / 'tests' / 'mockups' / 'linkedin')
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    # cards without a link are skipped with a log line per card
+    logging.disable(logging.INFO)
+
+    pages = [path.read_bytes() for path in sorted(args.fixtures.glob('*.html'))]
+    if not pages:
+        sys.exit(f"No .html fixtures in {args.fixtures}")
+    scraper = LinkedInJobsScraperService()
+
+    def lxml_parse(content: bytes) -> list:
+        return scraper._parse_job_cards(content, []) or []
+
+    def legacy_parse(content: bytes) -> list:
+        return _legacy_parse(scraper, content)
+
+    for content in pages:
+        if legacy_parse(content) != lxml_parse(content):
+            sys.exit("The parsers disagree on a fixture")
+
+    legacy_cards, legacy_seconds = _timed_rounds(legacy_parse, pages, args.rounds)
+    lxml_cards, lxml_seconds = _timed_rounds(lxml_parse, pages, args.rounds)
+
+    print(f"fixtures / rounds:       {len(pages)} pages, {legacy_cards // args.rounds} jobs / {args.rounds}")
+    print(f"BeautifulSoup find:      {legacy_cards / legacy_seconds:10.0f} cards/s")
+    print(f"lxml one pass:           {lxml_cards / lxml_seconds:10.0f} cards/s")
+    print(f"speedup:                 {legacy_seconds / lxml_seconds:10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
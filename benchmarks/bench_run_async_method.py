@@ -0,0 +1,48 @@
+"""
+Micro-benchmark: per-call overhead of utils.run_async_method.
+
+Compares the legacy mode (a new event loop per call) with the shared
+AsyncRunner loop mode. Run from the repository root:
+
+    python benchmarks/bench_run_async_method.py [--calls 2000]
+"""
+import argparse, asyncio, os, sys, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from utils.utils import AsyncRunner, run_async_method
+
+
+async def _noop(value: int) -> int:
+    await asyncio.sleep(0)
+    return value
+
+
+def _measure(calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        run_async_method(_noop, i)
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=2000)
+    args = parser.parse_args()
+
+    legacy_us = _measure(args.calls)
+
+    AsyncRunner.start(route_sync_calls=True)
+    try:
+        shared_us = _measure(args.calls)
+    finally:
+        AsyncRunner.shutdown()
+
+    print(f"calls per mode:          {args.calls}")
+    print(f"new loop per call:       {legacy_us:8.1f} us/call")
+    print(f"shared AsyncRunner loop: {shared_us:8.1f} us/call")
+    print(f"speedup:                 {legacy_us / shared_us:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,9 @@
-import configparser, webview, logging, os
+import concurrent.futures, configparser, json, webview, logging, os
+from dataclasses import asdict
 from typing import Any
 
+from pydantic import ValidationError
+
 from jobs_tracking.job_tracking_api import JobTrackingApi
 from jobs_tracking.models import CompanyDto, TrackedJobDto
 
@@ -8,9 +11,12 @@ from llm.llm_api import LLMApi
 
 from scripts_manager.scripts_manager_api import ScriptsManagerApi
 
+from repository.motor_client_registry import MotorClientRegistry
+
 from user.user_api import UserApi
 
 from utils.file_utils import CONFIG_FILE
+from utils.utils import AsyncRunner
 
 
 class CommandsAutomatorApi:
@@ -22,6 +28,14 @@ class CommandsAutomatorApi:
         self.job_tracking_api = job_tracking_api
         self.config_path = str(CONFIG_FILE)
         self._config_cache = None
+        # evaluate_js waits for the window, so changes are pushed from one thread, in order
+        self._job_changes_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="JobChangesPush")
+        # e.g. JOB_TRACKING_WRITE_BEHIND_MS=500 acknowledges job edits at once and writes them in batches
+        write_behind_ms = os.getenv('JOB_TRACKING_WRITE_BEHIND_MS')
+        if self.job_tracking_api is not None and write_behind_ms:
+            self.job_tracking_api.enable_write_behind(self._push_job_write_errors, float(write_behind_ms) / 1000)
+        if self.llm_api is not None:
+            self.llm_api.enable_job_streaming(self._push_streamed_jobs)
         
     def _load_config_once(self):
         """Load configuration once and cache it"""
@@ -80,8 +94,25 @@ class CommandsAutomatorApi:
     def call_llm(self, prompt: str, image_data: str, output_file_path: str, user_id:str = None):
         return self.llm_api.call_llm(prompt, image_data, output_file_path, user_id)
     
+    def submit_llm_call(self, prompt: str, image_data: str, output_file_path: str, user_id:str = None):
+        return self.llm_api.submit_llm_call(prompt, image_data, output_file_path, user_id)
+    
     def cancel_llm_operation(self):
         self.llm_api.cancel_operation()
+
+    def get_operation_result(self, handle: str) -> dict[str, Any]:
+        """Poll a non blocking operation. status is PENDING until the result is available"""
+        return asdict(AsyncRunner.poll_operation(handle))
+
+    def cancel_operation(self, handle: str) -> bool:
+        return AsyncRunner.cancel_operation(handle)
+
+    def get_async_loop_metrics(self) -> list[dict[str, Any]]:
+        return [asdict(metrics) for metrics in AsyncRunner.get_loop_metrics()]
+
+    def get_mongo_pool_stats(self) -> list[dict[str, Any]]:
+        return [{**asdict(stats), "avg_checkout_wait_ms": round(stats.avg_checkout_wait_ms, 3)}
+                for stats in MotorClientRegistry.get_pool_stats()]
     
     
     def select_folder(self):
@@ -89,46 +120,140 @@ class CommandsAutomatorApi:
             logging.error("No webview windows available")
             return None
         return webview.windows[0].create_file_dialog(webview.FOLDER_DIALOG)
+
+    def select_import_file(self):
+        if not webview.windows:
+            logging.error("No webview windows available")
+            return None
+        result = webview.windows[0].create_file_dialog(
+            webview.OPEN_DIALOG, file_types=('Job files (*.csv;*.json;*.jsonl)', 'All files (*.*)'))
+        return result[0] if result else None
     
         
     def register(self, email:str):
         if self.user_api is None:
-            return {"error": "User API not available - MongoDB configuration missing"}
+            return {"error": "User API not available - persistence failed to initialize"}
         return self.user_api.register(email)
     
 
     def get_job_application_states(self):
         """Get list of job application states"""
         if self.job_tracking_api is None:
-            return {"error": "Job Tracking API not available - MongoDB configuration missing"}
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
         return self.job_tracking_api.get_job_application_states()
     
     def track_new_job(self, user_id: str, company_name: str, job_dto_dict: dict) -> dict[str, Any]:
         if self.job_tracking_api is None:
-            return {"error": "Job Tracking API not available - MongoDB configuration missing"}        
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
         
         job_dto = TrackedJobDto(**job_dto_dict)
         return self.job_tracking_api.track_new_job(user_id=user_id, company_name=company_name, job_dto=job_dto)
     
     def track_existing_job(self, user_id: str, company_id: str, job_dto_dict: dict) -> dict[str, Any]:
         if self.job_tracking_api is None:
-            return {"error": "Job Tracking API not available - MongoDB configuration missing"}        
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
         
         job_dto = TrackedJobDto(**job_dto_dict)
         return self.job_tracking_api.track_existing_job(user_id=user_id, company_id=company_id, job_dto=job_dto)
       
+    def submit_track_new_job(self, user_id: str, company_name: str, job_dto_dict: dict) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+
+        job_dto = TrackedJobDto(**job_dto_dict)
+        return self.job_tracking_api.submit_track_new_job(user_id=user_id, company_name=company_name, job_dto=job_dto)
+
+    def submit_track_existing_job(self, user_id: str, company_id: str, job_dto_dict: dict) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+
+        job_dto = TrackedJobDto(**job_dto_dict)
+        return self.job_tracking_api.submit_track_existing_job(user_id=user_id, company_id=company_id, job_dto=job_dto)
+      
+    def list_tracked_jobs(self, user_id: str, job_filter: dict = None, sort: str = None,
+                          page_token: str = None, page_size: int = 50) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+        return self.job_tracking_api.list_tracked_jobs(user_id, job_filter, sort, page_token, page_size)
+
+    def track_jobs_bulk(self, user_id: str, companies_dicts: list[dict]) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+
+        try:
+            companies = [CompanyDto(**company_dict) for company_dict in companies_dicts or []]
+        except ValidationError as e:
+            logging.error(f"Invalid companies for bulk tracking: {e}")
+            return {"code": "INVALID_PARAMETER", "results": [], "error": str(e)}
+        return self.job_tracking_api.track_jobs_bulk(user_id=user_id, companies=companies)
+
+    def import_jobs_file(self, user_id: str, file_path: str) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+        return self.job_tracking_api.import_jobs_file(user_id=user_id, file_path=file_path)
+
     def get_tracked_jobs(self, user_id: str, company_name: str) -> list[dict] | dict:
         if self.job_tracking_api is None:
-            return {"error": "Job Tracking API not available - MongoDB configuration missing"}
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
         return self.job_tracking_api.get_tracked_jobs(user_id, company_name)
+
+    def submit_get_tracked_jobs(self, user_id: str, company_name: str) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+        return self.job_tracking_api.submit_get_tracked_jobs(user_id, company_name)
             
+    def get_job_analytics(self, user_id: str, weeks: int = 12) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+        return self.job_tracking_api.get_job_analytics(user_id, weeks)
+
+    def start_job_updates(self, user_id: str) -> dict[str, Any]:
+        """Live refresh of the job table, enabled by JOB_TRACKING_LIVE_UPDATES=1"""
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+        if os.getenv('JOB_TRACKING_LIVE_UPDATES', '').lower() not in ('1', 'true'):
+            return {"enabled": False}
+        return {"enabled": self.job_tracking_api.start_live_updates(user_id, self._push_job_changes)}
+
+    def _push_job_changes(self, changes: list[dict]):
+        self._job_changes_executor.submit(self._evaluate, "applyTrackedJobChanges", changes)
+
+    def _push_job_write_errors(self, failed: list[dict]):
+        self._job_changes_executor.submit(self._evaluate, "onTrackedJobWriteErrors", failed)
+
+    def _push_streamed_jobs(self, jobs: list[dict]):
+        self._job_changes_executor.submit(self._evaluate, "onStreamedJobs", jobs)
+
+    def _evaluate(self, js_function: str, payload: list[dict]):
+        """Calls window.<js_function>(payload) in the window, if the page defines it"""
+        if not webview.windows:
+            return
+        try:
+            webview.windows[0].evaluate_js(
+                f"window.{js_function} && window.{js_function}({json.dumps(payload)})")
+        except Exception as e:
+            logging.exception(f"Failed to call {js_function} in the window: {e}")
+
+    def shutdown(self):
+        """Stops the live updates and writes the queued job updates before the process exits"""
+        if self.job_tracking_api is not None:
+            # the watcher would otherwise keep reading while the queue is written and the loops stop
+            self.job_tracking_api.stop_live_updates()
+            self.job_tracking_api.flush_pending_updates()
+        self._job_changes_executor.shutdown(wait=False)
+
+    def get_job_tracking_cache_stats(self) -> dict[str, Any]:
+        if self.job_tracking_api is None:
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
+        return self.job_tracking_api.get_cache_stats()
+
     def extract_job_title_and_company(self, url:str):
         if self.job_tracking_api is None:
-            return {"error": "Job Tracking API not available - MongoDB configuration missing"}
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
         return self.job_tracking_api.extract_job_title_and_company(url)
         
     def delete_tracked_jobs(self, user_id: str, companies_jobs: list[dict[str, list[dict]]]):
         if self.job_tracking_api is None:
-            return {"error": "Job Tracking API not available - MongoDB configuration missing"}
+            return {"error": "Job Tracking API not available - persistence failed to initialize"}
         companies = [CompanyDto(**item) for item in companies_jobs]
         return self.job_tracking_api.delete_tracked_jobs(user_id, companies)
\ No newline at end of file
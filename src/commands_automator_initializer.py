@@ -11,6 +11,8 @@ from llm.services.llm_service import LLMService
 
 from scripts_manager.scripts_manager_api import ScriptsManagerApi
 
+from repository.motor_client_registry import MotorClientRegistry
+
 from user.services.user_registry_service import UserRegistryService
 from user.user_api import UserApi
 
@@ -19,7 +21,8 @@ from utils.logger_config import setup_logging
 
 from commands_automator_api import CommandsAutomatorApi
 
-from utils.utils import AsyncRunner
+from utils import file_utils
+from utils.utils import AsyncRunner, OperationClass
 from utils.logger_config import setup_logging
 
 
@@ -48,6 +51,9 @@ async def initialize_apis():
     """Initialize all APIs"""
 
     scripts_manager_api = ScriptsManagerApi()
+
+    # the MCP process reads the database settings from the environment it starts with
+    load_environment()
     
     llm_service = LLMService()
     llm_service.run_mcp_server()
@@ -55,23 +61,23 @@ async def initialize_apis():
 
     user_api = None
     job_tracking_api = None
-
-    load_environment()
     
     mongo_connection_string = os.getenv('MONGODB_URI')
     db_name = os.getenv('MONGODB_DB_NAME')
     
-    if not db_name or not mongo_connection_string:
-        logging.warning("MongoDB configuration not found in .env.local. Database-related features will be disabled.")
-    else:
-        try:
+    try:
+        if not db_name or not mongo_connection_string:
+            db_path = file_utils.get_local_db_file()
+            logging.warning(f"MongoDB configuration not found in .env.local. Tracking jobs in the local database {db_path}")
+            user_registry_service = await UserRegistryService.create_local(db_path)
+            job_tracking_service = await JobTrackingService.create_local(db_path)
+        else:
             user_registry_service = await UserRegistryService.create(mongo_connection_string=mongo_connection_string, db_name=db_name)
-            user_api = UserApi(user_registry_service)
-
             job_tracking_service = await JobTrackingService.create(mongo_connection_string=mongo_connection_string, db_name=db_name)
-            job_tracking_api = JobTrackingApi(job_tracking_service)
-        except Exception as e:
-            logging.error(f"Error initializing database APIs: {e}")
+        user_api = UserApi(user_registry_service)
+        job_tracking_api = JobTrackingApi(job_tracking_service)
+    except Exception as e:
+        logging.error(f"Error initializing database APIs: {e}")
 
     return scripts_manager_api, llm_api, user_api, job_tracking_api
 
@@ -82,9 +88,19 @@ def main():
         setup_logging()  # Set up logging at the application entry point
         logging.info("Starting Commands Automator application...")
 
-        AsyncRunner.start()
+        load_environment()
+        # e.g. ASYNC_LOOPS=db,llm,io runs Mongo, LLM and scraping work on separate loops.
+        # LLM calls get their own loop by default, so a long generation cannot hold up DB and UI calls
+        loop_names = [name.strip() for name in os.getenv('ASYNC_LOOPS', AsyncRunner.LLM_LOOP).split(',') if name.strip()]
+        AsyncRunner.start(route_sync_calls=True, loop_names=loop_names)
+        if os.getenv('ASYNC_MONITOR', '').lower() in ('1', 'true'):
+            AsyncRunner.enable_monitoring(
+                block_threshold=float(os.getenv('ASYNC_MONITOR_BLOCK_MS', '100')) / 1000,
+                summary_interval=float(os.getenv('ASYNC_MONITOR_SUMMARY_SECONDS', '60')))
         webview.settings['REMOTE_DEBUGGING_PORT'] = 9222
-        scripts_manager_api, llm_api, user_api, job_tracking_api = AsyncRunner.run_async(initialize_apis())
+        # Motor clients bind to the loop they are created on, so create them on the db loop
+        scripts_manager_api, llm_api, user_api, job_tracking_api = AsyncRunner.run_async(
+            initialize_apis(), loop_name=AsyncRunner.get_loop_name(OperationClass.DB_WRITE))
         # Initialize API and create window
         api = CommandsAutomatorApi(scripts_manager_api, llm_api, user_api, job_tracking_api)
         window = webview.create_window(
@@ -97,6 +113,8 @@ def main():
         
         logging.info("Starting webview...")
         webview.start(icon='ui/resources/Commands_Automator.ico', debug=True)
+        api.shutdown()
+        MotorClientRegistry.close_all()
     except Exception as ex:
         logging.exception(f"Fatal error in main: {ex}")
         raise
@@ -1,9 +1,20 @@
 import logging
+import os
+from dataclasses import asdict
+from typing import Callable, Optional
 
-from jobs_tracking.models import CompanyDto, JobTrackingApiResponse, JobTrackingApiResponseCode, CompanyApiResponse, TrackedJobDto
-from jobs_tracking.services.models import Company, CompanyResponse, JobApplicationState, JobTrackingResponse, TrackedJob
+from pydantic import ValidationError
+
+from jobs_tracking.job_tracking_import import group_rows_by_company, iter_batches, read_job_rows
+from jobs_tracking.models import BulkTrackApiResponse, BulkTrackItemDto, CompanyDto, FunnelStepDto, JobAnalyticsApiResponse, JobsImportApiResponse, JobTrackingApiResponse, JobTrackingApiResponseCode, CompanyApiResponse, TrackedJobDto, TrackedJobsPageApiResponse
+from jobs_tracking.services.models import BulkTrackStatus, Company, CompanyResponse, JobAnalytics, JobApplicationState, JobTrackingResponse, PendingJobUpdate, TrackedJob, TrackedJobChange, TrackedJobsPage
 from jobs_tracking.services.job_tracking_service import JobTrackingResponseCode, JobTrackingService
-from utils.utils import is_valid_uuid4
+from repository.pagination import DEFAULT_PAGE_SIZE
+from utils.utils import AsyncRunner, OperationClass, is_valid_uuid, is_valid_uuid4
+
+DEFAULT_IMPORT_BATCH_SIZE = 200
+# Failed items returned by an import, the rest are only counted
+MAX_IMPORT_ERRORS = 100
 
 class JobTrackingApi:
     
@@ -21,13 +32,9 @@ class JobTrackingApi:
         
     def track_new_job(self, user_id: str, company_name: str, job_dto: TrackedJobDto) -> JobTrackingApiResponse:
         
-        if not is_valid_uuid4(user_id):
-            logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
-            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.ERROR).model_dump()
-        
-        if not company_name or not job_dto or not  job_dto.job_title or not job_dto.job_url:
-            logging.error("Missing required parameter: user_id, company_name, job_dto , job url or job title")
-            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.ERROR).model_dump()
+        error_response = self._validate_new_job(user_id, company_name, job_dto)
+        if error_response:
+            return error_response
                
         tracked_job = self._map_dto_to_tracked_job(job_dto)
         
@@ -38,19 +45,27 @@ class JobTrackingApi:
         )
         return self.create_job_tracking_response(response)
 
+    def submit_track_new_job(self, user_id: str, company_name: str, job_dto: TrackedJobDto) -> dict:
+        """Non blocking track_new_job. Returns a handle for get_operation_result"""
+        error_response = self._validate_new_job(user_id, company_name, job_dto)
+        if error_response:
+            return error_response
+
+        async def track_new_job_operation():
+            response = await self.job_tracking_service.track_new_job(
+                user_id=user_id,
+                company_name=company_name,
+                tracked_job=self._map_dto_to_tracked_job(job_dto)
+            )
+            return self.create_job_tracking_response(response)
+
+        return {"handle": AsyncRunner.submit_operation(track_new_job_operation(), OperationClass.DB_WRITE)}
+
     def track_existing_job(self, user_id: str, company_id: str, job_dto: TrackedJobDto) -> JobTrackingApiResponse:
         
-        if not is_valid_uuid4(user_id) or not is_valid_uuid4(company_id):
-            logging.error(f"Invalid id: '{user_id}' or '{company_id} is not a valid UUID4")
-            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
-        
-        if not job_dto:
-            logging.error("Missing required parameter: job_dto")
-            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
-        
-        if not is_valid_uuid4(job_dto.job_id):
-            logging.error("invalid parameter: job_dto.job_id")
-            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+        error_response = self._validate_existing_job(user_id, company_id, job_dto)
+        if error_response:
+            return error_response
         
         tracked_job = self._map_dto_to_tracked_job(job_dto)
         
@@ -60,9 +75,178 @@ class JobTrackingApi:
             tracked_job=tracked_job
         )
         return self.create_job_tracking_response(response)
+
+    def submit_track_existing_job(self, user_id: str, company_id: str, job_dto: TrackedJobDto) -> dict:
+        """Non blocking track_existing_job. Returns a handle for get_operation_result"""
+        error_response = self._validate_existing_job(user_id, company_id, job_dto)
+        if error_response:
+            return error_response
+
+        async def track_existing_job_operation():
+            response = await self.job_tracking_service.track_existing_job(
+                user_id=user_id,
+                company_id=company_id,
+                tracked_job=self._map_dto_to_tracked_job(job_dto)
+            )
+            return self.create_job_tracking_response(response)
+
+        return {"handle": AsyncRunner.submit_operation(track_existing_job_operation(), OperationClass.DB_WRITE)}
  
     def get_tracked_jobs(self, user_id: str, company_name: str) -> CompanyApiResponse:
         
+        error_response = self._validate_get_tracked_jobs(user_id, company_name)
+        if error_response:
+            return error_response
+        
+        company_response: CompanyResponse = self.job_tracking_service.get_tracked_jobs_sync(user_id, company_name)
+        return self._create_company_api_response(company_response)
+
+    def submit_get_tracked_jobs(self, user_id: str, company_name: str) -> dict:
+        """Non blocking get_tracked_jobs. Returns a handle for get_operation_result"""
+        error_response = self._validate_get_tracked_jobs(user_id, company_name)
+        if error_response:
+            return error_response
+
+        async def get_tracked_jobs_operation():
+            company_response = await self.job_tracking_service.get_tracked_jobs(user_id, company_name)
+            return self._create_company_api_response(company_response)
+
+        return {"handle": AsyncRunner.submit_operation(get_tracked_jobs_operation(), OperationClass.DB_READ)}
+
+    def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None, sort: Optional[str] = None,
+                          page_token: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> dict:
+        """
+        One page of the user's tracked jobs across companies. `job_filter` may hold company_name,
+        job_state, updated_after and updated_before (ISO dates). `sort` is update_time_desc (default)
+        or update_time_asc. Pass the returned next_page_token to get the following page.
+        """
+        if not is_valid_uuid4(user_id):
+            logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
+            return TrackedJobsPageApiResponse(code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+
+        page: TrackedJobsPage = self.job_tracking_service.list_tracked_jobs_sync(user_id, job_filter, sort, page_token, page_size)
+        if not page or page.code != JobTrackingResponseCode.OK:
+            return TrackedJobsPageApiResponse(code=JobTrackingApiResponseCode.ERROR,
+                                              error_message=page.error_message if page else None).model_dump()
+
+        jobs = [
+            self._map_tracked_job_to_dto(company_job.tracked_job).model_copy(
+                update={"company_id": company_job.company_id, "company_name": company_job.company_name})
+            for company_job in page.jobs
+        ]
+        return TrackedJobsPageApiResponse(code=JobTrackingApiResponseCode.OK, jobs=jobs,
+                                          next_page_token=page.next_page_token).model_dump()
+
+    def track_jobs_bulk(self, user_id: str, companies: list[CompanyDto]) -> dict:
+        """Add or update the jobs of many companies at once. Returns a result per job"""
+        if not is_valid_uuid4(user_id):
+            logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
+            return BulkTrackApiResponse(code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+
+        if not companies:
+            logging.error("Missing required parameter: companies")
+            return BulkTrackApiResponse(code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+
+        results = self._track_jobs_bulk(user_id, companies)
+        if results is None:
+            return BulkTrackApiResponse(code=JobTrackingApiResponseCode.ERROR).model_dump()
+        return BulkTrackApiResponse(code=JobTrackingApiResponseCode.OK, results=results).model_dump()
+
+    def import_jobs_file(self, user_id: str, file_path: str, batch_size: int = DEFAULT_IMPORT_BATCH_SIZE) -> dict:
+        """
+        Streams a .csv, .jsonl or .json file of jobs into track_jobs_bulk, `batch_size` jobs at a time.
+        Rows have the columns company_name, job_url, job_title, job_state (default APPLIED),
+        contact_name, contact_linkedin and contact_email.
+        """
+        if not is_valid_uuid4(user_id):
+            logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
+            return JobsImportApiResponse(code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+
+        if not file_path or not os.path.isfile(file_path):
+            logging.error(f"Import file not found: '{file_path}'")
+            return JobsImportApiResponse(code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+
+        response = JobsImportApiResponse(code=JobTrackingApiResponseCode.OK)
+        try:
+            for batch in iter_batches(read_job_rows(file_path), max(1, batch_size)):
+                companies, invalid_results = self._map_rows_to_company_dtos(batch)
+                results = self._track_jobs_bulk(user_id, companies) if companies else []
+                if results is None:
+                    results = [BulkTrackItemDto(company_name=company.company_name, job_url=job.job_url,
+                                                status=BulkTrackStatus.ERROR, error_message="Batch failed")
+                               for company in companies for job in company.tracked_jobs]
+                self._add_import_results(response, invalid_results + results)
+        except (OSError, ValueError) as e:
+            logging.exception(f"Error importing jobs from {file_path}: {e}")
+            response.code = JobTrackingApiResponseCode.ERROR
+        logging.info(f"Imported {response.total} jobs from {file_path}: {response.created} created, "
+                     f"{response.updated} updated, {response.failed} failed")
+        return response.model_dump()
+
+    def _track_jobs_bulk(self, user_id: str, companies: list[CompanyDto]) -> Optional[list[BulkTrackItemDto]]:
+        domain_companies = self._map_dto_to_domain_companies(companies)
+        results = self.job_tracking_service.track_jobs_bulk_sync(user_id, domain_companies)
+        if results is None:
+            logging.error(f"Bulk tracking of {len(companies)} companies did not complete")
+            return None
+        return [BulkTrackItemDto(**asdict(result)) for result in results]
+
+    def _map_rows_to_company_dtos(self, rows: list[dict]) -> tuple[list[CompanyDto], list[BulkTrackItemDto]]:
+        """Validates import rows together. Returns the companies to track and a result per invalid row"""
+        companies = []
+        invalid_results = []
+        for company_name, company_rows in group_rows_by_company(rows).items():
+            tracked_jobs = []
+            for row in company_rows:
+                try:
+                    if not company_name:
+                        raise ValueError("missing company_name")
+                    tracked_jobs.append(TrackedJobDto(job_id=None, **{key: value for key, value in row.items() if key != "company_name"}))
+                except (ValidationError, ValueError) as e:
+                    invalid_results.append(BulkTrackItemDto(company_name=company_name, job_url=row.get("job_url") or "",
+                                                            status=BulkTrackStatus.INVALID, error_message=str(e)))
+            if tracked_jobs:
+                companies.append(CompanyDto(company_name=company_name, tracked_jobs=tracked_jobs))
+        return companies, invalid_results
+
+    def _add_import_results(self, response: JobsImportApiResponse, results: list[BulkTrackItemDto]):
+        for result in results:
+            response.total += 1
+            if result.status == BulkTrackStatus.CREATED:
+                response.created += 1
+            elif result.status == BulkTrackStatus.UPDATED:
+                response.updated += 1
+            else:
+                response.failed += 1
+                if len(response.errors) < MAX_IMPORT_ERRORS:
+                    response.errors.append(result)
+
+    def _validate_new_job(self, user_id: str, company_name: str, job_dto: TrackedJobDto) -> Optional[dict]:
+        if not is_valid_uuid4(user_id):
+            logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
+            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.ERROR).model_dump()
+        
+        if not company_name or not job_dto or not  job_dto.job_title or not job_dto.job_url:
+            logging.error("Missing required parameter: user_id, company_name, job_dto , job url or job title")
+            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.ERROR).model_dump()
+        return None
+
+    def _validate_existing_job(self, user_id: str, company_id: str, job_dto: TrackedJobDto) -> Optional[dict]:
+        # company ids are uuid5 of the user and company name
+        if not is_valid_uuid4(user_id) or not is_valid_uuid(company_id):
+            logging.error(f"Invalid id: '{user_id}' is not a valid UUID4 or '{company_id}' is not a valid UUID")
+            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+        
+        if not job_dto:
+            logging.error("Missing required parameter: job_dto")
+            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+        
+        if not is_valid_uuid4(job_dto.job_id):
+            logging.error("invalid parameter: job_dto.job_id")
+            return JobTrackingApiResponse(job=None, code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+        return None
+
+    def _validate_get_tracked_jobs(self, user_id: str, company_name: str) -> Optional[dict]:
         if not is_valid_uuid4(user_id):
             logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
             return CompanyApiResponse(company=None, code=JobTrackingApiResponseCode.ERROR).model_dump()
@@ -70,8 +254,9 @@ class JobTrackingApi:
         if not company_name:
             logging.error("Missing required parameter: company_name")
             return CompanyApiResponse(company=None, code=JobTrackingApiResponseCode.ERROR).model_dump()
-        
-        company_response: CompanyResponse = self.job_tracking_service.get_tracked_jobs_sync(user_id, company_name)
+        return None
+
+    def _create_company_api_response(self, company_response: CompanyResponse) -> dict:
         if company_response and company_response.code == JobTrackingResponseCode.OK:
             serialized_jobs = [self._map_tracked_job_to_dto(job) for job in company_response.company.tracked_jobs]
             company_dto = CompanyDto(company_id=company_response.company.company_id, company_name=company_response.company.company_name, tracked_jobs=serialized_jobs)
@@ -79,6 +264,86 @@ class JobTrackingApi:
                                                 code=JobTrackingApiResponseCode.OK).model_dump(exclude_none=True)
         return CompanyApiResponse(company=None, code=JobTrackingApiResponseCode.ERROR).model_dump()
     
+    def get_job_analytics(self, user_id: str, weeks: int = 12) -> dict:
+        """Counts of the user's jobs per state, company and week (last `weeks` weeks) and the outreach funnel"""
+        if not is_valid_uuid4(user_id):
+            logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
+            return JobAnalyticsApiResponse(code=JobTrackingApiResponseCode.INVALID_PARAMETER).model_dump()
+
+        analytics: JobAnalytics = self.job_tracking_service.get_job_analytics_sync(user_id, weeks)
+        if not analytics or analytics.code != JobTrackingResponseCode.OK:
+            return JobAnalyticsApiResponse(code=JobTrackingApiResponseCode.ERROR,
+                                           error_message=analytics.error_message if analytics else None).model_dump()
+
+        return JobAnalyticsApiResponse(
+            code=JobTrackingApiResponseCode.OK,
+            total=analytics.total,
+            by_state=analytics.by_state,
+            by_company=analytics.by_company,
+            by_week=analytics.by_week,
+            funnel=[FunnelStepDto(state=step.state.name, reached=step.reached, conversion=step.conversion)
+                    for step in analytics.funnel]
+        ).model_dump()
+
+    def start_live_updates(self, user_id: str, push_changes: Callable[[list[dict]], None]) -> bool:
+        """Calls `push_changes` with the serialized changes to the user's jobs made by any process"""
+        if not is_valid_uuid4(user_id):
+            logging.error(f"Invalid user_id: '{user_id}' is not a valid UUID4")
+            return False
+
+        def on_changes(changes: list[TrackedJobChange]):
+            push_changes([self._map_tracked_job_change(change) for change in changes])
+
+        self.job_tracking_service.start_live_updates(user_id, on_changes)
+        return True
+
+    def stop_live_updates(self):
+        self.job_tracking_service.stop_live_updates()
+
+    def _map_tracked_job_change(self, change: TrackedJobChange) -> dict:
+        job = None
+        if change.tracked_job:
+            job = self._map_tracked_job_to_dto(change.tracked_job).model_copy(
+                update={"company_id": change.company_id, "company_name": change.company_name}).model_dump()
+        return {
+            "change_type": change.change_type,
+            "company_name": change.company_name,
+            "company_id": change.company_id,
+            "job_id": change.job_id,
+            "job": job
+        }
+
+    def enable_write_behind(self, push_errors: Callable[[list[dict]], None], flush_delay: float):
+        """Acknowledges job updates before they are written, `push_errors` gets the serialized failed updates"""
+        def on_error(failed: list[PendingJobUpdate]):
+            push_errors([self._map_pending_job_update(pending) for pending in failed])
+
+        self.job_tracking_service.enable_write_behind(on_error, flush_delay)
+
+    def flush_pending_updates(self) -> int:
+        """Writes the queued job updates, returns the number that failed"""
+        failed = self.job_tracking_service.flush_pending_updates_sync()
+        if failed:
+            logging.error(f"{len(failed)} tracked job updates were not written on shutdown")
+        return len(failed)
+
+    def _map_pending_job_update(self, pending: PendingJobUpdate) -> dict:
+        return {
+            "company_id": pending.company_id,
+            "job_id": pending.tracked_job.job_id,
+            "job": self._map_tracked_job_to_dto(pending.tracked_job).model_copy(
+                update={"company_id": pending.company_id}).model_dump(),
+            "error_message": pending.error_message
+        }
+
+    def get_write_queue_stats(self) -> Optional[dict]:
+        stats = self.job_tracking_service.get_write_queue_stats()
+        return asdict(stats) if stats else None
+
+    def get_cache_stats(self) -> dict:
+        stats = self.job_tracking_service.get_cache_stats()
+        return {**asdict(stats), "hit_rate": round(stats.hit_rate, 3), "write_queue": self.get_write_queue_stats()}
+
     def extract_job_title_and_company(self, url:str):
         if not url:
             logging.error("Missing required parameter: url")
@@ -101,8 +366,8 @@ class JobTrackingApi:
             return {"success": False}
         
         domain_companies = self._map_dto_to_domain_companies(companies_jobs)
-        success = self.job_tracking_service.delete_tracked_jobs_sync(user_id, domain_companies)
-        return {"success" : success}
+        result = self.job_tracking_service.delete_tracked_jobs_sync(user_id, domain_companies)
+        return asdict(result)
 
     def _map_dto_to_tracked_job(self, job_dto: TrackedJobDto) -> TrackedJob:
         """Convert TrackedJobDto to domain TrackedJob"""
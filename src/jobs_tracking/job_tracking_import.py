@@ -0,0 +1,71 @@
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator
+
+# Columns of a flat import row, one row per job
+IMPORT_FIELDS = ("company_name", "job_url", "job_title", "job_state", "contact_name", "contact_linkedin", "contact_email")
+
+
+def read_job_rows(file_path: str) -> Iterator[dict]:
+    """
+    Yields one flat job row per job from a .csv, .jsonl or .json file.
+    CSV and JSON Lines files are streamed line by line. A .json file holds a list of rows
+    or of companies (`{"company_name": ..., "tracked_jobs": [...]}`) and is read at once.
+    """
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with open(path, newline='', encoding='utf-8-sig') as csv_file:
+            for row in csv.DictReader(csv_file):
+                yield _clean_row(row)
+    elif suffix == ".jsonl":
+        with open(path, encoding='utf-8') as jsonl_file:
+            for line_number, line in enumerate(jsonl_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield from _flatten(json.loads(line))
+                except json.JSONDecodeError as e:
+                    logging.error(f"Skipping invalid JSON in line {line_number} of {path.name}: {e}")
+    elif suffix == ".json":
+        with open(path, encoding='utf-8') as json_file:
+            items = json.load(json_file)
+        for item in items if isinstance(items, list) else [items]:
+            yield from _flatten(item)
+    else:
+        raise ValueError(f"Unsupported import file type '{suffix}', expected .csv, .jsonl or .json")
+
+
+def iter_batches(rows: Iterable[dict], batch_size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def group_rows_by_company(rows: list[dict]) -> dict[str, list[dict]]:
+    """Company name -> job rows, keeping the order of first appearance"""
+    companies: dict[str, list[dict]] = {}
+    for row in rows:
+        companies.setdefault(row.get("company_name") or "", []).append(row)
+    return companies
+
+
+def _flatten(item: dict) -> Iterator[dict]:
+    if "tracked_jobs" in item:
+        for job in item.get("tracked_jobs") or []:
+            yield _clean_row({**job, "company_name": item.get("company_name")})
+    else:
+        yield _clean_row(item)
+
+
+def _clean_row(row: dict) -> dict:
+    cleaned = {field: str(row.get(field) or "").strip() or None for field in IMPORT_FIELDS}
+    cleaned["job_state"] = (cleaned["job_state"] or "APPLIED").upper()
+    return cleaned
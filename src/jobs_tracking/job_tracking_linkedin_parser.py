@@ -1,6 +1,10 @@
 import logging
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+
+from llm.mcp_servers.job_search.utils.linkedin_html import parse_html
+
+_COMPANY_LINK_XPATH = etree.XPath("//a[contains(@href, '/company/')]")
 
 def extract_linkedin_job(url):
     headers = {
@@ -11,14 +15,17 @@ def extract_linkedin_job(url):
     try:
         response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        root = parse_html(response.content)
+        if root is None:
+            logging.error(f"Empty LinkedIn page at {url}")
+            return {"job_title": job_title, "company_name": company_name}
         # 1. Extract Job Title from <title> tag
         # Strategy: Find the <title> tag and parse it
         # LinkedIn format: "Company hiring Job Title in Location | LinkedIn"
         # or "Job Title - Company | Job Posting"
-        title_tag = soup.find('title')
-        if title_tag:
-            title_text = title_tag.get_text().strip()
+        title_tag = root.find('.//title')
+        if title_tag is not None:
+            title_text = title_tag.text_content().strip()
             # Remove " | LinkedIn" suffix if present
             if " | LinkedIn" in title_text:
                 title_text = title_text.split(" | LinkedIn")[0]
@@ -42,9 +49,10 @@ def extract_linkedin_job(url):
 
         # 2. Extract Company Name
         # Strategy: Look for the <a> tag that leads to a company page
-        company_tag = soup.find('a', href=lambda x: x and '/company/' in x)
-        if company_tag:
-            company_name = company_tag.find(string=True, recursive=False) or company_tag.get_text()
+        company_links = _COMPANY_LINK_XPATH(root)
+        if company_links:
+            # the link's own text, without the text of nested elements like logos
+            company_name = company_links[0].text or company_links[0].text_content()
         
         return {
             "job_title": job_title,
@@ -8,6 +8,7 @@ from jobs_tracking.services.models import JobApplicationState
 
 class TrackedJobDto(BaseModel):
     company_id: Optional[str] = None
+    company_name: Optional[str] = None
     job_id: Optional[str]
     job_url: str
     job_title: str
@@ -39,3 +40,48 @@ class CompanyApiResponse(BaseModel):
     company: Optional[CompanyDto] = None
 
 
+class TrackedJobsPageApiResponse(BaseModel):
+    code: JobTrackingApiResponseCode
+    jobs: list[TrackedJobDto] = []
+    next_page_token: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+
+
+class BulkTrackItemDto(BaseModel):
+    company_name: str
+    job_url: str
+    status: str
+    job_id: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+class BulkTrackApiResponse(BaseModel):
+    code: JobTrackingApiResponseCode
+    results: list[BulkTrackItemDto] = []
+
+
+class JobsImportApiResponse(BaseModel):
+    code: JobTrackingApiResponseCode
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[BulkTrackItemDto] = []
+
+
+class FunnelStepDto(BaseModel):
+    state: str
+    reached: int
+    conversion: Optional[float] = None
+
+
+class JobAnalyticsApiResponse(BaseModel):
+    code: JobTrackingApiResponseCode
+    total: int = 0
+    by_state: dict[str, int] = {}
+    by_company: dict[str, int] = {}
+    by_week: dict[str, int] = {}
+    funnel: list[FunnelStepDto] = []
+    error_message: Optional[str] = None
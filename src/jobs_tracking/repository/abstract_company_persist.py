@@ -0,0 +1,131 @@
+import uuid
+from abc import abstractmethod
+from typing import Optional
+
+from jobs_tracking.services.models import JobApplicationState
+from repository.abstract_persist import AbstractPersist
+from repository.models import PersistenceResponse
+from repository.pagination import DEFAULT_PAGE_SIZE, JobsSortOrder
+
+DEFAULT_ANALYTICS_WEEKS = 12
+ANALYTICS_TOP_COMPANIES = 20
+
+# Outreach steps in order. A job in a later state has passed all the earlier ones
+FUNNEL_STATES = [
+    JobApplicationState.CONNECTION_REQUESTED,
+    JobApplicationState.MESSAGE_SENT,
+    JobApplicationState.EMAIL_SENT,
+    JobApplicationState.APPLIED
+]
+
+_COMPANY_ID_NAMESPACE = uuid.UUID("6f1c2a8e-3b4d-4e5f-9a7b-1c2d3e4f5a6b")
+
+
+def company_id_for(user_id: str, company_name: str) -> str:
+    """
+    The company id is derived from (user_id, company_name), so a job can be
+    inserted for a known company without first looking up the company id
+    """
+    return str(uuid.uuid5(_COMPANY_ID_NAMESPACE, f"{user_id}:{company_name}"))
+
+
+def parse_job_analytics(facets: dict) -> dict:
+    """
+    Flattens the facets of the analytics queries: total, by_state, by_company and by_week
+    as lists of {_id, count}, and funnel as one {reached_<step>, conversion_<step>} document
+    """
+    total = facets.get("total") or []
+    funnel = (facets.get("funnel") or [{}])[0]
+    return {
+        "total": total[0]["count"] if total else 0,
+        "by_state": [{"state": bucket["_id"], "count": bucket["count"]} for bucket in facets.get("by_state", [])],
+        "by_company": [{"company_name": bucket["_id"], "count": bucket["count"]} for bucket in facets.get("by_company", [])],
+        "by_week": [{"week": bucket["_id"], "count": bucket["count"]} for bucket in facets.get("by_week", [])],
+        "funnel": [
+            {
+                "state": str(state),
+                "reached": funnel.get(f"reached_{index}", 0),
+                "conversion": funnel.get(f"conversion_{index}")
+            }
+            for index, state in enumerate(FUNNEL_STATES)
+        ]
+    }
+
+
+class AbstractCompanyPersist(AbstractPersist):
+    """
+    Storage of the tracked jobs, one record per job with user_id, company_name and company_id.
+    Jobs are unique per (user_id, job_url). Returned jobs are dictionaries without user_id.
+    """
+
+    # users found when jobs are written are remembered for a short while, users are deleted
+    # by the user persistence, so a deleted user is forgotten once the TTL passes
+    KNOWN_USERS_MAX_SIZE = 1024
+    KNOWN_USERS_TTL_SECONDS = 60.0
+
+    @abstractmethod
+    async def get_tracked_jobs(self, user_id: str, company_name: str) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def track_new_job(self, user_id: str, company_name: str, tracked_job_dict: dict) -> PersistenceResponse[dict]:
+        pass
+
+    @abstractmethod
+    async def track_jobs_bulk(self, user_id: str, companies_dicts: list[dict]) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def track_existing_job(self, user_id: str, company_id: str, tracked_job_dict: dict) -> PersistenceResponse[dict]:
+        pass
+
+    @abstractmethod
+    async def track_existing_jobs_bulk(self, user_id: str, updates: list[tuple[str, dict]]) -> PersistenceResponse[list[dict]]:
+        """
+        Updates many existing jobs of a user, given as (company_id, tracked_job_dict).
+        Returns one `{job_id, company_id, status, error_message}` dictionary per update, in order.
+        """
+        pass
+
+    @abstractmethod
+    async def delete_application(self, user_id: str, company_name: str) -> PersistenceResponse[bool]:
+        pass
+
+    @abstractmethod
+    async def delete_job(self, user_id: str, company_name: str, job_url: str) -> PersistenceResponse[bool]:
+        pass
+
+    @abstractmethod
+    async def delete_tracked_jobs(self, user_id: str, companies_dicts: list[dict]) -> PersistenceResponse[dict]:
+        pass
+
+    @abstractmethod
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None,
+                                sort: str = JobsSortOrder.UPDATE_TIME_DESC, page_token: Optional[str] = None,
+                                page_size: int = DEFAULT_PAGE_SIZE) -> PersistenceResponse[dict]:
+        pass
+
+    @abstractmethod
+    async def get_job_analytics(self, user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> PersistenceResponse[dict]:
+        pass
+
+    @abstractmethod
+    async def get_all_applications(self, user_id: str) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def get_jobs_by_state(self, user_id: str, state: str) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def get_recent_jobs(self, user_id: str, limit: int = 10) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def list_tracked_job_keys(self, user_id: str) -> PersistenceResponse[list[dict]]:
+        """The job_id, company_name and company_id of each of the user's jobs, without the rest of the job"""
+        pass
+
+    def watch_tracked_jobs(self, user_id: str, resume_after: Optional[dict] = None):
+        """Change stream of the user's jobs, where the storage has one"""
+        raise NotImplementedError(f"{self.__class__.__name__} has no change streams")
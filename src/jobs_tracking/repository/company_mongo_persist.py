@@ -1,37 +1,80 @@
 import logging
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 import pymongo.errors as mongo_errors
-from pymongo import UpdateOne
+from pymongo import ASCENDING, DESCENDING, DeleteOne, ReturnDocument, UpdateOne
 
-from jobs_tracking.services.models import TrackedJob
+from jobs_tracking.repository.abstract_company_persist import (
+    ANALYTICS_TOP_COMPANIES, DEFAULT_ANALYTICS_WEEKS, FUNNEL_STATES, AbstractCompanyPersist, company_id_for, parse_job_analytics
+)
+from jobs_tracking.repository.job_applications_migration import migrate_job_applications
+from jobs_tracking.services.models import BulkTrackStatus, TrackedJob
 from repository.abstract_owner_mongo_persist import AbstractOwnerMongoPersist
 from repository.models import PersistenceErrorCode, PersistenceResponse
+from repository.pagination import DEFAULT_PAGE_SIZE, JobsSortOrder, fetch_jobs_page
+from utils.lru_cache import LRUTTLCache
 
-class CompanyMongoPersist(AbstractOwnerMongoPersist):
+# Fields of a job document that are not returned to the callers
+JOB_PROJECTION = {"_id": 0, "user_id": 0}
+# Fields that identify a job and its company, see list_tracked_job_keys
+JOB_KEYS_PROJECTION = {"_id": 0, "job_id": 1, "company_name": 1, "company_id": 1}
+
+# How long a change stream read waits for more changes before the collected ones are handed out
+CHANGE_STREAM_MAX_AWAIT_MS = 500
+
+
+class CompanyMongoPersist(AbstractOwnerMongoPersist, AbstractCompanyPersist):
+    """
+    Stores one document per tracked job in the `tracked_jobs` collection.
+    Each document carries user_id, company_name and company_id, so a company is
+    the set of jobs sharing the same (user_id, company_name).
+    Jobs stored in the legacy `job_applications` collection (a `jobs` array per company)
+    are converted on startup by jobs_tracking.repository.job_applications_migration.
+    """
 
     def _setup_collections(self):
         #fields to ignore on update
         self.excluded_fields = {'job_url', 'user_id', 'company_name', 'job_id', 'company_id'}
+        self.tracked_jobs = self.async_db.tracked_jobs
         self.job_applications = self.async_db.job_applications
         self.users = self.async_db.users
+        self._known_user_ids: LRUTTLCache[str, bool] = LRUTTLCache(
+            max_size=self.KNOWN_USERS_MAX_SIZE, ttl=self.KNOWN_USERS_TTL_SECONDS)
       
     async def create_index(self):
-        if self.job_applications is not None:
-            await self.job_applications.create_index([("user_id", 1), ("company_id", 1)])
+        if self.tracked_jobs is not None:
+            await self.tracked_jobs.create_index([("user_id", ASCENDING), ("company_name", ASCENDING)])
+            await self.tracked_jobs.create_index([("user_id", ASCENDING), ("job_url", ASCENDING)], unique=True)
+            # also serves keyset pagination, see repository.pagination
+            await self.tracked_jobs.create_index([("user_id", ASCENDING), ("update_time", DESCENDING), ("job_id", DESCENDING)])
+            await self.tracked_jobs.create_index([("user_id", ASCENDING), ("job_id", ASCENDING)])
+            # state counts and funnel of the analytics pipeline
+            await self.tracked_jobs.create_index([("user_id", ASCENDING), ("job_state", ASCENDING)])
+        if self.job_applications is not None and await self.job_applications.find_one({}, {"_id": 1}):
+            await self._migrate_legacy_jobs()
+
+    async def _migrate_legacy_jobs(self):
+        """
+        Copies the jobs of the legacy job_applications collection that are not in tracked_jobs yet,
+        so they stay visible after the storage change. Jobs already copied are left as they are.
+        """
+        try:
+            await migrate_job_applications(self.async_db)
+        except Exception as e:
+            logging.exception(f"Could not copy the legacy job_applications jobs, "
+                              f"run jobs_tracking.repository.job_applications_migration: {e}")
         
     # ==================== APPLICATION CRUD ====================
        
     async def get_tracked_jobs(self, user_id: str, company_name: str) -> PersistenceResponse[list[dict]]:        
         """Get all application by user and company"""
         try:
-            result = await self.job_applications.find_one({
-                "user_id": user_id, "company_name": company_name
-            })
-            if result and "jobs" in result:
-                jobs = result["jobs"]
-                return PersistenceResponse(id=result["company_id"], data=jobs, code=PersistenceErrorCode.SUCCESS)
+            cursor = self.tracked_jobs.find({"user_id": user_id, "company_name": company_name}, JOB_PROJECTION)
+            jobs = await cursor.to_list(length=None)
+            if jobs:
+                return PersistenceResponse(id=jobs[0]["company_id"], data=jobs, code=PersistenceErrorCode.SUCCESS)
             return PersistenceResponse(data=[], code=PersistenceErrorCode.SUCCESS)
         except mongo_errors.OperationFailure as e:
             logging.exception(f"MongoDB operation failed: {e}")
@@ -52,30 +95,31 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
             )
 
     async def track_new_job(self, user_id: str, company_name: str, tracked_job_dict: dict) -> PersistenceResponse[dict]:
-        """Add or update a job in a company application
+        """Add or update a job in a company application in a single atomic upsert.
+
+        Jobs are matched by (user_id, job_url). A new job gets a fresh job_id and the
+        company id of (user_id, company_name); an existing job keeps both.
         
         Returns:
-            A PersistenceResponse with a dictionary indicating if the job was created or updated: `{"created": bool, "updated": bool}`.
+            A PersistenceResponse with the job document as stored after the upsert.
         """
         logging.info(f"started with user: {user_id} company: \"{company_name}\" job: \"{tracked_job_dict['job_title']}\"")
         
         try:
-            existing_company_application = await self._find_existing_application(user_id, company_name)
-            # init company id var
-            company_id = self._get_company_id(existing_company_application)
-            if existing_company_application:
-                # find a tracked job with the same job url
-                match = next((job for job in existing_company_application.get('jobs', []) 
-                            if job['job_url'] == tracked_job_dict['job_url'] and 
-                            self._has_job_changes(tracked_job_dict, job)), None)
-                if match:
-                    tracked_job_dict['job_id'] = match['job_id']
-                    return await self.track_existing_job(user_id, company_id, tracked_job_dict)
-
-            result, new_job = await self._create_new_job(tracked_job_dict, company_name, company_id, user_id)
-            if result.matched_count == 0:
-                return await self._create_new_application_if_possible(user_id, company_name, new_job)
-            return PersistenceResponse(data=new_job, code=PersistenceErrorCode.SUCCESS)
+            if not await self._user_exists(user_id):
+                logging.error(f"User {user_id} does not exist in the system.")
+                return PersistenceResponse(
+                    data=None,
+                    code=PersistenceErrorCode.NOT_FOUND,
+                    error_message="USER_NOT_FOUND"
+                )
+            try:
+                job = await self._upsert_job(user_id, company_name, tracked_job_dict)
+            except mongo_errors.DuplicateKeyError:
+                # Two concurrent upserts of the same url both tried to insert, the retry updates the winner
+                logging.info(f"Retrying concurrent upsert of job {tracked_job_dict['job_url']}")
+                job = await self._upsert_job(user_id, company_name, tracked_job_dict)
+            return PersistenceResponse(data=job, code=PersistenceErrorCode.SUCCESS)
         except mongo_errors.OperationFailure as e:
             logging.exception(f"MongoDB operation failed: {e}")
             return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message=str(e))
@@ -90,57 +134,103 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
             logging.exception(f"MongoDB error occurred: {e}")
             return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
     
-    async def _create_new_job(self, tracked_job_dict:dict, company_name:str, company_id:str, user_id:str):
-        job_id = str(uuid.uuid4())
-        new_job = {
-            "job_id": job_id,
-            "job_url": tracked_job_dict["job_url"],
+    async def _upsert_job(self, user_id: str, company_name: str, tracked_job_dict: dict) -> dict:
+        job_filter, job_update = self._job_upsert(user_id, company_name, tracked_job_dict)
+        return await self.tracked_jobs.find_one_and_update(
+            job_filter,
+            job_update,
+            projection=JOB_PROJECTION,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _job_upsert(self, user_id: str, company_name: str, tracked_job_dict: dict) -> tuple[dict, dict]:
+        """Filter and update document that create or update a job by (user_id, job_url)"""
+        set_fields = {
             "job_title": tracked_job_dict["job_title"],
-            "update_time": datetime.now(timezone.utc),
             "job_state": str(tracked_job_dict["job_state"]),
             "contact_name": tracked_job_dict.get("contact_name"),
             "contact_linkedin": tracked_job_dict.get("contact_linkedin"),
             "contact_email": tracked_job_dict.get("contact_email"),
-            "company_id": company_id
+            "update_time": datetime.now(timezone.utc)
         }
-        result = await self.job_applications.update_one(
-            {"user_id": user_id, "company_name": company_name, "company_id": company_id},
-            {"$push": {"jobs": new_job}}
-        )
-        return result, new_job
-        
-    async def _create_new_application_if_possible(self, user_id: str, company_name: str, new_job: dict) -> PersistenceResponse[dict]:
-        # STEP 2: The "Discovery" Check
-        # Now we check if the user exists at all in the system
-        user_exists = await self.users.find_one({"_id": user_id})
-        
-        if not user_exists:
-            logging.error(f"User {user_id} does not exist in the system.")
-            return PersistenceResponse(
-                data=None, 
-                code=PersistenceErrorCode.NOT_FOUND, 
-                error_message="USER_NOT_FOUND"
-            )
-        
-        logging.info(f"User exists, but company '{company_name}' application is new.")
-        # At this point, you know the user is valid, so you can safely 
-        # perform a secondary 'upsert' just for this company document.
-        await self._create_new_company_application(user_id, company_name, new_job)
-        return PersistenceResponse(data=new_job, code=PersistenceErrorCode.SUCCESS)
-
-    async def _create_new_company_application(self, user_id: str, company_name: str, new_job: dict):
-        application = {
-            "user_id": user_id,
-            "company_name": company_name,
-            "company_id": new_job.get("company_id"),
-            "jobs": [new_job]
+        job_update = {
+            "$set": set_fields,
+            "$setOnInsert": {
+                "job_id": str(uuid.uuid4()),
+                "company_name": company_name,
+                "company_id": company_id_for(user_id, company_name)
+            }
         }
-        await self.job_applications.insert_one(application)
+        return {"user_id": user_id, "job_url": tracked_job_dict["job_url"]}, job_update
+
+    async def track_jobs_bulk(self, user_id: str, companies_dicts: list[dict]) -> PersistenceResponse[list[dict]]:
+        """
+        Creates or updates many jobs, one unordered bulk_write per company.
+
+        Returns:
+            A PersistenceResponse with one `{company_name, job_url, status, job_id, error_message}`
+            dictionary per job, in the order of the input.
+        """
+        logging.info(f"started with user {user_id} with {len(companies_dicts)} companies")
+        try:
+            if not await self._user_exists(user_id):
+                logging.error(f"User {user_id} does not exist in the system.")
+                return PersistenceResponse(data=None, code=PersistenceErrorCode.NOT_FOUND, error_message="USER_NOT_FOUND")
+        except Exception as e:
+            logging.exception(f"MongoDB encountered an unknown error: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
+
+        results = []
+        for company_dict in companies_dicts:
+            results.extend(await self._track_company_jobs_bulk(user_id, company_dict))
+        return PersistenceResponse(data=results, code=PersistenceErrorCode.SUCCESS)
+
+    async def _track_company_jobs_bulk(self, user_id: str, company_dict: dict) -> list[dict]:
+        company_name = company_dict["company_name"]
+        jobs = company_dict.get("tracked_jobs", [])
+        upserts = [self._job_upsert(user_id, company_name, job) for job in jobs]
+        results = [
+            {
+                "company_name": company_name,
+                "job_url": job["job_url"],
+                "status": BulkTrackStatus.UPDATED,
+                "job_id": None,
+                "error_message": None
+            }
+            for job in jobs
+        ]
+        if not upserts:
+            return results
+
+        requests = [UpdateOne(job_filter, job_update, upsert=True) for job_filter, job_update in upserts]
+        try:
+            bulk_result = await self.tracked_jobs.bulk_write(requests, ordered=False)
+            upserted_ids = bulk_result.upserted_ids
+            write_errors = []
+        except mongo_errors.BulkWriteError as e:
+            upserted_ids = {upsert["index"]: upsert["_id"] for upsert in e.details.get("upserted", [])}
+            write_errors = e.details.get("writeErrors", [])
+        except Exception as e:
+            logging.exception(f"Failed to track jobs of company {company_name}: {e}")
+            for result in results:
+                result.update(status=BulkTrackStatus.ERROR, error_message=str(e))
+            return results
 
-    def _get_company_id(self, existing_company_application):
-         if existing_company_application:
-            return  existing_company_application['company_id']
-         return str(uuid.uuid4())
+        for index in upserted_ids:
+            results[index].update(status=BulkTrackStatus.CREATED, job_id=upserts[index][1]["$setOnInsert"]["job_id"])
+        for write_error in write_errors:
+            results[write_error["index"]].update(status=BulkTrackStatus.ERROR, error_message=write_error.get("errmsg"))
+        return results
+
+    async def _user_exists(self, user_id: str) -> bool:
+        """A user found is remembered for KNOWN_USERS_TTL_SECONDS"""
+        if self._known_user_ids.get(user_id):
+            return True
+        if await self.users.find_one({"_id": user_id}, {"_id": 1}):
+            self._known_user_ids.put(user_id, True)
+            return True
+        return False
     
     async def track_existing_job(self, user_id:str, company_id:str,  tracked_job_dict: dict)-> PersistenceResponse[dict]:
 
@@ -148,21 +238,20 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
      
         tracked_job_dict['update_time'] = datetime.now(timezone.utc)
 
-        # Use the '$' positional operator to update the matched job element in the jobs array
-        set_fields = {f"jobs.$.{key}": value for key, value in tracked_job_dict.items()
+        set_fields = {key: value for key, value in tracked_job_dict.items()
                 if key not in self.excluded_fields}
         try:
-            result = await self.job_applications.update_one(
+            result = await self.tracked_jobs.update_one(
                 {
                     "user_id": user_id,
-                    "company_id": company_id,
-                    "jobs.job_id": tracked_job_dict['job_id']
+                    "job_id": tracked_job_dict['job_id'],
+                    "company_id": company_id
                 },
                 {"$set": set_fields}
             )
             success = result and result.modified_count > 0
             if success:
-                return PersistenceResponse(data=tracked_job_dict, code=PersistenceErrorCode.SUCCESS)
+                return PersistenceResponse(data={**tracked_job_dict, "company_id": company_id}, code=PersistenceErrorCode.SUCCESS)
             return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message="Failed to update job")
         except mongo_errors.OperationFailure as e:
             logging.exception(f"MongoDB operation failed: {e}")
@@ -183,10 +272,67 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
             )
   
     
+    async def track_existing_jobs_bulk(self, user_id: str, updates: list[tuple[str, dict]]) -> PersistenceResponse[list[dict]]:
+        """
+        Updates many existing jobs with a single unordered bulk_write.
+
+        Returns:
+            A PersistenceResponse with one `{job_id, company_id, status, error_message}` dictionary
+            per update, in the order of the input. A job that was not found has the ERROR status.
+        """
+        logging.info(f"started with user {user_id} with {len(updates)} jobs")
+        update_time = datetime.now(timezone.utc)
+        requests = []
+        results = []
+        for company_id, tracked_job_dict in updates:
+            set_fields = {key: value for key, value in tracked_job_dict.items() if key not in self.excluded_fields}
+            set_fields["update_time"] = update_time
+            requests.append(UpdateOne(
+                {"user_id": user_id, "job_id": tracked_job_dict["job_id"], "company_id": company_id},
+                {"$set": set_fields}
+            ))
+            results.append({"job_id": tracked_job_dict["job_id"], "company_id": company_id,
+                            "status": BulkTrackStatus.UPDATED, "error_message": None})
+        if not requests:
+            return PersistenceResponse(data=results, code=PersistenceErrorCode.SUCCESS)
+
+        try:
+            bulk_result = await self.tracked_jobs.bulk_write(requests, ordered=False)
+            matched_count = bulk_result.matched_count
+            write_errors = []
+        except mongo_errors.BulkWriteError as e:
+            matched_count = e.details.get("nMatched", 0)
+            write_errors = e.details.get("writeErrors", [])
+        except mongo_errors.ConnectionFailure as e:
+            logging.exception(f"MongoDB connection failed: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.CONNECTION_ERROR, error_message=str(e))
+        except Exception as e:
+            logging.exception(f"Failed to update jobs for user {user_id}: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
+
+        for write_error in write_errors:
+            results[write_error["index"]].update(status=BulkTrackStatus.ERROR, error_message=write_error.get("errmsg"))
+        if matched_count + len(write_errors) < len(requests):
+            # a bulk_write reports only the total, so the jobs that are gone are looked up
+            await self._mark_missing_jobs(user_id, results)
+        return PersistenceResponse(data=results, code=PersistenceErrorCode.SUCCESS)
+
+    async def _mark_missing_jobs(self, user_id: str, results: list[dict]):
+        job_ids = [result["job_id"] for result in results if result["status"] == BulkTrackStatus.UPDATED]
+        try:
+            cursor = self.tracked_jobs.find({"user_id": user_id, "job_id": {"$in": job_ids}}, {"_id": 0, "job_id": 1, "company_id": 1})
+            existing = {(job["job_id"], job["company_id"]) for job in await cursor.to_list(length=None)}
+        except Exception as e:
+            logging.exception(f"Failed to look up the updated jobs of user {user_id}: {e}")
+            return
+        for result in results:
+            if result["status"] == BulkTrackStatus.UPDATED and (result["job_id"], result["company_id"]) not in existing:
+                result.update(status=BulkTrackStatus.ERROR, error_message="Job not found")
+
     async def delete_application(self, user_id: str, company_name: str) -> PersistenceResponse[bool]:
         """Delete an entire company application"""
         try:
-            result = await self.job_applications.delete_one({
+            result = await self.tracked_jobs.delete_many({
                 "user_id": user_id,
                 "company_name": company_name
             })
@@ -223,11 +369,10 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
 
         logging.info(f"started with user: {user_id} company: \"{company_name}\" job: \"{job_url}\"")
         try:
-            result = await self.job_applications.update_one(
-                {"user_id": user_id, "company_name": company_name},
-                {"$pull": {"jobs": {"job_url": job_url}}}
+            result = await self.tracked_jobs.delete_one(
+                {"user_id": user_id, "company_name": company_name, "job_url": job_url}
             )
-            if result.modified_count > 0:
+            if result.deleted_count > 0:
                 return PersistenceResponse(data=True, code=PersistenceErrorCode.SUCCESS)
             return PersistenceResponse(data=False, code=PersistenceErrorCode.NOT_FOUND, error_message="Job not found for deletion.")
         except mongo_errors.OperationFailure as e:
@@ -244,42 +389,124 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
             logging.exception(f"MongoDB encountered an unknown error: {e}")
             return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
 
-    async def delete_tracked_jobs(self, user_id: str, companies_dicts: list[dict]) -> bool:
+    async def delete_tracked_jobs(self, user_id: str, companies_dicts: list[dict]) -> PersistenceResponse[dict]:
+        """
+        Removes jobs from the database using company_name and job_url as unique identifiers,
+        with a single unordered bulk_write for all companies.
+
+        Returns:
+            A PersistenceResponse with `{"deleted_count": int, "companies": {company_name: count},
+            "jobs": {job_url: count}}`. A job url is unique per user, so each delete removes 0 or 1 jobs.
+            MongoDB reports only the total for a bulk_write, so the jobs that exist are found first
+            with one query and only they are deleted. This costs a second round trip, and a job that
+            another process deletes between the two still counts 1 for its url and company, although
+            `deleted_count` (the bulk_write total) does not include it.
         """
-        Removes jobs from the database using company_name and job_url 
-            as unique identifiers.
-            """
         logging.info(f"started with user {user_id} with {len(companies_dicts)} companies")
 
-        for company_dict in companies_dicts:
-            tracked_jobs = company_dict.get("tracked_jobs", [])
-            urls_to_remove = [job["job_url"] for job in tracked_jobs]
-            if not urls_to_remove:
-                continue
-            try:
+        requested = [
+            (company_dict["company_name"], job["job_url"])
+            for company_dict in companies_dicts
+            for job in company_dict.get("tracked_jobs", [])
+        ]
+        if not requested:
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.VALIDATION_ERROR, error_message="No jobs to delete")
+
+        # a job is listed once even if it was requested twice
+        requested = list(dict.fromkeys(requested))
+        try:
+            cursor = self.tracked_jobs.find(
+                {"user_id": user_id, "job_url": {"$in": [job_url for _, job_url in requested]}},
+                {"_id": 0, "company_name": 1, "job_url": 1}
+            )
+            existing = {(job["company_name"], job["job_url"]) for job in await cursor.to_list(length=None)}
+            found = [job for job in requested if job in existing]
+            deleted_count = 0
+            if found:
                 requests = [
-                    UpdateOne(
-                        {"user_id": user_id, "company_name": comp_dict["company_name"]},
-                        {"$pull": {"jobs": {"job_url": {"$in": [job["job_url"] for job in comp_dict.get("tracked_jobs", [])]}}}}
-                    )
-                    for comp_dict in companies_dicts if comp_dict.get("tracked_jobs")
+                    DeleteOne({"user_id": user_id, "company_name": company_name, "job_url": job_url})
+                    for company_name, job_url in found
                 ]
-                
-                if not requests:
-                    return False
-                
-                result = await self.job_applications.bulk_write(requests)
-                return result.modified_count > 0
-            except Exception as e:
-                logging.exception(f"Failed to delete jobs for user {user_id}: {e}")
-                return False
+                result = await self.tracked_jobs.bulk_write(requests, ordered=False)
+                deleted_count = result.deleted_count
+        except mongo_errors.BulkWriteError as e:
+            logging.exception(f"Failed to delete some jobs for user {user_id}: {e.details.get('writeErrors')}")
+            deleted_count = e.details.get("nRemoved", 0)
+        except mongo_errors.ConnectionFailure as e:
+            logging.exception(f"MongoDB connection failed: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.CONNECTION_ERROR, error_message=str(e))
+        except Exception as e:
+            logging.exception(f"Failed to delete jobs for user {user_id}: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
+
+        if deleted_count != len(requested):
+            logging.warning(f"Deleted {deleted_count} of {len(requested)} jobs for user {user_id}")
+        if deleted_count != len(found):
+            # deleted by someone else between the query and the delete
+            logging.warning(f"{len(found) - deleted_count} jobs of user {user_id} were deleted concurrently")
+        companies: dict[str, int] = {}
+        jobs: dict[str, int] = {}
+        for company_name, job_url in requested:
+            count = 1 if (company_name, job_url) in existing else 0
+            companies[company_name] = companies.get(company_name, 0) + count
+            jobs[job_url] = count
+        return PersistenceResponse(
+            data={"deleted_count": deleted_count, "companies": companies, "jobs": jobs},
+            code=PersistenceErrorCode.SUCCESS
+        )
     
+    def watch_tracked_jobs(self, user_id: str, resume_after: Optional[dict] = None):
+        """
+        Change stream of the user's tracked jobs, to be used with `async with`.
+        A delete event carries the deleted job only if changeStreamPreAndPostImages is enabled on
+        the collection, otherwise it has just the document key and is not filtered by user.
+        Change streams need a replica set (and MongoDB 6.0 for the pre-images), otherwise reading
+        the stream raises OperationFailure.
+        """
+        pipeline = [{"$match": {"$or": [
+            {"fullDocument.user_id": user_id},
+            {"fullDocumentBeforeChange.user_id": user_id},
+            {"operationType": "delete", "fullDocumentBeforeChange": None}
+        ]}}]
+        return self.tracked_jobs.watch(
+            pipeline,
+            full_document="updateLookup",
+            full_document_before_change="whenAvailable",
+            resume_after=resume_after,
+            max_await_time_ms=CHANGE_STREAM_MAX_AWAIT_MS
+        )
+
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None,
+                                sort: str = JobsSortOrder.UPDATE_TIME_DESC, page_token: Optional[str] = None,
+                                page_size: int = DEFAULT_PAGE_SIZE) -> PersistenceResponse[dict]:
+        """One page of the user's jobs as `{"jobs": [...], "next_page_token": str | None}`"""
+        return await fetch_jobs_page(self.tracked_jobs, user_id, job_filter, sort, page_token, page_size, JOB_PROJECTION)
+
+    async def get_job_analytics(self, user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> PersistenceResponse[dict]:
+        """Job counts per state, company and week plus the funnel, computed in one aggregation"""
+        try:
+            cursor = self.tracked_jobs.aggregate(job_analytics_pipeline(user_id, weeks))
+            results = await cursor.to_list(length=1)
+            return PersistenceResponse(data=parse_job_analytics(results[0] if results else {}), code=PersistenceErrorCode.SUCCESS)
+        except mongo_errors.OperationFailure as e:
+            logging.exception(f"MongoDB operation failed: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message=str(e))
+        except mongo_errors.ConnectionFailure as e:
+            logging.exception(f"MongoDB connection failed: {e}")
+            return PersistenceResponse(
+                data=None,
+                code=PersistenceErrorCode.CONNECTION_ERROR,
+                error_message=f"MongoDB connection failed: {e}"
+            )
+        except Exception as e:
+            logging.exception(f"MongoDB encountered an unknown error: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
+
     async def get_all_applications(self, user_id: str) -> PersistenceResponse[list[dict]]:
-        """Get all applications for a user"""
+        """Get all applications for a user, grouped by company as {company_name, company_id, jobs}"""
         try:
-            cursor = self.job_applications.find({"user_id": user_id})
-            results = await cursor.to_list(length=None)
-            companies = results
+            cursor = self.tracked_jobs.aggregate(company_applications_pipeline(user_id))
+            companies = await cursor.to_list(length=None)
             return PersistenceResponse(data=companies, code=PersistenceErrorCode.SUCCESS)
         except Exception as e:
             logging.exception(f"MongoDB encountered an unknown error: {e}")
@@ -294,37 +521,25 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
     
     async def get_jobs_by_state(self, user_id: str, state: str) -> PersistenceResponse[list[TrackedJob]]:
         """Get all jobs with a specific state across all companies"""
-        pipeline = [
-            {"$match": {"user_id": user_id}},
-            {"$unwind": "$jobs"},
-            {"$match": {"jobs.job_state": state}},
-            {"$project": {
-                "company_name": 1,
-                "job": "$jobs"
-            }}
-        ]
-        return await self._execute_job_aggregation(pipeline)
+        return await self._execute_job_query({"user_id": user_id, "job_state": state})
    
     async def get_recent_jobs(self, user_id: str, limit: int = 10) -> PersistenceResponse[list[dict]]:
         """Get most recently updated jobs"""
-        pipeline = [
-            {"$match": {"user_id": user_id}},
-            {"$unwind": "$jobs"},
-            {"$sort": {"jobs.update_time": -1}},
-            {"$limit": limit},
-            {"$project": {
-                "company_name": 1,
-                "job": "$jobs"
-            }}
-        ]
-        return await self._execute_job_aggregation(pipeline)
+        return await self._execute_job_query({"user_id": user_id}, sort=[("update_time", DESCENDING)], limit=limit)
 
-    async def _execute_job_aggregation(self, pipeline: list[dict]) -> PersistenceResponse[list[dict]]:
-        """Execute aggregation pipeline and convert results to dictionary list"""
+    async def list_tracked_job_keys(self, user_id: str) -> PersistenceResponse[list[dict]]:
+        return await self._execute_job_query({"user_id": user_id}, projection=JOB_KEYS_PROJECTION)
+
+    async def _execute_job_query(self, query: dict, sort: Optional[list[tuple]] = None, limit: int = 0,
+                                 projection: dict = JOB_PROJECTION) -> PersistenceResponse[list[dict]]:
+        """Execute a find on the tracked jobs and return the job dictionaries"""
         try:
-            cursor = self.job_applications.aggregate(pipeline)
-            results = await cursor.to_list(length=None)
-            tracked_jobs_dicts = [r["job"] for r in results]
+            cursor = self.tracked_jobs.find(query, projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            if limit:
+                cursor = cursor.limit(limit)
+            tracked_jobs_dicts = await cursor.to_list(length=None)
             return PersistenceResponse(data=tracked_jobs_dicts, code=PersistenceErrorCode.SUCCESS)
         except mongo_errors.OperationFailure as e:
             logging.exception(f"MongoDB operation failed: {e}")
@@ -339,29 +554,63 @@ class CompanyMongoPersist(AbstractOwnerMongoPersist):
         except Exception as e:
             logging.exception(f"MongoDB encountered an unknown error: {e}")
             return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
-    
-    async def _find_existing_application(self, user_id: str, company_name: str) -> dict:
-        try:
-            # Check if job already exists
-            existing = await self.job_applications.find_one({
-                "user_id": user_id,
-                "company_name": company_name
-            })
-            return existing
-        except mongo_errors.OperationFailure as e:
-            logging.exception(f"MongoDB operation failed: {e}")
-            raise
-        except mongo_errors.ConnectionFailure as e:
-            logging.exception(f"MongoDB connection failed: {e}")
-            raise
-        except Exception as e:
-            logging.exception(f"Unexpected error in add_job: {e}")
-            raise 
-
-    def _has_job_changes(self, existing_job: dict, new_job: dict) -> bool:
-        """Compare existing job with new job data (excluding job identifiers and update_time)"""
-        for key, value in new_job.items():
-            if key not in self.excluded_fields:
-                if existing_job.get(key) != value:
-                    return True
-        return False
+
+
+def company_applications_pipeline(user_id: str) -> list[dict]:
+    """Groups a user's job documents back into one {company_name, company_id, jobs} entry per company"""
+    return [
+        {"$match": {"user_id": user_id}},
+        {"$sort": {"update_time": -1}},
+        {"$project": JOB_PROJECTION},
+        {"$group": {
+            "_id": "$company_name",
+            "company_id": {"$first": "$company_id"},
+            "jobs": {"$push": "$$ROOT"}
+        }},
+        {"$project": {"_id": 0, "company_name": "$_id", "company_id": 1, "jobs": 1}},
+        {"$sort": {"company_name": 1}}
+    ]
+
+
+def job_analytics_pipeline(user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> list[dict]:
+    """
+    A single $facet aggregation over the user's jobs. Weeks are ISO weeks of the last update,
+    jobs keep only their current state, so the funnel counts the jobs that reached each step.
+    """
+    since = datetime.now(timezone.utc) - timedelta(weeks=weeks)
+    funnel_counts = {
+        f"reached_{index}": {"$sum": {"$cond": [{"$in": ["$job_state", [str(state) for state in FUNNEL_STATES[index:]]]}, 1, 0]}}
+        for index in range(len(FUNNEL_STATES))
+    }
+    funnel_conversions = {
+        f"conversion_{index}": {"$cond": [
+            {"$gt": [f"$reached_{index - 1}", 0]},
+            {"$divide": [f"$reached_{index}", f"$reached_{index - 1}"]},
+            None
+        ]}
+        for index in range(1, len(FUNNEL_STATES))
+    }
+    return [
+        {"$match": {"user_id": user_id}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "by_state": [
+                {"$group": {"_id": "$job_state", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}}
+            ],
+            "by_company": [
+                {"$group": {"_id": "$company_name", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": ANALYTICS_TOP_COMPANIES}
+            ],
+            "by_week": [
+                {"$match": {"update_time": {"$gte": since}}},
+                {"$group": {"_id": {"$dateToString": {"format": "%G-W%V", "date": "$update_time"}}, "count": {"$sum": 1}}},
+                {"$sort": {"_id": 1}}
+            ],
+            "funnel": [
+                {"$group": {"_id": None, **funnel_counts}},
+                {"$addFields": funnel_conversions}
+            ]
+        }}
+    ]
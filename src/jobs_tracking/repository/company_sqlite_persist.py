@@ -0,0 +1,452 @@
+import itertools
+import logging
+import sqlite3
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from jobs_tracking.repository.abstract_company_persist import (
+    ANALYTICS_TOP_COMPANIES, DEFAULT_ANALYTICS_WEEKS, FUNNEL_STATES, AbstractCompanyPersist, company_id_for, parse_job_analytics
+)
+from jobs_tracking.services.models import BulkTrackStatus
+from repository.abstract_sqlite_persist import AbstractSQLitePersist, from_db_time, to_db_time
+from repository.models import PersistenceErrorCode, PersistenceResponse
+from repository.pagination import (
+    DEFAULT_PAGE_SIZE, EXACT_FILTER_FIELDS, MAX_PAGE_SIZE, JobsSortOrder, decode_page_token, encode_page_token,
+    validate_job_filter
+)
+from utils.lru_cache import LRUTTLCache
+
+# Columns returned to the callers, user_id is left out as in JOB_PROJECTION of the Mongo persist
+JOB_COLUMNS = ("job_id", "job_url", "job_title", "job_state", "contact_name", "contact_linkedin", "contact_email",
+               "company_name", "company_id", "update_time")
+JOB_SELECT = f"SELECT {', '.join(JOB_COLUMNS)} FROM tracked_jobs"
+
+# Columns track_existing_job may change
+UPDATABLE_COLUMNS = ("job_title", "job_state", "contact_name", "contact_linkedin", "contact_email", "update_time")
+
+UPSERT_JOB = """
+INSERT INTO tracked_jobs (user_id, job_id, company_name, company_id, job_url, job_title, job_state,
+                          contact_name, contact_linkedin, contact_email, update_time)
+VALUES (:user_id, :job_id, :company_name, :company_id, :job_url, :job_title, :job_state,
+        :contact_name, :contact_linkedin, :contact_email, :update_time)
+ON CONFLICT (user_id, job_url) DO UPDATE SET
+    job_title = excluded.job_title,
+    job_state = excluded.job_state,
+    contact_name = excluded.contact_name,
+    contact_linkedin = excluded.contact_linkedin,
+    contact_email = excluded.contact_email,
+    update_time = excluded.update_time
+RETURNING job_id
+"""
+
+
+def job_from_row(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["update_time"] = from_db_time(job["update_time"])
+    return job
+
+
+def iso_week(update_time: str) -> str:
+    """The %G-W%V week of a stored time, the strftime of SQLite has no ISO weeks"""
+    year, week, _ = from_db_time(update_time).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class CompanySQLitePersist(AbstractSQLitePersist, AbstractCompanyPersist):
+    """
+    Tracked jobs in the `tracked_jobs` table of the local database, one row per job,
+    with the same semantics as CompanyMongoPersist
+    """
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self._known_user_ids: LRUTTLCache[str, bool] = LRUTTLCache(
+            max_size=self.KNOWN_USERS_MAX_SIZE, ttl=self.KNOWN_USERS_TTL_SECONDS)
+
+    # ==================== APPLICATION CRUD ====================
+
+    async def get_tracked_jobs(self, user_id: str, company_name: str) -> PersistenceResponse[list[dict]]:
+        """Get all application by user and company"""
+        try:
+            rows = await self._query(f"{JOB_SELECT} WHERE user_id = ? AND company_name = ?", (user_id, company_name))
+            jobs = [job_from_row(row) for row in rows]
+            if jobs:
+                return PersistenceResponse(id=jobs[0]["company_id"], data=jobs, code=PersistenceErrorCode.SUCCESS)
+            return PersistenceResponse(data=[], code=PersistenceErrorCode.SUCCESS)
+        except Exception as e:
+            return self._error_response(e)
+
+    async def track_new_job(self, user_id: str, company_name: str, tracked_job_dict: dict) -> PersistenceResponse[dict]:
+        """Add or update a job by (user_id, job_url) in a single upsert, see CompanyMongoPersist.track_new_job"""
+        logging.info(f"started with user: {user_id} company: \"{company_name}\" job: \"{tracked_job_dict['job_title']}\"")
+        try:
+            if not await self._user_exists(user_id):
+                logging.error(f"User {user_id} does not exist in the system.")
+                return PersistenceResponse(data=None, code=PersistenceErrorCode.NOT_FOUND, error_message="USER_NOT_FOUND")
+
+            def upsert(connection: sqlite3.Connection) -> dict:
+                [job_id] = connection.execute(UPSERT_JOB, self._job_row(user_id, company_name, tracked_job_dict)).fetchone()
+                row = connection.execute(f"{JOB_SELECT} WHERE user_id = ? AND job_id = ?", (user_id, job_id)).fetchone()
+                return job_from_row(row)
+
+            job = await self._transaction(upsert)
+            return PersistenceResponse(data=job, code=PersistenceErrorCode.SUCCESS)
+        except Exception as e:
+            return self._error_response(e)
+
+    @staticmethod
+    def _job_row(user_id: str, company_name: str, tracked_job_dict: dict) -> dict:
+        """Parameters of UPSERT_JOB. job_id and company_id are kept by an existing job"""
+        return {
+            "user_id": user_id,
+            "job_id": str(uuid.uuid4()),
+            "company_name": company_name,
+            "company_id": company_id_for(user_id, company_name),
+            "job_url": tracked_job_dict["job_url"],
+            "job_title": tracked_job_dict["job_title"],
+            "job_state": str(tracked_job_dict["job_state"]),
+            "contact_name": tracked_job_dict.get("contact_name"),
+            "contact_linkedin": tracked_job_dict.get("contact_linkedin"),
+            "contact_email": tracked_job_dict.get("contact_email"),
+            "update_time": to_db_time(datetime.now(timezone.utc))
+        }
+
+    async def track_jobs_bulk(self, user_id: str, companies_dicts: list[dict]) -> PersistenceResponse[list[dict]]:
+        """
+        Creates or updates many jobs, one transaction per company.
+
+        Returns:
+            A PersistenceResponse with one `{company_name, job_url, status, job_id, error_message}`
+            dictionary per job, in the order of the input.
+        """
+        logging.info(f"started with user {user_id} with {len(companies_dicts)} companies")
+        try:
+            if not await self._user_exists(user_id):
+                logging.error(f"User {user_id} does not exist in the system.")
+                return PersistenceResponse(data=None, code=PersistenceErrorCode.NOT_FOUND, error_message="USER_NOT_FOUND")
+        except Exception as e:
+            return self._error_response(e)
+
+        results = []
+        for company_dict in companies_dicts:
+            results.extend(await self._track_company_jobs_bulk(user_id, company_dict))
+        return PersistenceResponse(data=results, code=PersistenceErrorCode.SUCCESS)
+
+    async def _track_company_jobs_bulk(self, user_id: str, company_dict: dict) -> list[dict]:
+        company_name = company_dict["company_name"]
+        jobs = company_dict.get("tracked_jobs", [])
+        rows = [self._job_row(user_id, company_name, job) for job in jobs]
+        results = [
+            {
+                "company_name": company_name,
+                "job_url": job["job_url"],
+                "status": BulkTrackStatus.UPDATED,
+                "job_id": None,
+                "error_message": None
+            }
+            for job in jobs
+        ]
+        if not rows:
+            return results
+
+        def upsert_all(connection: sqlite3.Connection) -> list[str]:
+            return [connection.execute(UPSERT_JOB, row).fetchone()[0] for row in rows]
+
+        try:
+            job_ids = await self._transaction(upsert_all)
+        except Exception as e:
+            logging.exception(f"Failed to track jobs of company {company_name}: {e}")
+            for result in results:
+                result.update(status=BulkTrackStatus.ERROR, error_message=str(e))
+            return results
+
+        # an inserted row keeps the job_id generated for it, an updated one returns its own
+        for result, row, job_id in zip(results, rows, job_ids):
+            if job_id == row["job_id"]:
+                result.update(status=BulkTrackStatus.CREATED, job_id=job_id)
+        return results
+
+    async def _user_exists(self, user_id: str) -> bool:
+        """A user found is remembered for KNOWN_USERS_TTL_SECONDS"""
+        if self._known_user_ids.get(user_id):
+            return True
+        if await self._query("SELECT 1 FROM users WHERE user_id = ?", (user_id,)):
+            self._known_user_ids.put(user_id, True)
+            return True
+        return False
+
+    async def track_existing_job(self, user_id: str, company_id: str, tracked_job_dict: dict) -> PersistenceResponse[dict]:
+        logging.info(f"started with user: {user_id} company: \"{company_id}\"")
+
+        tracked_job_dict['update_time'] = datetime.now(timezone.utc)
+
+        set_fields = {key: value for key, value in tracked_job_dict.items() if key in UPDATABLE_COLUMNS}
+        set_fields["update_time"] = to_db_time(set_fields["update_time"])
+        if "job_state" in set_fields:
+            set_fields["job_state"] = str(set_fields["job_state"])
+        assignments = ", ".join(f"{column} = :{column}" for column in set_fields)
+        try:
+            cursor = await self._run(
+                self._connection.execute,
+                f"UPDATE tracked_jobs SET {assignments} WHERE user_id = :user_id AND job_id = :job_id AND company_id = :company_id",
+                {**set_fields, "user_id": user_id, "job_id": tracked_job_dict['job_id'], "company_id": company_id}
+            )
+            if cursor.rowcount > 0:
+                return PersistenceResponse(data={**tracked_job_dict, "company_id": company_id}, code=PersistenceErrorCode.SUCCESS)
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message="Failed to update job")
+        except Exception as e:
+            return self._error_response(e)
+
+    async def track_existing_jobs_bulk(self, user_id: str, updates: list[tuple[str, dict]]) -> PersistenceResponse[list[dict]]:
+        """
+        Updates many existing jobs in one transaction.
+
+        Returns:
+            A PersistenceResponse with one `{job_id, company_id, status, error_message}` dictionary
+            per update, in the order of the input. A job that was not found has the ERROR status.
+        """
+        logging.info(f"started with user {user_id} with {len(updates)} jobs")
+        update_time = to_db_time(datetime.now(timezone.utc))
+        statements = []
+        for company_id, tracked_job_dict in updates:
+            set_fields = {key: value for key, value in tracked_job_dict.items() if key in UPDATABLE_COLUMNS}
+            set_fields["update_time"] = update_time
+            if "job_state" in set_fields:
+                set_fields["job_state"] = str(set_fields["job_state"])
+            assignments = ", ".join(f"{column} = :{column}" for column in set_fields)
+            statements.append((
+                f"UPDATE tracked_jobs SET {assignments} WHERE user_id = :user_id AND job_id = :job_id AND company_id = :company_id",
+                {**set_fields, "user_id": user_id, "job_id": tracked_job_dict["job_id"], "company_id": company_id}
+            ))
+
+        def update_all(connection: sqlite3.Connection) -> list[int]:
+            return [connection.execute(sql, parameters).rowcount for sql, parameters in statements]
+
+        try:
+            updated = await self._transaction(update_all)
+        except Exception as e:
+            logging.exception(f"Failed to update jobs for user {user_id}: {e}")
+            return self._error_response(e)
+        results = [
+            {
+                "job_id": tracked_job_dict["job_id"],
+                "company_id": company_id,
+                "status": BulkTrackStatus.UPDATED if count else BulkTrackStatus.ERROR,
+                "error_message": None if count else "Job not found"
+            }
+            for (company_id, tracked_job_dict), count in zip(updates, updated)
+        ]
+        return PersistenceResponse(data=results, code=PersistenceErrorCode.SUCCESS)
+
+    async def delete_application(self, user_id: str, company_name: str) -> PersistenceResponse[bool]:
+        """Delete an entire company application"""
+        try:
+            cursor = await self._run(self._connection.execute,
+                                     "DELETE FROM tracked_jobs WHERE user_id = ? AND company_name = ?", (user_id, company_name))
+            if cursor.rowcount > 0:
+                return PersistenceResponse(data=True, code=PersistenceErrorCode.SUCCESS)
+            return PersistenceResponse(
+                data=False,
+                code=PersistenceErrorCode.NOT_FOUND,
+                error_message=f"Application for user {user_id} and company {company_name} not found."
+            )
+        except Exception as e:
+            return self._error_response(e)
+
+    async def delete_job(self, user_id: str, company_name: str, job_url: str) -> PersistenceResponse[bool]:
+        """Delete a specific job from a company application"""
+        logging.info(f"started with user: {user_id} company: \"{company_name}\" job: \"{job_url}\"")
+        try:
+            cursor = await self._run(
+                self._connection.execute,
+                "DELETE FROM tracked_jobs WHERE user_id = ? AND company_name = ? AND job_url = ?",
+                (user_id, company_name, job_url)
+            )
+            if cursor.rowcount > 0:
+                return PersistenceResponse(data=True, code=PersistenceErrorCode.SUCCESS)
+            return PersistenceResponse(data=False, code=PersistenceErrorCode.NOT_FOUND, error_message="Job not found for deletion.")
+        except Exception as e:
+            return self._error_response(e)
+
+    async def delete_tracked_jobs(self, user_id: str, companies_dicts: list[dict]) -> PersistenceResponse[dict]:
+        """
+        Removes jobs by company_name and job_url in one transaction.
+
+        Returns:
+            A PersistenceResponse with `{"deleted_count": int, "companies": {company_name: count},
+            "jobs": {job_url: count}}`. Every delete reports its own count.
+        """
+        logging.info(f"started with user {user_id} with {len(companies_dicts)} companies")
+
+        requested = [
+            (company_dict["company_name"], job["job_url"])
+            for company_dict in companies_dicts
+            for job in company_dict.get("tracked_jobs", [])
+        ]
+        if not requested:
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.VALIDATION_ERROR, error_message="No jobs to delete")
+
+        def delete_all(connection: sqlite3.Connection) -> list[int]:
+            return [
+                connection.execute("DELETE FROM tracked_jobs WHERE user_id = ? AND company_name = ? AND job_url = ?",
+                                   (user_id, company_name, job_url)).rowcount
+                for company_name, job_url in requested
+            ]
+
+        try:
+            deleted = await self._transaction(delete_all)
+        except Exception as e:
+            logging.exception(f"Failed to delete jobs for user {user_id}: {e}")
+            return self._error_response(e)
+
+        deleted_count = sum(deleted)
+        if deleted_count != len(requested):
+            logging.warning(f"Deleted {deleted_count} of {len(requested)} jobs for user {user_id}")
+        companies: dict[str, Optional[int]] = {}
+        jobs: dict[str, Optional[int]] = {}
+        for (company_name, job_url), count in zip(requested, deleted):
+            companies[company_name] = companies.get(company_name, 0) + count
+            jobs[job_url] = count
+        return PersistenceResponse(
+            data={"deleted_count": deleted_count, "companies": companies, "jobs": jobs},
+            code=PersistenceErrorCode.SUCCESS
+        )
+
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None,
+                                sort: str = JobsSortOrder.UPDATE_TIME_DESC, page_token: Optional[str] = None,
+                                page_size: int = DEFAULT_PAGE_SIZE) -> PersistenceResponse[dict]:
+        """
+        One page of the user's jobs as `{"jobs": [...], "next_page_token": str | None}`,
+        keyed on (update_time, job_id) as in repository.pagination
+        """
+        try:
+            sort_order = JobsSortOrder(sort or JobsSortOrder.UPDATE_TIME_DESC)
+            page_size = min(max(1, page_size or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+            where, parameters = self._jobs_page_conditions(user_id, job_filter, sort_order, page_token)
+        except ValueError as e:
+            logging.error(f"Invalid jobs page request: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.VALIDATION_ERROR, error_message=str(e))
+
+        direction = "DESC" if sort_order == JobsSortOrder.UPDATE_TIME_DESC else "ASC"
+        try:
+            # one extra job tells whether there is a next page
+            rows = await self._query(
+                f"{JOB_SELECT} WHERE {where} ORDER BY update_time {direction}, job_id {direction} LIMIT ?",
+                (*parameters, page_size + 1)
+            )
+            jobs = [job_from_row(row) for row in rows]
+            next_page_token = encode_page_token(jobs[page_size - 1]) if len(jobs) > page_size else None
+            return PersistenceResponse(
+                data={"jobs": jobs[:page_size], "next_page_token": next_page_token},
+                code=PersistenceErrorCode.SUCCESS
+            )
+        except Exception as e:
+            return self._error_response(e)
+
+    @staticmethod
+    def _jobs_page_conditions(user_id: str, job_filter: Optional[dict], sort: JobsSortOrder,
+                              page_token: Optional[str]) -> tuple[str, list]:
+        """WHERE clause of build_jobs_page_query in SQL. Raises ValueError for a bad filter or page token"""
+        job_filter = validate_job_filter(job_filter)
+        conditions, parameters = ["user_id = ?"], [user_id]
+        for field in EXACT_FILTER_FIELDS:
+            if job_filter.get(field):
+                value = job_filter[field]
+                conditions.append(f"{field} = ?")
+                parameters.append(value.lower() if field == "company_name" else value)
+        if job_filter.get("updated_after"):
+            conditions.append("update_time >= ?")
+            parameters.append(to_db_time(datetime.fromisoformat(job_filter["updated_after"])))
+        if job_filter.get("updated_before"):
+            conditions.append("update_time < ?")
+            parameters.append(to_db_time(datetime.fromisoformat(job_filter["updated_before"])))
+        if page_token:
+            update_time, job_id = decode_page_token(page_token)
+            operator = "<" if sort == JobsSortOrder.UPDATE_TIME_DESC else ">"
+            conditions.append(f"(update_time {operator} ? OR (update_time = ? AND job_id {operator} ?))")
+            parameters.extend([to_db_time(update_time), to_db_time(update_time), job_id])
+        return " AND ".join(conditions), parameters
+
+    async def get_job_analytics(self, user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> PersistenceResponse[dict]:
+        """The facets of job_analytics_pipeline, read in one transaction"""
+        since = to_db_time(datetime.now(timezone.utc) - timedelta(weeks=weeks))
+        funnel_columns = ", ".join(
+            f"COALESCE(SUM(job_state IN ({', '.join('?' for _ in FUNNEL_STATES[index:])})), 0)"
+            for index in range(len(FUNNEL_STATES))
+        )
+        funnel_parameters = [str(state) for index in range(len(FUNNEL_STATES)) for state in FUNNEL_STATES[index:]]
+
+        def read_facets(connection: sqlite3.Connection) -> dict:
+            by_state = connection.execute(
+                "SELECT job_state, COUNT(*) AS count FROM tracked_jobs WHERE user_id = ? "
+                "GROUP BY job_state ORDER BY count DESC, job_state", (user_id,)).fetchall()
+            by_company = connection.execute(
+                "SELECT company_name, COUNT(*) AS count FROM tracked_jobs WHERE user_id = ? "
+                "GROUP BY company_name ORDER BY count DESC, company_name LIMIT ?", (user_id, ANALYTICS_TOP_COMPANIES)).fetchall()
+            update_times = connection.execute(
+                "SELECT update_time FROM tracked_jobs WHERE user_id = ? AND update_time >= ?", (user_id, since)).fetchall()
+            reached = connection.execute(
+                f"SELECT {funnel_columns} FROM tracked_jobs WHERE user_id = ?", (*funnel_parameters, user_id)).fetchone()
+            return {"by_state": by_state, "by_company": by_company, "update_times": update_times, "reached": reached}
+
+        try:
+            facets = await self._transaction(read_facets)
+        except Exception as e:
+            return self._error_response(e)
+
+        total = sum(row["count"] for row in facets["by_state"])
+        week_counts: dict[str, int] = {}
+        for row in facets["update_times"]:
+            week = iso_week(row["update_time"])
+            week_counts[week] = week_counts.get(week, 0) + 1
+        reached = list(facets["reached"])
+        funnel = {f"reached_{index}": count for index, count in enumerate(reached)}
+        funnel.update({
+            f"conversion_{index}": reached[index] / reached[index - 1] if reached[index - 1] > 0 else None
+            for index in range(1, len(reached))
+        })
+        return PersistenceResponse(data=parse_job_analytics({
+            "total": [{"count": total}] if total else [],
+            "by_state": [{"_id": row["job_state"], "count": row["count"]} for row in facets["by_state"]],
+            "by_company": [{"_id": row["company_name"], "count": row["count"]} for row in facets["by_company"]],
+            "by_week": [{"_id": week, "count": count} for week, count in sorted(week_counts.items())],
+            "funnel": [funnel]
+        }), code=PersistenceErrorCode.SUCCESS)
+
+    async def get_all_applications(self, user_id: str) -> PersistenceResponse[list[dict]]:
+        """Get all applications for a user, grouped by company as {company_name, company_id, jobs}"""
+        try:
+            rows = await self._query(f"{JOB_SELECT} WHERE user_id = ? ORDER BY company_name, update_time DESC", (user_id,))
+        except Exception as e:
+            return self._error_response(e)
+        companies = []
+        for company_name, company_rows in itertools.groupby(rows, key=lambda row: row["company_name"]):
+            jobs = [job_from_row(row) for row in company_rows]
+            companies.append({"company_name": company_name, "company_id": jobs[0]["company_id"], "jobs": jobs})
+        return PersistenceResponse(data=companies, code=PersistenceErrorCode.SUCCESS)
+
+    # ==================== QUERY HELPERS ====================
+
+    async def get_jobs_by_state(self, user_id: str, state: str) -> PersistenceResponse[list[dict]]:
+        """Get all jobs with a specific state across all companies"""
+        return await self._execute_job_query(f"{JOB_SELECT} WHERE user_id = ? AND job_state = ?", (user_id, str(state)))
+
+    async def get_recent_jobs(self, user_id: str, limit: int = 10) -> PersistenceResponse[list[dict]]:
+        """Get most recently updated jobs"""
+        return await self._execute_job_query(
+            f"{JOB_SELECT} WHERE user_id = ? ORDER BY update_time DESC LIMIT ?", (user_id, limit or -1))
+
+    async def list_tracked_job_keys(self, user_id: str) -> PersistenceResponse[list[dict]]:
+        try:
+            rows = await self._query("SELECT job_id, company_name, company_id FROM tracked_jobs WHERE user_id = ?", (user_id,))
+            return PersistenceResponse(data=[dict(row) for row in rows], code=PersistenceErrorCode.SUCCESS)
+        except Exception as e:
+            return self._error_response(e)
+
+    async def _execute_job_query(self, sql: str, parameters: tuple) -> PersistenceResponse[list[dict]]:
+        try:
+            rows = await self._query(sql, parameters)
+            return PersistenceResponse(data=[job_from_row(row) for row in rows], code=PersistenceErrorCode.SUCCESS)
+        except Exception as e:
+            return self._error_response(e)
@@ -0,0 +1,108 @@
+"""
+Converts the legacy `job_applications` collection (one document per company with a `jobs` array)
+to the `tracked_jobs` collection (one document per job) used by CompanyMongoPersist.
+
+Company ids are re-derived from (user_id, company_name), see company_id_for.
+The migration is idempotent: jobs are upserted by (user_id, job_url), so it can be re-run
+after a partial failure. CompanyMongoPersist runs it on startup while legacy documents remain,
+it can also be run by hand, e.g. to drop the legacy collection (from the src folder):
+
+    python -m jobs_tracking.repository.job_applications_migration [--drop-legacy]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+
+from pymongo import UpdateOne
+
+from jobs_tracking.repository.abstract_company_persist import company_id_for
+
+
+@dataclass
+class MigrationResult:
+    companies: int = 0
+    jobs: int = 0
+    migrated: int = 0
+    skipped: int = 0
+
+
+async def migrate_job_applications(async_db, batch_size: int = 500, drop_legacy: bool = False) -> MigrationResult:
+    """
+    Copies every job of the legacy collection into `tracked_jobs`.
+    Jobs that already exist in `tracked_jobs` (same user_id and job_url) are kept as they are.
+    """
+    result = MigrationResult()
+    requests: list[UpdateOne] = []
+
+    async for application in async_db.job_applications.find({}):
+        result.companies += 1
+        user_id = application.get("user_id")
+        company_name = application.get("company_name")
+        company_id = company_id_for(user_id, company_name)
+        for job in application.get("jobs", []):
+            result.jobs += 1
+            if not user_id or not company_name or not job.get("job_url"):
+                logging.warning(f"Skipping job without user, company or url in application {application.get('_id')}")
+                result.skipped += 1
+                continue
+            job_document = {
+                **job,
+                "job_id": job.get("job_id") or str(uuid.uuid4()),
+                "user_id": user_id,
+                "company_name": company_name,
+                "company_id": company_id
+            }
+            requests.append(UpdateOne(
+                {"user_id": user_id, "job_url": job["job_url"]},
+                {"$setOnInsert": job_document},
+                upsert=True
+            ))
+            if len(requests) >= batch_size:
+                result.migrated += await _write_batch(async_db, requests)
+                requests = []
+
+    if requests:
+        result.migrated += await _write_batch(async_db, requests)
+
+    if drop_legacy and result.skipped == 0:
+        await async_db.job_applications.drop()
+        logging.info("Dropped the legacy job_applications collection")
+
+    logging.info(f"Migrated {result.migrated} of {result.jobs} jobs from {result.companies} companies, "
+                 f"skipped {result.skipped}")
+    return result
+
+
+async def _write_batch(async_db, requests: list[UpdateOne]) -> int:
+    bulk_result = await async_db.tracked_jobs.bulk_write(requests, ordered=False)
+    return bulk_result.upserted_count
+
+
+async def _main(drop_legacy: bool):
+    from dotenv import load_dotenv
+
+    from jobs_tracking.repository.company_mongo_persist import CompanyMongoPersist
+
+    load_dotenv('.env.local')
+    connection_string = os.getenv('MONGODB_URI')
+    db_name = os.getenv('MONGODB_DB_NAME')
+    if not connection_string or not db_name:
+        raise SystemExit("MONGODB_URI and MONGODB_DB_NAME must be set")
+
+    # creates the tracked_jobs indexes before the copy, so duplicate urls are upserted only once
+    company_persist = await CompanyMongoPersist.create(connection_string, db_name)
+    try:
+        await migrate_job_applications(company_persist.async_db, drop_legacy=drop_legacy)
+    finally:
+        await company_persist.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Convert job_applications to one document per tracked job")
+    parser.add_argument("--drop-legacy", action="store_true", help="drop job_applications after a full migration")
+    args = parser.parse_args()
+    asyncio.run(_main(args.drop_legacy))
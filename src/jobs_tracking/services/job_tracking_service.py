@@ -1,24 +1,40 @@
+import concurrent.futures
 from dataclasses import asdict
+from datetime import datetime, timezone
 import logging
 from urllib.parse import urlparse
-from typing import Optional
+from typing import Callable, Optional
 
 from jobs_tracking.job_tracking_linkedin_parser import extract_linkedin_job
+from jobs_tracking.repository.abstract_company_persist import DEFAULT_ANALYTICS_WEEKS, AbstractCompanyPersist
 from jobs_tracking.repository.company_mongo_persist import CompanyMongoPersist
-from jobs_tracking.services.models import Company, TrackedJob, CompanyResponse, JobTrackingResponse, JobTrackingResponseCode
-from jobs_tracking.services.models import JobApplicationState
+from jobs_tracking.repository.company_sqlite_persist import CompanySQLitePersist
+from jobs_tracking.services.models import BulkTrackResult, BulkTrackStatus, Company, CompanyTrackedJob, DeleteTrackedJobsResult, FunnelStep, JobAnalytics, TrackedJobsPage, TrackedJob, CompanyResponse, JobTrackingResponse, JobTrackingResponseCode
+from jobs_tracking.services.models import JobApplicationState, PendingJobUpdate, TrackedJobChange, TrackedJobChangeType
+from jobs_tracking.services.tracked_jobs_watcher import TrackedJobsWatcher
+from jobs_tracking.services.tracked_jobs_write_queue import TrackedJobsWriteQueue, WriteQueueStats
 
 from repository.models import PersistenceErrorCode, PersistenceResponse
+from repository.pagination import DEFAULT_PAGE_SIZE, JobsSortOrder
 from services.abstract_persistence_service import AbstractPersistenceService
 
 from utils import file_utils
-from utils.utils import AsyncRunner
+from utils.lru_cache import CacheStats, LRUTTLCache
+from utils.utils import AsyncRunner, OperationClass
 
 
 class JobTrackingService(AbstractPersistenceService):
 
-    def __init__(self, company_mongo_persist: CompanyMongoPersist):        
-        self.application_persist = company_mongo_persist
+    # get_tracked_jobs cache, keyed by (user_id, company_name)
+    CACHE_MAX_SIZE = 256
+    CACHE_TTL_SECONDS = 300.0
+
+    def __init__(self, company_persist: AbstractCompanyPersist):
+        self.application_persist = company_persist
+        self.tracked_jobs_cache: LRUTTLCache[tuple[str, str], PersistenceResponse[list[dict]]] = LRUTTLCache(
+            max_size=self.CACHE_MAX_SIZE, ttl=self.CACHE_TTL_SECONDS)
+        self._live_updates: Optional[concurrent.futures.Future] = None
+        self._write_queue: Optional[TrackedJobsWriteQueue] = None
         super().__init__(self.application_persist)
 
     @classmethod
@@ -28,6 +44,12 @@ class JobTrackingService(AbstractPersistenceService):
         company_persist = await CompanyMongoPersist.create(mongo_connection_string, db_name)
         return cls(company_persist)
 
+    @classmethod
+    async def create_local(cls, db_path):
+        """Service on the local SQLite database, used when no MongoDB is configured"""
+        company_persist = await CompanySQLitePersist.create(db_path)
+        return cls(company_persist)
+
     def track_new_job_sync(self, user_id: str, company_name: str, tracked_job: TrackedJob) -> JobTrackingResponse:
 
         logging.info(f"started with user: {user_id} company: \"{company_name}\" job: \"{tracked_job.job_title}\"")
@@ -36,7 +58,8 @@ class JobTrackingService(AbstractPersistenceService):
             user_id=user_id,
             company_name=company_name,
             tracked_job=tracked_job
-            )
+            ),
+            operation_class=OperationClass.DB_WRITE
         )
         return result    
     
@@ -48,7 +71,8 @@ class JobTrackingService(AbstractPersistenceService):
             user_id=user_id,
             company_id=company_id,
             tracked_job=tracked_job
-            )
+            ),
+            operation_class=OperationClass.DB_WRITE
         )
         return result
        
@@ -79,6 +103,10 @@ class JobTrackingService(AbstractPersistenceService):
             company_name=company_name,
             tracked_job_dict=asdict(tracked_job)
         )
+        self._invalidate_company(user_id, company_name)
+        if persistence_response.data and persistence_response.data.get("company_name") != company_name:
+            # the url was already tracked for another company, which was updated instead
+            self._invalidate_company(user_id, persistence_response.data.get("company_name"))
         return self._create_job_tracking_response(persistence_response, company_name, tracked_job)
     
 
@@ -102,14 +130,70 @@ class JobTrackingService(AbstractPersistenceService):
             return JobTrackingResponse(job=tracked_job, code=JobTrackingResponseCode.ERROR)
         
         tracked_job.job_url = job_url
+
+        if self._write_queue and tracked_job.job_id:
+            # optimistic ack, the write follows within the flush delay and failures go to the error callback.
+            # The queued job is also what reads return until it is written, so it carries its update time
+            tracked_job.update_time = datetime.now(timezone.utc)
+            self._write_queue.enqueue(user_id, company_id, tracked_job)
+            return JobTrackingResponse(job=tracked_job, company_id=company_id, code=JobTrackingResponseCode.OK)
                 
         persistence_response: PersistenceResponse[dict] = await self.application_persist.track_existing_job(
             user_id=user_id,
             company_id=company_id,
             tracked_job_dict=asdict(tracked_job)
         )
+        # only the company id is known here, so all companies of the user are dropped
+        self._invalidate_user(user_id)
         return self._create_job_tracking_response(persistence_response, company_id, tracked_job)
     
+    def track_jobs_bulk_sync(self, user_id: str, companies: list[Company]) -> list[BulkTrackResult]:
+
+        logging.info(f"started with user: {user_id} with {len(companies)} companies")
+        result = AsyncRunner.run_async(
+            self.track_jobs_bulk(
+            user_id=user_id,
+            companies=companies
+            ),
+            operation_class=OperationClass.DB_WRITE
+        )
+        return result
+
+    async def track_jobs_bulk(self, user_id: str, companies: list[Company]) -> list[BulkTrackResult]:
+        """Add or update many jobs at once. Returns one result per job, invalid jobs are not written"""
+        logging.info(f"started with user: {user_id} with {len(companies)} companies")
+
+        results: list[BulkTrackResult] = []
+        companies_dicts = []
+        for company in companies:
+            company_name = (company.company_name or "").lower()
+            valid_jobs = []
+            for tracked_job in company.tracked_jobs:
+                if self._validate_job_parameters(user_id, company_name, tracked_job):
+                    results.append(BulkTrackResult(company_name=company_name, job_url=tracked_job.job_url,
+                                                   status=BulkTrackStatus.INVALID, error_message="Invalid job parameters"))
+                    continue
+                tracked_job.job_url = urlparse(tracked_job.job_url).geturl()
+                valid_jobs.append(asdict(tracked_job))
+            if valid_jobs:
+                companies_dicts.append({"company_name": company_name, "tracked_jobs": valid_jobs})
+
+        if not companies_dicts:
+            return results
+
+        persistence_response: PersistenceResponse[list[dict]] = await self.application_persist.track_jobs_bulk(user_id, companies_dicts)
+        self._invalidate_user(user_id)
+        if persistence_response.code != PersistenceErrorCode.SUCCESS:
+            logging.error(f"Failed to track jobs in bulk for user {user_id}: {persistence_response.code}")
+            for company_dict in companies_dicts:
+                results.extend(BulkTrackResult(company_name=company_dict["company_name"], job_url=job["job_url"],
+                                               status=BulkTrackStatus.ERROR, error_message=persistence_response.error_message)
+                               for job in company_dict["tracked_jobs"])
+            return results
+
+        results.extend(BulkTrackResult(**result) for result in persistence_response.data)
+        return results
+
     def get_tracked_jobs_sync(self, user_id: str, company_name: str) -> CompanyResponse:
 
         logging.info(f"started with user: {user_id} company: \"{company_name}\"")
@@ -117,7 +201,8 @@ class JobTrackingService(AbstractPersistenceService):
             self.get_tracked_jobs(
             user_id=user_id,
             company_name=company_name
-            )
+            ),
+            operation_class=OperationClass.DB_READ
         )
         return result
     
@@ -132,13 +217,15 @@ class JobTrackingService(AbstractPersistenceService):
         company_name = company_name.lower()
         
         try:
-            response: PersistenceResponse[list[dict]] = await self.application_persist.get_tracked_jobs(user_id, company_name)
+            response = await self._get_tracked_jobs_cached(user_id, company_name)
             if response.code == PersistenceErrorCode.SUCCESS:
                 if not response.data:
                     logging.warning(f"No tracked jobs found for company {company_name}")
                     return CompanyResponse(company=None, code=JobTrackingResponseCode.NO_TRACKED_JOBS)
-                # Convert dicts back to domain objects
-                tracked_jobs = [TrackedJob.from_dict(job_dict) for job_dict in response.data]
+                # Convert dicts back to domain objects, queued updates are newer than the stored jobs
+                pending_jobs = self._pending_jobs(user_id)
+                tracked_jobs = [pending_jobs.get(job_dict["job_id"]) or TrackedJob.from_dict(job_dict)
+                                for job_dict in response.data]
                 company = Company(company_id=response.id, company_name=company_name, tracked_jobs=tracked_jobs)
                 return CompanyResponse(company=company, code=JobTrackingResponseCode.OK)
             else:
@@ -148,28 +235,187 @@ class JobTrackingService(AbstractPersistenceService):
             logging.error(f"Failed to get tracked jobs for company {company_name}: {e}")
             return CompanyResponse(company=None, code=JobTrackingResponseCode.ERROR)
 
+    def list_tracked_jobs_sync(self, user_id: str, job_filter: Optional[dict] = None, sort: Optional[str] = None,
+                               page_token: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> TrackedJobsPage:
+
+        logging.info(f"started with user: {user_id}")
+        result = AsyncRunner.run_async(
+            self.list_tracked_jobs(
+            user_id=user_id,
+            job_filter=job_filter,
+            sort=sort,
+            page_token=page_token,
+            page_size=page_size
+            ),
+            operation_class=OperationClass.DB_READ
+        )
+        return result
+
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None, sort: Optional[str] = None,
+                                page_token: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> TrackedJobsPage:
+        """One page of the user's tracked jobs of all companies, most recently updated first by default"""
+
+        logging.info(f"started with user: {user_id} filter: {job_filter} sort: {sort}")
+        if not user_id:
+            logging.error("Missing required parameters for list_tracked_jobs")
+            return TrackedJobsPage(code=JobTrackingResponseCode.ERROR, error_message="Missing user id")
+
+        response: PersistenceResponse[dict] = await self.application_persist.list_tracked_jobs(
+            user_id, job_filter, sort or JobsSortOrder.UPDATE_TIME_DESC, page_token, page_size)
+        if response.code != PersistenceErrorCode.SUCCESS:
+            logging.error(f"Failed to list tracked jobs for user {user_id}: {response.code}")
+            return TrackedJobsPage(code=JobTrackingResponseCode.ERROR, error_message=response.error_message)
+
+        pending_jobs = self._pending_jobs(user_id)
+        jobs = [
+            CompanyTrackedJob(company_id=job_dict["company_id"], company_name=job_dict["company_name"],
+                              tracked_job=pending_jobs.get(job_dict["job_id"]) or TrackedJob.from_dict(job_dict))
+            for job_dict in response.data["jobs"]
+        ]
+        return TrackedJobsPage(code=JobTrackingResponseCode.OK, jobs=jobs, next_page_token=response.data["next_page_token"])
+
+    def get_job_analytics_sync(self, user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> JobAnalytics:
+        return AsyncRunner.run_async(self.get_job_analytics(user_id, weeks), operation_class=OperationClass.DB_READ)
+
+    async def get_job_analytics(self, user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> JobAnalytics:
+        """Counts of the user's jobs per state, company and week, and the conversion between outreach steps"""
+
+        logging.info(f"started with user: {user_id} weeks: {weeks}")
+        if not user_id:
+            logging.error("Missing required parameters for get_job_analytics")
+            return JobAnalytics(code=JobTrackingResponseCode.ERROR, error_message="Missing user id")
+
+        response: PersistenceResponse[dict] = await self.application_persist.get_job_analytics(user_id, max(1, weeks))
+        if response.code != PersistenceErrorCode.SUCCESS:
+            logging.error(f"Failed to get job analytics for user {user_id}: {response.code}")
+            return JobAnalytics(code=JobTrackingResponseCode.ERROR, error_message=response.error_message)
+
+        analytics = response.data
+        return JobAnalytics(
+            code=JobTrackingResponseCode.OK,
+            total=analytics["total"],
+            by_state={bucket["state"]: bucket["count"] for bucket in analytics["by_state"]},
+            by_company={bucket["company_name"]: bucket["count"] for bucket in analytics["by_company"]},
+            by_week={bucket["week"]: bucket["count"] for bucket in analytics["by_week"]},
+            funnel=[
+                FunnelStep(state=JobApplicationState.from_string(step["state"]), reached=step["reached"],
+                           conversion=step["conversion"])
+                for step in analytics["funnel"]
+            ]
+        )
+
+    async def _get_tracked_jobs_cached(self, user_id: str, company_name: str) -> PersistenceResponse[list[dict]]:
+        """Read-through cache of the persisted jobs. Domain objects are rebuilt on every call"""
+        cache_key = (user_id, company_name)
+        cached_response = self.tracked_jobs_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        generation = self.tracked_jobs_cache.generation
+        response: PersistenceResponse[list[dict]] = await self.application_persist.get_tracked_jobs(user_id, company_name)
+        if response.code == PersistenceErrorCode.SUCCESS:
+            self.tracked_jobs_cache.put(cache_key, response, generation)
+        return response
+
+    def _invalidate_company(self, user_id: str, company_name: Optional[str]):
+        if company_name:
+            self.tracked_jobs_cache.invalidate((user_id, company_name.lower()))
+
+    def _invalidate_user(self, user_id: str):
+        self.tracked_jobs_cache.invalidate_where(lambda key: key[0] == user_id)
+
+    def start_live_updates(self, user_id: str, on_changes: Callable[[list[TrackedJobChange]], None],
+                           poll_interval: float = TrackedJobsWatcher.POLL_INTERVAL_SECONDS):
+        """
+        Follows the writes to the user's jobs from any process, keeps the cache in line with them
+        and passes them to `on_changes`, which is called on the db loop and must not block.
+        Replaces the live updates of a previous user.
+        """
+        self.stop_live_updates()
+
+        def apply_changes(changes: list[TrackedJobChange]):
+            for change in changes:
+                self._apply_change_to_cache(user_id, change)
+            on_changes(changes)
+
+        watcher = TrackedJobsWatcher(self.application_persist, user_id, apply_changes, poll_interval)
+        self._live_updates = AsyncRunner.submit(watcher.run(), operation_class=OperationClass.DB_READ)
+        logging.info(f"Started live updates of tracked jobs for user {user_id}")
+
+    def stop_live_updates(self):
+        if self._live_updates:
+            self._live_updates.cancel()
+            self._live_updates = None
+
+    def _apply_change_to_cache(self, user_id: str, change: TrackedJobChange):
+        """Patches the cached jobs of the changed company instead of reading them again"""
+        if not change.company_name:
+            # a delete without the deleted document, the company is not known
+            self._invalidate_user(user_id)
+            return
+
+        def patch(response: PersistenceResponse[list[dict]]) -> PersistenceResponse[list[dict]]:
+            jobs = [job for job in response.data if job.get("job_id") != change.job_id]
+            if change.change_type == TrackedJobChangeType.UPSERT:
+                jobs.append(asdict(change.tracked_job))
+            return PersistenceResponse(id=response.id or change.company_id, data=jobs, code=response.code)
+
+        self.tracked_jobs_cache.update((user_id, change.company_name), patch)
+
+    def enable_write_behind(self, on_error: Optional[Callable[[list[PendingJobUpdate]], None]] = None,
+                            flush_delay: float = TrackedJobsWriteQueue.FLUSH_DELAY_SECONDS):
+        """
+        Queues the updates of existing jobs instead of writing each one, see TrackedJobsWriteQueue.
+        `on_error` gets the updates that could not be written, on the db loop, and must not block.
+        """
+        self._write_queue = TrackedJobsWriteQueue(self.application_persist, self._invalidate_user, on_error, flush_delay)
+        logging.info(f"Write-behind of tracked job updates enabled, flush delay {flush_delay}s")
+
+    def flush_pending_updates_sync(self) -> list[PendingJobUpdate]:
+        """Writes the queued updates and stops queueing, e.g. on shutdown. Returns the failed updates"""
+        write_queue, self._write_queue = self._write_queue, None
+        if not write_queue:
+            return []
+        return AsyncRunner.run_async(write_queue.close(), operation_class=OperationClass.DB_WRITE)
+
+    def get_write_queue_stats(self) -> Optional[WriteQueueStats]:
+        return self._write_queue.stats() if self._write_queue else None
+
+    def _pending_jobs(self, user_id: str) -> dict[str, TrackedJob]:
+        return self._write_queue.pending_jobs(user_id) if self._write_queue else {}
+
+    def get_cache_stats(self) -> CacheStats:
+        return self.tracked_jobs_cache.stats()
+
     def extract_job_title_and_company(self, url:str):
         logging.info(f"start with {url}")
         return extract_linkedin_job(url)       
 
-    def delete_tracked_jobs_sync(self, user_id:str, companies_jobs: list[Company]):
+    def delete_tracked_jobs_sync(self, user_id:str, companies_jobs: list[Company]) -> DeleteTrackedJobsResult:
         logging.info(f"started with user: {user_id} with {len(companies_jobs)} companies")
         result = AsyncRunner.run_async(
             self.delete_tracked_jobs(
             user_id=user_id,
             companies_jobs=companies_jobs
-            )
+            ),
+            operation_class=OperationClass.DB_WRITE
         )
-        return result
+        return result or DeleteTrackedJobsResult(success=False)
     
-    async def delete_tracked_jobs(self, user_id: str, companies_jobs: list[Company]):
+    async def delete_tracked_jobs(self, user_id: str, companies_jobs: list[Company]) -> DeleteTrackedJobsResult:
         logging.info(f"started with user: {user_id} with {len(companies_jobs)} companies")
         if not user_id or not companies_jobs:
             logging.error("Missing required parameters for delete_tracked_jobs")
-            return False
+            return DeleteTrackedJobsResult(success=False)
         # Convert domain objects to dicts
         companies_dicts = [asdict(company) for company in companies_jobs]
-        return await self.application_persist.delete_tracked_jobs(user_id, companies_dicts)
+        response: PersistenceResponse[dict] = await self.application_persist.delete_tracked_jobs(user_id, companies_dicts)
+        for company_dict in companies_dicts:
+            self._invalidate_company(user_id, company_dict["company_name"])
+        if response.code != PersistenceErrorCode.SUCCESS:
+            logging.error(f"Failed to delete tracked jobs for user {user_id}: {response.code}")
+            return DeleteTrackedJobsResult(success=False)
+        return DeleteTrackedJobsResult(success=response.data["deleted_count"] > 0, **response.data)
 
     def _create_job_tracking_response(self, persistence_response: PersistenceResponse[dict], company_id: str, tracked_job: TrackedJob) -> JobTrackingResponse:
         if persistence_response.code == PersistenceErrorCode.SUCCESS:
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, fields
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import StrEnum
 from typing import Optional
@@ -91,6 +91,81 @@ class JobTrackingResponse:
     code: JobTrackingResponseCode
     company_id: Optional[str] = None
 
+class BulkTrackStatus(StrEnum):
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    INVALID = "INVALID"
+    ERROR = "ERROR"
+
+@dataclass
+class BulkTrackResult:
+    company_name: str
+    job_url: str
+    status: BulkTrackStatus
+    job_id: Optional[str] = None
+    error_message: Optional[str] = None
+
+@dataclass
+class DeleteTrackedJobsResult:
+    success: bool
+    deleted_count: int = 0
+    # jobs deleted per company and per url, None when the delete failed
+    companies: Optional[dict[str, int]] = None
+    jobs: Optional[dict[str, int]] = None
+
+@dataclass
+class CompanyTrackedJob:
+    company_id: str
+    company_name: str
+    tracked_job: TrackedJob
+
+@dataclass
+class TrackedJobsPage:
+    code: JobTrackingResponseCode
+    jobs: list[CompanyTrackedJob] = field(default_factory=list)
+    next_page_token: Optional[str] = None
+    error_message: Optional[str] = None
+
+@dataclass
+class PendingJobUpdate:
+    """An update of an existing job waiting in the write-behind queue"""
+    user_id: str
+    company_id: str
+    tracked_job: TrackedJob
+    # number of edits of the job merged into this update
+    coalesced: int = 1
+    error_message: Optional[str] = None
+
+class TrackedJobChangeType(StrEnum):
+    UPSERT = "UPSERT"
+    DELETE = "DELETE"
+
+@dataclass
+class TrackedJobChange:
+    change_type: TrackedJobChangeType
+    # company and job of a delete are None when the server did not keep the deleted document
+    company_name: Optional[str] = None
+    company_id: Optional[str] = None
+    job_id: Optional[str] = None
+    tracked_job: Optional[TrackedJob] = None
+
+@dataclass
+class FunnelStep:
+    state: JobApplicationState
+    reached: int
+    # share of the jobs of the previous step that reached this one, None for the first step
+    conversion: Optional[float] = None
+
+@dataclass
+class JobAnalytics:
+    code: JobTrackingResponseCode
+    total: int = 0
+    by_state: dict[str, int] = field(default_factory=dict)
+    by_company: dict[str, int] = field(default_factory=dict)
+    by_week: dict[str, int] = field(default_factory=dict)
+    funnel: list[FunnelStep] = field(default_factory=list)
+    error_message: Optional[str] = None
+
 @dataclass
 class CompanyResponse:
     code: PersistenceErrorCode
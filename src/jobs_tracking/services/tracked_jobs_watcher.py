@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import pymongo.errors as mongo_errors
+
+from jobs_tracking.repository.abstract_company_persist import AbstractCompanyPersist
+from jobs_tracking.repository.company_mongo_persist import JOB_PROJECTION
+from jobs_tracking.services.models import TrackedJob, TrackedJobChange, TrackedJobChangeType
+from repository.models import PersistenceErrorCode
+from repository.pagination import MAX_PAGE_SIZE, JobsSortOrder, encode_page_token
+
+
+class TrackedJobsWatcher:
+    """
+    Follows the writes to one user's tracked jobs, including writes of other processes
+    (the MCP server, scripts), and hands them to `on_changes` in batches.
+
+    A change stream is used when the store supports it. Otherwise the watcher polls for jobs
+    updated after the (update_time, job_id) key of the last job it has seen, and finds deleted
+    jobs by comparing the user's job ids with those of the previous poll.
+    """
+
+    POLL_INTERVAL_SECONDS = 5.0
+    RETRY_SECONDS = 5.0
+    MAX_BATCH_SIZE = 100
+
+    def __init__(self, company_persist: AbstractCompanyPersist, user_id: str,
+                 on_changes: Callable[[list[TrackedJobChange]], None], poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.company_persist = company_persist
+        self.user_id = user_id
+        self.on_changes = on_changes
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None
+
+    async def run(self):
+        try:
+            if not await self._watch_change_stream():
+                await self._poll()
+        except asyncio.CancelledError:
+            logging.info(f"Stopped watching tracked jobs of user {self.user_id}")
+            raise
+
+    async def _watch_change_stream(self) -> bool:
+        """Returns False when change streams are not available"""
+        resume_token = None
+        while True:
+            try:
+                async with self.company_persist.watch_tracked_jobs(self.user_id, resume_token) as stream:
+                    while stream.alive:
+                        changes = await self._read_batch(stream)
+                        if self.mode is None:
+                            self.mode = "change_stream"
+                            logging.info(f"Watching tracked jobs of user {self.user_id} with a change stream")
+                        resume_token = stream.resume_token
+                        self._emit(changes)
+            except mongo_errors.ConnectionFailure as e:
+                logging.warning(f"Tracked jobs change stream disconnected: {e}, resuming in {self.RETRY_SECONDS}s")
+                await asyncio.sleep(self.RETRY_SECONDS)
+            except NotImplementedError:
+                logging.info(f"{type(self.company_persist).__name__} has no change streams, polling tracked jobs "
+                             f"every {self.poll_interval}s")
+                return False
+            except mongo_errors.OperationFailure as e:
+                if self.mode is None:
+                    logging.info(f"Change streams are not available ({e}), polling tracked jobs "
+                                 f"every {self.poll_interval}s")
+                    return False
+                # e.g. the resume token fell off the oplog, changes in between are lost
+                logging.warning(f"Tracked jobs change stream failed: {e}, restarting it")
+                resume_token = None
+                await asyncio.sleep(self.RETRY_SECONDS)
+
+    async def _read_batch(self, stream) -> list[TrackedJobChange]:
+        changes = []
+        # try_next returns None once no change arrived within the stream max await time
+        while len(changes) < self.MAX_BATCH_SIZE:
+            event = await stream.try_next()
+            if event is None:
+                break
+            change = self._to_change(event)
+            if change:
+                changes.append(change)
+        return changes
+
+    def _to_change(self, event: dict) -> Optional[TrackedJobChange]:
+        operation = event.get("operationType")
+        if operation in ("insert", "update", "replace"):
+            document = event.get("fullDocument")
+            # the job was deleted before the update was looked up, its delete event follows
+            if not document:
+                return None
+            return self._upsert_change(document)
+        if operation == "delete":
+            document = event.get("fullDocumentBeforeChange")
+            if not document:
+                return TrackedJobChange(change_type=TrackedJobChangeType.DELETE)
+            return TrackedJobChange(
+                change_type=TrackedJobChangeType.DELETE,
+                company_name=document.get("company_name"),
+                company_id=document.get("company_id"),
+                job_id=document.get("job_id")
+            )
+        return None
+
+    @staticmethod
+    def _upsert_change(document: dict) -> TrackedJobChange:
+        job_document = {key: value for key, value in document.items() if key not in JOB_PROJECTION}
+        return TrackedJobChange(
+            change_type=TrackedJobChangeType.UPSERT,
+            company_name=job_document.get("company_name"),
+            company_id=job_document.get("company_id"),
+            job_id=job_document.get("job_id"),
+            tracked_job=TrackedJob.from_dict(job_document)
+        )
+
+    async def _poll(self):
+        self.mode = "polling"
+        page_token = encode_page_token({"update_time": datetime.now(timezone.utc), "job_id": ""})
+        known_jobs = await self._emit_deletes(None)
+        while True:
+            response = await self.company_persist.list_tracked_jobs(
+                self.user_id, None, JobsSortOrder.UPDATE_TIME_ASC, page_token, MAX_PAGE_SIZE)
+            if response.code != PersistenceErrorCode.SUCCESS:
+                logging.warning(f"Polling tracked jobs failed: {response.error_message}")
+            elif response.data["jobs"]:
+                jobs = response.data["jobs"]
+                page_token = encode_page_token(jobs[-1])
+                self._emit([self._upsert_change(job) for job in jobs])
+                if response.data["next_page_token"]:
+                    continue
+            known_jobs = await self._emit_deletes(known_jobs)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _emit_deletes(self, known_jobs: Optional[dict[str, dict]]) -> Optional[dict[str, dict]]:
+        """Emits the jobs of `known_jobs` that are gone. Returns the user's jobs by job_id, for the next poll"""
+        response = await self.company_persist.list_tracked_job_keys(self.user_id)
+        if response.code != PersistenceErrorCode.SUCCESS:
+            logging.warning(f"Polling tracked job ids failed: {response.error_message}")
+            return known_jobs
+        jobs = {job["job_id"]: job for job in response.data}
+        if known_jobs is not None:
+            self._emit([
+                TrackedJobChange(change_type=TrackedJobChangeType.DELETE, company_name=job.get("company_name"),
+                                 company_id=job.get("company_id"), job_id=job_id)
+                for job_id, job in known_jobs.items() if job_id not in jobs
+            ])
+        return jobs
+
+    def _emit(self, changes: list[TrackedJobChange]):
+        if not changes:
+            return
+        try:
+            self.on_changes(changes)
+        except Exception as e:
+            logging.exception(f"Error handling tracked job changes: {e}")
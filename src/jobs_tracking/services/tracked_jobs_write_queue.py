@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from jobs_tracking.repository.abstract_company_persist import AbstractCompanyPersist
+from jobs_tracking.services.models import BulkTrackStatus, PendingJobUpdate, TrackedJob
+from repository.models import PersistenceErrorCode
+
+
+@dataclass
+class WriteQueueStats:
+    pending: int
+    queued: int
+    coalesced: int
+    written: int
+    failed: int
+    flushes: int
+
+
+class TrackedJobsWriteQueue:
+    """
+    Write-behind queue of the updates of existing jobs. An update is acknowledged once it is queued
+    and written `flush_delay` seconds later, with one bulk write per user. Updates of the same job
+    within the delay are merged, the last edit wins, so rapid edits of a row cost one write.
+
+    The queue is not thread safe: enqueue and flush run on one event loop, the db loop in the application.
+    Updates that cannot be written are passed to `on_error` and dropped.
+    """
+
+    FLUSH_DELAY_SECONDS = 0.5
+    # a queue this long is written at once instead of after the delay
+    MAX_PENDING = 100
+
+    def __init__(self, company_persist: AbstractCompanyPersist, on_flushed: Callable[[str], None],
+                 on_error: Optional[Callable[[list[PendingJobUpdate]], None]] = None,
+                 flush_delay: float = FLUSH_DELAY_SECONDS, max_pending: int = MAX_PENDING):
+        self.company_persist = company_persist
+        self.on_flushed = on_flushed
+        self.on_error = on_error
+        self.flush_delay = flush_delay
+        self.max_pending = max_pending
+        self._pending: dict[tuple[str, str], PendingJobUpdate] = {}
+        self._delayed_flush: Optional[asyncio.Task] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stats = WriteQueueStats(pending=0, queued=0, coalesced=0, written=0, failed=0, flushes=0)
+
+    def enqueue(self, user_id: str, company_id: str, tracked_job: TrackedJob) -> PendingJobUpdate:
+        """Queues the update and schedules its write. Must be called on the loop of the queue"""
+        self._stats.queued += 1
+        key = (user_id, tracked_job.job_id)
+        pending = self._pending.get(key)
+        if pending:
+            pending.company_id = company_id
+            pending.tracked_job = tracked_job
+            pending.coalesced += 1
+            self._stats.coalesced += 1
+        else:
+            pending = PendingJobUpdate(user_id=user_id, company_id=company_id, tracked_job=tracked_job)
+            self._pending[key] = pending
+
+        if len(self._pending) >= self.max_pending:
+            self._start_task(self.flush())
+        elif self._delayed_flush is None or self._delayed_flush.done():
+            self._delayed_flush = self._start_task(self._flush_later())
+        return pending
+
+    def pending_jobs(self, user_id: str) -> dict[str, TrackedJob]:
+        """The queued version of the user's jobs by job_id, newer than the stored one"""
+        return {job_id: pending.tracked_job for (pending_user_id, job_id), pending in self._pending.items()
+                if pending_user_id == user_id}
+
+    def _start_task(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush()
+        except Exception as e:
+            logging.exception(f"Failed to flush the tracked jobs write queue: {e}")
+
+    async def flush(self) -> list[PendingJobUpdate]:
+        """Writes the queued updates now. Returns the updates that could not be written"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        # writes run one at a time, so a later edit of a job is never overtaken by an earlier one
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return []
+            updates_by_user: dict[str, list[PendingJobUpdate]] = {}
+            for pending in batch.values():
+                updates_by_user.setdefault(pending.user_id, []).append(pending)
+
+            failed = []
+            for user_id, updates in updates_by_user.items():
+                failed.extend(await self._write(user_id, updates))
+                self.on_flushed(user_id)
+            self._stats.flushes += 1
+            self._stats.written += len(batch) - len(failed)
+            self._stats.failed += len(failed)
+            logging.info(f"Flushed {len(batch)} tracked job updates, {len(failed)} failed")
+        if failed:
+            self._report(failed)
+        return failed
+
+    async def _write(self, user_id: str, updates: list[PendingJobUpdate]) -> list[PendingJobUpdate]:
+        response = await self.company_persist.track_existing_jobs_bulk(
+            user_id, [(pending.company_id, asdict(pending.tracked_job)) for pending in updates])
+        if response.code != PersistenceErrorCode.SUCCESS:
+            logging.error(f"Failed to write {len(updates)} tracked job updates of user {user_id}: {response.code}")
+            for pending in updates:
+                pending.error_message = response.error_message or str(response.code)
+            return updates
+
+        failed = []
+        for pending, result in zip(updates, response.data):
+            if result["status"] == BulkTrackStatus.ERROR:
+                pending.error_message = result["error_message"]
+                failed.append(pending)
+        return failed
+
+    def _report(self, failed: list[PendingJobUpdate]):
+        if not self.on_error:
+            return
+        try:
+            self.on_error(failed)
+        except Exception as e:
+            logging.exception(f"Error handling failed tracked job updates: {e}")
+
+    async def close(self) -> list[PendingJobUpdate]:
+        """Writes what is queued and waits for the writes in progress, e.g. on shutdown"""
+        failed = await self.flush()
+        # the delayed flush has nothing left to write, it would only keep the shutdown waiting
+        if self._delayed_flush is not None and self._delayed_flush is not asyncio.current_task():
+            self._delayed_flush.cancel()
+        running = [task for task in self._tasks if task is not asyncio.current_task()]
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        return failed
+
+    def stats(self) -> WriteQueueStats:
+        self._stats.pending = len(self._pending)
+        return WriteQueueStats(**asdict(self._stats))
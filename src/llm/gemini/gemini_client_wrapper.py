@@ -1,4 +1,4 @@
-import io, json, logging, mimetypes, os
+import asyncio, io, json, logging, mimetypes, os
 
 from google import genai
 from google.genai.chats import Chat
@@ -91,7 +91,8 @@ class GeminiClientWrapper:
         else:
             parts = [Part(text=prompt)]
         try:
-            response = chat.send_message(message=parts, config=config)
+            # the SDK call blocks until the whole answer is generated, keep it off the event loop
+            response = await asyncio.to_thread(chat.send_message, message=parts, config=config)
             if response:
                 return LLMResponse(response.text, LLMResponseCode.OK)
             return LLMResponse(f"Couldn't get result from gemini Api", LLMResponseCode.ERROR_USING_GEMINI_API)
@@ -1,8 +1,8 @@
 import base64, logging
 import asyncio
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional, Tuple
 
-from utils.utils import run_async_method, cancel_current_async_operation
+from utils.utils import AsyncRunner, OperationClass, run_async_method, cancel_current_async_operation
 from llm.llm_client.models import MCPResponse, MCPResponseCode
 from llm.services.llm_service import LLMService
 from llm.models import LLMApiResponse, LLMApiResponseCode
@@ -11,6 +11,11 @@ class LLMApi:
 
     def __init__(self,llm_service: LLMService):
         self.llm_service = llm_service
+        self._push_jobs: Optional[Callable[[list[dict]], None]] = None
+
+    def enable_job_streaming(self, push_jobs: Callable[[list[dict]], None]):
+        """Job searches pass the jobs they find to `push_jobs` while they run, before the final answer"""
+        self._push_jobs = push_jobs
 
     def cancel_operation(self):
         """Cancel the current LLM operation"""
@@ -18,12 +23,51 @@ class LLMApi:
   
 
     def call_llm(self, prompt: str, image_data: str, output_file_path: str, user_id:str = None) -> Dict[str, Any]:
+        error_response, decoded_data = self._decode_llm_input(prompt, image_data)
+        if error_response:
+            return error_response
+
+        try:
+            # Create and track the LLM task
+            async def llm_task():
+                return await self.llm_service.chat_with_bot(prompt, decoded_data, output_file_path, user_id, self._push_jobs)
+            
+            result: MCPResponse = run_async_method(llm_task)
+            return self._convert_mcp_response_to_api_response(result)
+        except asyncio.CancelledError:
+            logging.debug("LLM operation was cancelled")
+            resp = LLMApiResponse(error_message="Operation was cancelled", code=LLMApiResponseCode.OPERATION_CANCELLED)
+            return resp.dict()
+        except Exception as e:
+            logging.error("Unexpected error during LLM operation")
+            resp = LLMApiResponse(error_message="Error communicating with LLM", code=LLMApiResponseCode.ERROR_COMMUNICATING_WITH_LLM)
+            return resp.model_dump()
+
+    def submit_llm_call(self, prompt: str, image_data: str, output_file_path: str, user_id:str = None) -> Dict[str, Any]:
+        """Start an LLM call without blocking. Returns a handle for get_operation_result"""
+        error_response, decoded_data = self._decode_llm_input(prompt, image_data)
+        if error_response:
+            return error_response
+
+        async def llm_task():
+            result = await self.llm_service.chat_with_bot(prompt, decoded_data, output_file_path, user_id, self._push_jobs)
+            return self._convert_mcp_response_to_api_response(result)
+
+        try:
+            return {"handle": AsyncRunner.submit_operation(llm_task(), OperationClass.LLM)}
+        except Exception as e:
+            logging.exception(f"Error submitting LLM operation: {e}")
+            resp = LLMApiResponse(error_message="Error communicating with LLM", code=LLMApiResponseCode.ERROR_COMMUNICATING_WITH_LLM)
+            return resp.model_dump()
+
+    def _decode_llm_input(self, prompt: str, image_data: str) -> Tuple[Optional[Dict[str, Any]], Optional[bytes]]:
+        """Validate the prompt and decode the image. Returns (error response, decoded image data)"""
         if not prompt or not prompt.strip():
             resp = LLMApiResponse(
                 error_message="Prompt cannot be empty",
                 code=LLMApiResponseCode.ERROR_COMMUNICATING_WITH_LLM
             )
-            return resp.model_dump()
+            return resp.model_dump(), None
         
         decoded_data = None
         if image_data and image_data != '':
@@ -39,23 +83,8 @@ class LLMApi:
             except Exception as e:
                 logging.exception(f"Error processing image data: {e}")
                 resp = LLMApiResponse(error_message="Error loading image", code = LLMApiResponseCode.ERROR_LOADING_IMAGE_TO_MODEL)
-                return resp.model_dump()
-
-        try:
-            # Create and track the LLM task
-            async def llm_task():
-                return await self.llm_service.chat_with_bot(prompt, decoded_data, output_file_path, user_id)
-            
-            result: MCPResponse = run_async_method(llm_task)
-            return self._convert_mcp_response_to_api_response(result)
-        except asyncio.CancelledError:
-            logging.debug("LLM operation was cancelled")
-            resp = LLMApiResponse(error_message="Operation was cancelled", code=LLMApiResponseCode.OPERATION_CANCELLED)
-            return resp.dict()
-        except Exception as e:
-            logging.error("Unexpected error during LLM operation")
-            resp = LLMApiResponse(error_message="Error communicating with LLM", code=LLMApiResponseCode.ERROR_COMMUNICATING_WITH_LLM)
-            return resp.model_dump()
+                return resp.model_dump(), None
+        return None, decoded_data
         
     def _convert_mcp_response_to_api_response(self, result: MCPResponse) -> Dict[str, Any]:
         """Convert MCPResponse to LLMApiResponse dictionary"""
@@ -1,5 +1,5 @@
 import json, aiohttp, logging, asyncio
-
+from typing import Callable, Optional
 
 from mcp.client.streamable_http import streamable_http_client
 from mcp import ClientSession
@@ -11,6 +11,12 @@ from llm.llm_client.models import MCPResponse, MCPResponseCode
 from llm.llm_client.services.job_unifier_service import JobUnifierService
 from llm.llm_client.services.resume_refiner_service import ResumeRefinerService
 
+# Tool names are the names of the functions of llm.mcp_servers.job_applicant_mcp,
+# see tests/job_search/test_mcp_tool_names.py
+# Tools searching for jobs, their results are unified by the LLM
+JOB_SEARCH_TOOLS = ("search_jobs_on_the_internet", "stream_jobs_on_the_internet")
+# Tools with a variant that sends its results while it runs, used when the caller can show them
+STREAMING_TOOLS = {"search_jobs_on_the_internet": "stream_jobs_on_the_internet"}
 
 class SmartMCPClient:
     """An intelligent client that uses LLM to decide when to use MCP tools."""
@@ -30,7 +36,8 @@ class SmartMCPClient:
         # List of MCP tools with their name and parameters
         self.available_tools_descriptions = {}
 
-    async def process_query(self,  query: str, base64_decoded: str = None, output_file_path: str = None, user_id: str = None) -> MCPResponse:
+    async def process_query(self,  query: str, base64_decoded: str = None, output_file_path: str = None, user_id: str = None,
+                            on_jobs: Optional[Callable[[list[dict]], None]] = None) -> MCPResponse:
         """
         Process a user query using a combination of Gemini and MCP server.
 
@@ -39,6 +46,7 @@ class SmartMCPClient:
             query: The user's question or request
             base64_decoded: Base64 encoded image data (optional)
             output_file_path: Path to save output files
+            on_jobs: Called with the jobs a job search finds while it runs (optional)
         Returns:
             The response as a MCPResponse
         """
@@ -62,7 +70,7 @@ class SmartMCPClient:
                         logging.error("Error with tool selection")
                         return MCPResponse(code=MCPResponseCode.ERROR_WITH_TOOL_RESPONSE,text="Error with tool selection")
                     selected_tool,tool_args = tool_response.selected_tool, tool_response.args
-                    return await self._use_tool(selected_tool, tool_args, session, output_file_path)
+                    return await self._use_tool(selected_tool, tool_args, session, output_file_path, on_jobs)
                 elif tool_response.code == LLMToolResponseCode.MODEL_OVERLOADED:
                     return MCPResponse(tool_response.error_message, MCPResponseCode.ERROR_MODEL_OVERLOADED)
                 else:
@@ -143,9 +151,9 @@ class SmartMCPClient:
             
         message = self._init_system_prompt(query, user_id)
         
-        return self.gemini_client_wrapper.get_mcp_tool_response(prompt=message,
-                                                            chat=self.resume_chat,
-                                                            available_tools=self.available_tools_names)
+        # a blocking SDK call, run in a thread so the event loop keeps serving other calls
+        return await asyncio.to_thread(self.gemini_client_wrapper.get_mcp_tool_response, prompt=message,
+                                       chat=self.resume_chat, available_tools=self.available_tools_names)
    
     @staticmethod
     def _get_tool_and_params_using_keywords(query:str) -> LLMToolResponse:
@@ -153,7 +161,7 @@ class SmartMCPClient:
         if "resume" in query and "job" in query:
             return LLMToolResponse(code=LLMToolResponseCode.USING_TOOL, selected_tool="get_resume_files", args=None)
         if ("search" in query or "find" in query) and ("jobs" in query or "job" in query) and "internet" in query:
-            return LLMToolResponse(code=LLMToolResponseCode.USING_TOOL, selected_tool="search_jobs_from_the_internet", args=None)
+            return LLMToolResponse(code=LLMToolResponseCode.USING_TOOL, selected_tool="search_jobs_on_the_internet", args=None)
         return LLMToolResponse(code=LLMToolResponseCode.NOT_USING_TOOL, selected_tool=None, args=None)
         
          
@@ -209,10 +217,15 @@ Be selective and conservative with tool usage. Be concise. Only output valid JSO
 If no tool should be selected, respond to the query directly. Query: {query}
 """
     
-    async def _use_tool(self, selected_tool, tool_args, session: ClientSession, output_file_path: str) -> MCPResponse:
+    async def _use_tool(self, selected_tool, tool_args, session: ClientSession, output_file_path: str,
+                        on_jobs: Optional[Callable[[list[dict]], None]] = None) -> MCPResponse:
+        progress_callback = None
+        if on_jobs and selected_tool in STREAMING_TOOLS:
+            selected_tool = STREAMING_TOOLS[selected_tool]
+            progress_callback = self._jobs_progress_callback(on_jobs)
         logging.debug(f"Using tool: {selected_tool} with args: {tool_args}")
         try:
-            response = await session.call_tool(selected_tool, tool_args)
+            response = await session.call_tool(selected_tool, tool_args, progress_callback=progress_callback)
             
             if response is None:
                 return MCPResponse(f"Tool execution failed to return an answer", MCPResponseCode.ERROR_TOOL_RETURNED_NO_RESULT)
@@ -232,9 +245,26 @@ If no tool should be selected, respond to the query directly. Query: {query}
             logging.exception(f"Error using tool: {e}")
             return MCPResponse("Sorry, I couldn't execute tool.", MCPResponseCode.ERROR_COMMUNICATING_WITH_TOOL)
         
+    @staticmethod
+    def _jobs_progress_callback(on_jobs: Callable[[list[dict]], None]):
+        """Passes the jobs in the progress notifications of a streaming job search to `on_jobs`"""
+        async def on_progress(progress: float, total: float | None, message: str | None):
+            if not message:
+                return
+            try:
+                jobs = json.loads(message)
+            except json.JSONDecodeError:
+                logging.warning(f"Ignoring job search progress that is not a list of jobs: {message[:100]}")
+                return
+            try:
+                on_jobs(jobs)
+            except Exception as e:
+                logging.exception(f"Error handling {len(jobs)} streamed jobs: {e}")
+        return on_progress
+
     async def _use_tool_result(self, selected_tool, tool_result, output_file_path) -> MCPResponse:
         if selected_tool == 'get_resume_files':
             return await self.resume_refiner_service.refine_resume(tool_result, output_file_path)
-        if selected_tool == 'search_jobs_from_the_internet':
+        if selected_tool in JOB_SEARCH_TOOLS:
             return await self.job_unifier_service.get_unified_jobs()
         return MCPResponse(tool_result, MCPResponseCode.OK)
\ No newline at end of file
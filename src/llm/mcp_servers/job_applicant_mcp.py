@@ -1,10 +1,11 @@
-import asyncio, logging, multiprocessing
+import asyncio, json, logging, multiprocessing
 
 from multiprocessing import freeze_support
 from typing import List
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
+from llm.mcp_servers.job_search.models import ScrapedJob
 from llm.mcp_servers.mcp_dependency_container import MCPContainer
 from llm.mcp_servers.resume.models import ResumeData
 
@@ -29,6 +30,24 @@ async def search_jobs_on_the_internet(job_title: str | None = None, location: st
         remote = remote.lower() in ('true', '1', 'yes', 'on')
     return await job_search_service.search_jobs_from_internet(job_title, location, remote, user_id)
     
+@mcp.tool()
+async def stream_jobs_on_the_internet(ctx: Context, job_title: str | None = None, location: str | None = None,
+                                      remote: bool | str | None = None, user_id: str | None = None) -> list:
+    """Search for jobs from multiple sources (LinkedIn and Glassdoor), sending the new jobs of each
+    results page as a progress notification while the search runs. The message of a notification
+    is a JSON list of jobs, the progress is the number of jobs sent so far."""
+    global job_search_service
+    if isinstance(remote, str):
+        remote = remote.lower() in ('true', '1', 'yes', 'on')
+    sent_count = 0
+
+    async def send_jobs(jobs: List[ScrapedJob]):
+        nonlocal sent_count
+        sent_count += len(jobs)
+        await ctx.report_progress(sent_count, message=json.dumps([job.model_dump(mode='json') for job in jobs]))
+
+    return await job_search_service.search_jobs_from_internet(job_title, location, remote, user_id, on_jobs=send_jobs)
+    
 @mcp.tool()
 async def get_jobs_from_linkedin(job_title: str | None = None, location: str | None = None,
     remote: bool | str | None = None, user_id: str | None = None) -> list:
@@ -53,6 +72,23 @@ async def get_user_applications_for_company(user_id: str, company_name: str) ->
     global job_search_service
     return await job_search_service.get_user_applications_for_company(user_id, company_name)
 
+@mcp.tool()
+async def list_tracked_jobs(user_id: str, company_name: str | None = None, job_state: str | None = None,
+                            sort: str = "update_time_desc", page_token: str | None = None,
+                            page_size: int = 50) -> dict:
+    """List the user's tracked jobs across companies, one page at a time.
+    Pass the returned next_page_token to get the next page. sort is update_time_desc or update_time_asc."""
+    global job_search_service
+    job_filter = {key: value for key, value in {"company_name": company_name, "job_state": job_state}.items() if value}
+    return await job_search_service.list_tracked_jobs(user_id, job_filter, sort, page_token, page_size)
+
+@mcp.tool()
+async def get_job_analytics(user_id: str, weeks: int = 12) -> dict:
+    """Summarize the user's job search: number of tracked jobs per state, per company and per week
+    (last `weeks` weeks), and how many jobs reached each outreach step with the conversion from the previous step."""
+    global job_search_service
+    return await job_search_service.get_job_analytics(user_id, weeks)
+
 class MCPRunner:
     """Manages the MCP server subprocess"""
     
@@ -0,0 +1,142 @@
+import asyncio, logging, time
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+
+@dataclass
+class _PooledBrowser:
+    browser: Browser
+    launched_at: float
+    # contexts of running searches, the browser is closed after the last one once it is retired
+    open_contexts: int = 0
+    retired: bool = False
+
+    def age(self) -> float:
+        return time.monotonic() - self.launched_at
+
+
+class BrowserPool:
+    """
+    A Chromium browser kept running between searches, so a search only opens a new context
+    instead of launching a browser. Each search gets its own isolated context, with its own
+    cookies and storage. The browser is replaced when it disconnects or is older than
+    `max_age_seconds`, searches still using the old one finish on it.
+    Playwright objects belong to the event loop that started them, a new loop starts a new browser.
+    """
+
+    MAX_BROWSER_AGE_SECONDS = 30 * 60
+    LAUNCH_ARGS = [
+        '--no-sandbox',
+        '--disable-blink-features=AutomationControlled',
+        '--disable-dev-shm-usage',
+        '--disable-features=VizDisplayCompositor'
+    ]
+
+    def __init__(self, max_age_seconds: float = MAX_BROWSER_AGE_SECONDS, headless: bool = True):
+        self.max_age_seconds = max_age_seconds
+        self.headless = headless
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._playwright: Optional[Playwright] = None
+        self._current: Optional[_PooledBrowser] = None
+        self.launches = 0
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator[BrowserContext]:
+        """A new context of the warm browser, closed when the search ends"""
+        pooled, context = await self._open_context(context_options)
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logging.error(f"Error closing browser context: {e}", exc_info=True)
+            await self._release(pooled)
+
+    async def close(self):
+        """Close the browser and stop Playwright, the next search starts them again"""
+        if self._current is not None:
+            current, self._current = self._current, None
+            current.retired = True
+            if current.open_contexts == 0:
+                await self._close_browser(current)
+        if self._playwright is not None:
+            playwright, self._playwright = self._playwright, None
+            try:
+                await playwright.stop()
+            except Exception as e:
+                logging.error(f"Error stopping Playwright: {e}", exc_info=True)
+
+    async def _get_browser(self) -> _PooledBrowser:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # the browser of an earlier loop cannot be used or closed from this one
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._playwright = None
+            self._current = None
+        async with self._lock:
+            current = self._current
+            if current is not None and not self._is_healthy(current):
+                await self._retire(current)
+                current = None
+            if current is None:
+                current = self._current = _PooledBrowser(await self._launch(), time.monotonic())
+            return current
+
+    async def _open_context(self, context_options: dict) -> tuple[_PooledBrowser, BrowserContext]:
+        for attempt in (1, 2):
+            pooled = await self._get_browser()
+            pooled.open_contexts += 1
+            try:
+                return pooled, await pooled.browser.new_context(**context_options)
+            except Exception as e:
+                # the browser is unusable, it is replaced by a new one
+                await self._release(pooled, healthy=False)
+                if attempt == 2:
+                    raise
+                logging.warning(f"Could not open a browser context, retrying on a new browser: {e}")
+
+    def _is_healthy(self, pooled: _PooledBrowser) -> bool:
+        if not pooled.browser.is_connected():
+            logging.warning("The pooled browser disconnected, launching a new one")
+            return False
+        if pooled.age() > self.max_age_seconds:
+            logging.info(f"Recycling the pooled browser after {pooled.age():.0f} seconds")
+            return False
+        return True
+
+    async def _launch(self) -> Browser:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        start = time.perf_counter()
+        browser = await self._playwright.chromium.launch(headless=self.headless, args=self.LAUNCH_ARGS)
+        self.launches += 1
+        logging.info(f"Launched a pooled browser in {time.perf_counter() - start:.2f} seconds")
+        return browser
+
+    async def _release(self, pooled: _PooledBrowser, healthy: bool = True):
+        pooled.open_contexts -= 1
+        if not healthy and not pooled.retired:
+            await self._retire(pooled)
+        elif pooled.retired and pooled.open_contexts == 0:
+            await self._close_browser(pooled)
+
+    async def _retire(self, pooled: _PooledBrowser):
+        pooled.retired = True
+        if self._current is pooled:
+            self._current = None
+        if pooled.open_contexts == 0:
+            await self._close_browser(pooled)
+
+    @staticmethod
+    async def _close_browser(pooled: _PooledBrowser):
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logging.error(f"Error closing pooled browser: {e}", exc_info=True)
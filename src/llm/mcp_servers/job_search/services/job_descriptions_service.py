@@ -0,0 +1,159 @@
+import asyncio, logging, os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.services.job_scrapers.linkedin_jobs_scraper_service import LinkedInJobsScraperService
+from llm.mcp_servers.services.applied_jobs_index import linkedin_job_id
+
+from utils.file_utils import get_job_descriptions_cache_dir
+
+
+class JobDescriptionsService:
+    """
+    Fills in the descriptions of scraped LinkedIn jobs, whose search cards only have a placeholder.
+    Job pages are fetched by WORKERS workers through the scraper, which rate limits and retries them,
+    and every description is cached on disk by job id so it is only downloaded once across searches.
+    """
+
+    # the jobs of this source have descriptions to fetch
+    SOURCE = "linkedin"
+    WORKERS = 4
+    ENRICH_TIMEOUT_SECONDS = 120
+
+    def __init__(self, linkedin_jobs_scraper_service: LinkedInJobsScraperService, cache_dir: Optional[Path] = None):
+        self.scraper = linkedin_jobs_scraper_service
+        self.cache_dir = Path(cache_dir) if cache_dir else get_job_descriptions_cache_dir()
+
+    def start(self) -> 'JobDescriptionsSession':
+        """The description fetches of one search, whose jobs arrive in batches, e.g. page by page"""
+        return JobDescriptionsSession(self)
+
+    async def enrich_jobs(self, jobs: List[ScrapedJob], timeout: Optional[float] = None) -> int:
+        """
+        Sets the description of the jobs that lack one, from the cache or from the job page.
+        Returns the number of jobs enriched, jobs whose page fails or is not reached within
+        `timeout` seconds keep their placeholder.
+        """
+        session = self.start()
+        session.add(jobs)
+        return await session.finish(timeout)
+
+    def _needs_description(self, job: ScrapedJob) -> bool:
+        return not job.description or job.description == self.scraper.DESCRIPTION_PLACEHOLDER
+
+    @staticmethod
+    def _set_description(jobs: List[ScrapedJob], description: str) -> int:
+        for job in jobs:
+            job.description = description
+        return len(jobs)
+
+    def _cache_file(self, job_id: str) -> Path:
+        return self.cache_dir / f"{job_id}.txt"
+
+    def _read_cached(self, job_id: str) -> Optional[str]:
+        try:
+            return self._cache_file(job_id).read_text(encoding="utf-8") or None
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            logging.warning(f"Could not read the cached description of job {job_id}: {e}")
+            return None
+
+    def _write_cached(self, job_id: str, description: str):
+        cache_file = self._cache_file(job_id)
+        temp_file = cache_file.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_file.write_text(description, encoding="utf-8")
+            # readers never see a partly written description
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            logging.warning(f"Could not cache the description of job {job_id}: {e}")
+
+
+class JobDescriptionsSession:
+    """
+    One queue of job pages for a whole search, served by WORKERS workers as the pages of jobs are added.
+    A job id is fetched once, jobs with an id added again get the same description.
+    """
+
+    def __init__(self, service: JobDescriptionsService):
+        self.service = service
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        # the jobs of each id added so far, and the description of the ids already handled
+        self._jobs_by_id: Dict[str, List[ScrapedJob]] = {}
+        self._descriptions: Dict[str, Optional[str]] = {}
+        self.enriched = 0
+        self.from_cache = 0
+
+    def add(self, jobs: List[ScrapedJob]):
+        """Queues the jobs that lack a description, the workers start fetching them right away"""
+        for job in jobs:
+            job_id = linkedin_job_id(str(job.link)) if self.service._needs_description(job) and job.link else None
+            if not job_id:
+                continue
+            if job_id not in self._jobs_by_id:
+                self._jobs_by_id[job_id] = [job]
+                self._queue.put_nowait(job_id)
+            elif job_id in self._descriptions:
+                if self._descriptions[job_id]:
+                    self.enriched += self.service._set_description([job], self._descriptions[job_id])
+            else:
+                # set by the worker handling the id
+                self._jobs_by_id[job_id].append(job)
+        while len(self._workers) < min(self.service.WORKERS, len(self._jobs_by_id)):
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def finish(self, timeout: Optional[float] = None) -> int:
+        """
+        Waits for the queued jobs for up to `timeout` seconds and stops the workers.
+        Returns the number of jobs enriched, the jobs left keep their placeholder.
+        """
+        if not self._jobs_by_id:
+            return 0
+        timeout = timeout or self.service.ENRICH_TIMEOUT_SECONDS
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"Job descriptions not fetched within {timeout} seconds, {self._queue.qsize()} jobs left")
+        finally:
+            self.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        logging.info(f"Enriched {self.enriched} job descriptions, {self.from_cache} from the cache")
+        return self.enriched
+
+    def cancel(self):
+        """Stops the workers, e.g. when the search fails"""
+        for worker in self._workers:
+            worker.cancel()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._describe(job_id)
+            except Exception as e:
+                logging.error(f"Failed to fetch the description of job {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _describe(self, job_id: str):
+        description = None
+        cached = False
+        try:
+            description = await asyncio.to_thread(self.service._read_cached, job_id)
+            cached = bool(description)
+            if not cached:
+                description = await self.service.scraper.fetch_job_description(str(self._jobs_by_id[job_id][0].link))
+                if description:
+                    # a thread finishes the write even if the worker is cancelled meanwhile
+                    await asyncio.to_thread(self.service._write_cached, job_id, description)
+        finally:
+            # the jobs of the id added while it was fetched are in the list too
+            self._descriptions[job_id] = description
+            if description:
+                enriched = self.service._set_description(self._jobs_by_id[job_id], description)
+                self.enriched += enriched
+                self.from_cache += enriched if cached else 0
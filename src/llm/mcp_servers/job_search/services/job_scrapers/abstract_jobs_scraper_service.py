@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Callable, List, Optional
 from llm.mcp_servers.job_search.models import ScrapedJob
 
+# Called with the jobs of each results page as soon as the page is parsed, possibly from another thread
+PageCallback = Callable[[List[ScrapedJob]], None]
+
 
 class AbstractJobsScraperService(ABC):
 
+    # how long a search may take before its results are given up
+    SEARCH_TIMEOUT_SECONDS = 300.0
+
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -16,7 +22,8 @@ class AbstractJobsScraperService(ABC):
         
     @abstractmethod
     async def run_scraper(self, job_title: str, location: str, remote: bool = False, 
-                   forbidden_titles: List[str] = None, max_pages: int = 3) -> List[ScrapedJob]:
-        """Run the job scraper with specified parameters"""        
+                   forbidden_titles: List[str] = None, max_pages: int = 3,
+                   on_page: Optional[PageCallback] = None) -> List[ScrapedJob]:
+        """Run the job scraper with specified parameters, passing each page's jobs to `on_page` as they are found"""        
         pass
         
\ No newline at end of file
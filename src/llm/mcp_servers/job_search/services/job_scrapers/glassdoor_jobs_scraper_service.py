@@ -1,22 +1,58 @@
 import asyncio, json, random, logging
 
-from typing import List
+from typing import List, Optional
 
 from urllib.parse import urlencode
 from datetime import datetime
 
-from playwright.async_api import async_playwright
+from playwright.async_api import BrowserContext, Error as PlaywrightError, Page
 
-from llm.mcp_servers.job_search.services.job_scrapers.abstract_jobs_scraper_service import AbstractJobsScraperService
+from llm.mcp_servers.job_search.services.browser_pool import BrowserPool
+from llm.mcp_servers.job_search.services.job_scrapers.abstract_jobs_scraper_service import AbstractJobsScraperService, PageCallback
 from llm.mcp_servers.job_search.models import ScrapedJob
 from llm.mcp_servers.job_search.utils.time_parser import parse_time_expression
 
 from utils.file_utils import GLASSDOOR_SELECTORS_FILE
 
+# Applies the job_details selectors to every card in the browser, the same way _parse_job_card
+# does with locators: a boolean for 'exists', the attribute for 'href' and 'src', the inner text
+# otherwise, and null when the selector matches nothing
+EXTRACT_CARDS_SCRIPT = """
+({cardSelector, fields, maxCards}) => Array.from(document.querySelectorAll(cardSelector))
+    .slice(0, maxCards)
+    .map(card => {
+        const values = {};
+        for (const [field, config] of Object.entries(fields)) {
+            const element = card.querySelector(config.selector);
+            if (config.attribute === 'exists') {
+                values[field] = element !== null;
+            } else if (element === null) {
+                values[field] = null;
+            } else if (config.attribute === 'href' || config.attribute === 'src') {
+                values[field] = element.getAttribute(config.attribute);
+            } else {
+                values[field] = element.innerText;
+            }
+        }
+        return values;
+    })
+"""
+
 
 class GlassdoorJobsScraperService(AbstractJobsScraperService):
-    def __init__(self):
+    """
+    Scrapes Glassdoor job search with Playwright. Each search runs in its own context of the
+    browser of `browser_pool`, which stays running between searches.
+    The cards of a page are read with one page.evaluate of EXTRACT_CARDS_SCRIPT, or card by card
+    with locators when "extraction" in the selectors configuration is "per_card".
+    """
+
+    EXTRACTION_BULK = "bulk"
+    EXTRACTION_PER_CARD = "per_card"
+
+    def __init__(self, browser_pool: Optional[BrowserPool] = None):
         super().__init__()
+        self.browser_pool = browser_pool or BrowserPool()
         self.base_url = "https://www.glassdoor.com"
         self.headers['Upgrade-Insecure-Requests'] = 'keep-alive'
         
@@ -27,20 +63,29 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
                 self.selectors = json.load(f)
         except Exception as e:
             raise Exception(f"Failed to load selectors configuration: {e}") from e
+        self.extraction = self.selectors.get('extraction', self.EXTRACTION_BULK)
         
     def run_scraper_sync(self, job_title: str, location: str, remote: bool = False,
                         forbidden_titles: List[str] = None, max_pages: int = 3) -> List[ScrapedJob]:
-        return asyncio.run(self.run_scraper(
-            job_title=job_title,
-            location=location,
-            remote=remote,
-            forbidden_titles=forbidden_titles,
-            max_pages=max_pages
-        ))
+        async def run_and_close():
+            try:
+                return await self.run_scraper(
+                    job_title=job_title,
+                    location=location,
+                    remote=remote,
+                    forbidden_titles=forbidden_titles,
+                    max_pages=max_pages
+                )
+            finally:
+                # the browser cannot outlive the loop
+                await self.browser_pool.close()
+        return asyncio.run(run_and_close())
     
     async def run_scraper(self, job_title: str, location: str, remote: bool = False, forbidden_titles: List[str] = None, 
-                          max_pages: int = 3, max_jobs_per_page: int = 20) -> List[ScrapedJob]:
-        if job_title is None or location is None:
+                          max_pages: int = 3, max_jobs_per_page: int = 20,
+                          on_page: Optional[PageCallback] = None) -> List[ScrapedJob]:
+        # an empty query never launches a browser
+        if not job_title or not location:
             logging.error("Job title and location must be provided.")
             return []
         
@@ -48,59 +93,47 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
             forbidden_titles = []
 
         try:
-            await self._setup_browser()
-            jobs = await self._scrape_jobs(
-                job_title=job_title,
-                location=location, 
-                forbidden_titles=forbidden_titles,
-                max_pages=max_pages,
-                max_jobs_per_page=max_jobs_per_page
-            )
+            # a new isolated context on the warm browser, closed with the search
+            async with self.browser_pool.context(
+                user_agent=self.headers['User-Agent'],
+                viewport={'width': 1920, 'height': 1080},
+                extra_http_headers=self.headers
+            ) as context:
+                page = await self._new_page(context)
+                jobs = await self._scrape_jobs(
+                    page=page,
+                    job_title=job_title,
+                    location=location, 
+                    forbidden_titles=forbidden_titles,
+                    max_pages=max_pages,
+                    max_jobs_per_page=max_jobs_per_page,
+                    on_page=on_page
+                )
+        except PlaywrightError as ex:
+            # e.g. Chromium is not installed, the pages reported so far were passed to on_page
+            logging.exception(f"Glassdoor search failed in playwright: {ex}")
+            return []
                 
-            # Print summary
-            logging.info(f"Total jobs found: {len(jobs)}")
+        # Print summary
+        logging.info(f"Total jobs found: {len(jobs)}")
 
-            return jobs
-        finally:
-            await self._cleanup()
+        return jobs
         
-    async def _setup_browser(self):
-        """Initialize browser with stealth settings"""
-        if hasattr(self, 'browser'):
-            await self._cleanup()
-        try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--disable-features=VizDisplayCompositor'
-                ]
-            )
+    async def _new_page(self, context: BrowserContext) -> Page:
+        """A page of the search's context with stealth settings"""
+        page = await context.new_page()
         
-            self.context = await self.browser.new_context(
-                user_agent=self.headers['User-Agent'],
-                viewport={'width': 1920, 'height': 1080},
-                extra_http_headers=self.headers
-            )
-            
-            self.page = await self.context.new_page()
-            
-            # Add stealth scripts
-            await self.page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined,
-                });
-            """)
-            return True
-        except Exception as ex:
-            logging.exception(f"error setting up playwright {ex}")
-            return False
+        # Add stealth scripts
+        await page.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined,
+            });
+        """)
+        return page
 
-    async def _scrape_jobs(self, job_title: str, location: str, forbidden_titles: list[str],
-                          max_pages: int, max_jobs_per_page: int) -> List[ScrapedJob] :
+    async def _scrape_jobs(self, page: Page, job_title: str, location: str, forbidden_titles: list[str],
+                          max_pages: int, max_jobs_per_page: int,
+                          on_page: Optional[PageCallback] = None) -> List[ScrapedJob] :
         """Main scraping method"""
         logging.info(f"Starting scrape for '{job_title}' jobs in '{location}'")        
         jobs = []
@@ -108,8 +141,10 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
             logging.info(f"=== Scraping Page {page_num} ===")
             
             url = self._build_search_url(job_title, location, page_num)
-            page_jobs = await self._scrape_job_page(url, forbidden_titles, max_jobs_per_page)
+            page_jobs = await self._scrape_job_page(page, url, forbidden_titles, max_jobs_per_page)
             jobs.extend(page_jobs)
+            if on_page and page_jobs:
+                on_page(page_jobs)
             
             if len(page_jobs) == 0:
                 logging.info("No jobs found on this page, stopping...")
@@ -127,18 +162,6 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
         delay = random.uniform(min_delay, max_delay)
         await asyncio.sleep(delay)
     
-    async def _cleanup(self):
-        """Clean up browser resources"""
-        try:
-            if hasattr(self, 'context'):
-                await self.context.close()
-            if hasattr(self, 'browser'):
-                await self.browser.close()
-            if hasattr(self, 'playwright'):
-                await self.playwright.stop()
-        except Exception as e:
-            logging.error(f"Cleanup error: {e}", exc_info=True)
-    
     def _build_search_url(self, job_title: str, location: str, page):    
         """Build Glassdoor job search URL"""
         # Calculate URL path indices based on input lengths
@@ -156,11 +179,11 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
         path_component = f"SRCH_IL.{location_start},{location_end}_IN119_KO{keyword_start},{keyword_end}"
         return f"{self.base_url}/Job/{location}-{url_job_title}-jobs-{path_component}.htm?{urlencode(params)}"
          
-    async def _handle_popups(self):
+    async def _handle_popups(self, page: Page):
         """Handle common Glassdoor popups"""
         try:
             for _, selector in self.selectors['popups'].items():
-                popup_elem = self.page.locator(selector)
+                popup_elem = page.locator(selector)
                 if await popup_elem.count() > 0:
                     await popup_elem.first.click()
                     await self._random_delay(1, 2)
@@ -191,14 +214,40 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
                 else:
                     job_data[field] = False if config['attribute'] == 'exists' else "N/A"
 
-            if not self._validate_job(job_data, forbidden_titles):
-                logging.info(f"Skipping invalid job: {job_data['title']}")
-                return None
-            return self._create_scraped_job(job_data)
+            return self._job_from_data(job_data, forbidden_titles)
         
         except Exception as e:
                 logging.error(f"Error extracting job details: {e}", exc_info=True)
                 return None
+
+    def _parse_card_values(self, card_values: dict, forbidden_titles: list[str]) -> ScrapedJob | None:
+        """Build a job from the values EXTRACT_CARDS_SCRIPT read from its card"""
+        job_data = {}
+        try:
+            for field, config in self.selectors['job_details'].items():
+                value = card_values.get(field)
+                if config['attribute'] == 'exists':
+                    job_data[field] = bool(value)
+                elif value is None:
+                    job_data[field] = "N/A"
+                elif config['attribute'] == 'href':
+                    self._set_job_url(job_data, value)
+                elif config['attribute'] == 'src':
+                    job_data[field] = value or "N/A"
+                else:
+                    job_data[field] = value
+
+            return self._job_from_data(job_data, forbidden_titles)
+
+        except Exception as e:
+            logging.error(f"Error extracting job details: {e}", exc_info=True)
+            return None
+
+    def _job_from_data(self, job_data: dict, forbidden_titles: list[str]) -> ScrapedJob | None:
+        if not self._validate_job(job_data, forbidden_titles):
+            logging.info(f"Skipping invalid job: {job_data['title']}")
+            return None
+        return self._create_scraped_job(job_data)
         
     def _create_scraped_job(self, job_data: dict) -> ScrapedJob:
         """Prepare and construct ScrapedJob object from raw job data"""
@@ -215,36 +264,42 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
         )
     
     async def _extract_link(self, job_data, elem):
-        href = await elem.get_attribute('href')
+        self._set_job_url(job_data, await elem.get_attribute('href'))
+
+    def _set_job_url(self, job_data: dict, href: Optional[str]):
         if href:
             job_data['job_url'] = href if href and href.startswith('http') else f"{self.base_url}{href}"
         else:
             job_data['job_url'] = None
 
-    async def _scrape_job_page(self, url: str, forbidden_titles: list[str], max_jobs: int) -> List[ScrapedJob]:
+    async def _scrape_job_page(self, page: Page, url: str, forbidden_titles: list[str], max_jobs: int) -> List[ScrapedJob]:
         """Scrape jobs from a single page"""        
         jobs = []
         try:
             logging.debug(f"Scraping: {url}")
-            await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
             await self._random_delay(3, 5)
             
             # Handle popups
-            await self._handle_popups()
+            await self._handle_popups(page)
             
             # Wait for job container to load
             job_container_selectors = self.selectors['containers']['job_container']
             for job_container_selector in job_container_selectors:
                 try:
-                    await self.page.wait_for_selector(job_container_selector, timeout=15000)
+                    await page.wait_for_selector(job_container_selector, timeout=15000)
                     break
                 except Exception:
                     logging.debug(f"Container selector '{job_container_selector}' not found, trying next...")
                     continue
             else:
                 logging.warning("No job container selectors matched, page structure may have changed")                
+            if self.extraction == self.EXTRACTION_BULK:
+                bulk_jobs = await self._extract_jobs_bulk(page, forbidden_titles, max_jobs)
+                if bulk_jobs is not None:
+                    return bulk_jobs
             # Get all job listings on the page
-            job_elements = self.page.locator(self.selectors['containers']['job_card'])
+            job_elements = page.locator(self.selectors['containers']['job_card'])
             job_count = await job_elements.count()
             
             logging.debug(f"Found {job_count} job listings on this page")
@@ -270,6 +325,27 @@ class GlassdoorJobsScraperService(AbstractJobsScraperService):
 
         return jobs    
  
+    async def _extract_jobs_bulk(self, page: Page, forbidden_titles: list[str], max_jobs: int) -> Optional[List[ScrapedJob]]:
+        """The jobs of the page from one evaluate call, None when the script fails"""
+        try:
+            cards = await page.evaluate(EXTRACT_CARDS_SCRIPT, {
+                'cardSelector': self.selectors['containers']['job_card'],
+                'fields': self.selectors['job_details'],
+                'maxCards': max_jobs
+            })
+        except Exception as e:
+            logging.warning(f"Bulk extraction failed, reading the job cards one by one: {e}")
+            return None
+
+        logging.debug(f"Found {len(cards)} job listings on this page")
+        jobs = []
+        for card_values in cards:
+            job = self._parse_card_values(card_values, forbidden_titles)
+            if job and job.title != "N/A":
+                jobs.append(job)
+                logging.info(f"Scraped: {job.title} at {job.company}")
+        return jobs
+
     def _validate_job(self, job_data, forbidden_titles) -> bool:
         """Validate job data against forbidden titles"""
         required_fields = ['title', 'company', 'location']
@@ -1,33 +1,47 @@
-import asyncio, logging, requests, time, random
+import asyncio, logging
 
 from datetime import date, datetime
 from typing import List, Optional
 
-from bs4 import BeautifulSoup
+import aiohttp
 import urllib.parse
 
 from llm.mcp_servers.job_search.models import ScrapedJob
-from llm.mcp_servers.job_search.services.job_scrapers.abstract_jobs_scraper_service import AbstractJobsScraperService
+from llm.mcp_servers.job_search.services.job_scrapers.abstract_jobs_scraper_service import AbstractJobsScraperService, PageCallback
+from llm.mcp_servers.job_search.utils.linkedin_html import parse_job_cards, parse_job_description
+from llm.mcp_servers.job_search.utils.rate_limiter import HostRateLimiter
 
 class LinkedInJobsScraperService(AbstractJobsScraperService):
+    """
+    Scrapes the public LinkedIn job search with aiohttp. Result pages are fetched concurrently,
+    at most MAX_CONCURRENT_REQUESTS at a time and REQUESTS_PER_SECOND per host, and the HTTP
+    session is kept between searches so its connections are reused.
+    """
+
+    MAX_CONCURRENT_REQUESTS = 4
+    # on average one request every two seconds per host, with bursts of three
+    REQUESTS_PER_SECOND = 0.5
+    REQUESTS_BURST = 3
+    REQUEST_TIMEOUT_SECONDS = 30
+    RESULTS_PER_PAGE = 25
+    # job descriptions are fetched from the job pages later, the cards only have this
+    DESCRIPTION_PLACEHOLDER = "Click link to view full description"
+    DESCRIPTION_MAX_ATTEMPTS = 3
+    DESCRIPTION_RETRY_BACKOFF_SECONDS = 2.0
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
     def __init__(self):
         super().__init__()
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # the session and limiters belong to the event loop they were created on
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._rate_limiter: Optional[HostRateLimiter] = None
+        self._concurrency: Optional[asyncio.Semaphore] = None
 
     async def run_scraper(self, job_title: str, location: str = "", remote: bool = False, 
                     forbidden_titles: List[str] = None, max_pages: int = 3,
-                    job_type: str = "", experience_level: str = "") -> List[ScrapedJob]:
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None,
-                lambda: self.run_scraper_sync(job_title, location, remote, forbidden_titles, max_pages, job_type, experience_level)
-    )
-
-       
-    def run_scraper_sync(self, job_title: str, location: str = "", remote: bool = False, 
-                    forbidden_titles: List[str] = None, max_pages: int = 3,
-                    job_type: str = "", experience_level: str = "") -> List[ScrapedJob]:
+                    job_type: str = "", experience_level: str = "",
+                    on_page: Optional[PageCallback] = None) -> List[ScrapedJob]:
         """Run the LinkedIn job scraper with specified parameters
         
         Args:
@@ -38,6 +52,7 @@ class LinkedInJobsScraperService(AbstractJobsScraperService):
             max_pages: Maximum number of pages to scrape
             job_type: Job type filter (F, P, C, etc.)
             experience_level: Experience level filter (1, 2, 3, etc.)
+            on_page: Called with the jobs of each page once it is parsed
             
         Returns:
             List of Job objects
@@ -58,7 +73,38 @@ class LinkedInJobsScraperService(AbstractJobsScraperService):
         )    
         logging.debug(f"Search URL: {search_url}")
         
-        return self._scrape_job_listings(search_url=search_url, forbidden_titles=forbidden_titles, max_pages=max_pages)
+        return await self._scrape_job_listings(search_url=search_url, forbidden_titles=forbidden_titles,
+                                               max_pages=max_pages, on_page=on_page)
+
+    def run_scraper_sync(self, job_title: str, location: str = "", remote: bool = False, 
+                    forbidden_titles: List[str] = None, max_pages: int = 3,
+                    job_type: str = "", experience_level: str = "") -> List[ScrapedJob]:
+        async def run_and_close():
+            try:
+                return await self.run_scraper(job_title, location, remote, forbidden_titles, max_pages,
+                                              job_type, experience_level)
+            finally:
+                await self.close()
+        return asyncio.run(run_and_close())
+
+    async def close(self):
+        """Close the HTTP session, a later search opens a new one"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._session is None or self._session.closed:
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT_SECONDS),
+                connector=aiohttp.TCPConnector(limit_per_host=self.MAX_CONCURRENT_REQUESTS, keepalive_timeout=60)
+            )
+            self._rate_limiter = HostRateLimiter(self.REQUESTS_PER_SECOND, self.REQUESTS_BURST)
+            self._concurrency = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        return self._session
         
     def _build_search_url(self, job_title: str, location: str = "", job_type: str = "", 
                     experience_level: str = "", remote: bool = False) -> str:
@@ -99,40 +145,61 @@ class LinkedInJobsScraperService(AbstractJobsScraperService):
         
         return base_url + "?" + urllib.parse.urlencode(params)
     
-    def _scrape_job_listings(self, search_url: str, forbidden_titles: List[str], max_pages: int = 3) -> List[ScrapedJob]:
-        """Scrape job listings from LinkedIn search results"""
+    async def _scrape_job_listings(self, search_url: str, forbidden_titles: List[str], max_pages: int = 3,
+                                   on_page: Optional[PageCallback] = None) -> List[ScrapedJob]:
+        """Scrape job listings from LinkedIn search results, all pages at once"""
+        session = self._get_session()
+        pages = [asyncio.create_task(self._scrape_page(session, search_url, page, forbidden_titles, on_page))
+                 for page in range(max_pages)]
         jobs = []
-        
-        for page in range(max_pages):            
-            
-            # Add page parameter to URL
-            page_url = search_url + f"&start={page * 25}"
+        try:
+            for page, task in enumerate(pages):
+                await asyncio.wait({task})
+                page_jobs = None if task.cancelled() else task.result()
+                if page_jobs is None:
+                    # the results ended or the page failed, the later pages not fetched yet are not needed
+                    for pending in pages[page + 1:]:
+                        pending.cancel()
+                    continue
+                jobs.extend(page_jobs)
+        finally:
+            for task in pages:
+                task.cancel()
+        return jobs
 
+    async def _scrape_page(self, session: aiohttp.ClientSession, search_url: str, page: int,
+                           forbidden_titles: List[str], on_page: Optional[PageCallback]) -> Optional[List[ScrapedJob]]:
+        """The jobs of one results page, None when the page has no job cards or cannot be fetched"""
+        page_url = search_url + f"&start={page * self.RESULTS_PER_PAGE}"
+        async with self._concurrency:
+            await self._rate_limiter.acquire(page_url)
             logging.info(f"Scraping page {page_url}..")
-            soup = None
-            try:                
-                response = self.session.get(page_url, timeout=30)
-                response.raise_for_status()                
-                soup = BeautifulSoup(response.content, 'lxml')                      
-            except requests.RequestException as e:
+            try:
+                async with session.get(page_url) as response:
+                    response.raise_for_status()
+                    content = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 logging.exception(f"Error fetching job listings: {e}")
-                return jobs
-            
-            # Find job cards
-            job_cards = soup.find_all('div', class_='base-card')
-            
-            if not job_cards:
-                logging.warning("No job cards found on this page")
-                break
-            
-            for card in job_cards:
-                job = self._parse_job_card(card, forbidden_titles)
-                if job:
-                    jobs.append(job)
-            
-            # Be respectful with requests - use randomized delay
-            time.sleep(random.uniform(2, 5))          
-         
+                return None
+
+        # parsing takes tens of milliseconds a page, off the event loop
+        page_jobs = await asyncio.to_thread(self._parse_job_cards, content, forbidden_titles)
+        if page_jobs is None:
+            logging.warning("No job cards found on this page")
+            return None
+        if on_page and page_jobs:
+            on_page(page_jobs)
+        return page_jobs
+
+    def _parse_job_cards(self, content: bytes, forbidden_titles: List[str]) -> Optional[List[ScrapedJob]]:
+        job_cards = parse_job_cards(content)
+        if job_cards is None:
+            return None
+        jobs = []
+        for card in job_cards:
+            job = self._parse_job_card(card, forbidden_titles)
+            if job:
+                jobs.append(job)
         return jobs
 
     def _validate_job(self, job_data: dict) -> bool:
@@ -146,46 +213,22 @@ class LinkedInJobsScraperService(AbstractJobsScraperService):
             return False
         return True
 
-    def _parse_job_card(self, card, forbidden_titles) -> Optional[ScrapedJob]:
-        """Parse individual job card to extract job information"""
-              
-        # Create a dictionary to collect all fields first
+    def _parse_job_card(self, card: dict, forbidden_titles) -> Optional[ScrapedJob]:
+        """Build a job from the fields of its card, None when the job is forbidden or invalid"""
         job_data = {}
         try:
-            # Extract job title and link
-            title_element = card.find('h3', class_='base-search-card__title')
-            job_data['title'] = title_element.text.strip() if title_element else "N/A"
+            job_data['title'] = card.get('title', "N/A")
             if any(forbidden_title.lower() in  job_data['title'].lower() for forbidden_title in (forbidden_titles or [])):
                 logging.info(f"Skipping forbidden job title: {job_data['title']}")
                 return None
-    
-            # Extract company name
-            company_element = card.find('h4', class_='base-search-card__subtitle')
-            if not company_element:
-                company_element = card.find('a', {'data-tracking-control-name': 'public_jobs_topcard-org-name'})
-            job_data['company'] = company_element.text.strip() if company_element else "N/A"
-
-            # Extract location
-            location_element = card.find('span', class_='job-search-card__location')
-            job_data['location'] = location_element.text.strip() if location_element else "N/A"
-            
-            # Add description before creating the Job object
-            job_data['description'] = "Click link to view full description"
-                                    
-            # Add optional fields after creation
-            link_element = card.find('a', class_='base-card__full-link')
-            job_data['job_url'] = link_element['href'] if link_element and 'href' in link_element.attrs else "N/A"
- 
-
-            # Extract posted date
-            date_element = card.find('time', class_='job-search-card__listdate')
-            posted_date_str = None
-            if date_element and date_element.has_attr('datetime'):
-                posted_date_str = date_element['datetime']
-            
+            job_data['company'] = card.get('company', "N/A")
+            job_data['location'] = card.get('location', "N/A")
+            job_data['description'] = self.DESCRIPTION_PLACEHOLDER
+            job_data['link'] = card.get('link', "")
+
+            posted_date_str = card.get('posted_date')
             try:
                job_data['posted_date'] = datetime.fromisoformat(posted_date_str).date() if posted_date_str else date.today()
-          
             except (ValueError, TypeError):
                 logging.warning(f"Could not parse date '{posted_date_str}'. Using today's date.")
                 job_data['posted_date'] = date.today()
@@ -197,26 +240,46 @@ class LinkedInJobsScraperService(AbstractJobsScraperService):
                 logging.info(f"Skipping invalid job: {job_data['title']}")
                 return None
                 
-            job = ScrapedJob(**job_data)
-            return job
+            return ScrapedJob(**job_data)
             
         except Exception as e:
             logging.exception(f"Error parsing job card: {e}. Job data collected so far: {job_data}")
             return None
     
-    def _get_job_description(self, job_url: str) -> str:
+    async def fetch_job_description(self, job_url: str) -> Optional[str]:
+        """
+        The description on the job's page, None when the page has none or cannot be fetched.
+        Rate limited responses, server errors and timeouts are retried with a growing backoff.
+        """
+        session = self._get_session()
+        for attempt in range(1, self.DESCRIPTION_MAX_ATTEMPTS + 1):
+            retry_after = self.DESCRIPTION_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            async with self._concurrency:
+                await self._rate_limiter.acquire(job_url)
+                try:
+                    async with session.get(job_url) as response:
+                        if response.status not in self.RETRY_STATUSES:
+                            response.raise_for_status()
+                            content = await response.read()
+                            break
+                        retry_after = self._retry_after(response, retry_after)
+                        logging.warning(f"Fetching {job_url} returned {response.status}, attempt {attempt}")
+                except aiohttp.ClientResponseError as e:
+                    logging.error(f"Error fetching job description {job_url}: {e}")
+                    return None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logging.warning(f"Error fetching job description {job_url}: {e!r}, attempt {attempt}")
+            if attempt < self.DESCRIPTION_MAX_ATTEMPTS:
+                await asyncio.sleep(retry_after)
+        else:
+            logging.error(f"Giving up on job description {job_url} after {self.DESCRIPTION_MAX_ATTEMPTS} attempts")
+            return None
+
+        return await asyncio.to_thread(parse_job_description, content)
+
+    @staticmethod
+    def _retry_after(response: aiohttp.ClientResponse, default: float) -> float:
         try:
-            response = self.session.get(job_url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Look for job description
-            desc_element = soup.find('div', class_='show-more-less-html__markup')
-            if desc_element:
-                return desc_element.get_text(separator=' ', strip=True)
-            
-            return "Description not available"
-            
-        except Exception as e:
-            logging.error(f"Error fetching job description: {e}", exc_info=True)
-            return "Description not available"        
+            return float(response.headers.get('Retry-After', default))
+        except ValueError:
+            return default
@@ -0,0 +1,99 @@
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.utils.job_similarity import (
+    MinHasher, company_key, lsh_bands, title_shingles, title_similarity, jaccard
+)
+from llm.mcp_servers.services.applied_jobs_index import canonical_job_url
+
+# Titles of the same company at least this similar are the same job
+DEFAULT_SIMILARITY_THRESHOLD = 0.75
+MERGED_FIELDS = ("description", "link", "posted_date")
+
+
+class JobsDedupService:
+    """
+    Finds the same job scraped twice, from one site or from several, before the jobs reach the LLM.
+    Jobs are duplicates when their canonical urls are equal, or when their companies match and the
+    shingles of their titles are at least `threshold` similar. Similar titles are found with MinHash
+    signatures split into LSH bands, so a batch is deduplicated in one pass.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, num_perm: int = 64):
+        self.threshold = threshold
+        self.min_hasher = MinHasher(num_perm)
+
+    def dedupe(self, scraped_jobs: List[ScrapedJob],
+               threshold: Optional[float] = None) -> Tuple[List[ScrapedJob], List[ScrapedJob]]:
+        """
+        Returns the first occurrence of each job and the duplicates dropped. Details a duplicate has
+        and its first occurrence lacks, like the description, are copied to the first occurrence.
+        """
+        unique_jobs, duplicates = self.start(threshold).add(scraped_jobs)
+        if duplicates:
+            logging.info(f"Dropped {len(duplicates)} duplicate jobs out of {len(scraped_jobs)}")
+        return unique_jobs, duplicates
+
+    def start(self, threshold: Optional[float] = None) -> 'JobsDedupSession':
+        """A deduplication of jobs that arrive in batches, e.g. page by page"""
+        return JobsDedupSession(self.min_hasher, self.threshold if threshold is None else threshold)
+
+    def is_similar_to_any(self, job_title: str, titles: Iterable[str], threshold: Optional[float] = None) -> bool:
+        """True when one of `titles`, e.g. the applied jobs of the company, is similar to `job_title`"""
+        threshold = self.threshold if threshold is None else threshold
+        return any(title_similarity(job_title, title) >= threshold for title in titles)
+
+
+class JobsDedupSession:
+    """The jobs seen so far by canonical url and by LSH band, each batch is compared with all earlier ones"""
+
+    def __init__(self, min_hasher: MinHasher, threshold: float):
+        self.min_hasher = min_hasher
+        self.threshold = threshold
+        self.bands, self.rows = lsh_bands(min_hasher.num_perm, threshold)
+        self._by_url: dict[str, ScrapedJob] = {}
+        self._buckets: dict[tuple, list[ScrapedJob]] = {}
+
+    def add(self, scraped_jobs: List[ScrapedJob]) -> Tuple[List[ScrapedJob], List[ScrapedJob]]:
+        """Returns the jobs of the batch not seen before, and the duplicates"""
+        unique_jobs: List[ScrapedJob] = []
+        duplicates: List[ScrapedJob] = []
+        for job in scraped_jobs:
+            url = canonical_job_url(str(job.link)) if job.link else ""
+            company = company_key(job.company)
+            shingles = title_shingles(job.title)
+            signature = self.min_hasher.signature(shingles)
+            band_keys = [(company, band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+            original = self._by_url.get(url) if url else None
+            if original is None:
+                original = self._find_similar(shingles, band_keys)
+            if original is not None:
+                self._merge(original, job)
+                duplicates.append(job)
+                continue
+
+            unique_jobs.append(job)
+            if url:
+                self._by_url[url] = job
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, []).append(job)
+        return unique_jobs, duplicates
+
+    def _find_similar(self, shingles: frozenset[str], band_keys: list[tuple]) -> Optional[ScrapedJob]:
+        checked = set()
+        for band_key in band_keys:
+            for candidate in self._buckets.get(band_key, ()):
+                if id(candidate) in checked:
+                    continue
+                checked.add(id(candidate))
+                if jaccard(shingles, title_shingles(candidate.title)) >= self.threshold:
+                    return candidate
+        return None
+
+    @staticmethod
+    def _merge(original: ScrapedJob, duplicate: ScrapedJob):
+        for field in MERGED_FIELDS:
+            if getattr(original, field) is None and getattr(duplicate, field) is not None:
+                setattr(original, field, getattr(duplicate, field))
@@ -1,60 +1,46 @@
 import logging
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.services.jobs_dedup_service import JobsDedupService
 from llm.mcp_servers.services.company_mcp_service import CompanyMCPService
-from llm.mcp_servers.services.models import UserApplicationResponseCode
 
 
 class JobsFilterService:
     """Handles filtering of scraped jobs against applied jobs"""
     
-    def __init__(self, company_mcp_service: CompanyMCPService):
+    def __init__(self, company_mcp_service: CompanyMCPService, jobs_dedup_service: JobsDedupService):
         self.company_mcp_service = company_mcp_service
+        self.jobs_dedup_service = jobs_dedup_service
     
-    async def filter_jobs(self, scraped_jobs: List[ScrapedJob], user_id: str) -> Tuple[List, List]:
-        """Filter jobs that have already been applied for"""
+    async def filter_jobs(self, scraped_jobs: List[ScrapedJob], user_id: str,
+                          similarity_threshold: Optional[float] = None) -> Tuple[List, List]:
+        """
+        Filter jobs that have already been applied for: same canonical url or title, or a title
+        at least `similarity_threshold` similar to one applied for at the company
+        """
 
         if (len(scraped_jobs) == 0):
             logging.info("No jobs to filter")
             return [], []
 
-        response = await self.company_mcp_service.get_all_user_applications(user_id)
-        if response.code != UserApplicationResponseCode.SUCCESS:
-            logging.error(f"Failed to get user applications for user_id {user_id}: {response.error_message}")
+        applied_index = await self.company_mcp_service.get_applied_jobs_index(user_id)
+        if applied_index is None:
+            logging.error(f"Failed to get the applied jobs of user_id {user_id}")
             return scraped_jobs, []
         
-        tracked_companies_with_positions = response.user_applications
-        if len(tracked_companies_with_positions) == 0:
+        if len(applied_index) == 0:
             return scraped_jobs, []
         
-        company_lookup = {
-            app.company_name.strip().lower(): app 
-            for app in tracked_companies_with_positions
-        }
-
-        applied_company_names = [app.company_name.strip().lower() for app in tracked_companies_with_positions]
-        
         filtered_jobs = []
         tracked_jobs = []
         logging.info(f"iterating scraped_jobs of size: {len(scraped_jobs)}")
 
         for scraped_job in scraped_jobs:
-            scraped_company_name = scraped_job.company.strip().lower()
-            if scraped_company_name not in applied_company_names:
-                filtered_jobs.append(scraped_job)
-                continue
-
-            company_data = company_lookup.get(scraped_company_name)
-            if not company_data:
-                filtered_jobs.append(scraped_job)
-                continue
-        
-            applied_jobs = company_data.tracked_job
-            scraped_company_applied_job_urls = [job.job_url for job in applied_jobs]
-            scraped_company_applied_job_titles = [job.job_title.strip().lower() for job in applied_jobs]
-
-            if scraped_job.link in scraped_company_applied_job_urls or scraped_job.title.strip().lower() in scraped_company_applied_job_titles:
+            job_url = str(scraped_job.link) if scraped_job.link else None
+            if (applied_index.contains(scraped_job.company, job_url, scraped_job.title) or
+                    self.jobs_dedup_service.is_similar_to_any(
+                        scraped_job.title, applied_index.titles(scraped_job.company), similarity_threshold)):
                 tracked_jobs.append(scraped_job)
             else:
                 filtered_jobs.append(scraped_job)
@@ -0,0 +1,87 @@
+import random
+import re
+import zlib
+from functools import lru_cache
+from typing import Iterable, Optional
+
+# Legal suffixes that differ between sites for the same company
+COMPANY_SUFFIXES = {"ltd", "inc", "llc", "corp", "corporation", "co", "company", "gmbh", "limited", "plc", "sa", "bv"}
+# Abbreviations in titles, expanded so "Sr. Backend Dev" and "Senior Backend Developer" share their tokens
+TITLE_ABBREVIATIONS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer",
+    "dev": "developer", "mgr": "manager", "swe": "software engineer", "sw": "software",
+    "fullstack": "full stack", "backend": "back end", "frontend": "front end", "ml": "machine learning",
+}
+# Words and gender markers that carry no meaning in a title, e.g. "Developer (m/f/d)"
+TITLE_STOPWORDS = {"a", "an", "the", "and", "or", "of", "for", "to", "in", "at", "with", "m", "f", "d", "w", "x", "h"}
+
+_TOKEN = re.compile(r"[\w+#]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def company_tokens(company_name: Optional[str]) -> list[str]:
+    return [token for token in _TOKEN.findall((company_name or "").casefold()) if token not in COMPANY_SUFFIXES]
+
+
+def company_key(company_name: Optional[str]) -> str:
+    """The company name without case, punctuation or legal suffix: "ACME Ltd." and "Acme" share a key"""
+    return " ".join(company_tokens(company_name))
+
+
+@lru_cache(maxsize=4096)
+def title_tokens(job_title: Optional[str]) -> tuple[str, ...]:
+    tokens = []
+    for token in _TOKEN.findall((job_title or "").casefold()):
+        tokens.extend(TITLE_ABBREVIATIONS.get(token, token).split())
+    return tuple(token for token in tokens if token not in TITLE_STOPWORDS)
+
+
+@lru_cache(maxsize=4096)
+def title_shingles(job_title: Optional[str], size: int = 3) -> frozenset[str]:
+    """
+    The title tokens and the character shingles of each token. Tokens are shingled one by one,
+    so word order does not matter and a typo only changes a few shingles.
+    """
+    shingles = set()
+    for token in title_tokens(job_title):
+        shingles.add(token)
+        padded = f" {token} "
+        shingles.update(padded[index:index + size] for index in range(max(len(padded) - size + 1, 1)))
+    return frozenset(shingles)
+
+
+def jaccard(first: frozenset[str], second: frozenset[str]) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def title_similarity(first_title: Optional[str], second_title: Optional[str]) -> float:
+    return jaccard(title_shingles(first_title), title_shingles(second_title))
+
+
+def lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    (bands, rows) dividing a signature of `num_perm` values so that pairs around `threshold`
+    become candidates. Rounds towards more bands, candidates are verified anyway.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [option for option in options if (1 / option[0]) ** (1 / option[1]) <= threshold]
+    return max(below or options[:1], key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+
+class MinHasher:
+    """MinHash signatures of shingle sets, with `num_perm` universal hash functions over crc32"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._permutations = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                              for _ in range(num_perm)]
+
+    def signature(self, shingles: Iterable[str]) -> tuple[int, ...]:
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles]
+        if not hashes:
+            return (_MERSENNE_PRIME,) * self.num_perm
+        return tuple(min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in self._permutations)
+
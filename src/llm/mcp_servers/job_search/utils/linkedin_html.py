@@ -0,0 +1,90 @@
+import threading
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+
+# the fields of a search results card, by the tag and class of the element holding them
+CARD_FIELDS = {
+    ("h3", "base-search-card__title"): "title",
+    ("h4", "base-search-card__subtitle"): "company",
+    ("span", "job-search-card__location"): "location",
+    ("a", "base-card__full-link"): "link",
+    ("time", "job-search-card__listdate"): "posted_date",
+}
+# the company link of cards without a subtitle
+COMPANY_LINK_TRACKING = "public_jobs_topcard-org-name"
+
+_CARDS_XPATH = etree.XPath("//div[contains(concat(' ', normalize-space(@class), ' '), ' base-card ')]")
+_DESCRIPTION_XPATH = etree.XPath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' show-more-less-html__markup ')]")
+_CARD_TAGS = tuple({tag for tag, _ in CARD_FIELDS})
+
+# lxml parsers are locked while parsing, pages parsed in several threads get a parser each
+_parsers = threading.local()
+
+
+def parse_html(content: bytes) -> Optional[etree._Element]:
+    """The root of a LinkedIn page read as utf-8, None when the page is empty or cannot be parsed"""
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        # LinkedIn pages are utf-8 and do not always declare it, lxml would read them as latin-1
+        parser = _parsers.parser = lxml.html.HTMLParser(encoding="utf-8")
+    if not content or not content.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(content, parser=parser)
+    except etree.ParserError:
+        return None
+
+
+def _text(element: etree._Element) -> str:
+    return element.text_content().strip()
+
+
+def parse_job_cards(content: bytes) -> Optional[list[dict]]:
+    """
+    The fields of each job card of a search results page as strings, in one walk over each card.
+    Missing fields are absent from the card's dictionary. None when the page has no job cards.
+    """
+    root = parse_html(content)
+    cards = _CARDS_XPATH(root) if root is not None else []
+    if not cards:
+        return None
+    return [_parse_card(card) for card in cards]
+
+
+def _parse_card(card: etree._Element) -> dict:
+    fields = {}
+    company_link = None
+    for element in card.iter(_CARD_TAGS):
+        field = None
+        for class_name in (element.get("class") or "").split():
+            field = CARD_FIELDS.get((element.tag, class_name))
+            if field:
+                break
+        if field is None:
+            if company_link is None and element.tag == "a" and element.get("data-tracking-control-name") == COMPANY_LINK_TRACKING:
+                company_link = element
+            continue
+        if field in fields:
+            continue
+        if field == "link":
+            fields[field] = element.get("href")
+        elif field == "posted_date":
+            fields[field] = element.get("datetime")
+        else:
+            fields[field] = _text(element)
+    if "company" not in fields and company_link is not None:
+        fields["company"] = _text(company_link)
+    return {field: value for field, value in fields.items() if value is not None}
+
+
+def parse_job_description(content: bytes) -> Optional[str]:
+    """The text of the description on a job page, with its whitespace collapsed"""
+    root = parse_html(content)
+    description_elements = _DESCRIPTION_XPATH(root) if root is not None else []
+    if not description_elements:
+        return None
+    description = " ".join(" ".join(description_elements[0].itertext()).split())
+    return description or None
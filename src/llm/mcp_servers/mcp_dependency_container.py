@@ -4,47 +4,77 @@ from dependency_injector import providers
 from llm.mcp_servers.job_search.services.job_scrapers.glassdoor_jobs_scraper_service import GlassdoorJobsScraperService
 from llm.mcp_servers.job_search.services.job_scrapers.linkedin_jobs_scraper_service import LinkedInJobsScraperService
 from llm.mcp_servers.job_search.services.jobs_saver_service import JobsSaverService
+from llm.mcp_servers.job_search.services.browser_pool import BrowserPool
+from llm.mcp_servers.job_search.services.job_descriptions_service import JobDescriptionsService
+from llm.mcp_servers.job_search.services.jobs_dedup_service import JobsDedupService
 from llm.mcp_servers.services.job_search_service import JobSearchService
 from llm.mcp_servers.job_search.services.jobs_filter_service import JobsFilterService
 from llm.mcp_servers.resume.services.resume_loader_service import ResumeLoaderService
 from llm.mcp_servers.persistence.mcp_company_mongo_persist import MCPCompanyMongoPersist
+from llm.mcp_servers.persistence.mcp_company_sqlite_persist import MCPCompanySQLitePersist
 from llm.mcp_servers.services.company_mcp_service import CompanyMCPService
 
 from utils.dependency_container import Container
 
 class MCPContainer(Container):
     
-    # MongoDB persistence
-    mcp_mongo_company_persist = providers.Resource(
-        MCPCompanyMongoPersist,
-        connection_string=Container.config.mongo.connection_string,
-        db_name=Container.config.mongo.db_name
+    # Persistence, MongoDB or the local SQLite database
+    mcp_company_persist = providers.Selector(
+        Container.config.persistence.backend,
+        mongo=providers.Resource(
+            MCPCompanyMongoPersist,
+            connection_string=Container.config.mongo.connection_string,
+            db_name=Container.config.mongo.db_name
+        ),
+        sqlite=providers.Singleton(
+            MCPCompanySQLitePersist,
+            db_path=Container.config.sqlite.db_path
+        )
     )
     
     # Services
     resume_loader_service = providers.Factory(ResumeLoaderService)
-    linkedin_jobs_scraper_service = providers.Factory(LinkedInJobsScraperService)
-    glassdoor_jobs_scraper_service = providers.Factory(GlassdoorJobsScraperService)
+    # one instance, so the HTTP connections and the rate limit carry over between searches
+    linkedin_jobs_scraper_service = providers.Singleton(LinkedInJobsScraperService)
+    # one browser for the MCP process, kept running between Glassdoor searches
+    browser_pool = providers.Singleton(BrowserPool)
+    glassdoor_jobs_scraper_service = providers.Factory(
+        GlassdoorJobsScraperService,
+        browser_pool=browser_pool
+    )
     job_saver_service = providers.Factory(JobsSaverService)
+    jobs_dedup_service = providers.Singleton(JobsDedupService)
+    job_descriptions_service = providers.Singleton(
+        JobDescriptionsService,
+        linkedin_jobs_scraper_service=linkedin_jobs_scraper_service
+    )
 
     # Company MCP Service
     company_mcp_service = providers.Singleton(
         CompanyMCPService,
-        company_persist=mcp_mongo_company_persist
+        company_persist=mcp_company_persist
     )
     
     # Jobs Filter Service
     jobs_filter_service = providers.Factory(
         JobsFilterService,
-        company_mcp_service=company_mcp_service
+        company_mcp_service=company_mcp_service,
+        jobs_dedup_service=jobs_dedup_service
     )
     
+    # Job sources by name, a new scraper only needs an entry here
+    job_scrapers = providers.Dict(
+        linkedin=linkedin_jobs_scraper_service,
+        glassdoor=glassdoor_jobs_scraper_service
+    )
+
     job_search_service = providers.Factory(
         JobSearchService,
-        linkedin_jobs_scraper_service=linkedin_jobs_scraper_service,
-        glassdoor_jobs_scraper_service=glassdoor_jobs_scraper_service,
+        job_scrapers=job_scrapers,
         jobs_saver_service=job_saver_service,
         jobs_filter_service=jobs_filter_service,
+        jobs_dedup_service=jobs_dedup_service,
+        job_descriptions_service=job_descriptions_service,
         company_mcp_service=company_mcp_service
     )
 
@@ -54,13 +84,14 @@ class MCPContainer(Container):
      
         logging.info("Initializing MCP DI container")
         container = MCPContainer()
+        MCPContainer.configure_from_environment(container)
         
         try:
             # Initialize resources first
             container.init_resources()
             
             company_mcp_service = container.company_mcp_service()
-            # Then initialize MongoDB connection
+            # Then initialize the database connection
             await company_mcp_service.initialize()
             
             cls._container = container
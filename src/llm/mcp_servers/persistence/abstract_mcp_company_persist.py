@@ -0,0 +1,37 @@
+from abc import abstractmethod
+from typing import Optional
+
+from jobs_tracking.repository.abstract_company_persist import DEFAULT_ANALYTICS_WEEKS
+from repository.abstract_persist import AbstractPersist
+from repository.models import PersistenceResponse
+from repository.pagination import DEFAULT_PAGE_SIZE, JobsSortOrder
+
+
+class AbstractMCPCompanyPersist(AbstractPersist):
+    """Read access of the MCP tools to the tracked jobs"""
+
+    @abstractmethod
+    async def get_application(self, user_id: str, company_name: str) -> PersistenceResponse[dict]:
+        pass
+
+    @abstractmethod
+    async def get_all_applications(self, user_id: str) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None,
+                                sort: str = JobsSortOrder.UPDATE_TIME_DESC, page_token: Optional[str] = None,
+                                page_size: int = DEFAULT_PAGE_SIZE) -> PersistenceResponse[dict]:
+        pass
+
+    @abstractmethod
+    async def get_jobs_by_state(self, user_id: str, state: str) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def get_recent_jobs(self, user_id: str, limit: int = 10) -> PersistenceResponse[list[dict]]:
+        pass
+
+    @abstractmethod
+    async def get_job_analytics(self, user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> PersistenceResponse[dict]:
+        pass
@@ -1,11 +1,17 @@
 import logging
-import pymongo.errors as mongo_errors
+from typing import Optional
 
-from motor.motor_asyncio import AsyncIOMotorClient
+import pymongo.errors as mongo_errors
+from pymongo import DESCENDING
 
+from jobs_tracking.repository.abstract_company_persist import DEFAULT_ANALYTICS_WEEKS, parse_job_analytics
+from jobs_tracking.repository.company_mongo_persist import JOB_PROJECTION, company_applications_pipeline, job_analytics_pipeline
+from llm.mcp_servers.persistence.abstract_mcp_company_persist import AbstractMCPCompanyPersist
 from repository.abstract_mongo_persist import AbstractMongoPersist
 from repository.models import PersistenceErrorCode, PersistenceResponse
-class MCPCompanyMongoPersist(AbstractMongoPersist):
+from repository.motor_client_registry import MotorClientRegistry
+from repository.pagination import DEFAULT_PAGE_SIZE, JobsSortOrder, fetch_jobs_page
+class MCPCompanyMongoPersist(AbstractMongoPersist, AbstractMCPCompanyPersist):
     
     async def initialize_connection(self):
         """
@@ -13,32 +19,26 @@ class MCPCompanyMongoPersist(AbstractMongoPersist):
         """
         await super().initialize_connection()
 
-        self.job_applications = self.async_db.job_applications
+        self.tracked_jobs = self.async_db.tracked_jobs
 
     def _init_motor_client(self):
-        self.async_client = AsyncIOMotorClient(
-            self.connection_string
-        )
+        self.async_client = MotorClientRegistry.acquire(self.connection_string)
     
     async def close(self):
         """Close MongoDB connection."""
-        if self.async_client:
-            self.async_client.close()
-            self.async_client = None
-            self.async_db = None
-            self.job_applications = None
+        await super().close()
+        self.tracked_jobs = None
    
   
     async def get_application(self, user_id: str, company_name: str) -> PersistenceResponse[dict]:
-        """Get application by user and company"""
+        """Get application by user and company, as {company_name, company_id, jobs}"""
         try:
-            result = await self.job_applications.find_one({
-                "user_id": user_id,
-                "company_name": company_name.lower()
-                })
-            if result:
+            company_name = company_name.lower()
+            cursor = self.tracked_jobs.find({"user_id": user_id, "company_name": company_name}, JOB_PROJECTION)
+            jobs = await cursor.to_list(length=None)
+            if jobs:
                 return PersistenceResponse(
-                    data=result,
+                    data={"company_name": company_name, "company_id": jobs[0]["company_id"], "jobs": jobs},
                     code=PersistenceErrorCode.SUCCESS
                 )
             return PersistenceResponse(
@@ -65,9 +65,9 @@ class MCPCompanyMongoPersist(AbstractMongoPersist):
             )
     
     async def get_all_applications(self, user_id: str) -> PersistenceResponse[list[dict]]:
-        """Get all applications for a user"""
+        """Get all applications for a user, grouped by company"""
         try:
-            cursor = self.job_applications.find({"user_id": user_id})
+            cursor = self.tracked_jobs.aggregate(company_applications_pipeline(user_id))
             results = await cursor.to_list(length=None)
             return PersistenceResponse(
                 data=results,
@@ -91,6 +91,12 @@ class MCPCompanyMongoPersist(AbstractMongoPersist):
                 error_message=str(e)
             )
    
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None,
+                                sort: str = JobsSortOrder.UPDATE_TIME_DESC, page_token: Optional[str] = None,
+                                page_size: int = DEFAULT_PAGE_SIZE) -> PersistenceResponse[dict]:
+        """One page of the user's jobs as `{"jobs": [...], "next_page_token": str | None}`"""
+        return await fetch_jobs_page(self.tracked_jobs, user_id, job_filter, sort, page_token, page_size, JOB_PROJECTION)
+
     async def get_jobs(self, user_id: str, company_name: str) -> PersistenceResponse[list[dict]]:
         """Get all jobs for a company"""
         app_response = await self.get_application(user_id, company_name)
@@ -104,17 +110,9 @@ class MCPCompanyMongoPersist(AbstractMongoPersist):
     
     async def get_jobs_by_state(self, user_id: str, state: str) -> PersistenceResponse[list[dict]]:
         """Get all jobs with a specific state across all companies"""
-        pipeline = [
-            {"$match": {"user_id": user_id}},
-            {"$unwind": "$jobs"},
-            {"$match": {"jobs.state": state}},
-            {"$project": {
-                "company_name": 1,
-                "job": "$jobs"
-            }}
-        ]
         try:
-            results = await self.job_applications.aggregate(pipeline).to_list(length=None)
+            cursor = self.tracked_jobs.find({"user_id": user_id, "job_state": state}, JOB_PROJECTION)
+            results = await cursor.to_list(length=None)
             return PersistenceResponse(data=results, code=PersistenceErrorCode.SUCCESS)
         except mongo_errors.OperationFailure as e:
             logging.exception(f"MongoDB operation failed: {e}")
@@ -132,18 +130,9 @@ class MCPCompanyMongoPersist(AbstractMongoPersist):
     
     async def get_recent_jobs(self, user_id: str, limit: int = 10) -> PersistenceResponse[list[dict]]:
         """Get most recently updated jobs"""
-        pipeline = [
-            {"$match": {"user_id": user_id}},
-            {"$unwind": "$jobs"},
-            {"$sort": {"jobs.update_time": -1}},
-            {"$limit": limit},
-            {"$project": {
-                "company_name": 1,
-                "job": "$jobs"
-            }}
-        ]
         try:
-            results = await self.job_applications.aggregate(pipeline).to_list(length=None)
+            cursor = self.tracked_jobs.find({"user_id": user_id}, JOB_PROJECTION).sort("update_time", DESCENDING).limit(limit)
+            results = await cursor.to_list(length=None)
             return PersistenceResponse(data=results, code=PersistenceErrorCode.SUCCESS)
         except mongo_errors.OperationFailure as e:
             logging.exception(f"MongoDB operation failed: {e}")
@@ -160,13 +149,33 @@ class MCPCompanyMongoPersist(AbstractMongoPersist):
             return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
 
 
+    async def get_job_analytics(self, user_id: str, weeks: int = DEFAULT_ANALYTICS_WEEKS) -> PersistenceResponse[dict]:
+        """Job counts per state, company and week plus the funnel, computed in one aggregation"""
+        try:
+            cursor = self.tracked_jobs.aggregate(job_analytics_pipeline(user_id, weeks))
+            results = await cursor.to_list(length=1)
+            return PersistenceResponse(data=parse_job_analytics(results[0] if results else {}), code=PersistenceErrorCode.SUCCESS)
+        except mongo_errors.OperationFailure as e:
+            logging.exception(f"MongoDB operation failed: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message=str(e))
+        except mongo_errors.ConnectionFailure as e:
+            logging.exception(f"MongoDB connection failed: {e}")
+            return PersistenceResponse(
+                data=None,
+                code=PersistenceErrorCode.CONNECTION_ERROR,
+                error_message=f"MongoDB connection failed: {e}"
+            )
+        except Exception as e:
+            logging.exception(f"MongoDB encountered an unknown error: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
+
     async def _find_existing_application(self, user_id, company_name, job_url):
         try:
             # Check if job already exists
-            existing = await self.job_applications.find_one({
+            existing = await self.tracked_jobs.find_one({
                 "user_id": user_id,
                 "company_name": company_name,
-                "jobs.job_url": job_url
+                "job_url": job_url
             })
             return existing
         except mongo_errors.OperationFailure as e:
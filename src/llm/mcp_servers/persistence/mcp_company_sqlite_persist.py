@@ -0,0 +1,31 @@
+from jobs_tracking.repository.company_sqlite_persist import JOB_SELECT, CompanySQLitePersist, job_from_row
+from llm.mcp_servers.persistence.abstract_mcp_company_persist import AbstractMCPCompanyPersist
+from repository.models import PersistenceErrorCode, PersistenceResponse
+
+
+class MCPCompanySQLitePersist(CompanySQLitePersist, AbstractMCPCompanyPersist):
+    """Read access of the MCP server to the local database the application writes"""
+
+    async def get_application(self, user_id: str, company_name: str) -> PersistenceResponse[dict]:
+        """Get application by user and company, as {company_name, company_id, jobs}"""
+        company_name = company_name.lower()
+        try:
+            rows = await self._query(f"{JOB_SELECT} WHERE user_id = ? AND company_name = ?", (user_id, company_name))
+        except Exception as e:
+            return self._error_response(e)
+        if rows:
+            jobs = [job_from_row(row) for row in rows]
+            return PersistenceResponse(
+                data={"company_name": company_name, "company_id": jobs[0]["company_id"], "jobs": jobs},
+                code=PersistenceErrorCode.SUCCESS
+            )
+        return PersistenceResponse(data=None, code=PersistenceErrorCode.NOT_FOUND, error_message="Application not found")
+
+    async def get_jobs(self, user_id: str, company_name: str) -> PersistenceResponse[list[dict]]:
+        """Get all jobs for a company"""
+        app_response = await self.get_application(user_id, company_name)
+        if app_response.code == PersistenceErrorCode.SUCCESS and app_response.data:
+            return PersistenceResponse(data=app_response.data.get("jobs", []), code=PersistenceErrorCode.SUCCESS)
+        elif app_response.code == PersistenceErrorCode.NOT_FOUND:
+            return PersistenceResponse(data=[], code=PersistenceErrorCode.NOT_FOUND)
+        return app_response
@@ -0,0 +1,104 @@
+import re
+import time
+from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from llm.mcp_servers.job_search.utils.job_similarity import company_key
+
+# Query parameters that identify the job on its site, all other parameters are tracking noise
+JOB_ID_QUERY_PARAMS = {"jl", "jk", "gh_jid", "lever-source", "jobid", "job_id"}
+
+_LINKEDIN_JOB_URL = re.compile(r"^(?:https?://)?(?:[\w-]+\.)?linkedin\.com/jobs/view/(?:[^/?#]*?-)?(\d+)/?(?:[?#]|$)", re.IGNORECASE)
+_LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d+)/?$")
+
+
+def normalize_company(company_name: Optional[str]) -> str:
+    return company_key(company_name)
+
+
+def normalize_title(job_title: Optional[str]) -> str:
+    return " ".join((job_title or "").split()).casefold()
+
+
+def linkedin_job_id(job_url: Optional[str]) -> Optional[str]:
+    """The numeric id of a LinkedIn job url, from /jobs/view/<slug>-<id> or ?currentJobId=<id>"""
+    if not job_url:
+        return None
+    parts = urlsplit(str(job_url).strip())
+    match = _LINKEDIN_JOB_ID.search(parts.path)
+    return match.group(1) if match else dict(parse_qsl(parts.query)).get("currentJobId")
+
+
+def canonical_job_url(job_url: Optional[str]) -> str:
+    """
+    The same posting under one key: no scheme, www, fragment, trailing slash or tracking parameters.
+    LinkedIn jobs are keyed by their numeric id, so /jobs/view/<slug>-<id> and ?currentJobId=<id> match.
+    """
+    if not job_url:
+        return ""
+    job_url = str(job_url).strip()
+    # most scraped jobs, skips parsing the url
+    match = _LINKEDIN_JOB_URL.match(job_url)
+    if match:
+        return f"linkedin.com/jobs/view/{match.group(1)}"
+    parts = urlsplit(job_url)
+    host = parts.netloc.lower().removeprefix("www.")
+    query = dict(parse_qsl(parts.query))
+    if host.endswith("linkedin.com"):
+        job_id = linkedin_job_id(job_url)
+        if job_id:
+            return f"linkedin.com/jobs/view/{job_id}"
+    kept_query = urlencode(sorted((key, value) for key, value in query.items() if key.lower() in JOB_ID_QUERY_PARAMS))
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{kept_query}" if kept_query else f"{host}{path}"
+
+
+class AppliedJobsIndex:
+    """
+    The jobs a user already tracks, as normalized company -> (canonical urls, normalized titles),
+    so checking a scraped job costs two set lookups. Jobs are only added: updates of a tracked job
+    add its new url and title, deleted jobs stay until the index is rebuilt.
+    """
+
+    def __init__(self):
+        self._companies: dict[str, tuple[set[str], set[str]]] = {}
+        self.jobs_count = 0
+        # newest update_time of the indexed jobs, the next refresh reads the jobs updated since
+        self.synced_until: Optional[datetime] = None
+        self.built_at = time.monotonic()
+
+    def add(self, company_name: str, job_url: Optional[str], job_title: Optional[str],
+            update_time: Optional[datetime] = None):
+        urls, titles = self._companies.setdefault(normalize_company(company_name), (set(), set()))
+        if job_url:
+            urls.add(canonical_job_url(job_url))
+        if job_title:
+            titles.add(normalize_title(job_title))
+        self.jobs_count += 1
+        if update_time and (self.synced_until is None or update_time > self.synced_until):
+            self.synced_until = update_time
+
+    def add_job(self, job: dict):
+        """Adds a job dictionary as returned by the persistence layer"""
+        self.add(job["company_name"], job.get("job_url"), job.get("job_title"), job.get("update_time"))
+
+    def contains(self, company_name: str, job_url: Optional[str], job_title: Optional[str]) -> bool:
+        """True when the company has a tracked job with the same canonical url or the same title"""
+        company = self._companies.get(normalize_company(company_name))
+        if company is None:
+            return False
+        urls, titles = company
+        # the title is cheaper to normalize than the url
+        return (bool(job_title) and normalize_title(job_title) in titles) or (bool(job_url) and canonical_job_url(job_url) in urls)
+
+    def titles(self, company_name: str) -> set[str]:
+        """The normalized titles of the company's tracked jobs"""
+        company = self._companies.get(normalize_company(company_name))
+        return company[1] if company else set()
+
+    def age(self) -> float:
+        return time.monotonic() - self.built_at
+
+    def __len__(self) -> int:
+        return len(self._companies)
@@ -1,14 +1,24 @@
 import logging
+from datetime import timedelta
+from typing import Any, Optional
 
-from llm.mcp_servers.persistence.mcp_company_mongo_persist import MCPCompanyMongoPersist
+from llm.mcp_servers.persistence.abstract_mcp_company_persist import AbstractMCPCompanyPersist
+from llm.mcp_servers.services.applied_jobs_index import AppliedJobsIndex
 from llm.mcp_servers.services.models import UserApplicationResponse, UserApplication, UserApplicationResponseCode
 
 from repository.models import PersistenceErrorCode
+from repository.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, JobsSortOrder
 
 class CompanyMCPService:
+
+    # the applied jobs index is rebuilt after this long, which drops the jobs deleted meanwhile
+    APPLIED_INDEX_MAX_AGE_SECONDS = 3600.0
+    # a refresh reads again the jobs of this window before the last sync, for writes committed late
+    APPLIED_INDEX_REFRESH_OVERLAP = timedelta(minutes=1)
     
-    def __init__(self, company_persist: MCPCompanyMongoPersist):
+    def __init__(self, company_persist: AbstractMCPCompanyPersist):
         self.mcp_company_persist = company_persist
+        self._applied_indexes: dict[str, AppliedJobsIndex] = {}
 
     async def initialize(self):
         """
@@ -44,6 +54,50 @@ class CompanyMCPService:
                 error_message=response.error_message or "Unknown error occurred"
             )
         
+    async def get_applied_jobs_index(self, user_id: str) -> Optional[AppliedJobsIndex]:
+        """
+        Index of the jobs the user tracks, loaded once per session. Later calls add the jobs
+        written since the previous call, by any process. Returns None when the jobs cannot be read.
+        """
+        index = self._applied_indexes.get(user_id)
+        if index is None or index.age() > self.APPLIED_INDEX_MAX_AGE_SECONDS:
+            index = await self._build_applied_jobs_index(user_id)
+        elif not await self._refresh_applied_jobs_index(user_id, index):
+            return None
+        if index is not None:
+            self._applied_indexes[user_id] = index
+        return index
+
+    async def _build_applied_jobs_index(self, user_id: str) -> Optional[AppliedJobsIndex]:
+        response = await self.mcp_company_persist.get_all_applications(user_id)
+        if response.code != PersistenceErrorCode.SUCCESS:
+            logging.error(f"Failed to load the applied jobs of user {user_id}: {response.error_message}")
+            return None
+        index = AppliedJobsIndex()
+        for application in response.data:
+            for job in application["jobs"]:
+                index.add_job(job)
+        logging.info(f"Indexed {index.jobs_count} applied jobs of {len(index)} companies for user {user_id}")
+        return index
+
+    async def _refresh_applied_jobs_index(self, user_id: str, index: AppliedJobsIndex) -> bool:
+        if index.synced_until is None:
+            job_filter = None
+        else:
+            job_filter = {"updated_after": (index.synced_until - self.APPLIED_INDEX_REFRESH_OVERLAP).isoformat()}
+        page_token = None
+        while True:
+            response = await self.mcp_company_persist.list_tracked_jobs(
+                user_id, job_filter, JobsSortOrder.UPDATE_TIME_ASC, page_token, MAX_PAGE_SIZE)
+            if response.code != PersistenceErrorCode.SUCCESS:
+                logging.error(f"Failed to refresh the applied jobs of user {user_id}: {response.error_message}")
+                return False
+            for job in response.data["jobs"]:
+                index.add_job(job)
+            page_token = response.data["next_page_token"]
+            if not page_token:
+                return True
+
     async def get_user_applications_for_company(self, user_id: str, company_name: str) -> UserApplicationResponse:
         """
         Get all job applications for a specific user and company.
@@ -80,3 +134,28 @@ class CompanyMCPService:
                 user_applications=[],
                 error_message=str(e)
             )
+
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None, sort: Optional[str] = None,
+                                page_token: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> dict[str, Any]:
+        """
+        One page of the user's tracked jobs across companies, with a next_page_token for the following page.
+        """
+        response = await self.mcp_company_persist.list_tracked_jobs(
+            user_id, job_filter, sort or JobsSortOrder.UPDATE_TIME_DESC, page_token, page_size)
+        if response.code != PersistenceErrorCode.SUCCESS:
+            return {"success": False, "jobs": [], "error": response.error_message or "Unknown error occurred"}
+
+        jobs = [
+            {**job, "update_time": job["update_time"].isoformat() if job.get("update_time") else None}
+            for job in response.data["jobs"]
+        ]
+        return {"success": True, "jobs": jobs, "next_page_token": response.data["next_page_token"]}
+
+    async def get_job_analytics(self, user_id: str, weeks: int = 12) -> dict[str, Any]:
+        """
+        Job counts per state, company and week, and the conversion between outreach steps.
+        """
+        response = await self.mcp_company_persist.get_job_analytics(user_id, weeks)
+        if response.code != PersistenceErrorCode.SUCCESS:
+            return {"success": False, "error": response.error_message or "Unknown error occurred"}
+        return {"success": True, **response.data}
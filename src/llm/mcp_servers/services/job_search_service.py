@@ -1,68 +1,125 @@
-import logging
-from typing import List, Dict, Any, Optional, Tuple
+import asyncio, logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
 
-from llm.mcp_servers.job_search.services.job_scrapers.abstract_jobs_scraper_service import AbstractJobsScraperService
-from llm.mcp_servers.job_search.services.job_scrapers.glassdoor_jobs_scraper_service import GlassdoorJobsScraperService
-from llm.mcp_servers.job_search.services.job_scrapers.linkedin_jobs_scraper_service import LinkedInJobsScraperService
+from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.services.job_scrapers.abstract_jobs_scraper_service import AbstractJobsScraperService, PageCallback
+from llm.mcp_servers.job_search.services.job_descriptions_service import JobDescriptionsService, JobDescriptionsSession
+from llm.mcp_servers.job_search.services.jobs_dedup_service import JobsDedupService, JobsDedupSession
 from llm.mcp_servers.job_search.services.jobs_filter_service import JobsFilterService
 from llm.mcp_servers.job_search.services.jobs_saver_service import JobsSaverService
 from llm.mcp_servers.services.company_mcp_service import CompanyMCPService
 
 from utils.file_utils import JOB_SEARCH_CONFIG_FILE, read_json_file
 
+# Receives the new jobs of a search as they are found
+JobsCallback = Callable[[List[ScrapedJob]], Awaitable[None]]
+
+
+@dataclass
+class _SourcesSearch:
+    """The state of one search over several sources"""
+    dedup_session: JobsDedupSession
+    on_jobs: Optional[JobsCallback]
+    # fetches the descriptions of the jobs found so far, finished before the jobs are saved
+    descriptions: Optional[JobDescriptionsSession] = None
+    non_applied_jobs: Dict[str, List] = field(default_factory=dict)
+    suspected_applied_jobs: Dict[str, List] = field(default_factory=dict)
+
 
 class JobSearchService:
-    """Service class for handling job applicant MCP operations"""
+    """
+    Service class for handling job applicant MCP operations.
+    Job sources are the scrapers in `job_scrapers` by name, a new source only needs to be registered there.
+    """
     
-    def __init__(self, linkedin_jobs_scraper_service: LinkedInJobsScraperService, glassdoor_jobs_scraper_service: GlassdoorJobsScraperService,
-                 company_mcp_service: CompanyMCPService, jobs_filter_service: JobsFilterService, jobs_saver_service:JobsSaverService):
+    def __init__(self, job_scrapers: Dict[str, AbstractJobsScraperService],
+                 company_mcp_service: CompanyMCPService, jobs_filter_service: JobsFilterService, jobs_saver_service:JobsSaverService,
+                 jobs_dedup_service: JobsDedupService,
+                 job_descriptions_service: Optional[JobDescriptionsService] = None):
         self.company_mcp_service = company_mcp_service
-        self.linkedin_jobs_scraper_service = linkedin_jobs_scraper_service
-        self.glasdoor_jobs_scraper_service = glassdoor_jobs_scraper_service
+        self.job_scrapers = job_scrapers
         self.jobs_filter_service = jobs_filter_service
         self.jobs_saver_service = jobs_saver_service
+        self.jobs_dedup_service = jobs_dedup_service
+        self.job_descriptions_service = job_descriptions_service
   
 
     async def search_jobs_from_internet(self, job_title: Optional[str] = None, location: Optional[str] = None, 
-                                      remote: Optional[bool] = None, user_id: Optional[str] = None) -> List:
-        """Search for jobs from multiple sources (LinkedIn and Glassdoor)"""
-        job_title, location, remote, forbidden_titles = await self._get_search_params_from_config_or_default(
-            job_title, location, remote)
-        
-        jobs = []
-        
-        # LinkedIn jobs
-        linkedin_jobs = await self._run_scraper_with_filtering(
-            'linkedin', self.linkedin_jobs_scraper_service, job_title, location, remote, user_id, forbidden_titles)
-        if linkedin_jobs:
-            jobs.extend(linkedin_jobs)
-
-        # Glassdoor jobs
-        glassdoor_jobs = await self._run_scraper_with_filtering(
-            'glassdoor', self.glasdoor_jobs_scraper_service, job_title, location, remote, user_id, forbidden_titles)
-        if glassdoor_jobs:
-            jobs.extend(glassdoor_jobs)
-
-        return jobs
+                                      remote: Optional[bool] = None, user_id: Optional[str] = None,
+                                      on_jobs: Optional[JobsCallback] = None) -> List:
+        """Search for jobs from all sources (LinkedIn, Glassdoor...) at once"""
+        return await self.search_jobs_from_sources(list(self.job_scrapers), job_title, location, remote, user_id, on_jobs)
     
-    async def get_jobs_from_linkedin(self, job_title: Optional[str] = None, remote: Optional[bool] = None,
-                                   user_id: Optional[str] = None) -> List:
+    async def get_jobs_from_linkedin(self, job_title: Optional[str] = None, location: Optional[str] = None,
+                                     remote: Optional[bool] = None, user_id: Optional[str] = None) -> List:
         """Search for jobs on LinkedIn"""
-        job_title, location, remote, forbidden_titles = await self._get_search_params_from_config_or_default(
-            job_title, location, remote)
-        return await self._run_scraper_with_filtering(
-            'linkedin', self.linkedin_jobs_scraper_service, job_title, location, remote, user_id, forbidden_titles)
+        return await self.search_jobs_from_sources(['linkedin'], job_title, location, remote, user_id)
 
     async def get_jobs_from_glassdoor(self, job_title: Optional[str] = None, 
                                     location: Optional[str] = None, 
                                     remote: Optional[bool] = None, 
                                     user_id: Optional[str] = None) -> List:
         """Search for jobs on Glassdoor"""
-        job_title, location, remote, forbidden_titles = await self._get_search_params_from_config_or_default(
-            job_title, location, remote)
+        return await self.search_jobs_from_sources(['glassdoor'], job_title, location, remote, user_id)
+
+    async def search_jobs_from_sources(self, sources: List[str], job_title: Optional[str] = None,
+                                       location: Optional[str] = None, remote: Optional[bool] = None,
+                                       user_id: Optional[str] = None, on_jobs: Optional[JobsCallback] = None) -> List:
+        """
+        Run the scrapers of `sources` concurrently, each within its timeout, and filter out duplicate
+        and applied jobs. A source that fails or times out is logged and the jobs of the others are returned.
+        Pages are filtered as the scrapers parse them, and the new jobs of each page are passed to `on_jobs`.
+        When descriptions are enriched, the pages feed one queue of description fetches for the search,
+        jobs are queued after they are passed to `on_jobs`, and the jobs saved and returned have them.
+        """
+        job_title, location, remote, forbidden_titles, similarity_threshold, source_timeouts, enrich_descriptions = \
+            await self._get_search_params_from_config_or_default(job_title, location, remote)
+
+        unknown_sources = [source for source in sources if source not in self.job_scrapers]
+        if unknown_sources:
+            logging.error(f"Unknown job sources {unknown_sources}, known sources are {list(self.job_scrapers)}")
+        sources = [source for source in sources if source in self.job_scrapers]
+
+        # scrapers may report pages from their own threads, pages are handled here one at a time
+        loop = asyncio.get_running_loop()
+        pages: asyncio.Queue = asyncio.Queue()
+
+        def page_callback(source: str):
+            return lambda jobs: loop.call_soon_threadsafe(pages.put_nowait, (source, jobs))
+
+        scraping = asyncio.gather(*(
+            self._run_scraper(source, self.job_scrapers[source], job_title, location, remote, forbidden_titles,
+                              source_timeouts.get(source), page_callback(source))
+            for source in sources))
+        scraping.add_done_callback(lambda _: pages.put_nowait(None))
+
+        descriptions = self.job_descriptions_service.start() \
+            if enrich_descriptions and self.job_descriptions_service else None
+        search = _SourcesSearch(self.jobs_dedup_service.start(similarity_threshold), on_jobs, descriptions)
+        try:
+            while (page := await pages.get()) is not None:
+                await self._filter_page(search, *page, user_id, similarity_threshold)
+            # jobs of scrapers that do not report pages
+            for source, remaining_jobs in zip(sources, await scraping):
+                await self._filter_page(search, source, remaining_jobs, user_id, similarity_threshold)
+            if descriptions:
+                await descriptions.finish()
+        finally:
+            scraping.cancel()
+            if descriptions:
+                descriptions.cancel()
+
+        # Save filtered results, one file per source
+        await asyncio.gather(*(self._save_source_jobs(source, search.non_applied_jobs.get(source, []),
+                                                      search.suspected_applied_jobs.get(source, []))
+                               for source in sources))
 
-        return await self._run_scraper_with_filtering(
-            'glassdoor', self.glasdoor_jobs_scraper_service, job_title, location, remote, user_id, forbidden_titles)
+        non_applied_jobs = [job for source in sources for job in search.non_applied_jobs.get(source, [])]
+        suspected_count = sum(len(jobs) for jobs in search.suspected_applied_jobs.values())
+        logging.info(f"Found {len(non_applied_jobs)} new jobs and {suspected_count} suspected applied jobs from {sources}")
+        
+        return non_applied_jobs
 
     async def get_user_applications_for_company(self, user_id: str, company_name: str) -> Dict[str, Any]:
         """Get all job applications for a specific user and company"""
@@ -72,44 +129,90 @@ class JobSearchService:
             logging.error(f"Error getting user applications: {e}", exc_info=True)
             return {"success": False, "error": str(e)}
 
-    async def _run_scraper_with_filtering(self, scraper_name: str, scraper: AbstractJobsScraperService, 
-                                        job_title: str, location: str, remote: bool,
-                                        user_id: Optional[str], forbidden_titles: List[str]) -> List:
-        """Run a specific scraper and filter out applied jobs"""
-        
-        
-        # Run the scraper
-        jobs = await scraper.run_scraper(
-            job_title=job_title,
-            location=location,
-            remote=remote,
-            forbidden_titles=forbidden_titles,
-            max_pages=2
-        )
+    async def list_tracked_jobs(self, user_id: str, job_filter: Optional[dict] = None, sort: Optional[str] = None,
+                                page_token: Optional[str] = None, page_size: int = 50) -> Dict[str, Any]:
+        """Get one page of the user's tracked jobs across all companies"""
+        try:
+            return await self.company_mcp_service.list_tracked_jobs(user_id, job_filter, sort, page_token, page_size)
+        except Exception as e:
+            logging.error(f"Error listing tracked jobs: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+
+    async def get_job_analytics(self, user_id: str, weeks: int = 12) -> Dict[str, Any]:
+        """Get counts of the user's tracked jobs per state, company and week, and the funnel conversion"""
+        try:
+            return await self.company_mcp_service.get_job_analytics(user_id, weeks)
+        except Exception as e:
+            logging.error(f"Error getting job analytics: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+
+    async def _run_scraper(self, scraper_name: str, scraper: AbstractJobsScraperService, job_title: str,
+                           location: str, remote: bool, forbidden_titles: List[str],
+                           timeout: Optional[float] = None, on_page: Optional[PageCallback] = None) -> List:
+        """
+        Run a specific scraper, no jobs when it fails or takes longer than its timeout.
+        Returns the jobs that were not passed to `on_page`.
+        """
+        timeout = timeout or scraper.SEARCH_TIMEOUT_SECONDS
+        reported_job_ids = set()
+
+        def report_page(page_jobs: List):
+            reported_job_ids.update(id(job) for job in page_jobs)
+            if on_page:
+                on_page(page_jobs)
+
+        try:
+            jobs = await asyncio.wait_for(scraper.run_scraper(
+                job_title=job_title,
+                location=location,
+                remote=remote,
+                forbidden_titles=forbidden_titles,
+                max_pages=2,
+                on_page=report_page
+            ), timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"The {scraper_name} scraper did not finish within {timeout} seconds")
+            return []
+        except Exception as e:
+            logging.error(f"The {scraper_name} scraper failed: {e}", exc_info=True)
+            return []
         
         if not jobs:
             logging.warning(f"No jobs found from {scraper_name} scraper")
             return []
-        
-        # Filter applied jobs
-        non_applied_jobs, suspected_applied_jobs = await self.jobs_filter_service.filter_jobs(jobs, user_id)
-        
-        # Save filtered results
+        return [job for job in jobs if id(job) not in reported_job_ids]
+
+    async def _filter_page(self, search: '_SourcesSearch', source: str, jobs: List, user_id: Optional[str],
+                           similarity_threshold: Optional[float]):
+        """Drop the jobs seen before and filter out applied jobs"""
+        unique_jobs, _ = search.dedup_session.add(jobs)
+        if not unique_jobs:
+            return
+        non_applied_jobs, suspected_applied_jobs = await self.jobs_filter_service.filter_jobs(
+            unique_jobs, user_id, similarity_threshold)
+        search.non_applied_jobs.setdefault(source, []).extend(non_applied_jobs)
+        search.suspected_applied_jobs.setdefault(source, []).extend(suspected_applied_jobs)
+        if search.on_jobs and non_applied_jobs:
+            try:
+                await search.on_jobs(non_applied_jobs)
+            except Exception as e:
+                # the search goes on, the jobs are still returned at the end
+                logging.error(f"Failed to report {len(non_applied_jobs)} jobs from {source}: {e}", exc_info=True)
+                search.on_jobs = None
+        if search.descriptions and source == JobDescriptionsService.SOURCE and non_applied_jobs:
+            search.descriptions.add(non_applied_jobs)
+
+    async def _save_source_jobs(self, scraper_name: str, non_applied_jobs: List, suspected_applied_jobs: List):
         if non_applied_jobs:
-            await self.jobs_saver_service.save_jobs_to_file(
-                non_applied_jobs, f'non_applied_jobs_{scraper_name}.json')
-        
+            await self.jobs_saver_service.save_jobs_to_file(non_applied_jobs, f'non_applied_jobs_{scraper_name}.json')
         if suspected_applied_jobs:
             await self.jobs_saver_service.save_jobs_to_file(
                 suspected_applied_jobs, f'suspected_applied_jobs_{scraper_name}.json')
-        
-        logging.info(f"Found {len(non_applied_jobs)} new jobs and {len(suspected_applied_jobs)} suspected applied jobs from {scraper_name}")
-        
-        return non_applied_jobs
 
     async def _get_search_params_from_config_or_default(self, job_title: Optional[str] = None, 
                                                       location: Optional[str] = None,
-                                                      remote: Optional[bool] = None) -> Tuple[str, str, bool, List[str]]:
+                                                      remote: Optional[bool] = None
+                                                      ) -> Tuple[str, str, bool, List[str], Optional[float], Dict[str, float], bool]:
         """Get search parameters from config or use defaults"""
         try:
             job_search_config = await read_json_file(JOB_SEARCH_CONFIG_FILE)
@@ -130,5 +233,14 @@ class JobSearchService:
 
         # Get forbidden titles from config
         forbidden_titles = job_search_config.get('job_search', {}).get('forbidden_titles', [])
+
+        # How similar two titles of a company must be to count as the same job, None for the default
+        similarity_threshold = job_search_config.get('job_search', {}).get('similarity_threshold')
+
+        # Seconds each source may take by source name, the scraper's own timeout otherwise
+        source_timeouts = job_search_config.get('job_search', {}).get('source_timeouts', {})
+
+        # Whether to fetch the full descriptions of LinkedIn jobs, their cards only have a placeholder
+        enrich_descriptions = bool(job_search_config.get('job_search', {}).get('enrich_descriptions', False))
         
-        return job_title, location, remote, forbidden_titles
\ No newline at end of file
+        return job_title, location, remote, forbidden_titles, similarity_threshold, source_timeouts, enrich_descriptions
\ No newline at end of file
@@ -1,4 +1,5 @@
 import logging
+from typing import Callable, Optional
 
 from llm.llm_client.mcp_client import SmartMCPClient
 from llm.llm_client.models import MCPResponse, MCPResponseCode
@@ -21,7 +22,8 @@ class LLMService:
             raise
 
  
-    async def chat_with_bot(self, prompt: str, image_path: str | None, output_file_path: str | None, user_id: str) -> MCPResponse:
+    async def chat_with_bot(self, prompt: str, image_path: str | None, output_file_path: str | None, user_id: str,
+                            on_jobs: Optional[Callable[[list[dict]], None]] = None) -> MCPResponse:
         """
         Process a chat query using the MCP client.
         
@@ -30,6 +32,7 @@ class LLMService:
             image_path: Optional path to an image file
             output_file_path: Optional path for output file
             user_id: User identifier for the query
+            on_jobs: Optional callback receiving the jobs of a job search as they are found
             
         Returns:
            MCPResponse: The processed response from the MCP client
@@ -38,7 +41,7 @@ class LLMService:
             Exceptions are caught and returned as error responses rather than raised.
         """
         try:
-            return await self.mcp_client.process_query(prompt, image_path, output_file_path, user_id)
+            return await self.mcp_client.process_query(prompt, image_path, output_file_path, user_id, on_jobs)
         except Exception as e:
             logging.error(f"Error processing LLM query: {e}", exc_info=True)
             return MCPResponse("Unknown error occurred", MCPResponseCode.ERROR_COMMUNICATING_WITH_LLM)
@@ -1,7 +1,10 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 import logging
 
-class AbstractMongoPersist(ABC):
+from repository.abstract_persist import AbstractPersist
+from repository.motor_client_registry import MotorClientRegistry
+
+class AbstractMongoPersist(AbstractPersist):
     __slots__ = ('connection_string', 'db_name', 'async_client', 'async_db')
     
     def __init__(self, connection_string: str, db_name: str):  
@@ -58,6 +61,13 @@ class AbstractMongoPersist(ABC):
         self.async_client._serializable = False
         self.async_db._serializable = False
 
+    async def close(self):
+        """Releases the shared Motor client, which is closed once no persist class uses it"""
+        if self.async_client:
+            MotorClientRegistry.release(self.async_client)
+            self.async_client = None
+            self.async_db = None
+
     @abstractmethod
     def _init_motor_client(self):
         pass
\ No newline at end of file
@@ -2,9 +2,8 @@ import logging
 import asyncio
 from abc import abstractmethod
 
-from motor.motor_asyncio import AsyncIOMotorClient
-
 from repository.abstract_mongo_persist import AbstractMongoPersist
+from repository.motor_client_registry import MotorClientRegistry
 
 class AbstractOwnerMongoPersist(AbstractMongoPersist):
     """
@@ -34,10 +33,8 @@ class AbstractOwnerMongoPersist(AbstractMongoPersist):
 
         logging.info(f"Initializing {self.__class__.__name__} on loop: {id(loop)}")
 
-        self.async_client = AsyncIOMotorClient(
-            self.connection_string,
-            io_loop=loop
-        )
+        # persist classes on the same loop share one client and connection pool
+        self.async_client = MotorClientRegistry.acquire(self.connection_string, loop)
 
     @abstractmethod
     def _setup_collections(self):
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractPersist(ABC):
+    """
+    Storage independent base of the persistence classes. Services depend on the domain
+    interfaces derived from it, implemented for MongoDB and for a local SQLite database.
+    """
+
+    @abstractmethod
+    async def initialize_connection(self):
+        pass
+
+    @abstractmethod
+    async def close(self):
+        pass
@@ -0,0 +1,136 @@
+import asyncio
+import concurrent.futures
+import logging
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from repository.abstract_persist import AbstractPersist
+from repository.models import PersistenceErrorCode, PersistenceResponse
+
+T = TypeVar('T')
+
+# Tables and indexes of the local database. The indexes follow the queries of the Mongo collections:
+# jobs are read by (user_id, company_name), upserted by (user_id, job_url), updated by (user_id, job_id),
+# paged by (user_id, update_time, job_id) and counted by (user_id, job_state)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tracked_jobs (
+    user_id TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    company_id TEXT NOT NULL,
+    job_url TEXT NOT NULL,
+    job_title TEXT,
+    job_state TEXT,
+    contact_name TEXT,
+    contact_linkedin TEXT,
+    contact_email TEXT,
+    update_time TEXT NOT NULL,
+    PRIMARY KEY (user_id, job_id)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS tracked_jobs_user_url ON tracked_jobs (user_id, job_url);
+CREATE INDEX IF NOT EXISTS tracked_jobs_user_company ON tracked_jobs (user_id, company_name);
+CREATE INDEX IF NOT EXISTS tracked_jobs_user_update_time ON tracked_jobs (user_id, update_time DESC, job_id DESC);
+CREATE INDEX IF NOT EXISTS tracked_jobs_user_state ON tracked_jobs (user_id, job_state);
+"""
+
+
+def to_db_time(value: datetime) -> str:
+    """Fixed width UTC text, so times sort and compare as strings"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def from_db_time(value: str) -> datetime:
+    """Naive UTC datetime, as pymongo returns them"""
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+
+
+class AbstractSQLitePersist(AbstractPersist):
+    """
+    Base class for the persistence classes on a local SQLite database, used when no
+    MongoDB server is configured. The database runs in WAL mode, so the MCP process
+    reads while the application writes.
+
+    sqlite3 calls block, so every instance runs them on its own single thread,
+    which also serializes the use of its connection.
+    """
+
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = str(db_path)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def __repr__(self):
+        status = "connected" if self._connection is not None else "not connected"
+        return f"{self.__class__.__name__}(db_path={self.db_path!r}, status={status})"
+
+    @classmethod
+    async def create(cls, db_path: str | Path) -> "AbstractSQLitePersist":
+        """Async Factory: returns a connected instance with the schema in place"""
+        instance = cls(db_path)
+        await instance.initialize_connection()
+        return instance
+
+    async def initialize_connection(self):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.__class__.__name__)
+        self._connection = await self._run(self._connect)
+        logging.info(f"Initialized {self.__class__.__name__} on {self.db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # autocommit mode, writes that must be atomic run in an explicit transaction
+        connection = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+        connection.executescript(SCHEMA)
+        return connection
+
+    async def close(self):
+        if self._connection is not None:
+            await self._run(self._connection.close)
+            self._connection = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _query(self, sql: str, parameters: tuple | dict = ()) -> list[sqlite3.Row]:
+        return await self._run(lambda: self._connection.execute(sql, parameters).fetchall())
+
+    async def _transaction(self, function: Callable[[sqlite3.Connection], T]) -> T:
+        """Runs function(connection) in one IMMEDIATE transaction"""
+        def run_in_transaction():
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = function(self._connection)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+            return result
+        return await self._run(run_in_transaction)
+
+    @staticmethod
+    def _error_response(e: Exception) -> PersistenceResponse:
+        if isinstance(e, sqlite3.IntegrityError):
+            logging.exception(f"SQLite constraint failed: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.DUPLICATE_KEY, error_message=str(e))
+        if isinstance(e, sqlite3.OperationalError):
+            logging.exception(f"SQLite operation failed: {e}")
+            return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message=str(e))
+        logging.exception(f"SQLite encountered an unknown error: {e}")
+        return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
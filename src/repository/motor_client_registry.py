@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+
+@dataclass(frozen=True)
+class MotorPoolOptions:
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: Optional[int] = None
+    # e.g. ("zstd", "snappy", "zlib"), zstd and snappy need the pymongo[zstd,snappy] extras
+    compressors: tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls) -> "MotorPoolOptions":
+        """Reads MONGODB_MAX_POOL_SIZE, MONGODB_MIN_POOL_SIZE, MONGODB_MAX_IDLE_TIME_MS and MONGODB_COMPRESSORS"""
+        max_idle_time_ms = os.getenv('MONGODB_MAX_IDLE_TIME_MS')
+        return cls(
+            max_pool_size=int(os.getenv('MONGODB_MAX_POOL_SIZE', cls.max_pool_size)),
+            min_pool_size=int(os.getenv('MONGODB_MIN_POOL_SIZE', cls.min_pool_size)),
+            max_idle_time_ms=int(max_idle_time_ms) if max_idle_time_ms else None,
+            compressors=tuple(name.strip() for name in os.getenv('MONGODB_COMPRESSORS', '').split(',') if name.strip())
+        )
+
+    def client_kwargs(self) -> dict:
+        kwargs = {"maxPoolSize": self.max_pool_size, "minPoolSize": self.min_pool_size}
+        if self.max_idle_time_ms is not None:
+            kwargs["maxIdleTimeMS"] = self.max_idle_time_ms
+        if self.compressors:
+            kwargs["compressors"] = ",".join(self.compressors)
+        return kwargs
+
+
+@dataclass
+class PoolStats:
+    loop_id: int
+    max_pool_size: int
+    references: int
+    open_connections: int = 0
+    checked_out: int = 0
+    max_checked_out: int = 0
+    checkouts: int = 0
+    checkout_failures: int = 0
+    total_checkout_wait: float = 0.0
+    pool_clears: int = 0
+
+    @property
+    def avg_checkout_wait_ms(self) -> float:
+        return self.total_checkout_wait * 1000 / self.checkouts if self.checkouts else 0.0
+
+
+class _PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts the connection pool events of one client. Called from the pymongo threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_checkout_wait = 0.0
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            self.total_checkout_wait += getattr(event, "duration", 0.0) or 0.0
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+
+@dataclass
+class _ClientEntry:
+    client: AsyncIOMotorClient
+    loop: asyncio.AbstractEventLoop
+    options: MotorPoolOptions
+    listener: _PoolStatsListener
+    references: int = 0
+
+
+class MotorClientRegistry:
+    """
+    One AsyncIOMotorClient per (connection string, event loop), shared by the persistence classes.
+
+    A Motor client is bound to the loop it runs on, so persist classes created on the same
+    loop share a client, its connection pool and its monitoring threads. The client is
+    closed when the last persist class releases it.
+    """
+
+    _clients: dict[tuple[str, int], _ClientEntry] = {}
+    _lock = threading.Lock()
+    _options: Optional[MotorPoolOptions] = None
+
+    @classmethod
+    def configure(cls, options: Optional[MotorPoolOptions]):
+        """Pool options of the clients created from now on. Defaults to MotorPoolOptions.from_env()"""
+        with cls._lock:
+            cls._options = options
+
+    @classmethod
+    def acquire(cls, connection_string: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> AsyncIOMotorClient:
+        """Returns the shared client of this loop (the running loop by default), creating it on first use"""
+        loop = loop or asyncio.get_running_loop()
+        key = (connection_string, id(loop))
+        with cls._lock:
+            entry = cls._clients.get(key)
+            if entry is None or entry.loop is not loop or entry.loop.is_closed():
+                options = cls._options or MotorPoolOptions.from_env()
+                listener = _PoolStatsListener()
+                client = AsyncIOMotorClient(connection_string, io_loop=loop, event_listeners=[listener],
+                                            **options.client_kwargs())
+                # disable processing of pywebview of the motor objects, which are not serializable
+                client._serializable = False
+                entry = _ClientEntry(client=client, loop=loop, options=options, listener=listener)
+                cls._clients[key] = entry
+                logging.info(f"Created Motor client on loop {id(loop)} with {options}")
+            entry.references += 1
+            return entry.client
+
+    @classmethod
+    def release(cls, client: AsyncIOMotorClient):
+        """Drops one reference to the client and closes it when nobody uses it anymore"""
+        with cls._lock:
+            for key, entry in cls._clients.items():
+                if entry.client is client:
+                    entry.references -= 1
+                    if entry.references > 0:
+                        return
+                    del cls._clients[key]
+                    break
+            else:
+                return
+        client.close()
+        logging.info(f"Closed Motor client on loop {key[1]}")
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            entries = list(cls._clients.values())
+            cls._clients.clear()
+        for entry in entries:
+            entry.client.close()
+        if entries:
+            logging.info(f"Closed {len(entries)} Motor clients")
+
+    @classmethod
+    def get_pool_stats(cls) -> list[PoolStats]:
+        with cls._lock:
+            entries = list(cls._clients.values())
+        stats = []
+        for entry in entries:
+            listener = entry.listener
+            with listener._lock:
+                stats.append(PoolStats(
+                    loop_id=id(entry.loop),
+                    max_pool_size=entry.options.max_pool_size,
+                    references=entry.references,
+                    open_connections=listener.open_connections,
+                    checked_out=listener.checked_out,
+                    max_checked_out=listener.max_checked_out,
+                    checkouts=listener.checkouts,
+                    checkout_failures=listener.checkout_failures,
+                    total_checkout_wait=listener.total_checkout_wait,
+                    pool_clears=listener.pool_clears
+                ))
+        return stats
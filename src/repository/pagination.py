@@ -0,0 +1,120 @@
+import base64
+import json
+import logging
+from datetime import datetime
+from enum import StrEnum
+from typing import Optional
+
+import pymongo.errors as mongo_errors
+from pymongo import ASCENDING, DESCENDING
+
+from repository.models import PersistenceErrorCode, PersistenceResponse
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Filter keys accepted by list_tracked_jobs, values are matched exactly
+EXACT_FILTER_FIELDS = ("company_name", "job_state")
+
+
+class JobsSortOrder(StrEnum):
+    UPDATE_TIME_DESC = "update_time_desc"
+    UPDATE_TIME_ASC = "update_time_asc"
+
+
+def encode_page_token(job: dict) -> str:
+    """Opaque token holding the (update_time, job_id) key of the last job of a page"""
+    key = {"update_time": job["update_time"].isoformat(), "job_id": job["job_id"]}
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_page_token(page_token: str) -> tuple[datetime, str]:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(page_token.encode()))
+        return datetime.fromisoformat(key["update_time"]), key["job_id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {e}") from e
+
+
+def validate_job_filter(job_filter: Optional[dict]) -> dict:
+    """Raises ValueError for an unknown filter key"""
+    job_filter = job_filter or {}
+    unknown_keys = set(job_filter) - set(EXACT_FILTER_FIELDS) - {"updated_after", "updated_before"}
+    if unknown_keys:
+        raise ValueError(f"Unsupported filter keys: {sorted(unknown_keys)}")
+    return job_filter
+
+
+def build_jobs_page_query(user_id: str, job_filter: Optional[dict], sort: JobsSortOrder,
+                          page_token: Optional[str]) -> tuple[dict, list[tuple]]:
+    """
+    Query and sort for one page of a user's jobs. Pages are keyed on (update_time, job_id),
+    so a page starts right after the last job of the previous one, without skip().
+    Raises ValueError for an unknown filter key or a bad page token.
+    """
+    job_filter = validate_job_filter(job_filter)
+    conditions: list[dict] = [{"user_id": user_id}]
+    for field in EXACT_FILTER_FIELDS:
+        if job_filter.get(field):
+            value = job_filter[field]
+            conditions.append({field: value.lower() if field == "company_name" else value})
+    update_time_range = {}
+    if job_filter.get("updated_after"):
+        update_time_range["$gte"] = datetime.fromisoformat(job_filter["updated_after"])
+    if job_filter.get("updated_before"):
+        update_time_range["$lt"] = datetime.fromisoformat(job_filter["updated_before"])
+    if update_time_range:
+        conditions.append({"update_time": update_time_range})
+
+    descending = sort == JobsSortOrder.UPDATE_TIME_DESC
+    if page_token:
+        update_time, job_id = decode_page_token(page_token)
+        operator = "$lt" if descending else "$gt"
+        conditions.append({"$or": [
+            {"update_time": {operator: update_time}},
+            {"update_time": update_time, "job_id": {operator: job_id}}
+        ]})
+
+    direction = DESCENDING if descending else ASCENDING
+    query = conditions[0] if len(conditions) == 1 else {"$and": conditions}
+    return query, [("update_time", direction), ("job_id", direction)]
+
+
+async def fetch_jobs_page(collection, user_id: str, job_filter: Optional[dict], sort: str,
+                          page_token: Optional[str], page_size: int, projection: dict) -> PersistenceResponse[dict]:
+    """
+    Reads one page of a user's job documents.
+
+    Returns:
+        A PersistenceResponse with `{"jobs": [...], "next_page_token": str | None}`.
+    """
+    try:
+        sort_order = JobsSortOrder(sort or JobsSortOrder.UPDATE_TIME_DESC)
+        page_size = min(max(1, page_size or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)
+        query, sort_spec = build_jobs_page_query(user_id, job_filter, sort_order, page_token)
+    except ValueError as e:
+        logging.error(f"Invalid jobs page request: {e}")
+        return PersistenceResponse(data=None, code=PersistenceErrorCode.VALIDATION_ERROR, error_message=str(e))
+
+    try:
+        # one extra job tells whether there is a next page
+        cursor = collection.find(query, projection).sort(sort_spec).limit(page_size + 1)
+        jobs = await cursor.to_list(length=page_size + 1)
+        next_page_token = encode_page_token(jobs[page_size - 1]) if len(jobs) > page_size else None
+        return PersistenceResponse(
+            data={"jobs": jobs[:page_size], "next_page_token": next_page_token},
+            code=PersistenceErrorCode.SUCCESS
+        )
+    except mongo_errors.OperationFailure as e:
+        logging.exception(f"MongoDB operation failed: {e}")
+        return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message=str(e))
+    except mongo_errors.ConnectionFailure as e:
+        logging.exception(f"MongoDB connection failed: {e}")
+        return PersistenceResponse(
+            data=None,
+            code=PersistenceErrorCode.CONNECTION_ERROR,
+            error_message=f"MongoDB connection failed: {e}"
+        )
+    except Exception as e:
+        logging.exception(f"MongoDB encountered an unknown error: {e}")
+        return PersistenceResponse(data=None, code=PersistenceErrorCode.UNKNOWN_ERROR, error_message=str(e))
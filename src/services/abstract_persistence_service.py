@@ -1,9 +1,9 @@
-from repository.abstract_mongo_persist import AbstractMongoPersist
+from repository.abstract_persist import AbstractPersist
 
 
 class AbstractPersistenceService:
 
-    def __init__(self, abstractMongoPersist:AbstractMongoPersist):
+    def __init__(self, abstractMongoPersist:AbstractPersist):
         self.abstractMongoPersist = abstractMongoPersist
         
     
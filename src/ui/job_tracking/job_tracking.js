@@ -39,6 +39,20 @@ async function initJobTracking() {
         }
     });
 
+    const importJobsBtn = document.getElementById('import-jobs-btn');
+    if (importJobsBtn) {
+        importJobsBtn.addEventListener('click', async () => {
+            await importJobsFile();
+        });
+    }
+
+    const jobAnalyticsBtn = document.getElementById('job-analytics-btn');
+    if (jobAnalyticsBtn) {
+        jobAnalyticsBtn.addEventListener('click', async () => {
+            await showJobAnalytics();
+        });
+    }
+
     // Add bulk delete functionality
     const bulkDeleteBtn = document.getElementById('bulk-delete-btn');
     if (bulkDeleteBtn) {
@@ -46,6 +60,13 @@ async function initJobTracking() {
             await bulkDeleteSelectedRows();
         });
     }
+
+    // Jobs changed by other processes (MCP tools, scripts) are pushed by applyTrackedJobChanges
+    try {
+        await window.pywebview.api.start_job_updates(window.userId);
+    } catch (error) {
+        console.error('Error starting job updates:', error);
+    }
 }
 
 async function trackJob(rowData, isFromBlankRow = false, rowElement = null) {
@@ -90,20 +111,22 @@ async function trackJob(rowData, isFromBlankRow = false, rowElement = null) {
     }
 
     try {
-        let jobTrackingResponse;
+        let submission;
         if (rowData.job_id) {
-            jobTrackingResponse = await window.pywebview.api.track_existing_job(
+            submission = await window.pywebview.api.submit_track_existing_job(
                 userId,
                 rowData.company_id,
                 jobDto
             );
         } else {
-            jobTrackingResponse = await window.pywebview.api.track_new_job(
+            submission = await window.pywebview.api.submit_track_new_job(
                 userId,
                 rowData.company_name,
                 jobDto
             );
         }
+        const operation = await runOperation(submission);
+        const jobTrackingResponse = operation?.result;
 
         if (jobTrackingResponse && jobTrackingResponse.code === 'OK') {
             showAlert('Job application tracked successfully!', 'success');
@@ -146,7 +169,9 @@ async function viewJobApplications(companyName) {
     }
 
     try {
-        const response = await window.pywebview.api.get_tracked_jobs(userId, companyName);
+        const submission = await window.pywebview.api.submit_get_tracked_jobs(userId, companyName);
+        const operation = await runOperation(submission);
+        const response = operation?.result;
         if (response && response.company) {
             displayJobsTable(response.company);
         } else {
@@ -290,6 +315,11 @@ function addJobToTable(job, companyName, companyId) {
 }
 
 function updateRow(row, job) {
+    if (row.classList.contains('write-failed')) {
+        row.classList.remove('write-failed');
+        row.removeAttribute('title');
+    }
+
     const jobTitleDiv = row.querySelector('.job-title');
     if (jobTitleDiv) jobTitleDiv.textContent = job.job_title || '';
 
@@ -495,9 +525,106 @@ async function bulkDeleteSelectedRows() {
         if (response?.success) {
             checkboxes.forEach(cb => cb.closest('tr').remove());
             updateBulkDeleteVisibility();
-            showAlert('Deleted successfully', 'success');
+            showAlert(`Deleted ${response.deleted_count} jobs successfully`, 'success');
+        }
+    } catch (error) {
+        console.error(error);
+    }
+}
+
+async function importJobsFile() {
+    const userId = window.userId;
+    if (!userId) {
+        showAlert('Please login first.', 'warning');
+        return;
+    }
+
+    const filePath = await window.pywebview.api.select_import_file();
+    if (!filePath) return;
+
+    try {
+        const response = await window.pywebview.api.import_jobs_file(userId, filePath);
+        if (response?.code === 'OK') {
+            const type = response.failed > 0 ? 'warning' : 'success';
+            showAlert(`Imported ${response.total} jobs: ${response.created} new, ${response.updated} updated, ${response.failed} failed`, type);
+            response.errors?.forEach(error => console.warn('Import failed for', error.job_url, error.error_message));
+        } else {
+            showAlert(response?.error || 'Failed to import jobs.', 'error');
         }
     } catch (error) {
         console.error(error);
+        showAlert('Failed to import jobs.', 'error');
     }
-}
\ No newline at end of file
+}
+
+async function showJobAnalytics() {
+    const userId = window.userId;
+    if (!userId) {
+        showAlert('Please login first.', 'warning');
+        return;
+    }
+
+    const analyticsDiv = document.getElementById('job-analytics');
+    try {
+        const response = await window.pywebview.api.get_job_analytics(userId, 12);
+        if (response?.code !== 'OK') {
+            showAlert(response?.error_message || response?.error || 'Failed to load job stats.', 'error');
+            return;
+        }
+        const states = Object.entries(response.by_state)
+            .map(([state, count]) => `${getStateLabel(state)}: ${count}`).join(', ');
+        const funnel = response.funnel
+            .map(step => `${getStateLabel(step.state)} ${step.reached}` +
+                (step.conversion === null ? '' : ` (${Math.round(step.conversion * 100)}%)`)).join(' → ');
+        const companies = Object.entries(response.by_company).slice(0, 5)
+            .map(([company, count]) => `${company} (${count})`).join(', ');
+        const weeks = Object.entries(response.by_week)
+            .map(([week, count]) => `${week}: ${count}`).join(', ');
+        analyticsDiv.innerHTML = '';
+        [`Total: ${response.total}`, `By state: ${states}`, `Funnel: ${funnel}`,
+         `Top companies: ${companies}`, `Updated per week: ${weeks}`].forEach(line => {
+            const lineDiv = document.createElement('div');
+            lineDiv.textContent = line;
+            analyticsDiv.appendChild(lineDiv);
+        });
+        analyticsDiv.style.display = 'block';
+    } catch (error) {
+        console.error(error);
+        showAlert('Failed to load job stats.', 'error');
+    }
+}
+
+window.applyTrackedJobChanges = function (changes) {
+    const tableBody = document.getElementById('job-table-body');
+    if (!tableBody) return;
+
+    changes.forEach(change => {
+        const row = change.job_id ? tableBody.querySelector(`tr[data-job-id="${CSS.escape(change.job_id)}"]`) : null;
+        if (change.change_type === 'DELETE') {
+            row?.remove();
+            return;
+        }
+        if (row) {
+            updateRow(row, change.job);
+        } else if (tableBody.querySelector(`tr[data-company-id="${CSS.escape(change.company_id || '')}"]`)) {
+            // only the jobs of the company shown in the table are added
+            addJobToTable(change.job, change.company_name, change.company_id);
+        }
+    });
+    updateBulkDeleteVisibility();
+};
+
+// Job edits are acknowledged before they are written when JOB_TRACKING_WRITE_BEHIND_MS is set,
+// the edits that could not be written are reported here
+window.onTrackedJobWriteErrors = function (failed) {
+    const tableBody = document.getElementById('job-table-body');
+    failed.forEach(update => {
+        const row = tableBody?.querySelector(`tr[data-job-id="${CSS.escape(update.job_id || '')}"]`);
+        if (row) {
+            row.classList.add('write-failed');
+            row.title = `Not saved: ${update.error_message || 'unknown error'}`;
+        }
+    });
+    const jobTitles = failed.map(update => update.job?.job_title).filter(Boolean).join(', ');
+    showAlert(`Failed to save ${failed.length} job update(s)${jobTitles ? `: ${jobTitles}` : ''}.`, 'error');
+};
@@ -268,6 +268,7 @@ async function callLLM() {
     const spinner = document.getElementById('spinner');
     const cancelBtn = document.getElementById('cancel-btn');
     showSpinnedAndCancelButton(spinner, cancelBtn);
+    startStreamedJobs(responseBox);
     
     let response = '';
     try {
@@ -278,6 +279,7 @@ async function callLLM() {
     }
 
     hideSpinneAndCancelButon(spinner, cancelBtn);
+    finishStreamedJobs();
     
     // RENDER STEP: This now handles Markdown + Sanitization + Highlighting
     addReponseToResponseBox(response, responseBox);
@@ -291,6 +293,68 @@ async function callLLM() {
     queryBox.focus();
 }
 
+// Jobs a job search sends while it runs, shown above the final answer of the query
+let streamedJobs = null;
+
+function startStreamedJobs(responseBox) {
+    streamedJobs = { responseBox, element: null, list: null, summary: null, count: 0 };
+}
+
+function finishStreamedJobs() {
+    if (streamedJobs?.summary) {
+        streamedJobs.summary.textContent = `Found ${streamedJobs.count} new jobs`;
+    }
+    streamedJobs = null;
+}
+
+function createStreamedJobsElement() {
+    const element = document.createElement('div');
+    element.className = 'llm-response llm-streamed-jobs';
+    const summary = document.createElement('div');
+    summary.className = 'llm-streamed-jobs-summary';
+    const list = document.createElement('ul');
+    element.append(summary, list);
+    streamedJobs.responseBox.appendChild(element);
+    Object.assign(streamedJobs, { element, list, summary });
+}
+
+function createStreamedJobItem(job) {
+    const item = document.createElement('li');
+    const title = document.createElement(isSafeLink(job.link) ? 'a' : 'span');
+    title.textContent = job.title;
+    if (isSafeLink(job.link)) {
+        title.href = job.link;
+        title.target = '_blank';
+        title.rel = 'noopener noreferrer';
+    }
+    const details = document.createElement('span');
+    details.textContent = ` - ${job.company}, ${job.location}`;
+    item.append(title, details);
+    return item;
+}
+
+function isSafeLink(link) {
+    return typeof link === 'string' && /^https?:\/\//i.test(link);
+}
+
+// Called by Python with the jobs of each results page as the search finds them
+window.onStreamedJobs = function (jobs) {
+    if (!streamedJobs || !Array.isArray(jobs) || jobs.length === 0) {
+        return;
+    }
+    if (!streamedJobs.element) {
+        createStreamedJobsElement();
+    }
+    const fragment = document.createDocumentFragment();
+    jobs.forEach(job => fragment.appendChild(createStreamedJobItem(job)));
+    streamedJobs.list.appendChild(fragment);
+    streamedJobs.count += jobs.length;
+    streamedJobs.summary.textContent = `Found ${streamedJobs.count} new jobs so far, still searching...`;
+
+    const responseBox = streamedJobs.responseBox;
+    responseBox.scrollTop = responseBox.scrollHeight;
+};
+
 /**
  * SECURE RENDERING FUNCTION
  * 1. Converts Markdown to HTML
@@ -364,7 +428,17 @@ async function getMessageFromLLMResponse(prompt, imageData, outputPath) {
     let message = 'Unknown error occurred';
     try {
         const userId = window.userId || window.user_id || '';
-        let resp = await window.pywebview.api.call_llm(prompt, imageData, outputPath, userId);
+        const submission = await window.pywebview.api.submit_llm_call(prompt, imageData, outputPath, userId);
+        const operation = await runOperation(submission);
+        switch (operation?.status) {
+            case 'CANCELLED':
+                return 'Operation was cancelled';
+            case 'TIMEOUT':
+                return 'LLM operation timed out. Please try again.';
+            case 'NOT_FOUND':
+                return operation.error_message || 'Unknown error occurred';
+        }
+        let resp = operation?.result;
 
         // Normalize response to object
         if (typeof resp === 'string') {
@@ -43,6 +43,23 @@ async function safeApiCall(apiFunction, ...args) {
     }
 }
 
+// Poll a backend operation handle until it leaves the PENDING state.
+// Submit endpoints return {handle}; anything else (e.g. a validation error) is returned as-is.
+async function runOperation(submission, pollInterval = 200, maxPollInterval = 2000) {
+    if (!submission || !submission.handle) {
+        return { status: 'ERROR', result: submission };
+    }
+    let interval = pollInterval;
+    while (true) {
+        const operation = await window.pywebview.api.get_operation_result(submission.handle);
+        if (!operation || operation.status !== 'PENDING') {
+            return operation;
+        }
+        await new Promise(resolve => setTimeout(resolve, interval));
+        interval = Math.min(interval * 2, maxPollInterval);
+    }
+}
+
 // Escape HTML to prevent XSS attacks
 function escapeHtml(text) {
     const div = document.createElement('div');
@@ -0,0 +1,24 @@
+from abc import abstractmethod
+
+from repository.abstract_persist import AbstractPersist
+from repository.models import PersistenceResponse
+
+
+class AbstractUserPersist(AbstractPersist):
+    """Storage of the users. A user is returned as {"_id": user_id, "email": email}"""
+
+    @abstractmethod
+    async def register_user(self, email: str) -> PersistenceResponse:
+        pass
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> PersistenceResponse:
+        pass
+
+    @abstractmethod
+    async def update_user_email(self, user_id: str, new_email: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_user(self, user_id: str) -> bool:
+        pass
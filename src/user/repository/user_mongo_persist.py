@@ -1,22 +1,55 @@
 import logging
 import uuid
+from typing import Optional
 
+from pymongo import ASCENDING, ReturnDocument
 from pymongo.errors import DuplicateKeyError
 import pymongo.errors as mongo_errors
 
 from repository.abstract_owner_mongo_persist import AbstractOwnerMongoPersist
+from user.repository.abstract_user_persist import AbstractUserPersist
 from repository.models import PersistenceErrorCode, PersistenceResponse
 
+EMAIL_INDEX = "email_1"
+LEGACY_USERID_INDEX = "userid_1"
 
-class UserMongoPersist(AbstractOwnerMongoPersist):
+
+class UserMongoPersist(AbstractOwnerMongoPersist, AbstractUserPersist):
 
     def _setup_collections(self):
         self.users = self.async_db.users
         self.job_applications = self.async_db.job_applications
+        self.tracked_jobs = self.async_db.tracked_jobs
 
     async def create_index(self):
         if self.users is not None:
-            await self.users.create_index([("userid", 1)], unique=True)
+            indexes = await self.users.index_information()
+            # the legacy index is on a field that is never written, so all users share its null key
+            if LEGACY_USERID_INDEX in indexes:
+                await self.users.drop_index(LEGACY_USERID_INDEX)
+                logging.info(f"Dropped the legacy {LEGACY_USERID_INDEX} index of users")
+            await self._create_email_index(indexes.get(EMAIL_INDEX))
+
+    async def _create_email_index(self, existing_index: Optional[dict]):
+        """
+        Unique email index. Duplicate emails written before the index existed prevent it,
+        then a non unique index keeps logins indexed until the duplicates are merged.
+        """
+        if existing_index and existing_index.get("unique"):
+            return
+        duplicates = await self.users.aggregate([
+            {"$group": {"_id": "$email", "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ]).to_list(length=None)
+        if duplicates:
+            logging.error(f"Cannot create a unique email index: {len(duplicates)} emails belong to more than one user. "
+                          f"Merge them and restart to enforce unique emails")
+            if not existing_index:
+                await self.users.create_index([("email", ASCENDING)], name=EMAIL_INDEX)
+            return
+        if existing_index:
+            await self.users.drop_index(EMAIL_INDEX)
+        await self.users.create_index([("email", ASCENDING)], name=EMAIL_INDEX, unique=True)
     
     async def get_user(self, email: str) -> PersistenceResponse:
         """Register a new user"""
@@ -28,22 +61,14 @@ class UserMongoPersist(AbstractOwnerMongoPersist):
                                     error_message=f"encountered an unkown error while trying to find user {email}")
     
     async def register_user(self, email: str) -> PersistenceResponse:
-        response = await self.get_user_by_email(email)
-        
-        if response.data != None:
-            return response
-        
-        user_id = str(uuid.uuid4())
-        user = {
-            "_id": user_id,
-            "email": email
-        }
+        """Returns the user of this email, creating it in the same upsert when it does not exist"""
         try:
-            await self.users.insert_one(user)
+            try:
+                user = await self._upsert_user(email)
+            except DuplicateKeyError:
+                # Another process created the user concurrently, the retry finds it
+                user = await self._upsert_user(email)
             return PersistenceResponse(data=user, code=PersistenceErrorCode.SUCCESS)
-        except DuplicateKeyError:
-            # Another process created the user concurrently
-            return await self.get_user_by_email(email)
         except mongo_errors.OperationFailure as e:
             logging.exception(f"MongoDB operation failed: {e}")
             return PersistenceResponse(data=None, code=PersistenceErrorCode.OPERATION_ERROR, error_message=str(e))
@@ -62,6 +87,14 @@ class UserMongoPersist(AbstractOwnerMongoPersist):
                 error_message=str(e)
             )
 
+    async def _upsert_user(self, email: str) -> dict:
+        return await self.users.find_one_and_update(
+            {"email": email},
+            {"$setOnInsert": {"_id": str(uuid.uuid4()), "email": email}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
     async def get_user_by_email(self, email: str) -> PersistenceResponse:
         """Get user by email"""
         try:
@@ -102,6 +135,7 @@ class UserMongoPersist(AbstractOwnerMongoPersist):
         try:
             async with await self.async_db.client.start_session() as session:
                 async with session.start_transaction():
+                    await self.tracked_jobs.delete_many({"user_id": user_id}, session=session)
                     await self.job_applications.delete_many({"user_id": user_id}, session=session)
                     result = await self.users.delete_one({"_id": user_id}, session=session)
                     return result.deleted_count > 0
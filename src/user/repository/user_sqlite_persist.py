@@ -0,0 +1,58 @@
+import logging
+import sqlite3
+import uuid
+
+from repository.abstract_sqlite_persist import AbstractSQLitePersist
+from repository.models import PersistenceErrorCode, PersistenceResponse
+from user.repository.abstract_user_persist import AbstractUserPersist
+
+
+def user_from_row(row: sqlite3.Row) -> dict:
+    """Users have the shape of the Mongo user documents"""
+    return {"_id": row["user_id"], "email": row["email"]}
+
+
+class UserSQLitePersist(AbstractSQLitePersist, AbstractUserPersist):
+    """Users in the `users` table of the local database, unique by email"""
+
+    async def register_user(self, email: str) -> PersistenceResponse:
+        """Returns the user of this email, creating it when it does not exist"""
+        def upsert_user(connection: sqlite3.Connection) -> dict:
+            connection.execute("INSERT INTO users (user_id, email) VALUES (?, ?) ON CONFLICT (email) DO NOTHING",
+                               (str(uuid.uuid4()), email))
+            return user_from_row(connection.execute("SELECT user_id, email FROM users WHERE email = ?", (email,)).fetchone())
+
+        try:
+            user = await self._transaction(upsert_user)
+            return PersistenceResponse(data=user, code=PersistenceErrorCode.SUCCESS)
+        except Exception as e:
+            return self._error_response(e)
+
+    async def get_user_by_email(self, email: str) -> PersistenceResponse:
+        """Get user by email"""
+        try:
+            rows = await self._query("SELECT user_id, email FROM users WHERE email = ?", (email,))
+            return PersistenceResponse(data=user_from_row(rows[0]) if rows else None, code=PersistenceErrorCode.SUCCESS)
+        except Exception as e:
+            return self._error_response(e)
+
+    async def update_user_email(self, user_id: str, new_email: str) -> bool:
+        try:
+            cursor = await self._run(self._connection.execute,
+                                     "UPDATE users SET email = ? WHERE user_id = ?", (new_email, user_id))
+            return cursor.rowcount > 0
+        except sqlite3.IntegrityError:
+            logging.warning(f"Cannot update user {user_id}: email {new_email} already exists")
+            return False
+
+    async def delete_user(self, user_id: str) -> bool:
+        """Delete user and all their applications"""
+        def delete(connection: sqlite3.Connection) -> bool:
+            connection.execute("DELETE FROM tracked_jobs WHERE user_id = ?", (user_id,))
+            return connection.execute("DELETE FROM users WHERE user_id = ?", (user_id,)).rowcount > 0
+
+        try:
+            return await self._transaction(delete)
+        except Exception as ex:
+            logging.exception(f"Error deleting user {user_id}: {ex}")
+            return False
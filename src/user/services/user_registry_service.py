@@ -1,16 +1,30 @@
+from repository.models import PersistenceErrorCode
 from services.abstract_persistence_service import AbstractPersistenceService
+from user.repository.abstract_user_persist import AbstractUserPersist
 from user.repository.user_mongo_persist import UserMongoPersist
+from user.repository.user_sqlite_persist import UserSQLitePersist
 from user.services.models import UserRegistryResponse, UserRegistryResponseCode
-from utils.utils import AsyncRunner
+from utils.lru_cache import LRUTTLCache
+from utils.utils import AsyncRunner, OperationClass
 import logging
 
         
 class UserRegistryService(AbstractPersistenceService):
+
+    # email -> user_id login cache. Unknown emails are cached for a short time,
+    # so repeated failed logins do not reach the database
+    CACHE_MAX_SIZE = 1024
+    CACHE_TTL_SECONDS = 3600.0
+    NEGATIVE_CACHE_TTL_SECONDS = 30.0
     
-    def __init__(self, user_persist: UserMongoPersist):
+    def __init__(self, user_persist: AbstractUserPersist):
         # We now REQUIRE an initialized persistence object to be passed in
         self.user_persist = user_persist
         super().__init__(self.user_persist)
+        self.user_ids_cache: LRUTTLCache[str, str] = LRUTTLCache(
+            max_size=self.CACHE_MAX_SIZE, ttl=self.CACHE_TTL_SECONDS)
+        self.unknown_emails_cache: LRUTTLCache[str, bool] = LRUTTLCache(
+            max_size=self.CACHE_MAX_SIZE, ttl=self.NEGATIVE_CACHE_TTL_SECONDS)
 
     @classmethod
     async def create(cls, mongo_connection_string, db_name):
@@ -21,10 +35,17 @@ class UserRegistryService(AbstractPersistenceService):
         # 2. Return the fully formed service
         return cls(user_persist)
 
+    @classmethod
+    async def create_local(cls, db_path):
+        """Service on the local SQLite database, used when no MongoDB is configured"""
+        user_persist = await UserSQLitePersist.create(db_path)
+        return cls(user_persist)
+
     def login(self, user_email: str) -> UserRegistryResponse:        
         try:
             response: UserRegistryResponse = AsyncRunner.run_async(
-                self.login_user_async(user_email)
+                self.login_user_async(user_email),
+                operation_class=OperationClass.DB_READ
             )
             return response
         except Exception:
@@ -34,7 +55,8 @@ class UserRegistryService(AbstractPersistenceService):
     def register(self, user_email: str) -> UserRegistryResponse:        
         try:
             response: UserRegistryResponse = AsyncRunner.run_async(
-                self.register_async(user_email)
+                self.register_async(user_email),
+                operation_class=OperationClass.DB_WRITE
             )
             return response
         except Exception:
@@ -45,18 +67,35 @@ class UserRegistryService(AbstractPersistenceService):
         if not user_email or not user_email.strip():
             return UserRegistryResponse(code=UserRegistryResponseCode.ERROR, error_message="Email is required")
         user_email = user_email.strip().lower()
-        response = await self.user_persist.get_user(user_email)
-        if response:
-             return UserRegistryResponse(user_id=str(response.data['_id']), code=UserRegistryResponseCode.OK)
-        logging.error("User not found")
-        return UserRegistryResponse(error_message="User not found", code=UserRegistryResponseCode.ERROR)
+        user_id = self.user_ids_cache.get(user_email)
+        if user_id:
+            return UserRegistryResponse(user_id=user_id, code=UserRegistryResponseCode.OK)
+        if self.unknown_emails_cache.get(user_email):
+            return UserRegistryResponse(error_message="User not found", code=UserRegistryResponseCode.ERROR)
+
+        generation = self.unknown_emails_cache.generation
+        response = await self.user_persist.get_user_by_email(user_email)
+        if response.code != PersistenceErrorCode.SUCCESS:
+            logging.error(f"Failed to get user: {response.code}")
+            return UserRegistryResponse(error_message="Error during login", code=UserRegistryResponseCode.ERROR)
+        if response.data is None:
+            logging.error("User not found")
+            self.unknown_emails_cache.put(user_email, True, generation)
+            return UserRegistryResponse(error_message="User not found", code=UserRegistryResponseCode.ERROR)
+
+        user_id = str(response.data['_id'])
+        self.user_ids_cache.put(user_email, user_id)
+        return UserRegistryResponse(user_id=user_id, code=UserRegistryResponseCode.OK)
 
     async def register_async(self, user_email: str) -> UserRegistryResponse:
         if not user_email or not user_email.strip():
             return UserRegistryResponse(code=UserRegistryResponseCode.ERROR, error_message="Email is required")
         user_email = user_email.strip().lower()
         response = await self.user_persist.register_user(user_email)
-        if response:
-             return UserRegistryResponse(user_id=str(response.data['_id']), code=UserRegistryResponseCode.OK)
+        if response.code == PersistenceErrorCode.SUCCESS and response.data:
+            user_id = str(response.data['_id'])
+            self.unknown_emails_cache.invalidate(user_email)
+            self.user_ids_cache.put(user_email, user_id)
+            return UserRegistryResponse(user_id=user_id, code=UserRegistryResponseCode.OK)
         logging.error("Failed to create user")
-        return UserRegistryResponse(error_message="Failed to create user", code=UserRegistryResponseCode.ERROR)
\ No newline at end of file
+        return UserRegistryResponse(error_message="Failed to create user", code=UserRegistryResponseCode.ERROR)
@@ -0,0 +1,115 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Coroutine, Optional
+
+
+@dataclass
+class LoopMetrics:
+    name: str
+    queue_depth: int
+    submitted: int
+    completed: int
+    lag_ms: float
+    max_lag_ms: float
+
+
+class BackgroundLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+    Counts submitted coroutines and probes the loop lag, so starvation
+    of one loop is visible from the outside.
+    """
+
+    # Seconds between two lag probes
+    LAG_PROBE_INTERVAL = 0.5
+
+    def __init__(self, name: str, thread_name: Optional[str] = None):
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name=thread_name or f"AsyncBackgroundLoop-{name}"
+        )
+        self._metrics_lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._lag = 0.0
+        self._max_lag = 0.0
+
+    def start(self, timeout: float = 2.0):
+        """Starts the loop thread and waits until the loop is running"""
+        running = threading.Event()
+        self.loop.call_soon_threadsafe(running.set)
+        self.thread.start()
+        if not running.wait(timeout):
+            logging.warning(f"AsyncRunner: loop '{self.name}' did not start within timeout.")
+        asyncio.run_coroutine_threadsafe(self._probe_lag(), self.loop)
+
+    def stop(self, timeout: float = 2.0):
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=timeout)
+        if self.thread.is_alive():
+            logging.warning(f"AsyncRunner: loop '{self.name}' did not terminate within timeout.")
+
+    def is_running(self) -> bool:
+        return self.loop.is_running()
+
+    def is_current_thread(self) -> bool:
+        return threading.current_thread() is self.thread
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedules a coroutine on this loop. Thread safe."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        with self._metrics_lock:
+            self._pending += 1
+            self._submitted += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def metrics(self) -> LoopMetrics:
+        with self._metrics_lock:
+            return LoopMetrics(
+                name=self.name,
+                queue_depth=self._pending,
+                submitted=self._submitted,
+                completed=self._completed,
+                lag_ms=round(self._lag * 1000, 3),
+                max_lag_ms=round(self._max_lag * 1000, 3)
+            )
+
+    def _on_done(self, _future: concurrent.futures.Future):
+        with self._metrics_lock:
+            self._pending -= 1
+            self._completed += 1
+
+    async def _probe_lag(self):
+        """Sleeps for a fixed interval and records how late the loop woke up"""
+        while True:
+            expected = self.loop.time() + self.LAG_PROBE_INTERVAL
+            await asyncio.sleep(self.LAG_PROBE_INTERVAL)
+            lag = max(0.0, self.loop.time() - expected)
+            with self._metrics_lock:
+                self._lag = lag
+                self._max_lag = max(self._max_lag, lag)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            # Cancel leftover tasks (lag probe, abandoned work), clean up generators, etc.
+            try:
+                tasks = asyncio.all_tasks(self.loop)
+                for task in tasks:
+                    task.cancel()
+                self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+                self.loop.close()
+            except Exception as e:
+                logging.error(f"Error closing loop '{self.name}': {e}")
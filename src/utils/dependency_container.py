@@ -1,7 +1,11 @@
 import logging
 import asyncio
+import os
+
 from dependency_injector import containers, providers
 
+from utils import file_utils
+
 
 class Container(containers.DeclarativeContainer):
     """Dependency injection container"""
@@ -19,11 +23,18 @@ class Container(containers.DeclarativeContainer):
     # Global container instance
     _container = None
 
-    # Configuration
+    # Configuration, read from the environment by init_container once .env.local is loaded
     config = providers.Configuration()
-    
-    config.mongo.connection_string.from_value("mongodb://localhost:27017/")
-    config.mongo.db_name.from_value("job_tracker")
+
+    @staticmethod
+    def configure_from_environment(container):
+        """Set the configuration of a container from the environment variables as they are now"""
+        container.config.mongo.connection_string.from_value(os.getenv('MONGODB_URI', "mongodb://localhost:27017/"))
+        container.config.mongo.db_name.from_value(os.getenv('MONGODB_DB_NAME', "job_tracker"))
+        # the MCP server reads the store the application writes: MongoDB when it is configured, the local database otherwise
+        container.config.persistence.backend.from_value(
+            "mongo" if os.getenv('MONGODB_URI') and os.getenv('MONGODB_DB_NAME') else "sqlite")
+        container.config.sqlite.db_path.from_value(str(file_utils.get_local_db_file()))
 
     @classmethod
     def get_container(cls) -> 'Container':
@@ -43,6 +54,7 @@ class Container(containers.DeclarativeContainer):
 
             # Create and configure container
             container = Container()
+            Container.configure_from_environment(container)
             # Initialize resources
             container.init_resources()
 
@@ -69,6 +69,22 @@ GLASSDOOR_SELECTORS_FILE = JOB_SEARCH_CONFIG_FILE.parent / 'glassdoor_selectors.
 JOB_TITLES_CONFIG_FILE = BASE_DIR / 'jobs_tracking' / 'config' / 'job_titles_keywords.json'
 
 
+def get_local_db_file() -> Path:
+    """SQLite database of the tracked jobs when no MongoDB is configured, JOB_TRACKING_DB_PATH overrides it"""
+    db_path = os.getenv('JOB_TRACKING_DB_PATH')
+    if db_path:
+        return Path(db_path)
+    return Path(os.getenv('APPDATA', os.path.expanduser('~/.config'))) / 'commands_automator' / 'job_tracker.db'
+
+
+def get_job_descriptions_cache_dir() -> Path:
+    """Downloaded job descriptions by job id, kept between searches, JOB_DESCRIPTIONS_CACHE_DIR overrides it"""
+    cache_dir = os.getenv('JOB_DESCRIPTIONS_CACHE_DIR')
+    if cache_dir:
+        return Path(cache_dir)
+    return Path(os.getenv('APPDATA', os.path.expanduser('~/.config'))) / 'commands_automator' / 'job_descriptions'
+
+
 
 T = TypeVar('T', bound=BaseModel)
 
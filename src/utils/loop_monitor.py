@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from utils.background_loop import BackgroundLoop
+
+# Frames under this folder are application code, used to name blocking hot spots
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class BlockingEvent:
+    loop_name: str
+    started_at: float
+    location: str
+    stack: str
+    duration: float = 0.0
+
+
+@dataclass
+class _LoopStats:
+    """Samples collected for one loop since the last summary"""
+    lag_samples: list[float] = field(default_factory=list)
+    blocking_count: int = 0
+    blocked_time: float = 0.0
+    last_beat: float = 0.0
+    current_event: Optional[BlockingEvent] = None
+
+
+class LoopMonitor:
+    """
+    Opt-in instrumentation for AsyncRunner loops.
+
+    A heartbeat coroutine on every loop records when the loop last got to run.
+    A watchdog thread checks the heartbeats; when a loop has not run for longer
+    than `block_threshold` seconds, the stack of the loop thread is captured, so
+    the synchronous call that holds the loop (e.g. requests or a sync SDK call
+    inside a coroutine) is logged with its location.
+    Every `summary_interval` seconds a summary of lag and hot spots is logged.
+    """
+
+    def __init__(self, loops: list[BackgroundLoop], block_threshold: float = 0.1, summary_interval: float = 60.0):
+        self._loops = loops
+        self._block_threshold = block_threshold
+        self._summary_interval = summary_interval
+        self._beat_interval = max(block_threshold / 4, 0.005)
+        self._stats: dict[str, _LoopStats] = {loop.name: _LoopStats() for loop in loops}
+        self._hot_spots: Counter[str] = Counter()
+        self._hot_spot_time: Counter[str] = Counter()
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        now = time.monotonic()
+        for background_loop in self._loops:
+            self._stats[background_loop.name].last_beat = now
+            asyncio.run_coroutine_threadsafe(self._heartbeat(background_loop.name), background_loop.loop)
+        self._watchdog = threading.Thread(target=self._watch, daemon=True, name="AsyncLoopMonitor")
+        self._watchdog.start()
+        logging.info(f"LoopMonitor: monitoring loops {[loop.name for loop in self._loops]} "
+                     f"(block_threshold={self._block_threshold}s, summary_interval={self._summary_interval}s)")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._watchdog:
+            self._watchdog.join(timeout=2.0)
+        self._log_summary()
+
+    def get_hot_spots(self, limit: int = 10) -> list[tuple[str, int, float]]:
+        """Returns (location, times seen, total blocked seconds) for the worst offenders"""
+        with self._stats_lock:
+            return [(location, count, round(self._hot_spot_time[location], 3))
+                    for location, count in self._hot_spots.most_common(limit)]
+
+    async def _heartbeat(self, loop_name: str):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._beat_interval
+            await asyncio.sleep(self._beat_interval)
+            lag = max(0.0, loop.time() - expected)
+            now = time.monotonic()
+            with self._stats_lock:
+                stats = self._stats[loop_name]
+                stats.last_beat = now
+                stats.lag_samples.append(lag)
+                event = stats.current_event
+                stats.current_event = None
+                if event:
+                    event.duration = now - event.started_at
+                    stats.blocked_time += event.duration
+                    self._hot_spot_time[event.location] += event.duration
+            if event:
+                logging.warning(f"LoopMonitor: loop '{loop_name}' was blocked for {event.duration * 1000:.0f} ms "
+                                f"at {event.location}")
+
+    def _watch(self):
+        next_summary = time.monotonic() + self._summary_interval
+        while not self._stop_event.wait(self._beat_interval):
+            now = time.monotonic()
+            for background_loop in self._loops:
+                self._check_loop(background_loop, now)
+            if now >= next_summary:
+                self._log_summary()
+                next_summary = now + self._summary_interval
+
+    def _check_loop(self, background_loop: BackgroundLoop, now: float):
+        with self._stats_lock:
+            stats = self._stats[background_loop.name]
+            # Heartbeat is overdue and this stall was not reported yet
+            if stats.current_event or now - stats.last_beat < self._block_threshold + self._beat_interval:
+                return
+            frame = sys._current_frames().get(background_loop.thread.ident)
+            if frame is None:
+                return
+            stack = traceback.extract_stack(frame)
+            location = self._find_location(stack)
+            stats.current_event = BlockingEvent(
+                loop_name=background_loop.name,
+                started_at=stats.last_beat,
+                location=location,
+                stack="".join(traceback.format_list(stack))
+            )
+            stats.blocking_count += 1
+            self._hot_spots[location] += 1
+            event = stats.current_event
+        logging.warning(f"LoopMonitor: loop '{background_loop.name}' blocked for more than "
+                        f"{self._block_threshold * 1000:.0f} ms at {location}\n{event.stack}")
+
+    @staticmethod
+    def _find_location(stack: traceback.StackSummary) -> str:
+        """Innermost application frame, falls back to the innermost frame"""
+        for frame in reversed(stack):
+            if frame.filename.startswith(_APP_ROOT) and not frame.filename.endswith(("loop_monitor.py", "background_loop.py")):
+                return f"{os.path.relpath(frame.filename, _APP_ROOT)}:{frame.lineno} in {frame.name}"
+        frame = stack[-1]
+        return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+    def _log_summary(self):
+        with self._stats_lock:
+            lines = []
+            for loop_name, stats in self._stats.items():
+                samples = sorted(stats.lag_samples)
+                if samples:
+                    avg_lag = sum(samples) / len(samples)
+                    p95_lag = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+                    max_lag = samples[-1]
+                else:
+                    avg_lag = p95_lag = max_lag = 0.0
+                lines.append(f"  {loop_name}: lag avg={avg_lag * 1000:.1f} ms p95={p95_lag * 1000:.1f} ms "
+                             f"max={max_lag * 1000:.1f} ms, blocked {stats.blocking_count} times "
+                             f"for {stats.blocked_time * 1000:.0f} ms")
+                stats.lag_samples.clear()
+                stats.blocking_count = 0
+                stats.blocked_time = 0.0
+            hot_spots = [f"  {location}: {count} times, {self._hot_spot_time[location] * 1000:.0f} ms"
+                         for location, count in self._hot_spots.most_common(5)]
+        summary = "\n".join(lines)
+        if hot_spots:
+            summary += "\n Hot spots since start:\n" + "\n".join(hot_spots)
+        logging.info(f"LoopMonitor summary:\n{summary}")
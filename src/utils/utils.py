@@ -1,26 +1,71 @@
 import asyncio
+import concurrent.futures
 import threading
 import logging
+import time
+import uuid
+from dataclasses import dataclass
+from enum import StrEnum
 from typing import TypeVar, Any, Coroutine, Optional, Callable, Set
 from uuid import UUID
 
+from utils.background_loop import BackgroundLoop, LoopMetrics
+from utils.loop_monitor import LoopMonitor
+
 T = TypeVar('T')
 
+# the timeout of AsyncRunner.run_async when the caller gives none, see run_async
+_UNSET_TIMEOUT: Any = object()
+
+
+class OperationClass(StrEnum):
+    """Workload classes with their own timeout budget"""
+    DB_READ = "DB_READ"
+    DB_WRITE = "DB_WRITE"
+    LLM = "LLM"
+    SCRAPING = "SCRAPING"
+
+
+class OperationStatus(StrEnum):
+    PENDING = "PENDING"
+    DONE = "DONE"
+    ERROR = "ERROR"
+    TIMEOUT = "TIMEOUT"
+    CANCELLED = "CANCELLED"
+    NOT_FOUND = "NOT_FOUND"
+
+
+@dataclass
+class OperationResult:
+    handle: str
+    status: OperationStatus
+    result: Any = None
+    error_message: Optional[str] = None
+
+
+@dataclass
+class _Operation:
+    future: concurrent.futures.Future
+    operation_class: OperationClass
+    submitted_at: float
+    finished_at: Optional[float] = None
+
 _active_tasks: Set[asyncio.Task] = set()
 _task_lock = threading.Lock()
-_current_llm_task: Optional[asyncio.Task] = None
+_current_llm_task: Optional[asyncio.Task | concurrent.futures.Future] = None
 _llm_task_lock = threading.Lock()
 
 def cancel_current_async_operation():
     """Cancel all currently running async operations"""
     global _active_tasks, _current_llm_task    
     with _llm_task_lock:
-        if _current_llm_task and not _current_llm_task.done():
-            _current_llm_task.cancel()
-            logging.debug("Cancelled current LLM task")
-            _current_llm_task = None
+        task, _current_llm_task = _current_llm_task, None
+    # Cancel outside the lock - done callbacks of the task may clear it as well
+    if task and not task.done():
+        task.cancel()
+        logging.debug("Cancelled current LLM task")
 
-def set_current_llm_task(task: asyncio.Task):
+def set_current_llm_task(task: asyncio.Task | concurrent.futures.Future):
     """Set the current LLM task for tracking"""
     global _current_llm_task
     logging.debug("setting current LLM task")
@@ -34,14 +79,32 @@ def clear_current_llm_task():
     with _llm_task_lock:
         _current_llm_task = None
 
-def run_async_method(async_method: Callable[..., Coroutine[Any, Any, T]], *args, **kwargs) ->  Optional[T]:
+def _clear_current_llm_task_if(task: asyncio.Task | concurrent.futures.Future):
+    """Clear the current LLM task only if it was not replaced by a newer one"""
+    global _current_llm_task
+    with _llm_task_lock:
+        if _current_llm_task is task:
+            _current_llm_task = None
+
+def _is_llm_method(async_method: Callable) -> bool:
+    return hasattr(async_method, '__name__') and 'llm' in async_method.__name__.lower()
+
+def run_async_method(async_method: Callable[..., Coroutine[Any, Any, T]], *args,
+                     timeout: Optional[float] = None, **kwargs) ->  Optional[T]:
     """
      Runs an async method synchronously. Returns None on error after logging.
+     When AsyncRunner routes sync calls, the coroutine runs on the shared background loop
+     and is cancelled once `timeout` seconds pass. Otherwise a fresh loop is created per call.
     """
+    if AsyncRunner.is_routing_sync_calls():
+        return _run_on_shared_loop(async_method, timeout, *args, **kwargs)
+
     global _active_tasks, _current_llm_task
     try:
         async def _wrapped_method():
-            return await async_method(*args, **kwargs)
+            if timeout is None:
+                return await async_method(*args, **kwargs)
+            return await asyncio.wait_for(async_method(*args, **kwargs), timeout)
         
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -51,7 +114,7 @@ def run_async_method(async_method: Callable[..., Coroutine[Any, Any, T]], *args,
                 _active_tasks.add(task)
             
             # If this looks like an LLM task, track it separately
-            if hasattr(async_method, '__name__') and 'llm' in async_method.__name__.lower():
+            if _is_llm_method(async_method):
                 set_current_llm_task(task)
             
             try:
@@ -73,104 +136,350 @@ def run_async_method(async_method: Callable[..., Coroutine[Any, Any, T]], *args,
         clear_current_llm_task()
         return None # Caller must handle None return
 
+def _run_on_shared_loop(async_method: Callable[..., Coroutine[Any, Any, T]], timeout: Optional[float],
+                        *args, **kwargs) -> Optional[T]:
+    """
+    Runs an async method on the AsyncRunner loop, so loop bound resources
+    (aiohttp sessions, motor clients, SDK transports) are reused across calls.
+    """
+    is_llm_task = _is_llm_method(async_method)
+    try:
+        coro = async_method(*args, **kwargs)
+        AsyncRunner._ensure_not_on_loop_thread(coro)
+        future = AsyncRunner.submit(coro, OperationClass.LLM if is_llm_task else None)
+    except Exception as e:
+        logging.error(f"Error submitting async method {e}", exc_info=True)
+        return None
+
+    if is_llm_task:
+        # cancel() on the concurrent future is thread safe and cancels the task on the loop
+        set_current_llm_task(future)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.CancelledError:
+        logging.debug("Async operation was cancelled")
+        raise asyncio.CancelledError()
+    except TimeoutError:
+        future.cancel()
+        logging.error(f"Async method {getattr(async_method, '__name__', async_method)} timed out after {timeout}s")
+        return None
+    except Exception as e:
+        logging.error(f"Error running async method {e}", exc_info=True)
+        return None # Caller must handle None return
+    finally:
+        if is_llm_task:
+            clear_current_llm_task()
+
 
 class AsyncRunner:
     """
-    Manages a background asyncio event loop running in a separate thread.
+    Manages background asyncio event loops running in separate threads.
     Allows synchronous code (like pywebview API methods) to execute 
-    coroutines on that background loop thread-safely.
+    coroutines on those background loops thread-safely.
+
+    By default a single loop runs all the work. Additional named loops
+    (e.g. "db", "llm", "io") can be started, and operations are then routed
+    to them by OperationClass so slow work cannot starve other loops.
     """
     
     _lock = threading.Lock()
-    _loop: Optional[asyncio.AbstractEventLoop] = None
-    _loop_thread: Optional[threading.Thread] = None
+    _loops: dict[str, BackgroundLoop] = {}
     _started = False
+    _route_sync_calls = False
+
+    DEFAULT_LOOP = "default"
+    DB_LOOP = "db"
+    LLM_LOOP = "llm"
+    IO_LOOP = "io"
+
+    DEFAULT_TIMEOUT = 30.0
+
+    # Loop used for each operation class, when that loop was started
+    _routes: dict[OperationClass, str] = {
+        OperationClass.DB_READ: DB_LOOP,
+        OperationClass.DB_WRITE: DB_LOOP,
+        OperationClass.LLM: LLM_LOOP,
+        OperationClass.SCRAPING: IO_LOOP,
+    }
+
+    # Per operation class timeouts in seconds (None = no timeout)
+    _operation_timeouts: dict[OperationClass, Optional[float]] = {
+        OperationClass.DB_READ: 10.0,
+        OperationClass.DB_WRITE: 20.0,
+        OperationClass.LLM: 300.0,
+        OperationClass.SCRAPING: 900.0,
+    }
+
+    # Finished operations nobody collected are dropped after this many seconds
+    OPERATION_RESULT_TTL = 300.0
+
+    _operations: dict[str, _Operation] = {}
+    _operations_lock = threading.Lock()
+
+    _monitor: Optional[LoopMonitor] = None
 
     @classmethod
-    def start(cls):
+    def start(cls, route_sync_calls: bool = False, loop_names: Optional[list[str]] = None):
         """
-        Starts the persistent event loop in a daemon thread.
+        Starts the persistent event loops in daemon threads.
         This must be called BEFORE webview.start().
+
+        Args:
+            route_sync_calls: If True, run_async_method executes on the background loops
+                              instead of creating a new event loop per call.
+            loop_names: Extra named loops to start next to the default one, e.g. ["db", "llm", "io"].
         """
         with cls._lock:
+            cls._route_sync_calls = route_sync_calls
             if cls._started:
                 return
-            
-            def _start_background_loop(loop: asyncio.AbstractEventLoop):
-                asyncio.set_event_loop(loop)
-                try:
-                    loop.run_forever()
-                finally:
-                    # Clean up generators, etc.
-                    try:
-                        loop.run_until_complete(loop.shutdown_asyncgens())
-                        loop.close()
-                    except Exception as e:
-                        logging.error(f"Error closing loop: {e}")
-
-            cls._loop = asyncio.new_event_loop()
-            cls._loop_thread = threading.Thread(
-                target=_start_background_loop, 
-                args=(cls._loop,), 
-                daemon=True,
-                name="AsyncBackgroundLoop"
-            )
-            cls._loop_thread.start()
+
+            names = [cls.DEFAULT_LOOP] + [name for name in (loop_names or []) if name != cls.DEFAULT_LOOP]
+            for name in names:
+                thread_name = "AsyncBackgroundLoop" if name == cls.DEFAULT_LOOP else None
+                background_loop = BackgroundLoop(name, thread_name=thread_name)
+                background_loop.start()
+                cls._loops[name] = background_loop
             cls._started = True
-            logging.info("AsyncRunner: Background event loop started.")
+            logging.info(f"AsyncRunner: Background event loops {names} started (route_sync_calls={route_sync_calls}).")
+
+    @classmethod
+    def is_routing_sync_calls(cls) -> bool:
+        """Returns True when sync-to-async bridge calls should use the background loop."""
+        return cls._route_sync_calls and cls._started and bool(cls._loops)
     
       
     @classmethod
-    def get_loop(cls) -> asyncio.AbstractEventLoop:
-        """Returns the running background loop."""
-        if not cls._started or not cls._loop:
+    def get_loop(cls, loop_name: str = DEFAULT_LOOP) -> asyncio.AbstractEventLoop:
+        """Returns a running background loop."""
+        if not cls._started or not cls._loops:
             raise RuntimeError("AsyncRunner not initialized. Call AsyncRunner.start() first.")
-        if not cls._loop.is_running():
-            raise RuntimeError("AsyncRunner loop is not running.")
-        return cls._loop
+        background_loop = cls._loops.get(loop_name) or cls._loops[cls.DEFAULT_LOOP]
+        if not background_loop.is_running():
+            raise RuntimeError(f"AsyncRunner loop '{background_loop.name}' is not running.")
+        return background_loop.loop
+
+    @classmethod
+    def get_loop_name(cls, operation_class: Optional[OperationClass] = None) -> str:
+        """Returns the name of the loop that runs the given operation class"""
+        loop_name = cls._routes.get(operation_class, cls.DEFAULT_LOOP)
+        return loop_name if loop_name in cls._loops else cls.DEFAULT_LOOP
+
+    @classmethod
+    def get_loop_metrics(cls) -> list[LoopMetrics]:
+        """Per loop queue depth (submitted, not finished coroutines) and lag"""
+        return [background_loop.metrics() for background_loop in list(cls._loops.values())]
 
     @classmethod
-    def run_async(cls, coro: Coroutine[Any, Any, T]) -> T:
+    def enable_monitoring(cls, block_threshold: float = 0.1, summary_interval: float = 60.0):
         """
-        Thread-safe execution of a coroutine from a synchronous context.
-        
-        This submits the coroutine to the background loop and blocks 
-        the calling thread until the result is ready.
+        Opt-in instrumentation: measures loop lag, logs the stack of any call that
+        holds a loop longer than `block_threshold` seconds and logs a summary
+        every `summary_interval` seconds. Must be called after start().
+        """
+        with cls._lock:
+            if not cls._started:
+                raise RuntimeError("AsyncRunner.start() must be called before enabling monitoring.")
+            if cls._monitor:
+                return
+            cls._monitor = LoopMonitor(list(cls._loops.values()), block_threshold, summary_interval)
+            cls._monitor.start()
+
+    @classmethod
+    def get_blocking_hot_spots(cls, limit: int = 10) -> list[tuple[str, int, float]]:
+        """(location, times seen, total blocked seconds) for the worst blocking calls, if monitoring is enabled"""
+        return cls._monitor.get_hot_spots(limit) if cls._monitor else []
+
+    @classmethod
+    def submit(cls, coro: Coroutine[Any, Any, T], operation_class: Optional[OperationClass] = None,
+               loop_name: Optional[str] = None) -> concurrent.futures.Future:
         """
-        if not cls._loop:
+        Schedules a coroutine on a background loop and returns immediately.
+        The loop is `loop_name` if given, otherwise the loop routed for `operation_class`.
+        Cancelling the returned future cancels the task on the loop.
+        """
+        if not cls._loops:
+            coro.close()
             raise RuntimeError("AsyncRunner.start() must be called before running async tasks.")
 
+        background_loop = cls._loops.get(loop_name or cls.get_loop_name(operation_class)) or cls._loops[cls.DEFAULT_LOOP]
         # This is the magic bridge:
         # It schedules the coroutine on the background loop safely.
-        future = asyncio.run_coroutine_threadsafe(coro, cls._loop)
+        return background_loop.submit(coro)
+
+    @classmethod
+    def _ensure_not_on_loop_thread(cls, coro: Coroutine):
+        """Blocking on a result from inside a loop thread would stall (or deadlock) that loop"""
+        if any(background_loop.is_current_thread() for background_loop in list(cls._loops.values())):
+            coro.close()
+            raise RuntimeError("AsyncRunner cannot block on a loop thread; await the coroutine instead.")
+
+    @classmethod
+    def run_async(cls, coro: Coroutine[Any, Any, T], timeout: Optional[float] = _UNSET_TIMEOUT,
+                  operation_class: Optional[OperationClass] = None, loop_name: Optional[str] = None) -> T:
+        """
+        Thread-safe execution of a coroutine from a synchronous context.
+        
+        This submits the coroutine to a background loop and blocks 
+        the calling thread until the result is ready, or until `timeout`
+        seconds pass (None waits forever). On timeout the task is cancelled.
+        If `operation_class` is given, the coroutine runs on the loop routed for that class,
+        and its configured timeout is used unless `timeout` is given. Without either
+        the timeout is DEFAULT_TIMEOUT.
+        """
+        if timeout is _UNSET_TIMEOUT:
+            timeout = cls.get_operation_timeout(operation_class) if operation_class is not None else cls.DEFAULT_TIMEOUT
+        cls._ensure_not_on_loop_thread(coro)
+        future = cls.submit(coro, operation_class, loop_name)
         
         try:
             # Block this thread (the UI thread) until result is ready
-            return future.result(timeout=30.0)  # Adjust timeout as needed
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            logging.error(f"AsyncRunner Error: operation timed out after {timeout}s")
+            raise
         except Exception as e:
             logging.error(f"AsyncRunner Error: {e}")
             raise
 
-        
+    # ==================== NON BLOCKING OPERATIONS ====================
+
+    @classmethod
+    def get_operation_timeout(cls, operation_class: OperationClass) -> Optional[float]:
+        return cls._operation_timeouts.get(operation_class, cls.DEFAULT_TIMEOUT)
+
+    @classmethod
+    def set_operation_timeout(cls, operation_class: OperationClass, timeout: Optional[float]):
+        """Override the timeout of an operation class (None disables the timeout)"""
+        with cls._lock:
+            cls._operation_timeouts[operation_class] = timeout
+
+    @classmethod
+    def submit_operation(cls, coro: Coroutine[Any, Any, T],
+                         operation_class: OperationClass = OperationClass.DB_READ) -> str:
+        """
+        Schedules a coroutine on the background loop without blocking the caller.
+        The timeout of the operation class is enforced on the loop itself.
+
+        Returns:
+            A handle to be used with poll_operation, await_operation and cancel_operation.
+        """
+        timeout = cls.get_operation_timeout(operation_class)
+
+        async def _with_timeout():
+            if timeout is None:
+                return await coro
+            return await asyncio.wait_for(coro, timeout)
+
+        future = cls.submit(_with_timeout(), operation_class)
+        handle = str(uuid.uuid4())
+        operation = _Operation(future=future, operation_class=operation_class, submitted_at=time.monotonic())
+
+        def _on_done(done_future: concurrent.futures.Future):
+            operation.finished_at = time.monotonic()
+            if operation_class == OperationClass.LLM:
+                _clear_current_llm_task_if(done_future)
+
+        if operation_class == OperationClass.LLM:
+            set_current_llm_task(future)
+        future.add_done_callback(_on_done)
+
+        with cls._operations_lock:
+            cls._prune_operations()
+            cls._operations[handle] = operation
+        logging.debug(f"AsyncRunner: submitted {operation_class} operation {handle}")
+        return handle
+
+    @classmethod
+    def poll_operation(cls, handle: str) -> OperationResult:
+        """
+        Returns the current state of an operation without blocking.
+        Finished operations are forgotten once their result was returned.
+        """
+        with cls._operations_lock:
+            operation = cls._operations.get(handle)
+            if operation is None:
+                return OperationResult(handle=handle, status=OperationStatus.NOT_FOUND,
+                                       error_message="Unknown or expired operation handle")
+            if not operation.future.done():
+                return OperationResult(handle=handle, status=OperationStatus.PENDING)
+            del cls._operations[handle]
+        return cls._to_operation_result(handle, operation)
+
+    @classmethod
+    def await_operation(cls, handle: str, timeout: Optional[float] = None) -> OperationResult:
+        """Blocks until the operation finishes or `timeout` seconds pass, then polls it."""
+        with cls._operations_lock:
+            operation = cls._operations.get(handle)
+        if operation is not None:
+            concurrent.futures.wait([operation.future], timeout=timeout)
+        return cls.poll_operation(handle)
+
+    @classmethod
+    def cancel_operation(cls, handle: str) -> bool:
+        with cls._operations_lock:
+            operation = cls._operations.get(handle)
+        if operation is None:
+            return False
+        return operation.future.cancel()
+
+    @classmethod
+    def _to_operation_result(cls, handle: str, operation: _Operation) -> OperationResult:
+        future = operation.future
+        if future.cancelled():
+            return OperationResult(handle=handle, status=OperationStatus.CANCELLED, error_message="Operation was cancelled")
+        error = future.exception()
+        if error is None:
+            return OperationResult(handle=handle, status=OperationStatus.DONE, result=future.result())
+        if isinstance(error, TimeoutError):
+            timeout = cls.get_operation_timeout(operation.operation_class)
+            logging.error(f"AsyncRunner: {operation.operation_class} operation {handle} timed out after {timeout}s")
+            return OperationResult(handle=handle, status=OperationStatus.TIMEOUT,
+                                   error_message=f"Operation timed out after {timeout}s")
+        logging.error(f"AsyncRunner: operation {handle} failed: {error}", exc_info=error)
+        return OperationResult(handle=handle, status=OperationStatus.ERROR, error_message=str(error))
+
+    @classmethod
+    def _prune_operations(cls):
+        """Drop finished operations whose result was never collected. Caller holds _operations_lock."""
+        now = time.monotonic()
+        expired = [handle for handle, operation in cls._operations.items()
+                   if operation.finished_at is not None and now - operation.finished_at > cls.OPERATION_RESULT_TTL]
+        for handle in expired:
+            del cls._operations[handle]
+
     @classmethod
     def shutdown(cls):
-        """Stops the background loop gracefully."""
-        if cls._loop and cls._loop.is_running():
-             logging.info("AsyncRunner: Stopping background loop...")
-             cls._loop.call_soon_threadsafe(cls._loop.stop)
-             
-        if cls._loop_thread:
-             cls._loop_thread.join(timeout=2.0)
-             if cls._loop_thread.is_alive():
-                logging.warning("AsyncRunner: Background thread did not terminate within timeout.")
+        """Stops the background loops gracefully."""
+        logging.info("AsyncRunner: Stopping background loops...")
+        if cls._monitor:
+            cls._monitor.stop()
+            cls._monitor = None
+        for background_loop in list(cls._loops.values()):
+            background_loop.stop()
         
-            # Reset state to allow restart
+        # Reset state to allow restart
         with cls._lock:
-            cls._loop = None
-            cls._loop_thread = None
+            cls._loops = {}
             cls._started = False
+            cls._route_sync_calls = False
+        with cls._operations_lock:
+            for operation in cls._operations.values():
+                operation.future.cancel()
+            cls._operations.clear()
         logging.info("AsyncRunner: Shutdown complete.")
 
+def is_valid_uuid(id: str) -> bool:
+    """Validate if the id is a UUID of any version, e.g. the uuid5 company ids"""
+    if not id or not isinstance(id, str):
+        return False
+
+    try:
+        return str(UUID(id)) == id
+    except (ValueError, AttributeError):
+        return False
+
 def is_valid_uuid4(id: str) -> bool:
     """Validate if the user_id is a valid UUID4"""
     if not id or not isinstance(id, str):
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from llm.mcp_servers.job_search.services.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts: list[FakeContext] = []
+
+    def is_connected(self) -> bool:
+        return self.connected and not self.closed
+
+    async def new_context(self, **options) -> FakeContext:
+        if not self.is_connected():
+            raise RuntimeError("Target page, context or browser has been closed")
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowserPool(BrowserPool):
+    """Launches fake browsers instead of Chromium"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.browsers: list[FakeBrowser] = []
+
+    async def _launch(self) -> FakeBrowser:
+        self.launches += 1
+        self.browsers.append(FakeBrowser())
+        return self.browsers[-1]
+
+
+@pytest.mark.asyncio
+async def test_searches_share_the_warm_browser_with_their_own_contexts():
+    pool = FakeBrowserPool()
+
+    async with pool.context() as first_context:
+        async with pool.context() as second_context:
+            assert first_context is not second_context
+    async with pool.context() as third_context:
+        pass
+
+    assert pool.launches == 1
+    assert first_context.closed and second_context.closed and third_context.closed
+    assert not pool.browsers[0].closed
+
+@pytest.mark.asyncio
+async def test_disconnected_browser_is_replaced():
+    pool = FakeBrowserPool()
+    async with pool.context():
+        pass
+    pool.browsers[0].connected = False
+
+    async with pool.context():
+        pass
+
+    assert pool.launches == 2
+    assert pool.browsers[0].closed and not pool.browsers[1].closed
+
+@pytest.mark.asyncio
+async def test_old_browser_is_recycled_after_its_searches_end():
+    pool = FakeBrowserPool(max_age_seconds=0.05)
+
+    async with pool.context():
+        await asyncio.sleep(0.1)
+        async with pool.context():
+            # a new search gets a new browser, the running search keeps the old one
+            assert pool.launches == 2
+            assert not pool.browsers[0].closed
+        assert not pool.browsers[0].closed
+
+    assert pool.browsers[0].closed
+
+@pytest.mark.asyncio
+async def test_context_failure_retries_on_a_new_browser():
+    pool = FakeBrowserPool()
+    async with pool.context():
+        pass
+    # crashed without the pool noticing
+    pool.browsers[0].closed = True
+
+    async with pool.context() as context:
+        assert context in pool.browsers[1].contexts
+
+@pytest.mark.asyncio
+async def test_close_waits_for_running_searches():
+    pool = FakeBrowserPool()
+
+    async with pool.context():
+        await pool.close()
+        assert not pool.browsers[0].closed
+
+    assert pool.browsers[0].closed
@@ -0,0 +1,116 @@
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from llm.mcp_servers.job_search.services.job_scrapers.glassdoor_jobs_scraper_service import (
+    EXTRACT_CARDS_SCRIPT, GlassdoorJobsScraperService
+)
+
+
+class FakeLocator:
+    def __init__(self, count: int = 0):
+        self._count = count
+
+    async def count(self) -> int:
+        return self._count
+
+
+class FakePage:
+    """A loaded results page whose cards are read by evaluate, no popups"""
+
+    def __init__(self, cards: list[dict] = None, evaluate_error: Exception = None):
+        self.cards = cards or []
+        self.evaluate_error = evaluate_error
+        self.evaluate_calls = []
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def wait_for_selector(self, selector, **kwargs):
+        pass
+
+    def locator(self, selector) -> FakeLocator:
+        return FakeLocator()
+
+    async def evaluate(self, script, arg):
+        self.evaluate_calls.append((script, arg))
+        if self.evaluate_error:
+            raise self.evaluate_error
+        return self.cards[:arg['maxCards']]
+
+
+def card_values(title: str, url: str = None, **values) -> dict:
+    return {"title": title, "company": "Acme", "location": "Tel Aviv", "url": url, "company_rating": "4.1",
+            "company_logo": None, "description": "Build services", "posted_date": "3d", "job_id": title,
+            "tracking_link": None, **values}
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    service = GlassdoorJobsScraperService()
+
+    async def no_delay(*args):
+        pass
+
+    monkeypatch.setattr(service, "_random_delay", no_delay)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_page_cards_are_read_with_one_evaluate(scraper):
+    page = FakePage([
+        card_values("Backend Developer", "/job-listing/backend-developer-JV_1.htm"),
+        card_values("QA Engineer", "https://www.glassdoor.com/job-listing/qa-JV_2.htm"),
+        card_values("Data Engineer", None, company=None),
+        card_values("Platform Engineer", "/job-listing/platform-JV_3.htm", description=None,
+                    tracking_link="https://www.glassdoor.com/partner/jobListing.htm?jobListingId=3"),
+    ])
+
+    jobs = await scraper._scrape_job_page(page, "https://www.glassdoor.com/Job/search.htm", ["QA"], max_jobs=10)
+
+    [(script, arg)] = page.evaluate_calls
+    assert script == EXTRACT_CARDS_SCRIPT
+    assert arg["cardSelector"] == scraper.selectors["containers"]["job_card"]
+    assert arg["fields"] == scraper.selectors["job_details"]
+    # the forbidden title is skipped, a card without a company is N/A as with locators
+    assert [(job.title, job.company) for job in jobs] == [
+        ("Backend Developer", "Acme"), ("Data Engineer", "N/A"), ("Platform Engineer", "Acme")]
+    assert str(jobs[0].link) == "https://www.glassdoor.com/job-listing/backend-developer-JV_1.htm"
+    assert jobs[0].description == "Build services" and jobs[0].posted_date is not None
+    # the tracking link is the last href field, it wins like in card by card extraction
+    assert str(jobs[2].link) == "https://www.glassdoor.com/partner/jobListing.htm?jobListingId=3"
+    assert jobs[2].description is None
+
+@pytest.mark.asyncio
+async def test_max_jobs_is_passed_to_the_script(scraper):
+    page = FakePage([card_values(f"Developer {index}", f"/job-listing/JV_{index}.htm") for index in range(5)])
+
+    jobs = await scraper._scrape_job_page(page, "https://www.glassdoor.com/Job/search.htm", [], max_jobs=2)
+
+    assert page.evaluate_calls[0][1]["maxCards"] == 2
+    assert len(jobs) == 2
+
+@pytest.mark.asyncio
+async def test_failed_evaluate_falls_back_to_card_by_card(scraper):
+    page = FakePage(evaluate_error=RuntimeError("SyntaxError: not a valid selector"))
+
+    jobs = await scraper._scrape_job_page(page, "https://www.glassdoor.com/Job/search.htm", [], max_jobs=10)
+
+    assert jobs == []
+    assert len(page.evaluate_calls) == 1
+
+@pytest.mark.asyncio
+async def test_per_card_extraction_skips_evaluate(scraper):
+    scraper.extraction = GlassdoorJobsScraperService.EXTRACTION_PER_CARD
+    page = FakePage([card_values("Backend Developer")])
+
+    assert await scraper._scrape_job_page(page, "https://www.glassdoor.com/Job/search.htm", [], max_jobs=10) == []
+    assert page.evaluate_calls == []
+
+@pytest.mark.asyncio
+async def test_browser_launch_failure_returns_no_jobs(scraper, monkeypatch):
+    async def launch_failure():
+        raise PlaywrightError("Executable doesn't exist")
+
+    monkeypatch.setattr(scraper.browser_pool, "_launch", launch_failure)
+
+    assert await scraper.run_scraper("python developer", "Israel", max_pages=1) == []
@@ -0,0 +1,114 @@
+import pytest
+from aiohttp import web
+
+from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.services.job_descriptions_service import JobDescriptionsService
+from llm.mcp_servers.job_search.services.job_scrapers.linkedin_jobs_scraper_service import LinkedInJobsScraperService
+
+JOB_PAGE = """
+<html><body>
+  <h1>Developer</h1>
+  <div class="description__text">
+    <div class="show-more-less-html__markup relative">
+      <p>Build <strong>services</strong> for job {job_id}.</p>
+      <ul><li>Python</li><li>SQL</li></ul>
+    </div>
+  </div>
+</body></html>
+"""
+
+
+@pytest.fixture
+async def job_pages_server():
+    requests = []
+    # job id -> responses to fail with before the page is served
+    failures = {"2": [429], "3": [404]}
+
+    async def job_page(request: web.Request) -> web.Response:
+        job_id = request.match_info["slug"].rsplit("-", 1)[-1]
+        requests.append(job_id)
+        if failures.get(job_id):
+            return web.Response(status=failures[job_id].pop(0), headers={"Retry-After": "0"})
+        return web.Response(text=JOB_PAGE.format(job_id=job_id), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/jobs/view/{slug}/", job_page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield f"http://127.0.0.1:{runner.addresses[0][1]}", requests
+    await runner.cleanup()
+
+@pytest.fixture
+async def scraper():
+    service = LinkedInJobsScraperService()
+    service.REQUESTS_PER_SECOND = 100
+    service.DESCRIPTION_RETRY_BACKOFF_SECONDS = 0.01
+    yield service
+    await service.close()
+
+
+def make_job(base_url: str, job_id: int) -> ScrapedJob:
+    return ScrapedJob(title=f"Developer {job_id}", company="Acme", location="Tel Aviv",
+                      description=LinkedInJobsScraperService.DESCRIPTION_PLACEHOLDER,
+                      link=f"{base_url}/jobs/view/developer-at-acme-{job_id}/")
+
+
+@pytest.mark.asyncio
+async def test_descriptions_are_fetched_and_cached(scraper, job_pages_server, tmp_path):
+    base_url, requests = job_pages_server
+    jobs = [make_job(base_url, job_id) for job_id in (1, 2, 3)]
+
+    enriched = await JobDescriptionsService(scraper, tmp_path).enrich_jobs(jobs)
+
+    assert enriched == 2
+    assert jobs[0].description == "Build services for job 1. Python SQL"
+    # rate limited once, then fetched
+    assert jobs[1].description == "Build services for job 2. Python SQL"
+    assert requests.count("2") == 2
+    # not found is not retried and keeps the placeholder
+    assert jobs[2].description == LinkedInJobsScraperService.DESCRIPTION_PLACEHOLDER
+    assert requests.count("3") == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["1.txt", "2.txt"]
+
+@pytest.mark.asyncio
+async def test_cached_descriptions_are_not_downloaded_again(scraper, job_pages_server, tmp_path):
+    base_url, requests = job_pages_server
+    (tmp_path / "1.txt").write_text("Cached description", encoding="utf-8")
+    jobs = [make_job(base_url, 1), make_job(base_url, 4)]
+
+    enriched = await JobDescriptionsService(scraper, tmp_path).enrich_jobs(jobs)
+
+    assert enriched == 2
+    assert jobs[0].description == "Cached description"
+    assert requests == ["4"]
+
+@pytest.mark.asyncio
+async def test_jobs_with_a_description_are_left_alone(scraper, job_pages_server, tmp_path):
+    base_url, requests = job_pages_server
+    job = make_job(base_url, 1)
+    job.description = "Full description"
+
+    assert await JobDescriptionsService(scraper, tmp_path).enrich_jobs([job]) == 0
+    assert requests == []
+
+@pytest.mark.asyncio
+async def test_pages_of_a_search_share_one_queue(scraper, job_pages_server, tmp_path):
+    base_url, requests = job_pages_server
+    service = JobDescriptionsService(scraper, tmp_path)
+    first_page = [make_job(base_url, job_id) for job_id in (1, 4, 5)]
+    second_page = [make_job(base_url, job_id) for job_id in (1, 6, 7)]
+
+    session = service.start()
+    session.add(first_page)
+    session.add(second_page)
+    workers = list(session._workers)
+    enriched = await session.finish()
+
+    assert enriched == 6
+    assert len(workers) == JobDescriptionsService.WORKERS
+    assert all(worker.done() for worker in workers)
+    # the job of both pages is fetched once
+    assert sorted(requests) == ["1", "4", "5", "6", "7"]
+    assert second_page[0].description == "Build services for job 1. Python SQL"
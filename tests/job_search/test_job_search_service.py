@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.services.job_scrapers.abstract_jobs_scraper_service import AbstractJobsScraperService
+from llm.mcp_servers.job_search.services.jobs_dedup_service import JobsDedupService
+from llm.mcp_servers.job_search.services.jobs_filter_service import JobsFilterService
+from llm.mcp_servers.job_search.services.jobs_saver_service import JobsSaverService
+from llm.mcp_servers.persistence.mcp_company_sqlite_persist import MCPCompanySQLitePersist
+from llm.mcp_servers.services import job_search_service as job_search_module
+from llm.mcp_servers.services.company_mcp_service import CompanyMCPService
+from llm.mcp_servers.services.job_search_service import JobSearchService
+from utils import file_utils
+
+
+class StubScraper(AbstractJobsScraperService):
+    """Returns fixed jobs after a delay, or raises"""
+
+    def __init__(self, jobs: list[ScrapedJob], delay: float = 0.0, error: Exception = None):
+        super().__init__()
+        self.jobs, self.delay, self.error = jobs, delay, error
+
+    async def run_scraper(self, job_title, location, remote=False, forbidden_titles=None, max_pages=3, on_page=None):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.jobs
+
+
+class PagingStubScraper(AbstractJobsScraperService):
+    """Reports one page of jobs per delay, from a worker thread"""
+
+    def __init__(self, pages: list[list[ScrapedJob]], delay: float):
+        super().__init__()
+        self.pages, self.delay = pages, delay
+
+    async def run_scraper(self, job_title, location, remote=False, forbidden_titles=None, max_pages=3, on_page=None):
+        return await asyncio.get_running_loop().run_in_executor(None, self._scrape, on_page)
+
+    def _scrape(self, on_page):
+        jobs = []
+        for page in self.pages:
+            time.sleep(self.delay)
+            jobs.extend(page)
+            on_page(page)
+        return jobs
+
+
+def make_scraped_job(company: str, title: str, link: str) -> ScrapedJob:
+    return ScrapedJob(title=title, company=company, location="Tel Aviv", description=title, link=link)
+
+
+@pytest.fixture
+async def company_mcp_service(tmp_path):
+    persist = await MCPCompanySQLitePersist.create(tmp_path / "job_tracker.db")
+    yield CompanyMCPService(persist)
+    await persist.close()
+
+@pytest.fixture(autouse=True)
+def job_search_config(tmp_path, monkeypatch):
+    config_file = tmp_path / "job_keywords.json"
+    config_file.write_text(json.dumps({"job_search": {"source_timeouts": {"slow": 0.2}}}))
+    monkeypatch.setattr(job_search_module, "JOB_SEARCH_CONFIG_FILE", config_file)
+    monkeypatch.setattr(file_utils, "JOB_FILE_DIR", tmp_path / "saved_jobs")
+
+def make_service(company_mcp_service, job_scrapers: dict) -> JobSearchService:
+    dedup_service = JobsDedupService()
+    return JobSearchService(job_scrapers, company_mcp_service, JobsFilterService(company_mcp_service, dedup_service),
+                            JobsSaverService(), dedup_service)
+
+
+@pytest.mark.asyncio
+async def test_sources_run_concurrently_and_are_deduplicated(company_mcp_service, tmp_path):
+    service = make_service(company_mcp_service, {
+        "linkedin": StubScraper([make_scraped_job("Acme", "Backend Developer", "https://acme.com/jobs/1")], delay=0.3),
+        "glassdoor": StubScraper([make_scraped_job("Acme Ltd", "Back-End Developer", "https://glassdoor.com/job?jl=5"),
+                                  make_scraped_job("Globex", "QA Engineer", "https://globex.com/jobs/2")], delay=0.3),
+    })
+
+    start = time.perf_counter()
+    jobs = await service.search_jobs_from_internet(user_id="user")
+
+    assert time.perf_counter() - start < 0.55
+    assert [job.company for job in jobs] == ["Acme", "Globex"]
+    assert sorted(path.name for path in (tmp_path / "saved_jobs").iterdir()) == \
+        ["non_applied_jobs_glassdoor.json", "non_applied_jobs_linkedin.json"]
+
+@pytest.mark.asyncio
+async def test_failed_and_slow_sources_return_partial_results(company_mcp_service):
+    service = make_service(company_mcp_service, {
+        "linkedin": StubScraper([make_scraped_job("Acme", "Backend Developer", "https://acme.com/jobs/1")]),
+        "glassdoor": StubScraper([], error=RuntimeError("blocked")),
+        "slow": StubScraper([make_scraped_job("Globex", "QA Engineer", "https://globex.com/jobs/2")], delay=5),
+    })
+
+    jobs = await asyncio.wait_for(service.search_jobs_from_internet(user_id="user"), 2)
+
+    assert [job.company for job in jobs] == ["Acme"]
+
+@pytest.mark.asyncio
+async def test_search_single_source(company_mcp_service):
+    service = make_service(company_mcp_service, {
+        "linkedin": StubScraper([make_scraped_job("Acme", "Backend Developer", "https://acme.com/jobs/1")]),
+        "glassdoor": StubScraper([make_scraped_job("Globex", "QA Engineer", "https://globex.com/jobs/2")]),
+    })
+
+    jobs = await service.get_jobs_from_linkedin("Developer", "Tel Aviv", False, "user")
+
+    assert [job.company for job in jobs] == ["Acme"]
+
+@pytest.mark.asyncio
+async def test_jobs_are_reported_page_by_page(company_mcp_service):
+    service = make_service(company_mcp_service, {
+        "linkedin": PagingStubScraper([[make_scraped_job("Acme", "Backend Developer", "https://acme.com/jobs/1")],
+                                       [make_scraped_job("Acme", "Backend Developer", "https://acme.com/jobs/1?ref=2"),
+                                        make_scraped_job("Globex", "QA Engineer", "https://globex.com/jobs/2")]], delay=0.2),
+    })
+    start = time.perf_counter()
+    reported = []
+
+    async def on_jobs(jobs):
+        reported.append(([job.company for job in jobs], time.perf_counter() - start))
+
+    jobs = await service.search_jobs_from_internet(user_id="user", on_jobs=on_jobs)
+
+    assert [companies for companies, _ in reported] == [["Acme"], ["Globex"]]
+    assert reported[0][1] < 0.35
+    assert [job.company for job in jobs] == ["Acme", "Globex"]
@@ -0,0 +1,35 @@
+from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.services.jobs_dedup_service import JobsDedupService
+from llm.mcp_servers.job_search.utils.job_similarity import company_key, title_similarity
+
+
+def make_scraped_job(company: str, title: str, link: str = None, description: str = None) -> ScrapedJob:
+    return ScrapedJob(title=title, company=company, location="Tel Aviv", description=description, link=link)
+
+
+def test_title_similarity_ignores_abbreviations_order_and_markers():
+    assert title_similarity("Senior Backend Developer", "Sr. Back-end Dev (m/f/d)") == 1.0
+    assert title_similarity("Software Engineer, Data Platform", "Data Platform Software Engineer") == 1.0
+    assert title_similarity("Backend Engineer", "Frontend Engineer") < 0.75
+    assert company_key("ACME Technologies Ltd.") == company_key("Acme technologies")
+
+def test_dedupe_keeps_first_occurrence_and_merges_details():
+    jobs = [
+        make_scraped_job("Acme", "Senior Software Engineer", "https://www.linkedin.com/jobs/view/4012345678/?refId=1"),
+        make_scraped_job("Acme", "Python Developer", "https://il.linkedin.com/jobs/search/?currentJobId=4012345678"),
+        make_scraped_job("ACME Ltd", "Senior Softwre Engineer", "https://www.glassdoor.com/job-listing/x?jl=1", "Build things"),
+        make_scraped_job("Globex", "Senior Software Engineer", "https://globex.com/jobs/1"),
+        make_scraped_job("Acme", "Senior Frontend Engineer", "https://acme.com/jobs/2"),
+    ]
+
+    unique_jobs, duplicates = JobsDedupService().dedupe(jobs)
+
+    assert unique_jobs == [jobs[0], jobs[3], jobs[4]]
+    assert duplicates == [jobs[1], jobs[2]]
+    assert unique_jobs[0].description == "Build things"
+
+def test_dedupe_threshold_is_configurable():
+    jobs = [make_scraped_job("Acme", "Senior Python Developer"), make_scraped_job("Acme", "Python Developer")]
+
+    assert len(JobsDedupService().dedupe(jobs)[0]) == 2
+    assert len(JobsDedupService().dedupe(jobs, threshold=0.6)[0]) == 1
@@ -0,0 +1,82 @@
+import pytest
+
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import JobApplicationState, TrackedJob
+from llm.mcp_servers.job_search.models import ScrapedJob
+from llm.mcp_servers.job_search.services.jobs_dedup_service import JobsDedupService
+from llm.mcp_servers.job_search.services.jobs_filter_service import JobsFilterService
+from llm.mcp_servers.persistence.mcp_company_sqlite_persist import MCPCompanySQLitePersist
+from llm.mcp_servers.services.applied_jobs_index import canonical_job_url
+from llm.mcp_servers.services.company_mcp_service import CompanyMCPService
+from user.services.user_registry_service import UserRegistryService
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "job_tracker.db"
+
+@pytest.fixture
+async def job_service(db_path):
+    service = await JobTrackingService.create_local(db_path)
+    yield service
+    await service.application_persist.close()
+
+@pytest.fixture
+async def user_id(db_path, job_service):
+    user_service = await UserRegistryService.create_local(db_path)
+    try:
+        return (await user_service.register_async("filter@example.com")).user_id
+    finally:
+        await user_service.user_persist.close()
+
+@pytest.fixture
+async def company_mcp_service(db_path, job_service):
+    persist = await MCPCompanySQLitePersist.create(db_path)
+    yield CompanyMCPService(persist)
+    await persist.close()
+
+@pytest.fixture
+def jobs_filter(company_mcp_service):
+    return JobsFilterService(company_mcp_service, JobsDedupService())
+
+
+def make_scraped_job(company: str, title: str, link: str) -> ScrapedJob:
+    return ScrapedJob(title=title, company=company, location="Tel Aviv", description=title, link=link)
+
+async def track(job_service, user_id, company: str, title: str, url: str):
+    await job_service.track_new_job(user_id, company, TrackedJob(job_url=url, job_title=title, job_state=JobApplicationState.APPLIED))
+
+
+def test_canonical_job_url_drops_tracking_noise():
+    assert canonical_job_url("https://www.linkedin.com/jobs/view/python-developer-at-acme-4012345678/?refId=abc&trackingId=x") \
+        == canonical_job_url("https://il.linkedin.com/jobs/search/?currentJobId=4012345678&keywords=python")
+    assert canonical_job_url("https://www.glassdoor.com/job-listing/dev?jl=1009&src=GD_JOB_AD#apply") == "glassdoor.com/job-listing/dev?jl=1009"
+
+@pytest.mark.asyncio
+async def test_filter_matches_url_variants_and_titles(jobs_filter, job_service, user_id):
+    await track(job_service, user_id, "Acme", "Backend Developer", "https://www.linkedin.com/jobs/view/4012345678/")
+    scraped = [
+        make_scraped_job("ACME ", "Python Engineer", "https://il.linkedin.com/jobs/view/python-engineer-at-acme-4012345678?refId=1"),
+        make_scraped_job("acme", "backend  developer", "https://acme.com/careers/7"),
+        make_scraped_job("Acme Ltd.", "Back-End Dev (m/f/d)", "https://acme.com/careers/9"),
+        make_scraped_job("Acme", "Data Engineer", "https://acme.com/careers/8"),
+        make_scraped_job("Globex", "Backend Developer", "https://globex.com/careers/1"),
+    ]
+
+    filtered, tracked = await jobs_filter.filter_jobs(scraped, user_id)
+
+    assert [job.title for job in tracked] == ["Python Engineer", "backend  developer", "Back-End Dev (m/f/d)"]
+    assert [job.company for job in filtered] == ["Acme", "Globex"]
+
+@pytest.mark.asyncio
+async def test_index_picks_up_jobs_tracked_after_it_was_loaded(jobs_filter, company_mcp_service, job_service, user_id):
+    await track(job_service, user_id, "Acme", "Backend Developer", "https://acme.com/careers/7")
+    scraped = [make_scraped_job("Globex", "QA Engineer", "https://globex.com/careers/1")]
+    first_index = await company_mcp_service.get_applied_jobs_index(user_id)
+    assert (await jobs_filter.filter_jobs(scraped, user_id))[1] == []
+
+    await track(job_service, user_id, "Globex", "QA Engineer", "https://globex.com/careers/1")
+
+    filtered, tracked = await jobs_filter.filter_jobs(scraped, user_id)
+    assert (filtered, tracked) == ([], scraped)
+    assert await company_mcp_service.get_applied_jobs_index(user_id) is first_index
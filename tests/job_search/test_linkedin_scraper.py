@@ -0,0 +1,127 @@
+import asyncio
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from llm.mcp_servers.job_search.services.job_scrapers.linkedin_jobs_scraper_service import LinkedInJobsScraperService
+from llm.mcp_servers.job_search.utils.linkedin_html import parse_job_cards
+from llm.mcp_servers.job_search.utils.rate_limiter import TokenBucket
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "mockups" / "linkedin"
+
+JOB_CARD = """
+<div class="base-card">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/{job_id}/"></a>
+  <h3 class="base-search-card__title">{title}</h3>
+  <h4 class="base-search-card__subtitle">Acme</h4>
+  <span class="job-search-card__location">Tel Aviv</span>
+  <time class="job-search-card__listdate" datetime="2026-10-01"></time>
+</div>
+"""
+
+
+@pytest.fixture
+async def aiohttp_server_factory():
+    runners = []
+
+    async def start(pages_with_jobs: int, delay: float = 0.2):
+        requested_pages = []
+
+        async def jobs_page(request: web.Request) -> web.Response:
+            start_index = int(request.query["start"])
+            requested_pages.append(start_index)
+            await asyncio.sleep(delay)
+            page = start_index // LinkedInJobsScraperService.RESULTS_PER_PAGE
+            cards = "".join(JOB_CARD.format(job_id=page * 10 + index, title=f"Developer {page}-{index}")
+                            for index in range(3)) if page < pages_with_jobs else ""
+            return web.Response(text=f"<html><body>{cards}</body></html>", content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/jobs", jobs_page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        runners.append(runner)
+        port = runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}/jobs?keywords=developer", requested_pages
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
+
+@pytest.fixture
+async def scraper():
+    service = LinkedInJobsScraperService()
+    service.REQUESTS_PER_SECOND = 100
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_pages_are_fetched_concurrently(scraper, aiohttp_server_factory):
+    search_url, _ = await aiohttp_server_factory(pages_with_jobs=4)
+    reported_pages = []
+
+    start = time.perf_counter()
+    jobs = await scraper._scrape_job_listings(search_url, forbidden_titles=["Developer 1-"], max_pages=4,
+                                              on_page=reported_pages.append)
+
+    assert time.perf_counter() - start < 0.6
+    assert [job.title for job in jobs] == ["Developer 0-0", "Developer 0-1", "Developer 0-2",
+                                           "Developer 2-0", "Developer 2-1", "Developer 2-2",
+                                           "Developer 3-0", "Developer 3-1", "Developer 3-2"]
+    assert str(jobs[0].link) == "https://www.linkedin.com/jobs/view/0/"
+    assert len(reported_pages) == 3
+
+@pytest.mark.asyncio
+async def test_pages_after_the_last_results_are_not_fetched(scraper, aiohttp_server_factory):
+    scraper.MAX_CONCURRENT_REQUESTS = 1
+    search_url, requested_pages = await aiohttp_server_factory(pages_with_jobs=1, delay=0.05)
+
+    jobs = await scraper._scrape_job_listings(search_url, forbidden_titles=[], max_pages=5)
+
+    assert len(jobs) == 3
+    # the page in flight when the empty page is parsed may still be requested, the rest are not
+    assert requested_pages[:2] == [0, 25] and len(requested_pages) <= 3
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests_after_the_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    start = time.perf_counter()
+    for _ in range(4):
+        await bucket.acquire()
+
+    # two immediately, then one every 50 ms
+    assert 0.09 < time.perf_counter() - start < 0.2
+
+def test_cards_of_a_saved_results_page_are_parsed():
+    content = (FIXTURES_DIR / "search_results_page.html").read_bytes()
+
+    cards = parse_job_cards(content)
+    jobs = LinkedInJobsScraperService()._parse_job_cards(content, forbidden_titles=["Team Lead"])
+
+    assert len(cards) == 25
+    # the card without a link is dropped, as are the forbidden titles
+    assert "link" not in cards[13]
+    assert len(jobs) == 24 - sum("Team Lead" in card["title"] for card in cards)
+    assert all(str(job.link).startswith("https://il.linkedin.com/jobs/view/") for job in jobs)
+    # the company link of cards without a subtitle, and no date on "new" cards
+    assert cards[5]["company"] == "Globex" and "posted_date" not in cards[3]
+
+def test_cards_of_a_results_fragment_are_parsed():
+    jobs = LinkedInJobsScraperService()._parse_job_cards(
+        (FIXTURES_DIR / "search_results_fragment.html").read_bytes(), forbidden_titles=[])
+
+    assert len(jobs) == 10
+    assert jobs[4].posted_date == date.today()
+    # pages without a charset are read as utf-8
+    assert any(job.location.startswith("תל אביב") for job in jobs)
+
+def test_page_without_cards():
+    assert parse_job_cards(b"<html><body><p>No jobs</p></body></html>") is None
+    assert parse_job_cards(b"") is None
@@ -0,0 +1,26 @@
+import pytest
+
+from llm.llm_client.mcp_client import JOB_SEARCH_TOOLS, STREAMING_TOOLS, SmartMCPClient
+from llm.mcp_servers.job_applicant_mcp import mcp
+
+
+@pytest.fixture
+async def server_tools() -> set[str]:
+    return {tool.name for tool in await mcp.list_tools()}
+
+
+@pytest.mark.asyncio
+async def test_client_tool_names_are_served(server_tools):
+    client_tools = {*JOB_SEARCH_TOOLS, *STREAMING_TOOLS, *STREAMING_TOOLS.values()}
+    assert client_tools <= server_tools
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query, tool", [
+    ("Search for jobs on the internet", "search_jobs_on_the_internet"),
+    ("Refine my resume for this job", "get_resume_files"),
+])
+async def test_keyword_shortcut_selects_a_served_tool(server_tools, query, tool):
+    selected_tool = SmartMCPClient._get_tool_and_params_using_keywords(query).selected_tool
+
+    assert selected_tool == tool
+    assert selected_tool in server_tools
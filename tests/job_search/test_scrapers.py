@@ -1,11 +1,23 @@
+import os
+
 import pytest
 from dependency_injector import containers, providers
+from playwright.sync_api import sync_playwright
 
 from jobs_tracking.job_tracking_linkedin_parser import extract_linkedin_job
 from llm.mcp_servers.job_search.services.job_scrapers.glassdoor_jobs_scraper_service import GlassdoorJobsScraperService
 from llm.mcp_servers.job_search.services.job_scrapers.linkedin_jobs_scraper_service import LinkedInJobsScraperService
 from llm.mcp_servers.job_search.models import ScrapedJob
 
+def _chromium_installed() -> bool:
+    try:
+        with sync_playwright() as playwright:
+            return os.path.exists(playwright.chromium.executable_path)
+    except Exception:
+        return False
+
+requires_chromium = pytest.mark.skipif(not _chromium_installed(), reason="Playwright Chromium is not installed")
+
 class Container(containers.DeclarativeContainer):
     linkedin_scraper = providers.Factory(LinkedInJobsScraperService)
     glassdoor_scraper = providers.Factory(GlassdoorJobsScraperService)
@@ -19,8 +31,10 @@ def linkedin_jobs_scraper(container):
     return container.linkedin_scraper()
 
 @pytest.fixture
-def glassdoor_jobs_scraper(container):
-    return container.glassdoor_scraper()
+async def glassdoor_jobs_scraper(container):
+    scraper = container.glassdoor_scraper()
+    yield scraper
+    await scraper.browser_pool.close()
 
 @pytest.mark.asyncio
 async def test_linkedin_scraper(linkedin_jobs_scraper):
@@ -33,6 +47,7 @@ async def test_linkedin_scraper(linkedin_jobs_scraper):
         assert jobs[0].title.lower().find("python") != -1
 
 
+@requires_chromium
 @pytest.mark.asyncio
 async def test_glassdoor_scraper(glassdoor_jobs_scraper):
     """
@@ -53,7 +68,9 @@ async def test_scraper_empty_query(linkedin_jobs_scraper, glassdoor_jobs_scraper
     glassdoor_jobs = await glassdoor_jobs_scraper.run_scraper("", "")
     
     assert isinstance(linkedin_jobs, list)
-    assert isinstance(glassdoor_jobs, list)
+    assert glassdoor_jobs == []
+    # an empty query does not launch a browser
+    assert glassdoor_jobs_scraper.browser_pool.launches == 0
 
 def test_linkedin_job_and_company_scaper():
     url = "https://www.linkedin.com/jobs/view/4343611949/"
@@ -0,0 +1,90 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import JobApplicationState, JobTrackingResponseCode
+
+from tests.mockups.mongo_mockups import MockCompanyMongoPersist
+
+USER_ID = "user-1"
+
+JOB_STATES = {
+    "acme": ["CONNECTION_REQUESTED", "MESSAGE_SENT", "APPLIED", "APPLIED"],
+    "globex": ["CONNECTION_REQUESTED", "EMAIL_SENT"],
+    "initech": ["CONNECTION_REQUESTED"]
+}
+
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.tracked_jobs.drop()
+
+@pytest.fixture
+def job_service(db):
+    return JobTrackingService(MockCompanyMongoPersist(db))
+
+@pytest.fixture
+def tracked_jobs(db):
+    now = datetime.now(timezone.utc)
+    jobs = []
+    for company_name, states in JOB_STATES.items():
+        for index, state in enumerate(states):
+            jobs.append({
+                "user_id": USER_ID,
+                "job_id": f"{company_name}-{index}",
+                "job_url": f"https://example.com/{company_name}/{index}",
+                "job_title": "Developer",
+                "job_state": state,
+                "company_name": company_name,
+                "company_id": f"{company_name}-id",
+                # one job per week going back, the initech job is older than the analytics window
+                "update_time": now - timedelta(weeks=len(jobs) * 3)
+            })
+    other_user_job = {**jobs[0], "user_id": "other-user", "job_id": "other-job"}
+    db.tracked_jobs.insert_many(jobs + [other_user_job])
+    return jobs
+
+
+@pytest.mark.asyncio
+async def test_job_analytics_counts_per_state_and_company(job_service, tracked_jobs):
+    analytics = await job_service.get_job_analytics(USER_ID)
+
+    assert analytics.code == JobTrackingResponseCode.OK
+    assert analytics.total == 7
+    assert analytics.by_state == {"APPLIED": 2, "CONNECTION_REQUESTED": 3, "EMAIL_SENT": 1, "MESSAGE_SENT": 1}
+    assert list(analytics.by_company.items()) == [("acme", 4), ("globex", 2), ("initech", 1)]
+
+@pytest.mark.asyncio
+async def test_job_analytics_weeks_are_limited_to_the_window(job_service, tracked_jobs):
+    analytics = await job_service.get_job_analytics(USER_ID, weeks=12)
+
+    # jobs are 3 weeks apart, so the last 12 weeks hold the 4 most recent ones
+    assert sum(analytics.by_week.values()) == 4
+    assert list(analytics.by_week) == sorted(analytics.by_week)
+    assert all("-W" in week for week in analytics.by_week)
+
+@pytest.mark.asyncio
+async def test_job_analytics_funnel_conversion(job_service, tracked_jobs):
+    analytics = await job_service.get_job_analytics(USER_ID)
+
+    assert [step.state for step in analytics.funnel] == [
+        JobApplicationState.CONNECTION_REQUESTED,
+        JobApplicationState.MESSAGE_SENT,
+        JobApplicationState.EMAIL_SENT,
+        JobApplicationState.APPLIED
+    ]
+    assert [step.reached for step in analytics.funnel] == [7, 4, 3, 2]
+    assert analytics.funnel[0].conversion is None
+    assert analytics.funnel[1].conversion == pytest.approx(4 / 7)
+    assert analytics.funnel[3].conversion == pytest.approx(2 / 3)
+
+@pytest.mark.asyncio
+async def test_job_analytics_without_jobs(job_service):
+    analytics = await job_service.get_job_analytics(USER_ID)
+
+    assert analytics.code == JobTrackingResponseCode.OK
+    assert analytics.total == 0
+    assert analytics.by_state == {}
+    assert [step.reached for step in analytics.funnel] == [0, 0, 0, 0]
+    assert all(step.conversion is None for step in analytics.funnel[1:])
@@ -0,0 +1,99 @@
+import pytest
+import mongomock
+from datetime import datetime, timezone
+
+from jobs_tracking.repository.company_mongo_persist import company_id_for
+from jobs_tracking.repository.job_applications_migration import migrate_job_applications
+
+from tests.mockups.mongo_mockups import AsyncMockDatabase, MockCompanyMongoPersist
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().job_tracker_migration_test
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.job_applications.drop()
+    db.tracked_jobs.drop()
+
+
+def _legacy_job(job_id: str, job_url: str) -> dict:
+    return {
+        "job_id": job_id,
+        "job_url": job_url,
+        "job_title": "Developer",
+        "job_state": "APPLIED",
+        "update_time": datetime.now(timezone.utc),
+        "company_id": "company-1"
+    }
+
+
+@pytest.mark.asyncio
+async def test_migrate_job_applications_creates_document_per_job(db):
+    persist = MockCompanyMongoPersist(db)
+    await persist.create_index()
+    db.job_applications.insert_one({
+        "user_id": "user-1",
+        "company_name": "acme",
+        "company_id": "company-1",
+        "jobs": [_legacy_job("job-1", "https://acme.com/jobs/1"), _legacy_job("job-2", "https://acme.com/jobs/2")]
+    })
+
+    result = await migrate_job_applications(AsyncMockDatabase(db))
+
+    assert result.companies == 1
+    assert result.migrated == 2
+    response = await persist.get_tracked_jobs("user-1", "acme")
+    assert response.id == company_id_for("user-1", "acme")
+    assert {job["job_id"] for job in response.data} == {"job-1", "job-2"}
+
+
+@pytest.mark.asyncio
+async def test_migrate_job_applications_is_idempotent(db):
+    db.job_applications.insert_one({
+        "user_id": "user-1",
+        "company_name": "acme",
+        "company_id": "company-1",
+        "jobs": [_legacy_job("job-1", "https://acme.com/jobs/1")]
+    })
+
+    await migrate_job_applications(AsyncMockDatabase(db))
+    second_run = await migrate_job_applications(AsyncMockDatabase(db), drop_legacy=True)
+
+    assert second_run.migrated == 0
+    assert db.tracked_jobs.count_documents({}) == 1
+    assert "job_applications" not in db.list_collection_names()
+
+
+@pytest.mark.asyncio
+async def test_create_index_copies_legacy_jobs(db):
+    db.job_applications.insert_one({
+        "user_id": "user-1",
+        "company_name": "acme",
+        "company_id": "company-1",
+        "jobs": [_legacy_job("job-1", "https://acme.com/jobs/1"), _legacy_job("job-2", "https://acme.com/jobs/2")]
+    })
+    persist = MockCompanyMongoPersist(db)
+    await persist.create_index()
+    db.tracked_jobs.update_one({"job_id": "job-1"}, {"$set": {"job_state": "INTERVIEW"}})
+
+    # a restart keeps the jobs updated since the copy
+    await persist.create_index()
+
+    response = await persist.get_tracked_jobs("user-1", "acme")
+    assert {job["job_id"]: job["job_state"] for job in response.data} == {"job-1": "INTERVIEW", "job-2": "APPLIED"}
+
+
+@pytest.mark.asyncio
+async def test_create_index_adds_job_indexes(db):
+    persist = MockCompanyMongoPersist(db)
+    await persist.create_index()
+
+    indexes = db.tracked_jobs.index_information()
+    keys = [index["key"] for index in indexes.values()]
+    assert [("user_id", 1), ("company_name", 1)] in keys
+    assert [("user_id", 1), ("update_time", -1), ("job_id", -1)] in keys
+    unique_url_index = next(index for index in indexes.values() if index["key"] == [("user_id", 1), ("job_url", 1)])
+    assert unique_url_index["unique"] is True
@@ -6,6 +6,7 @@ from jobs_tracking.services.models import JobApplicationState, JobTrackingRespon
 from tests.mockups.mongo_mockups import MockCompanyMongoPersist, MockUserMongoPersist
 import mongomock
 import time
+import asyncio
 
 @pytest.fixture
 def db():
@@ -18,6 +19,7 @@ def cleanup_db(db):
     # Cleanup after test
     db.users.drop()
     db.job_applications.drop()
+    db.tracked_jobs.drop()
 
 
 @pytest.fixture
@@ -401,9 +403,99 @@ async def test_delete_tracked_jobs(user_service, job_service):
     # Use the company object returned, which contains the job to delete
     company_to_delete = res.company
     
-    success = await job_service.delete_tracked_jobs(user_id, [company_to_delete])
-    assert success is True
+    result = await job_service.delete_tracked_jobs(user_id, [company_to_delete])
+    assert result.success is True
+    assert result.deleted_count == 1
+    assert result.companies == {company_name.lower(): 1}
+    assert result.jobs == {job.job_url: 1}
     
     # 5. Verify it is gone
     res_after = await job_service.get_tracked_jobs(user_id, company_name)
-    assert res_after.code == JobTrackingResponseCode.NO_TRACKED_JOBS
\ No newline at end of file
+    assert res_after.code == JobTrackingResponseCode.NO_TRACKED_JOBS
+
+@pytest.mark.asyncio
+async def test_track_same_url_twice_keeps_one_job(user_service, job_service, db):
+    """Test that tracking a job url again updates the stored job instead of adding a new one."""
+    auth_res = await user_service.register_async("repeat@example.com")
+    user_id = auth_res.user_id
+
+    job = TrackedJob(
+        job_url="https://example.com/job/repeat",
+        job_title="Developer",
+        job_state=JobApplicationState.APPLIED
+    )
+    res1 = await job_service.track_new_job(user_id, "Repeat Company", job)
+    job.job_state = JobApplicationState.EMAIL_SENT
+    res2 = await job_service.track_new_job(user_id, "Repeat Company", job)
+
+    assert res2.code == JobTrackingResponseCode.OK
+    assert res2.job.job_id == res1.job.job_id
+    assert res2.job.job_state == JobApplicationState.EMAIL_SENT
+    assert db.tracked_jobs.count_documents({"user_id": user_id}) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_track_same_url_creates_one_job(user_service, job_service, db):
+    """Test that concurrent tracks of the same url end up as a single job of the same company."""
+    auth_res = await user_service.register_async("concurrent@example.com")
+    user_id = auth_res.user_id
+
+    jobs = [
+        TrackedJob(job_url="https://example.com/job/concurrent", job_title="Developer", job_state=state)
+        for state in (JobApplicationState.APPLIED, JobApplicationState.MESSAGE_SENT)
+    ]
+    responses = await asyncio.gather(*(job_service.track_new_job(user_id, "Concurrent Company", job) for job in jobs))
+
+    assert all(response.code == JobTrackingResponseCode.OK for response in responses)
+    assert responses[0].job.job_id == responses[1].job.job_id
+    assert responses[0].company_id == responses[1].company_id
+    assert db.tracked_jobs.count_documents({"user_id": user_id}) == 1
+
+
+
+@pytest.mark.asyncio
+async def test_delete_tracked_jobs_of_many_companies(user_service, job_service):
+    """Test deleting jobs of several companies at once, including a job that is already gone."""
+    auth_res = await user_service.register_async("multi.deleter@example.com")
+    user_id = auth_res.user_id
+
+    companies = []
+    for company_name in ("First Company", "Second Company"):
+        for index in range(2):
+            job = TrackedJob(job_url=f"https://example.com/{company_name}/{index}", job_title="Developer",
+                             job_state=JobApplicationState.APPLIED)
+            await job_service.track_new_job(user_id, company_name, job)
+        companies.append((await job_service.get_tracked_jobs(user_id, company_name)).company)
+
+    result = await job_service.delete_tracked_jobs(user_id, companies)
+    assert result.deleted_count == 4
+    assert result.companies == {"first company": 2, "second company": 2}
+
+    first_job, second_job = companies[0].tracked_jobs
+    await job_service.track_new_job(user_id, "First Company", first_job)
+    result = await job_service.delete_tracked_jobs(user_id, companies[:1])
+    assert result.success is True
+    assert result.deleted_count == 1
+    assert result.companies == {"first company": 1}
+    assert result.jobs == {first_job.job_url: 1, second_job.job_url: 0}
+
+    result = await job_service.delete_tracked_jobs(user_id, companies[:1])
+    assert result.success is False
+    assert result.deleted_count == 0
+    assert result.companies == {"first company": 0}
+    assert result.jobs == {job.job_url: 0 for job in companies[0].tracked_jobs}
+
+@pytest.mark.asyncio
+async def test_deleted_user_is_forgotten_after_ttl(db, user_service, monkeypatch):
+    monkeypatch.setattr(MockCompanyMongoPersist, "KNOWN_USERS_TTL_SECONDS", 0.05)
+    job_service = JobTrackingService(MockCompanyMongoPersist(db))
+    user_id = (await user_service.register_async("deleted.user@example.com")).user_id
+    job = TrackedJob(job_url="https://example.com/job/deleted", job_title="Developer",
+                     job_state=JobApplicationState.APPLIED)
+    assert (await job_service.track_new_job(user_id, "Some Company", job)).code == JobTrackingResponseCode.OK
+
+    db.users.delete_one({"_id": user_id})
+    await asyncio.sleep(0.1)
+
+    job.job_url = "https://example.com/job/after-delete"
+    assert (await job_service.track_new_job(user_id, "Some Company", job)).code == JobTrackingResponseCode.ERROR
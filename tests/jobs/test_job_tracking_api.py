@@ -0,0 +1,74 @@
+import pytest
+
+from jobs_tracking.job_tracking_api import JobTrackingApi
+from jobs_tracking.models import JobTrackingApiResponseCode, TrackedJobDto
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import JobApplicationState
+from user.services.user_registry_service import UserRegistryService
+from utils.utils import AsyncRunner
+
+from tests.mockups.mongo_mockups import MockCompanyMongoPersist, MockUserMongoPersist
+
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.users.drop()
+    db.tracked_jobs.drop()
+
+@pytest.fixture
+def async_runner():
+    AsyncRunner.start()
+    yield
+    AsyncRunner.shutdown()
+
+@pytest.fixture
+def job_tracking_api(db, async_runner):
+    return JobTrackingApi(JobTrackingService(MockCompanyMongoPersist(db)))
+
+@pytest.fixture
+def user_id(db, async_runner):
+    return AsyncRunner.run_async(UserRegistryService(MockUserMongoPersist(db)).register_async("api@example.com")).user_id
+
+
+def test_track_then_update_job_through_the_api(job_tracking_api, user_id):
+    job_dto = TrackedJobDto(job_id=None, job_url="https://acme.com/jobs/1", job_title="Developer",
+                            job_state=JobApplicationState.APPLIED)
+    created = job_tracking_api.track_new_job(user_id, "Acme", job_dto)
+    assert created["code"] == JobTrackingApiResponseCode.OK
+
+    company = job_tracking_api.get_tracked_jobs(user_id, "Acme")["company"]
+    [job] = company["tracked_jobs"]
+    job["job_state"] = JobApplicationState.EMAIL_SENT
+    updated = job_tracking_api.track_existing_job(user_id, company["company_id"], TrackedJobDto(**job))
+
+    assert updated["code"] == JobTrackingApiResponseCode.OK
+    company = job_tracking_api.get_tracked_jobs(user_id, "Acme")["company"]
+    assert company["tracked_jobs"][0]["job_state"] == JobApplicationState.EMAIL_SENT
+
+def test_queued_update_through_the_api(job_tracking_api, user_id):
+    job_tracking_api.job_tracking_service.enable_write_behind(flush_delay=60)
+    job_dto = TrackedJobDto(job_id=None, job_url="https://acme.com/jobs/1", job_title="Developer",
+                            job_state=JobApplicationState.APPLIED)
+    job_tracking_api.track_new_job(user_id, "Acme", job_dto)
+    company = job_tracking_api.get_tracked_jobs(user_id, "Acme")["company"]
+    [job] = company["tracked_jobs"]
+    job["job_state"] = JobApplicationState.EMAIL_SENT
+
+    updated = job_tracking_api.track_existing_job(user_id, company["company_id"], TrackedJobDto(**job))
+
+    assert updated["code"] == JobTrackingApiResponseCode.OK
+    assert updated["job"]["update_time"]
+    # the company is read with the queued update before it is written
+    [queued_job] = job_tracking_api.get_tracked_jobs(user_id, "Acme")["company"]["tracked_jobs"]
+    assert queued_job["job_state"] == JobApplicationState.EMAIL_SENT
+    assert queued_job["update_time"]
+    assert job_tracking_api.job_tracking_service.flush_pending_updates_sync() == []
+
+def test_update_with_invalid_company_id_is_rejected(job_tracking_api, user_id):
+    job_dto = TrackedJobDto(job_id="5b2d1c9e-8f3a-4d6b-9c1e-2a3b4c5d6e7f", job_url="https://acme.com/jobs/1",
+                            job_title="Developer", job_state=JobApplicationState.APPLIED)
+
+    response = job_tracking_api.track_existing_job(user_id, "not-a-uuid", job_dto)
+
+    assert response["code"] == JobTrackingApiResponseCode.INVALID_PARAMETER
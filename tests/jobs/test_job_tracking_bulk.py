@@ -0,0 +1,81 @@
+import json
+import pytest
+
+from jobs_tracking.job_tracking_api import JobTrackingApi
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import BulkTrackStatus, Company, JobApplicationState, TrackedJob
+from user.services.user_registry_service import UserRegistryService
+from utils.utils import AsyncRunner
+
+from tests.mockups.mongo_mockups import MockCompanyMongoPersist, MockUserMongoPersist
+
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.users.drop()
+    db.tracked_jobs.drop()
+
+@pytest.fixture
+def user_service(db):
+    return UserRegistryService(MockUserMongoPersist(db))
+
+@pytest.fixture
+def job_service(db):
+    return JobTrackingService(MockCompanyMongoPersist(db))
+
+@pytest.fixture
+def async_runner():
+    AsyncRunner.start()
+    yield
+    AsyncRunner.shutdown()
+
+
+def _job(url: str, title: str = "Developer") -> TrackedJob:
+    return TrackedJob(job_url=url, job_title=title, job_state=JobApplicationState.APPLIED)
+
+
+@pytest.mark.asyncio
+async def test_track_jobs_bulk_returns_result_per_job(user_service, job_service, db):
+    user_id = (await user_service.register_async("bulk@example.com")).user_id
+    await job_service.track_new_job(user_id, "Acme", _job("https://acme.com/jobs/1"))
+
+    results = await job_service.track_jobs_bulk(user_id, [
+        Company(company_id=None, company_name="Acme", tracked_jobs=[_job("https://acme.com/jobs/1", "Lead"), _job("https://acme.com/jobs/2")]),
+        Company(company_id=None, company_name="Globex", tracked_jobs=[_job("https://globex.com/jobs/1"), _job("", "No url")]),
+    ])
+
+    statuses = {result.job_url: result.status for result in results}
+    assert statuses == {
+        "": BulkTrackStatus.INVALID,
+        "https://acme.com/jobs/1": BulkTrackStatus.UPDATED,
+        "https://acme.com/jobs/2": BulkTrackStatus.CREATED,
+        "https://globex.com/jobs/1": BulkTrackStatus.CREATED,
+    }
+    assert db.tracked_jobs.count_documents({"user_id": user_id}) == 3
+    assert db.tracked_jobs.find_one({"job_url": "https://acme.com/jobs/1"})["job_title"] == "Lead"
+
+
+@pytest.mark.asyncio
+async def test_track_jobs_bulk_unknown_user_fails_all_jobs(job_service):
+    results = await job_service.track_jobs_bulk("unknown-user", [
+        Company(company_id=None, company_name="Acme", tracked_jobs=[_job("https://acme.com/jobs/1")])
+    ])
+
+    assert [result.status for result in results] == [BulkTrackStatus.ERROR]
+
+
+def test_import_jobs_file_streams_batches(user_service, job_service, async_runner, tmp_path, db):
+    user_id = AsyncRunner.run_async(user_service.register_async("import@example.com")).user_id
+    rows = [{"company_name": "Acme", "job_url": f"https://acme.com/jobs/{index}", "job_title": "Developer"}
+            for index in range(5)]
+    rows.append({"company_name": "Acme", "job_url": "https://acme.com/jobs/bad", "job_title": "Developer", "job_state": "NOT_A_STATE"})
+    import_file = tmp_path / "jobs.jsonl"
+    import_file.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+
+    response = JobTrackingApi(job_service).import_jobs_file(user_id, str(import_file), batch_size=2)
+
+    assert response["code"] == "OK"
+    assert (response["total"], response["created"], response["failed"]) == (6, 5, 1)
+    assert response["errors"][0]["status"] == BulkTrackStatus.INVALID
+    assert db.tracked_jobs.count_documents({"user_id": user_id}) == 5
@@ -0,0 +1,28 @@
+import pytest
+
+from jobs_tracking import job_tracking_linkedin_parser
+from jobs_tracking.job_tracking_linkedin_parser import extract_linkedin_job
+
+# utf-8 without a meta charset, as LinkedIn serves job pages
+JOB_PAGE = """
+<html><head><title>Café Ñandú hiring Développeur Backend in Zürich | LinkedIn</title></head>
+<body><a href="https://www.linkedin.com/company/cafe-nandu">Café Ñandú</a></body></html>
+""".encode("utf-8")
+
+
+class FakeResponse:
+    content = JOB_PAGE
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def job_page(monkeypatch):
+    monkeypatch.setattr(job_tracking_linkedin_parser.requests, "get", lambda *args, **kwargs: FakeResponse())
+
+
+def test_utf8_job_page_without_charset(job_page):
+    result = extract_linkedin_job("https://www.linkedin.com/jobs/view/1/")
+
+    assert result == {"job_title": "Développeur Backend", "company_name": "Café Ñandú"}
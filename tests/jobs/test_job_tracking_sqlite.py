@@ -0,0 +1,142 @@
+import pytest
+
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import (
+    BulkTrackStatus, Company, JobApplicationState, JobTrackingResponseCode, TrackedJob
+)
+from llm.mcp_servers.persistence.mcp_company_sqlite_persist import MCPCompanySQLitePersist
+from repository.models import PersistenceErrorCode
+from user.services.user_registry_service import UserRegistryService
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "job_tracker.db"
+
+@pytest.fixture
+async def user_service(db_path):
+    service = await UserRegistryService.create_local(db_path)
+    yield service
+    await service.user_persist.close()
+
+@pytest.fixture
+async def job_service(db_path):
+    service = await JobTrackingService.create_local(db_path)
+    yield service
+    await service.application_persist.close()
+
+@pytest.fixture
+async def user_id(user_service):
+    response = await user_service.register_async("local.user@example.com")
+    return response.user_id
+
+
+def make_job(index: int, state: JobApplicationState = JobApplicationState.APPLIED) -> TrackedJob:
+    return TrackedJob(
+        job_url=f"https://example.com/jobs/{index}",
+        job_title=f"Developer {index}",
+        job_state=state,
+        contact_name="Jane"
+    )
+
+
+@pytest.mark.asyncio
+async def test_track_and_update_job(job_service, user_id):
+    created = await job_service.track_new_job(user_id, "Acme", make_job(1))
+    assert created.code == JobTrackingResponseCode.OK
+
+    response = await job_service.get_tracked_jobs(user_id, "acme")
+    [job] = response.company.tracked_jobs
+    assert job.job_title == "Developer 1"
+
+    job.job_state = JobApplicationState.EMAIL_SENT
+    updated = await job_service.track_existing_job(user_id, response.company.company_id, job)
+    assert updated.code == JobTrackingResponseCode.OK
+
+    response = await job_service.get_tracked_jobs(user_id, "acme")
+    assert response.company.tracked_jobs[0].job_state == JobApplicationState.EMAIL_SENT
+    assert response.company.tracked_jobs[0].job_id == job.job_id
+
+@pytest.mark.asyncio
+async def test_track_job_of_unknown_user(job_service):
+    response = await job_service.track_new_job("unknown-user", "Acme", make_job(1))
+
+    assert response.code != JobTrackingResponseCode.OK
+
+@pytest.mark.asyncio
+async def test_bulk_track_reports_created_and_updated(job_service, user_id):
+    await job_service.track_new_job(user_id, "Acme", make_job(1))
+
+    results = await job_service.track_jobs_bulk(user_id, [
+        Company(company_id=None, company_name="Acme", tracked_jobs=[make_job(1), make_job(2)])
+    ])
+
+    assert [result.status for result in results] == [BulkTrackStatus.UPDATED, BulkTrackStatus.CREATED]
+    assert results[1].job_id is not None
+
+@pytest.mark.asyncio
+async def test_list_tracked_jobs_pages_by_update_time(job_service, user_id):
+    for index in range(5):
+        await job_service.track_new_job(user_id, f"Company {index % 2}", make_job(index))
+
+    first_page = await job_service.list_tracked_jobs(user_id, page_size=3)
+    second_page = await job_service.list_tracked_jobs(user_id, page_token=first_page.next_page_token, page_size=3)
+
+    urls = [job.tracked_job.job_url for job in first_page.jobs + second_page.jobs]
+    assert urls == [f"https://example.com/jobs/{index}" for index in reversed(range(5))]
+    assert second_page.next_page_token is None
+
+    filtered = await job_service.list_tracked_jobs(user_id, job_filter={"company_name": "Company 1"})
+    assert len(filtered.jobs) == 2
+
+@pytest.mark.asyncio
+async def test_delete_tracked_jobs_counts_each_job(job_service, user_id):
+    await job_service.track_new_job(user_id, "Acme", make_job(1))
+
+    result = await job_service.delete_tracked_jobs(user_id, [
+        Company(company_id=None, company_name="acme", tracked_jobs=[make_job(1), make_job(2)])
+    ])
+
+    assert result.deleted_count == 1
+    assert result.jobs == {"https://example.com/jobs/1": 1, "https://example.com/jobs/2": 0}
+
+@pytest.mark.asyncio
+async def test_job_analytics(job_service, user_id):
+    await job_service.track_new_job(user_id, "Acme", make_job(1, JobApplicationState.CONNECTION_REQUESTED))
+    await job_service.track_new_job(user_id, "Acme", make_job(2, JobApplicationState.APPLIED))
+    await job_service.track_new_job(user_id, "Globex", make_job(3, JobApplicationState.MESSAGE_SENT))
+
+    analytics = await job_service.get_job_analytics(user_id)
+
+    assert analytics.total == 3
+    assert list(analytics.by_company.items()) == [("acme", 2), ("globex", 1)]
+    assert sum(analytics.by_week.values()) == 3
+    assert [step.reached for step in analytics.funnel] == [3, 2, 1, 1]
+    assert analytics.funnel[1].conversion == pytest.approx(2 / 3)
+
+@pytest.mark.asyncio
+async def test_mcp_persist_reads_jobs_of_the_application(job_service, user_id, db_path):
+    await job_service.track_new_job(user_id, "Acme", make_job(1))
+    mcp_persist = await MCPCompanySQLitePersist.create(db_path)
+    try:
+        response = await mcp_persist.get_application(user_id, "ACME")
+        applications = await mcp_persist.get_all_applications(user_id)
+    finally:
+        await mcp_persist.close()
+
+    assert response.code == PersistenceErrorCode.SUCCESS
+    assert response.data["jobs"][0]["job_url"] == "https://example.com/jobs/1"
+    assert [application["company_name"] for application in applications.data] == ["acme"]
+
+@pytest.mark.asyncio
+async def test_track_existing_jobs_bulk_reports_missing_jobs(job_service, user_id):
+    created = await job_service.track_new_job(user_id, "Acme", make_job(1))
+    created.job.job_state = JobApplicationState.EMAIL_SENT
+    missing = {**created.job.__dict__, "job_id": "missing-job"}
+
+    response = await job_service.application_persist.track_existing_jobs_bulk(
+        user_id, [(created.company_id, created.job.__dict__), (created.company_id, missing)])
+
+    assert [result["status"] for result in response.data] == [BulkTrackStatus.UPDATED, BulkTrackStatus.ERROR]
+    jobs = (await job_service.get_tracked_jobs(user_id, "acme")).company.tracked_jobs
+    assert jobs[0].job_state == JobApplicationState.EMAIL_SENT
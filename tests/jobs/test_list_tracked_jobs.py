@@ -0,0 +1,82 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import JobTrackingResponseCode
+
+from tests.mockups.mongo_mockups import MockCompanyMongoPersist
+
+USER_ID = "user-1"
+
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.tracked_jobs.drop()
+
+@pytest.fixture
+def job_service(db):
+    return JobTrackingService(MockCompanyMongoPersist(db))
+
+@pytest.fixture
+def tracked_jobs(db):
+    """25 jobs of two companies, where jobs 10 and 11 share the same update_time"""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    jobs = []
+    for index in range(25):
+        update_time = start + timedelta(hours=10 if index == 11 else index)
+        jobs.append({
+            "user_id": USER_ID,
+            "job_id": f"job-{index:02d}",
+            "job_url": f"https://example.com/jobs/{index}",
+            "job_title": "Developer",
+            "job_state": "APPLIED" if index % 2 else "EMAIL_SENT",
+            "company_name": "acme" if index < 15 else "globex",
+            "company_id": "acme-id" if index < 15 else "globex-id",
+            "update_time": update_time
+        })
+    other_user_job = {**jobs[0], "user_id": "other-user", "job_id": "other-job"}
+    db.tracked_jobs.insert_many(jobs + [other_user_job])
+    return jobs
+
+
+async def _all_pages(job_service, **kwargs) -> list:
+    pages = []
+    page_token = None
+    while True:
+        page = await job_service.list_tracked_jobs(USER_ID, page_token=page_token, **kwargs)
+        assert page.code == JobTrackingResponseCode.OK
+        pages.append(page)
+        page_token = page.next_page_token
+        if not page_token:
+            return pages
+
+
+@pytest.mark.asyncio
+async def test_list_tracked_jobs_pages_through_all_jobs(job_service, tracked_jobs):
+    pages = await _all_pages(job_service, page_size=10)
+
+    assert [len(page.jobs) for page in pages] == [10, 10, 5]
+    job_ids = [job.tracked_job.job_id for page in pages for job in page.jobs]
+    assert len(job_ids) == len(set(job_ids)) == 25
+    update_times = [job.tracked_job.update_time for page in pages for job in page.jobs]
+    assert update_times == sorted(update_times, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_list_tracked_jobs_filters_and_sorts_ascending(job_service, tracked_jobs):
+    pages = await _all_pages(job_service, job_filter={"company_name": "Globex", "job_state": "APPLIED"},
+                             sort="update_time_asc", page_size=2)
+
+    jobs = [job for page in pages for job in page.jobs]
+    assert [job.tracked_job.job_id for job in jobs] == ["job-15", "job-17", "job-19", "job-21", "job-23"]
+    assert all(job.company_id == "globex-id" for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_list_tracked_jobs_rejects_bad_request(job_service, tracked_jobs):
+    page = await job_service.list_tracked_jobs(USER_ID, job_filter={"job_url": "x"})
+    assert page.code == JobTrackingResponseCode.ERROR
+
+    page = await job_service.list_tracked_jobs(USER_ID, page_token="not-a-token")
+    assert page.code == JobTrackingResponseCode.ERROR
@@ -0,0 +1,83 @@
+import pytest
+
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import JobApplicationState, JobTrackingResponseCode, TrackedJob
+from user.services.user_registry_service import UserRegistryService
+from utils.lru_cache import LRUTTLCache
+
+from tests.mockups.mongo_mockups import MockCompanyMongoPersist, MockUserMongoPersist
+
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.users.drop()
+    db.tracked_jobs.drop()
+
+@pytest.fixture
+def job_service(db):
+    return JobTrackingService(MockCompanyMongoPersist(db))
+
+@pytest.fixture
+async def user_id(db):
+    return (await UserRegistryService(MockUserMongoPersist(db)).register_async("cache@example.com")).user_id
+
+
+def _job(url: str) -> TrackedJob:
+    return TrackedJob(job_url=url, job_title="Developer", job_state=JobApplicationState.APPLIED)
+
+
+@pytest.mark.asyncio
+async def test_repeated_views_are_served_from_cache(job_service, user_id, db):
+    await job_service.track_new_job(user_id, "Acme", _job("https://acme.com/jobs/1"))
+
+    await job_service.get_tracked_jobs(user_id, "Acme")
+    db.tracked_jobs.delete_many({})  # a cached view does not read the database
+    response = await job_service.get_tracked_jobs(user_id, "acme")
+
+    assert response.code == JobTrackingResponseCode.OK
+    assert len(response.company.tracked_jobs) == 1
+    stats = job_service.get_cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_company(job_service, user_id):
+    first = await job_service.track_new_job(user_id, "Acme", _job("https://acme.com/jobs/1"))
+    await job_service.get_tracked_jobs(user_id, "Acme")
+
+    await job_service.track_new_job(user_id, "Acme", _job("https://acme.com/jobs/2"))
+    response = await job_service.get_tracked_jobs(user_id, "Acme")
+    assert len(response.company.tracked_jobs) == 2
+
+    first.job.job_state = JobApplicationState.EMAIL_SENT
+    await job_service.track_existing_job(user_id, first.company_id, first.job)
+    response = await job_service.get_tracked_jobs(user_id, "Acme")
+    states = {job.job_url: job.job_state for job in response.company.tracked_jobs}
+    assert states["https://acme.com/jobs/1"] == JobApplicationState.EMAIL_SENT
+
+    await job_service.delete_tracked_jobs(user_id, [response.company])
+    response = await job_service.get_tracked_jobs(user_id, "Acme")
+    assert response.code == JobTrackingResponseCode.NO_TRACKED_JOBS
+    assert job_service.get_cache_stats().hits == 0
+
+
+def test_lru_ttl_cache_bounds():
+    cache = LRUTTLCache(max_size=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats().evictions == 1
+
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.put("a", 1, generation)
+    assert cache.get("a") is None
+
+    expired = LRUTTLCache(max_size=2, ttl=-1)
+    expired.put("a", 1)
+    assert expired.get("a") is None
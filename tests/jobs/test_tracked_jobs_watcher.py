@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import JobApplicationState, JobTrackingResponseCode, TrackedJob, TrackedJobChangeType
+from jobs_tracking.services.tracked_jobs_watcher import TrackedJobsWatcher
+
+from tests.mockups.mongo_mockups import MockCompanyMongoPersist
+
+USER_ID = "user-1"
+
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.tracked_jobs.drop()
+
+@pytest.fixture
+def job_service(db):
+    return JobTrackingService(MockCompanyMongoPersist(db))
+
+
+def _job_document(job_id: str, company_name: str = "acme", user_id: str = USER_ID, **fields) -> dict:
+    return {
+        "user_id": user_id,
+        "job_id": job_id,
+        "job_url": f"https://example.com/jobs/{job_id}",
+        "job_title": "Developer",
+        "job_state": "APPLIED",
+        "company_name": company_name,
+        "company_id": f"{company_name}-id",
+        "update_time": datetime.now(timezone.utc) + timedelta(seconds=1),
+        **fields
+    }
+
+
+async def _wait_for(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out waiting for changes"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_watcher_polls_without_change_streams(job_service, db):
+    batches = []
+    watcher = TrackedJobsWatcher(job_service.application_persist, USER_ID, batches.append, poll_interval=0.01)
+    task = asyncio.create_task(watcher.run())
+    try:
+        await _wait_for(lambda: watcher.mode == "polling")
+        db.tracked_jobs.insert_one(_job_document("job-1"))
+        db.tracked_jobs.insert_one(_job_document("other-job", user_id="other-user"))
+        await _wait_for(lambda: batches)
+
+        db.tracked_jobs.update_one({"job_id": "job-1"}, {"$set": {
+            "job_state": "EMAIL_SENT", "update_time": datetime.now(timezone.utc) + timedelta(seconds=2)}})
+        await _wait_for(lambda: len(batches) == 2)
+    finally:
+        task.cancel()
+
+    changes = [change for batch in batches for change in batch]
+    assert [change.job_id for change in changes] == ["job-1", "job-1"]
+    assert changes[0].change_type == TrackedJobChangeType.UPSERT
+    assert changes[0].company_name == "acme"
+    assert changes[1].tracked_job.job_state == "EMAIL_SENT"
+
+
+@pytest.mark.asyncio
+async def test_polling_finds_deleted_jobs(job_service, db):
+    # updated before the watcher starts, so only the delete is a change
+    earlier = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.tracked_jobs.insert_one(_job_document("job-1", update_time=earlier))
+    db.tracked_jobs.insert_one(_job_document("job-2", company_name="globex", update_time=earlier))
+    batches = []
+    watcher = TrackedJobsWatcher(job_service.application_persist, USER_ID, batches.append, poll_interval=0.01)
+    task = asyncio.create_task(watcher.run())
+    try:
+        await _wait_for(lambda: watcher.mode == "polling")
+        await asyncio.sleep(0.05)
+        db.tracked_jobs.delete_one({"job_id": "job-2"})
+        await _wait_for(lambda: batches)
+    finally:
+        task.cancel()
+
+    [[change]] = batches
+    assert change.change_type == TrackedJobChangeType.DELETE
+    assert (change.job_id, change.company_name, change.company_id) == ("job-2", "globex", "globex-id")
+
+
+@pytest.mark.asyncio
+async def test_changes_patch_the_cached_company(job_service, db):
+    db.tracked_jobs.insert_one(_job_document("job-1"))
+    await job_service.get_tracked_jobs(USER_ID, "acme")
+
+    # written by another process, e.g. the MCP server
+    job_service._apply_change_to_cache(USER_ID, TrackedJobsWatcher._upsert_change(_job_document("job-2")))
+    job_service._apply_change_to_cache(USER_ID, TrackedJobsWatcher._upsert_change(
+        _job_document("job-1", job_state=JobApplicationState.MESSAGE_SENT)))
+    db.tracked_jobs.delete_many({})
+    response = await job_service.get_tracked_jobs(USER_ID, "acme")
+
+    assert response.code == JobTrackingResponseCode.OK
+    jobs = {job.job_id: job for job in response.company.tracked_jobs}
+    assert set(jobs) == {"job-1", "job-2"}
+    assert jobs["job-1"].job_state == JobApplicationState.MESSAGE_SENT
+    assert job_service.get_cache_stats().misses == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_changes(job_service, db):
+    db.tracked_jobs.insert_many([_job_document("job-1"), _job_document("job-2")])
+    await job_service.get_tracked_jobs(USER_ID, "acme")
+    watcher = TrackedJobsWatcher(job_service.application_persist, USER_ID, lambda changes: None)
+
+    delete = watcher._to_change({"operationType": "delete", "fullDocumentBeforeChange": _job_document("job-1")})
+    job_service._apply_change_to_cache(USER_ID, delete)
+    response = await job_service.get_tracked_jobs(USER_ID, "acme")
+    assert [job.job_id for job in response.company.tracked_jobs] == ["job-2"]
+
+    # without the deleted document the company is unknown, so the user's cache is dropped
+    job_service._apply_change_to_cache(USER_ID, watcher._to_change({"operationType": "delete", "documentKey": {"_id": 1}}))
+    assert job_service.get_cache_stats().size == 0
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from jobs_tracking.services.job_tracking_service import JobTrackingService
+from jobs_tracking.services.models import JobApplicationState, JobTrackingResponseCode, TrackedJob
+from user.services.user_registry_service import UserRegistryService
+
+from tests.mockups.mongo_mockups import MockCompanyMongoPersist, MockUserMongoPersist
+
+
+@pytest.fixture(autouse=True)
+def cleanup_db(db):
+    yield
+    db.users.drop()
+    db.tracked_jobs.drop()
+
+@pytest.fixture
+def failed_updates():
+    return []
+
+@pytest.fixture
+def job_service(db, failed_updates):
+    service = JobTrackingService(MockCompanyMongoPersist(db))
+    # long delay, the tests flush explicitly
+    service.enable_write_behind(on_error=failed_updates.extend, flush_delay=60)
+    return service
+
+@pytest.fixture
+async def user_id(db):
+    return (await UserRegistryService(MockUserMongoPersist(db)).register_async("queue@example.com")).user_id
+
+@pytest.fixture
+async def tracked(job_service, user_id):
+    job = TrackedJob(job_url="https://acme.com/jobs/1", job_title="Developer", job_state=JobApplicationState.CONNECTION_REQUESTED)
+    return await job_service.track_new_job(user_id, "Acme", job)
+
+
+def _edit(job: TrackedJob, **changes) -> TrackedJob:
+    return TrackedJob(**{**job.__dict__, **changes})
+
+
+@pytest.mark.asyncio
+async def test_updates_are_acknowledged_before_they_are_written(job_service, user_id, tracked, db):
+    edited = _edit(tracked.job, job_state=JobApplicationState.APPLIED)
+
+    response = await job_service.track_existing_job(user_id, tracked.company_id, edited)
+
+    assert response.code == JobTrackingResponseCode.OK
+    assert db.tracked_jobs.find_one({"job_id": tracked.job.job_id})["job_state"] == "CONNECTION_REQUESTED"
+    # reads see the queued version
+    company = (await job_service.get_tracked_jobs(user_id, "Acme")).company
+    assert company.tracked_jobs[0].job_state == JobApplicationState.APPLIED
+
+@pytest.mark.asyncio
+async def test_updates_of_a_job_are_coalesced_into_one_write(job_service, user_id, tracked, db):
+    for state in (JobApplicationState.MESSAGE_SENT, JobApplicationState.EMAIL_SENT, JobApplicationState.APPLIED):
+        await job_service.track_existing_job(user_id, tracked.company_id, _edit(tracked.job, job_state=state))
+    await job_service.track_existing_job(user_id, tracked.company_id,
+                                         _edit(tracked.job, job_state=JobApplicationState.APPLIED, contact_name="Jane Doe"))
+
+    failed = await job_service._write_queue.flush()
+
+    assert failed == []
+    stored = db.tracked_jobs.find_one({"job_id": tracked.job.job_id})
+    assert (stored["job_state"], stored["contact_name"]) == ("APPLIED", "Jane Doe")
+    stats = job_service.get_write_queue_stats()
+    assert (stats.queued, stats.coalesced, stats.written, stats.flushes) == (4, 3, 1, 1)
+
+@pytest.mark.asyncio
+async def test_failed_updates_go_to_the_error_callback(job_service, user_id, tracked, db, failed_updates):
+    await job_service.track_existing_job(user_id, tracked.company_id, _edit(tracked.job, job_state=JobApplicationState.APPLIED))
+    db.tracked_jobs.delete_many({})
+
+    await job_service._write_queue.flush()
+
+    assert [pending.tracked_job.job_id for pending in failed_updates] == [tracked.job.job_id]
+    assert failed_updates[0].error_message == "Job not found"
+
+@pytest.mark.asyncio
+async def test_queue_is_flushed_after_the_delay(job_service, user_id, tracked, db):
+    job_service._write_queue.flush_delay = 0.01
+    await job_service.track_existing_job(user_id, tracked.company_id, _edit(tracked.job, job_state=JobApplicationState.APPLIED))
+
+    await asyncio.sleep(0.1)
+
+    assert db.tracked_jobs.find_one({"job_id": tracked.job.job_id})["job_state"] == "APPLIED"
+    assert job_service.get_write_queue_stats().pending == 0
@@ -1,5 +1,6 @@
 import pytest
 import mongomock
+from pymongo.errors import OperationFailure
 
 from jobs_tracking.repository.company_mongo_persist import CompanyMongoPersist
 from user.repository.user_mongo_persist import UserMongoPersist
@@ -14,6 +15,14 @@ class AsyncMockCursor:
     def __init__(self, cursor):
         self.cursor = cursor
 
+    def sort(self, *args, **kwargs):
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, *args, **kwargs):
+        self.cursor = self.cursor.limit(*args, **kwargs)
+        return self
+
     def __aiter__(self):
         return self
 
@@ -48,6 +57,18 @@ class AsyncMockCollection:
 
     async def delete_one(self, *args, **kwargs):
         return self.collection.delete_one(*args, **kwargs)
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return self.collection.find_one_and_update(*args, **kwargs)
+
+    async def delete_many(self, *args, **kwargs):
+        return self.collection.delete_many(*args, **kwargs)
+
+    async def drop(self, *args, **kwargs):
+        return self.collection.drop(*args, **kwargs)
+
+    async def index_information(self, *args, **kwargs):
+        return self.collection.index_information(*args, **kwargs)
     
     async def bulk_write(self, requests, *args, **kwargs):
         # Manual implementation to bypass mongomock/pymongo compatibility issues
@@ -57,8 +78,9 @@ class AsyncMockCollection:
         inserted_count = 0
         upserted_count = 0
         matched_count = 0
+        upserted_ids = {}
         
-        for req in requests:
+        for index, req in enumerate(requests):
             op_type = type(req).__name__
             
             if op_type == 'InsertOne':
@@ -70,6 +92,7 @@ class AsyncMockCollection:
                 matched_count += res.matched_count
                 if res.upserted_id:
                     upserted_count += 1
+                    upserted_ids[index] = res.upserted_id
             elif op_type == 'UpdateMany':
                 res = self.collection.update_many(req._filter, req._doc, upsert=getattr(req, '_upsert', False))
                 modified_count += res.modified_count
@@ -90,25 +113,39 @@ class AsyncMockCollection:
                 deleted_count += res.deleted_count
                 
         class MockBulkWriteResult:
-            def __init__(self, modified, deleted, inserted, upserted, matched):
+            def __init__(self, modified, deleted, inserted, upserted, matched, upserted_ids):
                 self.modified_count = modified
                 self.deleted_count = deleted
                 self.inserted_count = inserted
                 self.upserted_count = upserted
                 self.matched_count = matched
-                self.upserted_ids = {}
+                self.upserted_ids = upserted_ids
 
-        return MockBulkWriteResult(modified_count, deleted_count, inserted_count, upserted_count, matched_count)
+        return MockBulkWriteResult(modified_count, deleted_count, inserted_count, upserted_count, matched_count, upserted_ids)
     
     async def create_index(self, *args, **kwargs):
         return self.collection.create_index(*args, **kwargs)
 
+    async def drop_index(self, *args, **kwargs):
+        return self.collection.drop_index(*args, **kwargs)
+
+    def watch(self, *args, **kwargs):
+        return AsyncMockChangeStream()
+
     def find(self, *args, **kwargs):
         return AsyncMockCursor(self.collection.find(*args, **kwargs))
 
     def aggregate(self, *args, **kwargs):
         return AsyncMockCursor(self.collection.aggregate(*args, **kwargs))
 
+class AsyncMockChangeStream:
+    """mongomock is a standalone server, which has no change streams"""
+    async def __aenter__(self):
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    async def __aexit__(self, *args):
+        return False
+
 class AsyncMockDatabase:
     def __init__(self, db):
         self.db = db
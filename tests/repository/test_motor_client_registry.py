@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from repository.motor_client_registry import MotorClientRegistry, MotorPoolOptions
+
+CONNECTION_STRING = "mongodb://localhost:27017/"
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    MotorClientRegistry.configure(MotorPoolOptions(max_pool_size=5, min_pool_size=0, max_idle_time_ms=1000))
+    yield MotorClientRegistry
+    MotorClientRegistry.close_all()
+    MotorClientRegistry.configure(None)
+
+
+@pytest.mark.asyncio
+async def test_same_loop_shares_one_client():
+    first = MotorClientRegistry.acquire(CONNECTION_STRING)
+    second = MotorClientRegistry.acquire(CONNECTION_STRING)
+
+    assert first is second
+    assert first.options.pool_options.max_pool_size == 5
+    [stats] = MotorClientRegistry.get_pool_stats()
+    assert stats.references == 2
+    assert stats.max_pool_size == 5
+
+@pytest.mark.asyncio
+async def test_each_loop_gets_its_own_client():
+    client = MotorClientRegistry.acquire(CONNECTION_STRING)
+    other_loop = asyncio.new_event_loop()
+    try:
+        other_client = MotorClientRegistry.acquire(CONNECTION_STRING, other_loop)
+        assert other_client is not client
+        assert len(MotorClientRegistry.get_pool_stats()) == 2
+    finally:
+        other_loop.close()
+
+@pytest.mark.asyncio
+async def test_client_is_closed_by_last_release():
+    client = MotorClientRegistry.acquire(CONNECTION_STRING)
+    MotorClientRegistry.acquire(CONNECTION_STRING)
+
+    MotorClientRegistry.release(client)
+    assert len(MotorClientRegistry.get_pool_stats()) == 1
+
+    MotorClientRegistry.release(client)
+    assert MotorClientRegistry.get_pool_stats() == []
+    assert MotorClientRegistry.acquire(CONNECTION_STRING) is not client
+
+def test_pool_options_from_env(monkeypatch):
+    monkeypatch.setenv("MONGODB_MAX_POOL_SIZE", "20")
+    monkeypatch.setenv("MONGODB_MIN_POOL_SIZE", "2")
+    monkeypatch.setenv("MONGODB_COMPRESSORS", "zstd, zlib")
+
+    options = MotorPoolOptions.from_env()
+
+    assert options.client_kwargs() == {"maxPoolSize": 20, "minPoolSize": 2, "compressors": "zstd,zlib"}
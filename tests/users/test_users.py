@@ -31,3 +31,68 @@ async def test_register_user_login_returns_id(user_service):
     assert response.code == UserRegistryResponseCode.OK
     assert response.user_id is not None
     assert len(response.user_id) > 0
+
+
+@pytest.mark.asyncio
+async def test_register_existing_email_returns_same_user(user_service, db):
+    email = f"test-{uuid.uuid4()}@example.com"
+    first = await user_service.register_async(email)
+    second = await user_service.register_async(email.upper())
+
+    assert first.user_id == second.user_id
+    assert db.users.count_documents({"email": email}) == 1
+
+
+@pytest.mark.asyncio
+async def test_login_unknown_email_is_cached_until_registration(user_service):
+    email = f"test-{uuid.uuid4()}@example.com"
+
+    assert (await user_service.login_user_async(email)).code == UserRegistryResponseCode.ERROR
+    assert (await user_service.login_user_async(email)).code == UserRegistryResponseCode.ERROR
+    assert user_service.unknown_emails_cache.stats().hits == 1
+
+    registered = await user_service.register_async(email)
+    response = await user_service.login_user_async(email)
+
+    assert response.code == UserRegistryResponseCode.OK
+    assert response.user_id == registered.user_id
+
+
+@pytest.mark.asyncio
+async def test_login_reads_user_id_from_cache(user_service, db):
+    email = f"test-{uuid.uuid4()}@example.com"
+    await user_service.register_async(email)
+    user_service.user_ids_cache.clear()
+
+    first = await user_service.login_user_async(email)
+    db.users.delete_many({"email": email})
+    second = await user_service.login_user_async(email)
+
+    assert second.code == UserRegistryResponseCode.OK
+    assert second.user_id == first.user_id
+
+
+@pytest.mark.asyncio
+async def test_create_index_replaces_legacy_userid_index(db):
+    db.users.drop()
+    db.users.create_index([("userid", 1)], unique=True)
+
+    await MockUserMongoPersist(db).create_index()
+
+    indexes = db.users.index_information()
+    assert "userid_1" not in indexes
+    assert indexes["email_1"].get("unique")
+
+
+@pytest.mark.asyncio
+async def test_create_index_with_duplicate_emails_is_not_unique(db):
+    db.users.drop()
+    db.users.insert_many([{"_id": "user-1", "email": "same@example.com"}, {"_id": "user-2", "email": "same@example.com"}])
+
+    await MockUserMongoPersist(db).create_index()
+    assert not db.users.index_information()["email_1"].get("unique")
+
+    db.users.delete_one({"_id": "user-2"})
+    await MockUserMongoPersist(db).create_index()
+    assert db.users.index_information()["email_1"].get("unique")
+    db.users.drop()
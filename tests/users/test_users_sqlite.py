@@ -0,0 +1,37 @@
+import pytest
+
+from user.services.user_registry_service import UserRegistryService, UserRegistryResponseCode
+
+
+@pytest.fixture
+async def user_service(tmp_path):
+    service = await UserRegistryService.create_local(tmp_path / "job_tracker.db")
+    yield service
+    await service.user_persist.close()
+
+
+@pytest.mark.asyncio
+async def test_register_and_login(user_service):
+    registered = await user_service.register_async("local.user@example.com")
+    user_service.user_ids_cache.clear()
+
+    logged_in = await user_service.login_user_async("local.user@example.com")
+
+    assert registered.code == UserRegistryResponseCode.OK
+    assert logged_in.code == UserRegistryResponseCode.OK
+    assert logged_in.user_id == registered.user_id
+
+@pytest.mark.asyncio
+async def test_register_existing_email_returns_same_user(user_service):
+    first = await user_service.register_async("local.user@example.com")
+    second = await user_service.register_async("local.user@example.com")
+
+    assert second.user_id == first.user_id
+
+@pytest.mark.asyncio
+async def test_delete_user(user_service):
+    registered = await user_service.register_async("local.user@example.com")
+
+    assert await user_service.user_persist.delete_user(registered.user_id)
+    response = await user_service.user_persist.get_user_by_email("local.user@example.com")
+    assert response.data is None
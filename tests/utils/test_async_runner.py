@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.utils import AsyncRunner, OperationClass, OperationStatus, cancel_current_async_operation
+
+
+@pytest.fixture
+def async_runner():
+    timeouts = dict(AsyncRunner._operation_timeouts)
+    AsyncRunner.start(loop_names=[AsyncRunner.DB_LOOP, AsyncRunner.LLM_LOOP, AsyncRunner.IO_LOOP])
+    yield
+    AsyncRunner.shutdown()
+    AsyncRunner._operation_timeouts = timeouts
+
+
+async def _value(value):
+    return value
+
+async def _sleep(seconds: float):
+    await asyncio.sleep(seconds)
+    return seconds
+
+async def _fail():
+    raise ValueError("bad job url")
+
+async def _thread_name():
+    return threading.current_thread().name
+
+
+def _wait_until(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.01)
+
+
+def test_operation_is_done_then_forgotten(async_runner):
+    handle = AsyncRunner.submit_operation(_value(42))
+
+    result = AsyncRunner.await_operation(handle, timeout=2)
+    assert result.status == OperationStatus.DONE
+    assert result.result == 42
+
+    # the result was collected
+    assert AsyncRunner.poll_operation(handle).status == OperationStatus.NOT_FOUND
+
+def test_poll_running_operation_is_pending(async_runner):
+    handle = AsyncRunner.submit_operation(_sleep(10))
+
+    assert AsyncRunner.poll_operation(handle).status == OperationStatus.PENDING
+    assert AsyncRunner.await_operation(handle, timeout=0.05).status == OperationStatus.PENDING
+    AsyncRunner.cancel_operation(handle)
+
+def test_failed_operation_is_error(async_runner):
+    result = AsyncRunner.await_operation(AsyncRunner.submit_operation(_fail()), timeout=2)
+
+    assert result.status == OperationStatus.ERROR
+    assert result.error_message == "bad job url"
+
+def test_operation_times_out_after_its_class_timeout(async_runner):
+    AsyncRunner.set_operation_timeout(OperationClass.DB_WRITE, 0.05)
+
+    write = AsyncRunner.submit_operation(_sleep(0.3), OperationClass.DB_WRITE)
+    read = AsyncRunner.submit_operation(_sleep(0.3), OperationClass.DB_READ)
+
+    result = AsyncRunner.await_operation(write, timeout=2)
+    assert result.status == OperationStatus.TIMEOUT
+    assert result.error_message == "Operation timed out after 0.05s"
+    # the override applies to its class only
+    assert AsyncRunner.await_operation(read, timeout=2).status == OperationStatus.DONE
+
+def test_class_without_timeout_waits(async_runner):
+    AsyncRunner.set_operation_timeout(OperationClass.SCRAPING, None)
+
+    assert AsyncRunner.get_operation_timeout(OperationClass.SCRAPING) is None
+    result = AsyncRunner.await_operation(AsyncRunner.submit_operation(_sleep(0.1), OperationClass.SCRAPING), timeout=2)
+    assert result.status == OperationStatus.DONE
+
+def test_run_async_uses_the_class_timeout(async_runner):
+    AsyncRunner.set_operation_timeout(OperationClass.DB_READ, 0.05)
+
+    with pytest.raises(TimeoutError):
+        AsyncRunner.run_async(_sleep(1), operation_class=OperationClass.DB_READ)
+    # an explicit timeout wins over the class timeout
+    assert AsyncRunner.run_async(_sleep(0.1), timeout=2, operation_class=OperationClass.DB_READ) == 0.1
+
+def test_cancelled_operation(async_runner):
+    handle = AsyncRunner.submit_operation(_sleep(10))
+
+    assert AsyncRunner.cancel_operation(handle)
+    result = AsyncRunner.await_operation(handle, timeout=2)
+    assert result.status == OperationStatus.CANCELLED
+    assert AsyncRunner.poll_operation(handle).status == OperationStatus.NOT_FOUND
+
+def test_cancel_unknown_operation(async_runner):
+    assert not AsyncRunner.cancel_operation("no-such-handle")
+    assert AsyncRunner.await_operation("no-such-handle", timeout=0.01).status == OperationStatus.NOT_FOUND
+
+def test_cancel_current_llm_operation(async_runner):
+    handle = AsyncRunner.submit_operation(_sleep(10), OperationClass.LLM)
+
+    cancel_current_async_operation()
+    assert AsyncRunner.await_operation(handle, timeout=2).status == OperationStatus.CANCELLED
+
+def test_uncollected_results_are_pruned(async_runner, monkeypatch):
+    monkeypatch.setattr(AsyncRunner, "OPERATION_RESULT_TTL", 0.0)
+    forgotten = AsyncRunner.submit_operation(_value(1))
+    _wait_until(lambda: AsyncRunner._operations[forgotten].finished_at is not None)
+    time.sleep(0.01)
+
+    # submitting prunes the finished operations older than the ttl
+    handle = AsyncRunner.submit_operation(_sleep(10))
+    assert AsyncRunner.poll_operation(forgotten).status == OperationStatus.NOT_FOUND
+    assert AsyncRunner.poll_operation(handle).status == OperationStatus.PENDING
+    AsyncRunner.cancel_operation(handle)
+
+def test_operations_run_on_the_loop_of_their_class(async_runner):
+    def thread_of(operation_class: OperationClass) -> str:
+        return AsyncRunner.await_operation(AsyncRunner.submit_operation(_thread_name(), operation_class), timeout=2).result
+
+    assert thread_of(OperationClass.DB_READ) == "AsyncBackgroundLoop-db"
+    assert thread_of(OperationClass.DB_WRITE) == "AsyncBackgroundLoop-db"
+    assert thread_of(OperationClass.LLM) == "AsyncBackgroundLoop-llm"
+    assert thread_of(OperationClass.SCRAPING) == "AsyncBackgroundLoop-io"
+    assert AsyncRunner.run_async(_thread_name()) == "AsyncBackgroundLoop"
+    assert AsyncRunner.run_async(_thread_name(), loop_name=AsyncRunner.IO_LOOP) == "AsyncBackgroundLoop-io"
+
+def test_operations_use_the_default_loop_when_their_loop_is_not_started():
+    AsyncRunner.start()
+    try:
+        assert AsyncRunner.get_loop_name(OperationClass.DB_READ) == AsyncRunner.DEFAULT_LOOP
+        handle = AsyncRunner.submit_operation(_thread_name(), OperationClass.LLM)
+        assert AsyncRunner.await_operation(handle, timeout=2).result == "AsyncBackgroundLoop"
+    finally:
+        AsyncRunner.shutdown()
+
+def test_blocking_on_a_loop_thread_is_refused(async_runner):
+    async def _nested():
+        AsyncRunner.run_async(_value(1))
+
+    with pytest.raises(RuntimeError, match="cannot block on a loop thread"):
+        AsyncRunner.run_async(_nested())
+
+def test_loop_metrics_per_loop(async_runner):
+    AsyncRunner.run_async(_value(1), operation_class=OperationClass.DB_READ)
+
+    def metrics():
+        return {loop_metrics.name: loop_metrics for loop_metrics in AsyncRunner.get_loop_metrics()}
+
+    assert set(metrics()) == {"default", "db", "llm", "io"}
+    _wait_until(lambda: metrics()["db"].completed == 1)
+    assert metrics()["llm"].submitted == 0
+
+def test_submit_before_start_is_refused():
+    coro = _value(1)
+    with pytest.raises(RuntimeError, match="must be called before"):
+        AsyncRunner.submit(coro)
+    with pytest.raises(RuntimeError, match="must be called before"):
+        AsyncRunner.enable_monitoring()
+    assert AsyncRunner.get_blocking_hot_spots() == []
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from utils.background_loop import BackgroundLoop
+
+
+@pytest.fixture
+def background_loop(monkeypatch):
+    monkeypatch.setattr(BackgroundLoop, "LAG_PROBE_INTERVAL", 0.01)
+    background_loop = BackgroundLoop("test")
+    background_loop.start()
+    yield background_loop
+    background_loop.stop()
+
+
+def _wait_until(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.01)
+
+
+def test_metrics_count_submitted_and_completed(background_loop):
+    futures = [background_loop.submit(asyncio.sleep(0.2)) for _ in range(2)]
+
+    metrics = background_loop.metrics()
+    assert metrics.name == "test"
+    assert (metrics.queue_depth, metrics.submitted) == (2, 2)
+
+    for future in futures:
+        future.result(timeout=2)
+    _wait_until(lambda: background_loop.metrics().completed == 2)
+    assert background_loop.metrics().queue_depth == 0
+
+def test_failed_and_cancelled_coroutines_are_completed(background_loop):
+    async def _fail():
+        raise ValueError("failed")
+
+    background_loop.submit(_fail())
+    background_loop.submit(asyncio.sleep(10)).cancel()
+
+    _wait_until(lambda: background_loop.metrics().completed == 2)
+    assert background_loop.metrics().queue_depth == 0
+
+def test_blocking_call_shows_as_lag(background_loop):
+    async def _block():
+        time.sleep(0.2)
+
+    background_loop.submit(_block()).result(timeout=2)
+
+    _wait_until(lambda: background_loop.metrics().max_lag_ms >= 100)
+    # the last probe after the block was on time again
+    _wait_until(lambda: background_loop.metrics().lag_ms < 100)
+
+def test_runs_on_its_own_thread(background_loop):
+    async def _is_current_thread():
+        return background_loop.is_current_thread()
+
+    assert background_loop.submit(_is_current_thread()).result(timeout=2)
+    assert not background_loop.is_current_thread()
+    assert background_loop.thread.name == "AsyncBackgroundLoop-test"
+
+def test_stop_ends_the_thread(background_loop):
+    background_loop.stop()
+
+    assert not background_loop.is_running()
+    assert not background_loop.thread.is_alive()
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from utils.background_loop import BackgroundLoop
+from utils.loop_monitor import LoopMonitor
+
+
+@pytest.fixture
+def background_loop():
+    background_loop = BackgroundLoop("monitored")
+    background_loop.start()
+    yield background_loop
+    background_loop.stop()
+
+@pytest.fixture
+def monitor(background_loop):
+    monitor = LoopMonitor([background_loop], block_threshold=0.05, summary_interval=60)
+    monitor.start()
+    yield monitor
+    monitor.stop()
+
+
+def _wait_until(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.01)
+
+
+async def _block():
+    time.sleep(0.3)
+
+
+def test_blocking_call_is_a_hot_spot(background_loop, monitor, caplog):
+    caplog.set_level(logging.WARNING)
+    background_loop.submit(_block()).result(timeout=2)
+
+    # the duration is known once the heartbeat runs again
+    _wait_until(lambda: monitor.get_hot_spots() and monitor.get_hot_spots()[0][2] > 0)
+    [(location, count, blocked_seconds)] = monitor.get_hot_spots()
+    assert location.endswith("in _block")
+    assert count == 1
+    assert blocked_seconds >= 0.2
+    assert "loop 'monitored' blocked for more than 50 ms" in caplog.text
+
+def test_awaiting_is_not_blocking(background_loop, monitor):
+    background_loop.submit(asyncio.sleep(0.3)).result(timeout=2)
+
+    assert monitor.get_hot_spots() == []
+
+def test_stop_logs_a_summary(background_loop, monitor, caplog):
+    background_loop.submit(_block()).result(timeout=2)
+    _wait_until(lambda: monitor.get_hot_spots() and monitor.get_hot_spots()[0][2] > 0)
+
+    caplog.set_level(logging.INFO)
+    monitor.stop()
+    assert "monitored: lag avg=" in caplog.text
+    assert "blocked 1 times" in caplog.text
+    assert "Hot spots since start" in caplog.text